@@ -4,6 +4,7 @@ PUCT 探索（MCTS）にニューラルネットワークの policy/value を統
 デフォルトで学習済みモデルを使用します。
 """
 import logging
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
@@ -12,8 +13,9 @@ try:
 except ImportError:
     raise ImportError("PyTorch is required for AlphaZeroAgent")
 
-from .alphazero.mcts import MCTS, PASS_ACTION
+from .alphazero.mcts import MCTS, PASS_ACTION, MCTSNode
 from .base_agent import Agent
+from .search_stats import SearchStats
 from .networks.othello_net import OthelloNNet
 
 _logger = logging.getLogger(__name__)
@@ -27,6 +29,26 @@ DEFAULT_MODEL_PATH = Path(__file__).parent.parent / "models" / "alpha_zero_8x8_b
 FALLBACK_MODEL_PATH = Path(__file__).parent.parent / "models" / "alpha_zero_latest.pth"
 
 
+def _tree_stats(root: MCTSNode, simulations: int, board_size: int) -> SearchStats:
+    """訪問済みノードの数・最大深さと、訪問数の最も多い子をたどった読み筋（パスで止める）。"""
+    nodes = 0
+    max_depth = 0
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        nodes += 1
+        max_depth = max(max_depth, depth)
+        stack.extend((child, depth + 1) for child in node.children.values() if child.visit_count)
+    pv = []
+    node = root
+    while node.children:
+        action, node = max(node.children.items(), key=lambda item: item[1].visit_count)
+        if action == PASS_ACTION or not node.visit_count:
+            break
+        pv.append(divmod(action, board_size))
+    return SearchStats(nodes=nodes, depth=max_depth, simulations=simulations, pv=tuple(pv))
+
+
 class AlphaZeroAgent(Agent):
     """MCTS + PyTorch CNN のエージェント。
 
@@ -35,6 +57,7 @@ class AlphaZeroAgent(Agent):
         model_path: 学習済みモデルのパス（オプション）。
                    指定がない場合は models/alpha_zero_8x8_best.pth.tar を使用。
         board_size: 盤面サイズ（デフォルト 8）。
+        use_bitboard: 8x8 盤面で MCTS の着手生成にビットボードを使うか。
     """
 
     def __init__(
@@ -42,6 +65,7 @@ class AlphaZeroAgent(Agent):
         n_simulations: int = 50,
         model_path: Optional[str] = None,
         board_size: int = 8,
+        use_bitboard: bool = False,
     ) -> None:
         self._n_simulations = n_simulations
         self._board_size = board_size
@@ -79,6 +103,7 @@ class AlphaZeroAgent(Agent):
             net=self._net,
             n_simulations=n_simulations,
             board_size=board_size,
+            use_bitboard=use_bitboard,
         )
 
     @classmethod
@@ -118,13 +143,18 @@ class AlphaZeroAgent(Agent):
         turn = game.turn
 
         # 合法手なし → パス
-        from .negamax_agent import _valid_moves
+        from .search_primitives import _valid_moves
         if not _valid_moves(board, self._board_size, turn):
             return None
 
         # MCTS で訪問数を計算し、最大訪問数の手を選択
+        start = time.perf_counter()
         counts = self._mcts.run(board, turn)
         best_action = max(counts, key=lambda a: counts[a])
+        root = self._mcts.last_root
+        if root is not None:
+            stats = _tree_stats(root, self._n_simulations, self._board_size)
+            self.last_stats = stats._replace(elapsed_ms=(time.perf_counter() - start) * 1000.0)
 
         if best_action == PASS_ACTION:
             return None
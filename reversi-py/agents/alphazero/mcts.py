@@ -11,7 +11,7 @@ from typing import TYPE_CHECKING, Optional
 import torch
 
 from agents.alphazero.encoding import board_to_tensor
-from agents.negamax_agent import _apply, _flips_for_move, _undo, _valid_moves
+from agents.search_primitives import _apply, _move_helpers, _undo
 
 if TYPE_CHECKING:
     pass
@@ -66,6 +66,7 @@ class MCTS:
         board_size: 盤面サイズ（デフォルト 8）。
         dirichlet_alpha: Dirichlet ノイズ α（学習時ルートに加える）。
         dirichlet_eps: Dirichlet ノイズ混合率（0.0 で無効）。
+        use_bitboard: 8x8 盤面で着手生成にビットボードカーネルを使うか。
     """
 
     def __init__(
@@ -76,6 +77,7 @@ class MCTS:
         board_size: int = 8,
         dirichlet_alpha: float = 0.3,
         dirichlet_eps: float = 0.0,
+        use_bitboard: bool = False,
     ) -> None:
         self._net = net
         self._n_simulations = n_simulations
@@ -83,6 +85,9 @@ class MCTS:
         self._board_size = board_size
         self._dirichlet_alpha = dirichlet_alpha
         self._dirichlet_eps = dirichlet_eps
+        self._helpers = _move_helpers(board_size, use_bitboard)
+        # 直前の run の探索木のルート（探索統計用）
+        self.last_root: Optional[MCTSNode] = None
 
     def run(self, board: list[list[int]], turn: int) -> dict[int, int]:
         """MCTS 探索を実行し、着手ごとの訪問数を返す。
@@ -104,6 +109,7 @@ class MCTS:
 
         for _ in range(self._n_simulations):
             self._simulate(root, work, turn)
+        self.last_root = root
 
         return {a: c.visit_count for a, c in root.children.items()}
 
@@ -121,7 +127,7 @@ class MCTS:
                 flips: list = []
             else:
                 r, c = divmod(action, self._board_size)
-                flips = _flips_for_move(work, self._board_size, r, c, turn)
+                flips = self._helpers.flips_for_move(work, self._board_size, r, c, turn)
                 _apply(work, (r, c), flips, turn)
             path.append((child, action, flips, turn))
             node, turn = child, -turn
@@ -146,8 +152,8 @@ class MCTS:
 
     def _expand(self, node: MCTSNode, work: list[list[int]], turn: int) -> float:
         """葉ノードを展開してネット評価値（手番視点）を返す。"""
-        moves = _valid_moves(work, self._board_size, turn)
-        opponent_moves = _valid_moves(work, self._board_size, -turn)
+        moves = self._helpers.valid_moves(work, self._board_size, turn)
+        opponent_moves = self._helpers.valid_moves(work, self._board_size, -turn)
 
         if not moves and not opponent_moves:
             node.is_terminal = True
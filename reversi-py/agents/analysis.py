@@ -0,0 +1,66 @@
+"""局面の解析（multi-PV）: 1 回の反復深化で上位 k 手を正確な評価値付きで求める。
+
+SearchCore（search_core.py。NegamaxAgent などの基底）の analyze(game, k) が使う。反復深化の
+各深さで、ルートの手を前の深さの評価値の高い順に、下限 alpha を「これまでの
+k 番目の評価値」（k 手そろうまでは -inf）、上限を +inf にした窓で探索する:
+
+    評価値 > alpha  窓の中なので正確な値。上位 k 手に入る
+    評価値 <= alpha 上界しか分からないが、上位 k 手には入らない
+
+上限を開いているのでルートで枝を刈らず、k が合法手の数以上ならすべての手の
+正確な評価値が得られる。TT・評価キャッシュ・手順付けは深さと手の間で共有し、
+上位に入らない手はヌルウィンドウの探索で済むため、/play を k 回呼ぶ
+（k 個の局面を別々に探索する）よりずっと安い。
+"""
+import bisect
+import math
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+Move = Tuple[int, int]
+
+
+class MoveAnalysis(NamedTuple):
+    """解析した 1 手の結果。"""
+
+    move: Move
+    score: float  # 手番側から見た評価値（完了した最深の深さでの正確な値）
+    pv: Tuple[Move, ...] = ()  # move から始まる読み筋（分かる範囲）
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON にできる辞書。"""
+        return {
+            "move": list(self.move),
+            "score": self.score,
+            "pv": [list(move) for move in self.pv],
+        }
+
+
+def multipv_search(
+    moves: Sequence[Move], k: int, search: Callable[[Move, float], float]
+) -> List[Tuple[Move, float]]:
+    """ルートの手を順に探索し、上位 k 手を正確な評価値で求める。
+
+    Args:
+        moves: ルートの合法手（有望な順）。
+        k: 正確な評価値を求める上位の手の数（1 以上）。
+        search: (手, alpha) を受け取り、窓 (alpha, +inf) で探索した手番側から見た
+            評価値を返す関数（alpha 以下なら fail-soft の上界でよい）。
+
+    Returns:
+        (手, 評価値) を評価値の高い順に並べたリスト。先頭の min(k, len(moves)) 手の
+        評価値は正確で、残りは上界。同じ評価値なら正確な値の手、先に調べた手が前。
+    """
+    # これまでの上位 k 手の評価値（符号を反転して昇順に持ち、先頭 k 個が上位）
+    top: List[float] = []
+    results: List[Tuple[float, bool, Move]] = []
+    for move in moves:
+        alpha = -top[k - 1] if len(top) >= k else -math.inf
+        score = search(move, alpha)
+        exact = score > alpha
+        results.append((score, exact, move))
+        if exact:
+            bisect.insort(top, -score)
+            del top[k:]
+    # 上界が k 番目の正確な値と同じになることがあるので、同値なら正確な値を前に置く
+    results.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    return [(move, score) for score, _, move in results]
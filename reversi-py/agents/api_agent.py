@@ -1,10 +1,12 @@
 # agents/api_agent.py
 import logging
+import uuid
 from typing import Optional, Tuple, TYPE_CHECKING
 
 import requests
 
 from .base_agent import Agent
+from .search_stats import SearchStats
 
 if TYPE_CHECKING:
     from game import Game
@@ -16,7 +18,12 @@ class ApiAgent(Agent):
     """外部 API サーバーから手を取得する AI エージェント。"""
 
     def __init__(
-        self, api_url: str, timeout: int = 5, agent_type: str = "random"
+        self,
+        api_url: str,
+        timeout: int = 5,
+        agent_type: str = "random",
+        include_stats: bool = True,
+        session_id: Optional[str] = None,
     ) -> None:
         """ApiAgent を初期化します。
 
@@ -25,6 +32,9 @@ class ApiAgent(Agent):
             timeout: API リクエストのタイムアウト時間（秒）。デフォルトは 5。
                 推奨値は 5 以上。MCTS(time_limit_ms=4000) より大きい値を指定。
             agent_type: API サーバーに送信する戦略種別。デフォルトは 'random'。
+            include_stats: サーバーに探索統計も返させ、last_stats に置くか。
+            session_id: /play と /ponder に添える対局の識別子。サーバーはこれごとに
+                エージェント（TT・ポンダー）を使い回す。省略時はインスタンスごとに生成する。
 
         Raises:
             ValueError: api_url が空の場合。
@@ -34,6 +44,42 @@ class ApiAgent(Agent):
         self.api_url = api_url
         self.timeout = timeout
         self.agent_type = agent_type
+        self.include_stats = include_stats
+        self.session_id = session_id if session_id is not None else uuid.uuid4().hex
+
+    def ponder(self, game: 'Game') -> bool:
+        """相手の手番の局面を API サーバーの /ponder に送り、ポンダーを始めさせます。
+
+        api_url が /play で終わる場合のみ、同じサーバーの /ponder に送る。
+        エラーは記録するだけで例外は送出しない。
+
+        Args:
+            game: 自分が指した直後（相手の手番）のゲーム状態。
+
+        Returns:
+            サーバーがポンダーを始めたか。
+        """
+        if not self.api_url.endswith('/play'):
+            return False
+        payload = {
+            'board': game.get_board(),
+            'turn': game.turn,
+            'agent_type': self.agent_type,
+            'session_id': self.session_id,
+        }
+        try:
+            response = requests.post(
+                self.api_url[:-len('/play')] + '/ponder',
+                json=payload,
+                timeout=self.timeout,
+                verify=True
+            )
+            response.raise_for_status()
+            data = response.json()
+            return isinstance(data, dict) and data.get('pondering') is True
+        except (requests.exceptions.RequestException, ValueError):
+            logger.warning("API ponder request failed", exc_info=False)
+            return False
 
     def play(
         self, game: 'Game', timeout: Optional[int] = None
@@ -56,7 +102,11 @@ class ApiAgent(Agent):
             'board': board_state,
             'turn': turn,
             'agent_type': self.agent_type,
+            'session_id': self.session_id,
         }
+        if self.include_stats:
+            payload['include_stats'] = True
+        self.last_stats = None
 
         try:
             # APIサーバーにPOSTリクエストを送信
@@ -83,6 +133,13 @@ class ApiAgent(Agent):
                 logging.warning(f"API response missing 'move' key: {data}")
                 return None
 
+            stats = data.get('stats')
+            if isinstance(stats, dict):
+                try:
+                    self.last_stats = SearchStats.from_dict(stats)
+                except ValueError:
+                    logging.warning(f"API returned invalid stats: {stats}")
+
             move = data['move']
 
             if move is None:
@@ -1,5 +1,8 @@
 # agents/base_agent.py
-from typing import Optional, Tuple, TYPE_CHECKING
+import time
+from typing import Any, Optional, Tuple, TYPE_CHECKING
+
+from .search_stats import SearchStats
 
 if TYPE_CHECKING:
     from game import Game
@@ -8,6 +11,9 @@ if TYPE_CHECKING:
 class Agent:
     """AI エージェントの基本インターフェース。"""
 
+    # 直前の play の探索統計（探索するエージェントが play の中で置く）
+    last_stats: Optional[SearchStats] = None
+
     def play(self, game: 'Game') -> Optional[Tuple[int, int]]:
         """現在のゲーム状態から最善の手を選択します。
 
@@ -21,3 +27,26 @@ class Agent:
             NotImplementedError: サブクラスで実装してください。
         """
         raise NotImplementedError
+
+    def play_with_stats(
+        self, game: 'Game', **kwargs: Any
+    ) -> Tuple[Optional[Tuple[int, int]], SearchStats]:
+        """play を呼び、着手とその探索統計を返します。
+
+        play が統計を置かないエージェントでは、経過時間だけの SearchStats を返す。
+
+        Args:
+            game: ゲーム状態。
+            **kwargs: play に渡す引数（time_manager など）。
+
+        Returns:
+            (着手, 探索統計)。
+        """
+        self.last_stats = None
+        start = time.perf_counter()
+        move = self.play(game, **kwargs)  # type: ignore[call-arg]
+        stats = self.last_stats
+        if stats is None:
+            stats = SearchStats(elapsed_ms=(time.perf_counter() - start) * 1000.0)
+            self.last_stats = stats
+        return move, stats
@@ -0,0 +1,266 @@
+"""8x8 盤面用ビットボード着手生成カーネル。
+
+1 局面を 64-bit 整数 2 つ（手番側 / 相手側）で表し、シフトとマスクで
+合法手生成と反転計算を行う。ビット位置は ``sq = row * 8 + col``。
+
+search_primitives の ``_flips_for_move`` / ``_valid_moves`` と同じ契約の
+ラッパー（``flips_for_move`` / ``valid_moves``）を提供するため、
+各エージェントは ``use_bitboard=True`` で探索部を変えずに切り替えられる。
+"""
+from typing import Iterator, List, Tuple
+
+# ビットボードが扱う盤面サイズ
+SIZE = 8
+
+FULL = 0xFFFFFFFFFFFFFFFF
+# 左右端の列（A 列 / H 列）を除いたマスク。横・斜め方向の回り込みを防ぐ
+_INNER_COLS = 0x7E7E7E7E7E7E7E7E
+
+# (シフト量, 相手石に掛けるマスク)。正は左シフト（sq 増加方向）
+_SHIFTS = (
+    (1, _INNER_COLS),    # 東
+    (-1, _INNER_COLS),   # 西
+    (8, FULL),           # 南
+    (-8, FULL),          # 北
+    (9, _INNER_COLS),    # 南東
+    (7, _INNER_COLS),    # 南西
+    (-7, _INNER_COLS),   # 北東
+    (-9, _INNER_COLS),   # 北西
+)
+# legal_moves 用: 正負の方向を 1 組にした (シフト量, 相手石に掛けるマスク)
+_FILL_SHIFTS = tuple((shift, mask) for shift, mask in _SHIFTS if shift > 0)
+
+
+def from_board(board: List[List[int]], turn: int) -> Tuple[int, int]:
+    """リスト盤面を (手番側, 相手側) のビットボードに変換する。
+
+    Args:
+        board: 8x8 盤面（0=空, 1=白, -1=黒）。
+        turn: 手番（1=白, -1=黒）。
+
+    Returns:
+        (手番側の石, 相手側の石) のビットボード。
+    """
+    player = 0
+    opponent = 0
+    bit = 1
+    for row in board:
+        for v in row:
+            if v == turn:
+                player |= bit
+            elif v:
+                opponent |= bit
+            bit <<= 1
+    return player, opponent
+
+
+def to_board(player: int, opponent: int, turn: int) -> List[List[int]]:
+    """ビットボードをリスト盤面へ戻す（from_board の逆変換）。
+
+    Args:
+        player: 手番側の石。
+        opponent: 相手側の石。
+        turn: player 側の色（1=白, -1=黒）。
+
+    Returns:
+        8x8 盤面（0=空, 1=白, -1=黒）。
+    """
+    board = [[0] * SIZE for _ in range(SIZE)]
+    for sq in iter_bits(player):
+        board[sq >> 3][sq & 7] = turn
+    for sq in iter_bits(opponent):
+        board[sq >> 3][sq & 7] = -turn
+    return board
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """立っているビットの位置を昇順に返す。
+
+    Args:
+        mask: ビットボード。
+
+    Yields:
+        ビット位置（sq）。
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def legal_moves(player: int, opponent: int) -> int:
+    """手番側の合法手をビットボードで返す。
+
+    各方向について「自石に隣接する相手石の連なり」をシフトで伸ばし、
+    その先の空きマスを合法手とする。連なりは 1 マスずつ 6 回伸ばす代わりに、
+    相手石が 2 つ続く位置（pre）を使って 2 マスずつ伸ばす（parallel prefix）。
+
+    Args:
+        player: 手番側の石。
+        opponent: 相手側の石。
+
+    Returns:
+        合法手マスのビットボード。
+    """
+    empty = ~(player | opponent) & FULL
+    moves = 0
+    for shift, mask in _FILL_SHIFTS:
+        om = opponent & mask
+        double = shift * 2
+        t = om & (player << shift)
+        t |= om & (t << shift)
+        pre = om & (om << shift)
+        t |= pre & (t << double)
+        t |= pre & (t << double)
+        moves |= t << shift
+        t = om & (player >> shift)
+        t |= om & (t >> shift)
+        pre >>= shift
+        t |= pre & (t >> double)
+        t |= pre & (t >> double)
+        moves |= t >> shift
+    return moves & empty
+
+
+def _build_rays() -> Tuple[Tuple[Tuple[int, Tuple[int, ...]], ...], ...]:
+    """マスごとに、8 方向の (隣のビット, その先のビット列) を作る。
+
+    長さ 1 の方向（隣が盤端）は石を挟めないので含めない。
+    """
+    rays = []
+    for sq in range(SIZE * SIZE):
+        row, col = divmod(sq, SIZE)
+        per_square = []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr == 0 and dc == 0:
+                    continue
+                line = []
+                r, c = row + dr, col + dc
+                while 0 <= r < SIZE and 0 <= c < SIZE:
+                    line.append(1 << (r * SIZE + c))
+                    r += dr
+                    c += dc
+                if len(line) >= 2:
+                    per_square.append((line[0], tuple(line[1:])))
+        rays.append(tuple(per_square))
+    return tuple(rays)
+
+
+# sq -> ((隣のビット, その先のビット列), ...)
+_RAYS = _build_rays()
+# sq -> 石を挟みうる方向の隣接マス
+_NEIGHBOURS = tuple(sum(first for first, _ in rays) for rays in _RAYS)
+
+
+def flips(player: int, opponent: int, sq: int) -> int:
+    """sq に着手したときに反転する相手石をビットボードで返す。
+
+    シフトで 1 マスずつ伸ばす代わりに、マスごとに事前計算した方向ごとの
+    ビット列をたどる。隣に相手石がない方向は 1 回の AND で読み飛ばす。
+
+    Args:
+        player: 手番側の石。
+        opponent: 相手側の石。
+        sq: 着手マス（row * 8 + col）。空きマスであること。
+
+    Returns:
+        反転する石のビットボード（0 なら不合法手）。
+    """
+    if not _NEIGHBOURS[sq] & opponent:
+        return 0
+    result = 0
+    for first, rest in _RAYS[sq]:
+        if first & opponent:
+            line = first
+            for bit in rest:
+                if bit & opponent:
+                    line |= bit
+                else:
+                    if bit & player:
+                        result |= line
+                    break
+    return result
+
+
+def _squares(mask: int) -> List[Tuple[int, int]]:
+    """ビットボードを (row, col) のリスト（row-major 昇順）に変換する。"""
+    return [(sq >> 3, sq & 7) for sq in iter_bits(mask)]
+
+
+def valid_moves(board: List[List[int]], n: int, turn: int) -> List[Tuple[int, int]]:
+    """search_primitives._valid_moves と同じ契約のビットボード版。
+
+    Args:
+        board: 8x8 盤面（0=空, 1=白, -1=黒）。
+        n: 盤面サイズ（8 固定。契約互換のため受け取る）。
+        turn: プレイヤー（1=白, -1=黒）。
+
+    Returns:
+        合法手のリスト（row-major 順）。
+    """
+    player, opponent = from_board(board, turn)
+    return _squares(legal_moves(player, opponent))
+
+
+def mobility(board: List[List[int]], n: int, turn: int) -> int:
+    """search_primitives._mobility と同じ契約のビットボード版。
+
+    盤面変換を 1 回で済ませ、双方の合法手数をビット数で数える。
+
+    Args:
+        board: 8x8 盤面（0=空, 1=白, -1=黒）。
+        n: 盤面サイズ（8 固定。契約互換のため受け取る）。
+        turn: プレイヤー（1=白, -1=黒）。
+
+    Returns:
+        手番側の合法手数 - 相手側の合法手数。
+    """
+    player, opponent = from_board(board, turn)
+    return legal_moves(player, opponent).bit_count() - legal_moves(opponent, player).bit_count()
+
+
+def flips_for_move(
+    board: List[List[int]], n: int, row: int, col: int, turn: int
+) -> List[Tuple[int, int]]:
+    """search_primitives._flips_for_move と同じ契約のビットボード版。
+
+    反転リストの並びは row-major 昇順（リスト版は方向順）だが、
+    _apply / _undo は順序に依存しない。
+
+    Args:
+        board: 8x8 盤面（0=空, 1=白, -1=黒）。
+        n: 盤面サイズ（8 固定。契約互換のため受け取る）。
+        row: 着手行。
+        col: 着手列。
+        turn: プレイヤー（1=白, -1=黒）。
+
+    Returns:
+        反転する石の座標リスト（着手が不合法なら空リスト）。
+    """
+    if board[row][col] != 0:
+        return []
+    player, opponent = from_board(board, turn)
+    return _squares(flips(player, opponent, row * SIZE + col))
+
+
+def moves_with_flips(
+    board: List[List[int]], turn: int
+) -> List[Tuple[Tuple[int, int], List[Tuple[int, int]]]]:
+    """合法手と反転リストのペアを row-major 順でまとめて返す。
+
+    盤面変換を 1 回で済ませるため、全合法手の反転リストが必要な
+    探索ノード（手のオーダリング）では個別呼び出しより速い。
+
+    Args:
+        board: 8x8 盤面（0=空, 1=白, -1=黒）。
+        turn: プレイヤー（1=白, -1=黒）。
+
+    Returns:
+        (着手, 反転リスト) のリスト。
+    """
+    player, opponent = from_board(board, turn)
+    return [
+        ((sq >> 3, sq & 7), _squares(flips(player, opponent, sq)))
+        for sq in iter_bits(legal_moves(player, opponent))
+    ]
@@ -0,0 +1,379 @@
+"""8x8 終盤の完全読み切りソルバー（ビットボード）。
+
+空きマスが少なくなった局面を最後まで読み、手番側から見た最終石差
+（手番側の石数 - 相手側の石数）を求める。NegamaxAgent の汎用探索
+（静的な位置重みで手を並べ、ノードごとに反転リストを作る）と違い、
+盤面は 64-bit 整数 2 つのまま扱い、次の工夫で読み切れる空き数を伸ばす。
+
+    fastest-first  空きが多いノードでは、着手後の相手の合法手数が少ない手から読む
+    領域パリティ    盤面を 4 つの 4x4 象限に分け、空きが奇数個の象限の手を先に読む
+    PVS            石差は整数なので、2 手目以降を窓幅 1 のヌルウィンドウで調べる
+    置換表          空きの多いノードの石差の上下界と最善手を (手番側, 相手側) で引く
+    残り 1-3 マス  合法手生成を使わず、空きマスを直接試す専用ルーチン
+
+``solve(..., wld=True)`` は窓 (-1, 1) で勝ち / 負け / 引き分けだけを判定する
+（石差を確定させるより速い）。その場合の評価値は符号だけが意味を持つ。
+"""
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from . import bitboard
+from .bitboard import flips, legal_moves
+
+# 石差の範囲（評価値はこの範囲に収まる）
+MAX_SCORE = 64
+
+# 時刻チェックを行うノード数の間隔
+_NODES_PER_TIME_CHECK = 4096
+
+# 空きがこの数以下のノードは合法手生成をせず、空きマスをパリティ順に直接試す
+_SHALLOW_EMPTIES = 6
+
+# 空きがこの数以上のノードの結果（石差の上下界と最善手）を置換表に残す
+_TABLE_EMPTIES = 6
+# 置換表のエントリ数の上限（超えたら空にして作り直す）
+_TABLE_MAX_ENTRIES = 1 << 20
+
+# 各マスの属する象限のビット（領域パリティ用）
+_QUADRANT_BIT = tuple(
+    1 << ((2 if sq >> 3 >= 4 else 0) + (1 if sq & 7 >= 4 else 0)) for sq in range(64)
+)
+# 象限 -> そのマスのビットボード
+_QUADRANT_MASK = tuple(
+    sum(1 << sq for sq in range(64) if _QUADRANT_BIT[sq] == 1 << q) for q in range(4)
+)
+# 象限のビット集合 -> それらの象限のマスのビットボード
+_PARITY_MASK = tuple(
+    sum(_QUADRANT_MASK[q] for q in range(4) if parity >> q & 1) for parity in range(16)
+)
+
+
+class EndgameTimeout(Exception):
+    """読み切りが期限（またはノード数の上限）までに終わらなかったことを示す例外。"""
+
+
+class SolveResult(NamedTuple):
+    """読み切り結果。"""
+
+    score: int  # 手番側から見た最終石差（wld=True なら符号のみ有効）
+    move: Optional[int]  # 最善手のマス（row * 8 + col）。合法手がなければ None
+    nodes: int  # 探索したノード数
+
+
+def _parity(empty: int) -> int:
+    """空きマスが奇数個の象限のビット集合を返す。"""
+    parity = 0
+    for q in range(4):
+        if (empty & _QUADRANT_MASK[q]).bit_count() & 1:
+            parity |= 1 << q
+    return parity
+
+
+def _parity_order(empty: int, parity: int) -> List[int]:
+    """空きマスを、奇数象限のマスが先になるように並べる。"""
+    squares = []
+    odd = empty & _PARITY_MASK[parity]
+    for part in (odd, empty ^ odd):
+        while part:
+            low = part & -part
+            part ^= low
+            squares.append(low.bit_length() - 1)
+    return squares
+
+
+class EndgameSolver:
+    """ビットボードによる終盤完全読み切り。
+
+    Args:
+        deadline: time.monotonic() の期限。超えると EndgameTimeout を送出する。
+            None なら時間制限なし。
+        node_limit: 探索ノード数の上限。超えると EndgameTimeout を送出する
+            （_NODES_PER_TIME_CHECK ノードごとに確かめる）。None なら制限なし。
+    """
+
+    def __init__(
+        self, deadline: Optional[float] = None, node_limit: Optional[int] = None
+    ) -> None:
+        self.deadline = deadline
+        self.node_limit = node_limit
+        self.nodes = 0
+        self._next_check = _NODES_PER_TIME_CHECK
+        # (手番側, 相手側) -> (下界, 上界, 最善手のマス)
+        self._table: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+        # 時間切れのとき、ルートで読み終えた手の中の最善手を残す（まだ読んでいない手の方が
+        # 良いこともあるので、最善手とは限らない）
+        self.best_move: Optional[int] = None
+
+    def solve(
+        self,
+        player: int,
+        opponent: int,
+        wld: bool = False,
+        alpha: int = -MAX_SCORE,
+        beta: int = MAX_SCORE,
+    ) -> SolveResult:
+        """局面を最後まで読み、最終石差と最善手を返す。
+
+        Args:
+            player: 手番側の石。
+            opponent: 相手側の石。
+            wld: 勝ち / 負け / 引き分けだけを判定するか。
+            alpha: 探索窓の下限（wld=True なら無視）。
+            beta: 探索窓の上限（wld=True なら無視）。
+
+        Returns:
+            SolveResult。score が窓の外なら fail-soft の境界値。
+
+        Raises:
+            EndgameTimeout: deadline（または node_limit）までに読み切れなかった場合。
+        """
+        if wld:
+            alpha, beta = -1, 1
+        self.nodes = 0
+        self._next_check = _NODES_PER_TIME_CHECK
+        self.best_move = None
+        moves = legal_moves(player, opponent)
+        if not moves:
+            # 手番側がパスする局面は、相手の手番として読んで符号を返す
+            score = -self._search(opponent, player, -beta, -alpha, passed=True)
+            return SolveResult(score, None, self.nodes)
+        empty = ~(player | opponent) & bitboard.FULL
+        best = -MAX_SCORE - 1
+        for i, (sq, next_player, next_opponent) in enumerate(
+            self._ordered_children(player, opponent, moves, empty)
+        ):
+            score = self._child(next_player, next_opponent, alpha, beta, first=i == 0)
+            if score > best:
+                best = score
+                self.best_move = sq
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return SolveResult(best, self.best_move, self.nodes)
+
+    def _tick(self) -> None:
+        """ノード数を数え、一定間隔で期限とノード数の上限を確かめる。
+
+        残り 1-2 マスのノードは _tick を通らずに数えるので、間隔の倍数ちょうどではなく
+        次に確かめるノード数を超えたかで判定する。
+        """
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._next_check += _NODES_PER_TIME_CHECK
+            if (self.deadline is not None and time.monotonic() > self.deadline) or (
+                self.node_limit is not None and self.nodes >= self.node_limit
+            ):
+                raise EndgameTimeout()
+
+    def _ordered_children(
+        self, player: int, opponent: int, moves: int, empty: int, first: int = -1
+    ) -> List[Tuple[int, int, int]]:
+        """合法手を fastest-first + パリティ順に並べ、(マス, 子の手番側, 子の相手側) で返す。
+
+        first に置換表の最善手が渡されたら、それを先頭にする。
+        """
+        parity = _parity(empty)
+        keyed = []
+        while moves:
+            low = moves & -moves
+            moves ^= low
+            sq = low.bit_length() - 1
+            f = flips(player, opponent, sq)
+            next_player = opponent ^ f
+            next_opponent = player | f | low
+            # 相手の合法手が少ない手を先に。同数なら奇数象限の手を先に
+            replies = legal_moves(next_player, next_opponent).bit_count()
+            key = replies * 2 + (0 if parity & _QUADRANT_BIT[sq] else 1)
+            if sq == first:
+                key = -1
+            keyed.append((key, sq, next_player, next_opponent))
+        keyed.sort()
+        return [(sq, p, o) for _, sq, p, o in keyed]
+
+    def _child(self, player: int, opponent: int, alpha: int, beta: int, first: bool) -> int:
+        """着手済みの子局面（player が手番）を PVS で読み、親から見た値を返す。"""
+        if first:
+            return -self._search(player, opponent, -beta, -alpha, passed=False)
+        score = -self._search(player, opponent, -alpha - 1, -alpha, passed=False)
+        if alpha < score < beta:
+            score = -self._search(player, opponent, -beta, -score, passed=False)
+        return score
+
+    def _search(self, player: int, opponent: int, alpha: int, beta: int, passed: bool) -> int:
+        """手番側から見た最終石差（fail-soft のアルファベータ）。"""
+        empty = ~(player | opponent) & bitboard.FULL
+        count = empty.bit_count()
+        if count <= _SHALLOW_EMPTIES:
+            return self._shallow(player, opponent, alpha, beta, empty, _parity(empty))
+        self._tick()
+        moves = legal_moves(player, opponent)
+        if not moves:
+            if passed:
+                return player.bit_count() - opponent.bit_count()
+            return -self._search(opponent, player, -beta, -alpha, passed=True)
+
+        key = (player, opponent)
+        entry = self._table.get(key) if count >= _TABLE_EMPTIES else None
+        first = -1
+        if entry is not None:
+            lower, upper, first = entry
+            if lower >= beta:
+                return lower
+            if upper <= alpha:
+                return upper
+            alpha = max(alpha, lower)
+            beta = min(beta, upper)
+        orig_alpha = alpha
+
+        best = -MAX_SCORE - 1
+        best_sq = -1
+        for i, (sq, next_player, next_opponent) in enumerate(
+            self._ordered_children(player, opponent, moves, empty, first)
+        ):
+            score = self._child(next_player, next_opponent, alpha, beta, first=i == 0)
+            if score > best:
+                best = score
+                best_sq = sq
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if count >= _TABLE_EMPTIES:
+            lower, upper = (-MAX_SCORE, MAX_SCORE) if entry is None else entry[:2]
+            if best <= orig_alpha:
+                upper = min(upper, best)
+            elif best >= beta:
+                lower = max(lower, best)
+            else:
+                lower = upper = best
+            if len(self._table) >= _TABLE_MAX_ENTRIES:
+                self._table.clear()
+            self._table[key] = (lower, upper, best_sq)
+        return best
+
+    def _shallow(
+        self, player: int, opponent: int, alpha: int, beta: int, empty: int, parity: int
+    ) -> int:
+        """空きが少ないノード。合法手生成の代わりに空きマスを直接試す。"""
+        count = empty.bit_count()
+        if count == 3:
+            return self._last3(player, opponent, alpha, beta, empty, parity)
+        if count == 2:
+            return self._last2(player, opponent, alpha, beta, empty)
+        if count == 1:
+            return self._last1(player, opponent, empty.bit_length() - 1)
+        if not count:
+            return player.bit_count() - opponent.bit_count()
+        self._tick()
+        best = -MAX_SCORE - 1
+        for sq in _parity_order(empty, parity):
+            f = flips(player, opponent, sq)
+            if not f:
+                continue
+            bit = 1 << sq
+            score = -self._shallow(
+                opponent ^ f, player | f | bit, -beta, -alpha,
+                empty ^ bit, parity ^ _QUADRANT_BIT[sq],
+            )
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        return best
+        if best > -MAX_SCORE - 1:
+            return best
+        if legal_moves(opponent, player):
+            return -self._shallow(opponent, player, -beta, -alpha, empty, parity)
+        return player.bit_count() - opponent.bit_count()
+
+    def _last3(
+        self, player: int, opponent: int, alpha: int, beta: int, empty: int, parity: int
+    ) -> int:
+        """残り 3 マス。パリティ順に試し、パスは相手側で同じ 3 マスを試す。"""
+        self._tick()
+        squares = _parity_order(empty, parity)
+        for side in range(2):
+            best = -MAX_SCORE - 1
+            for sq in squares:
+                f = flips(player, opponent, sq)
+                if not f:
+                    continue
+                bit = 1 << sq
+                score = -self._last2(opponent ^ f, player | f | bit, -beta, -alpha, empty ^ bit)
+                if score > best:
+                    best = score
+                    if score > alpha:
+                        alpha = score
+                        if alpha >= beta:
+                            break
+            if best > -MAX_SCORE - 1:
+                return best if side == 0 else -best
+            # パス: 相手の手番として読み、符号を戻す
+            player, opponent = opponent, player
+            alpha, beta = -beta, -alpha
+        return player.bit_count() - opponent.bit_count()  # 双方パス（2 回入れ替えて元の向き）
+
+    def _last2(self, player: int, opponent: int, alpha: int, beta: int, empty: int) -> int:
+        """残り 2 マス。各マスを試した後の残り 1 マスはその場で確定させる。"""
+        self.nodes += 1
+        low = empty & -empty
+        a = low.bit_length() - 1
+        b = (empty ^ low).bit_length() - 1
+        for side in range(2):
+            best = -MAX_SCORE - 1
+            f = flips(player, opponent, a)
+            if f:
+                best = -self._last1(opponent ^ f, player | f | low, b)
+                if best >= beta:
+                    return best if side == 0 else -best
+            f = flips(player, opponent, b)
+            if f:
+                score = -self._last1(opponent ^ f, player | f | (1 << b), a)
+                if score > best:
+                    best = score
+            if best > -MAX_SCORE - 1:
+                return best if side == 0 else -best
+            player, opponent = opponent, player
+            alpha, beta = -beta, -alpha
+        return player.bit_count() - opponent.bit_count()  # 双方パス（2 回入れ替えて元の向き）
+
+    def _last1(self, player: int, opponent: int, sq: int) -> int:
+        """残り 1 マス（sq）の最終石差。"""
+        self.nodes += 1
+        diff = 2 * player.bit_count() - 63   # 空きは sq だけなので相手側は 63 - 手番側
+        f = flips(player, opponent, sq)
+        if f:
+            return diff + 2 * f.bit_count() + 1
+        f = flips(opponent, player, sq)
+        if f:
+            return diff - 2 * f.bit_count() - 1
+        return diff
+
+
+def solve_board(
+    board: List[List[int]],
+    turn: int,
+    wld: bool = False,
+    deadline: Optional[float] = None,
+) -> Tuple[int, Optional[Tuple[int, int]]]:
+    """リスト盤面の局面を読み切る。
+
+    Args:
+        board: 8x8 盤面（0=空, 1=白, -1=黒）。
+        turn: 手番（1=白, -1=黒）。
+        wld: 勝ち / 負け / 引き分けだけを判定するか。
+        deadline: time.monotonic() の期限（None なら制限なし）。
+
+    Returns:
+        (手番側から見た最終石差, 最善手 (row, col) または None)。
+
+    Raises:
+        EndgameTimeout: deadline までに読み切れなかった場合。
+    """
+    player, opponent = bitboard.from_board(board, turn)
+    result = EndgameSolver(deadline).solve(player, opponent, wld=wld)
+    move = None if result.move is None else divmod(result.move, bitboard.SIZE)
+    return result.score, move
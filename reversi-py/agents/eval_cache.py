@@ -0,0 +1,110 @@
+"""Zobrist ハッシュで引く、固定サイズ・ダイレクトマップの評価値キャッシュ。
+
+反復深化の各深さやアスピレーション・PVS の再探索、手順違いの同一局面で
+同じ葉が何度も評価される。葉の評価（mobility・確定石・パターン）は探索の
+浅いところでは処理時間の大半を占めるので、評価値を局面ごとに覚えておく。
+
+キーは手番を含まない Zobrist ハッシュ（zobrist.py。TT と同じ値）に、白番なら
+TURN_KEY を XOR したもの。スロットはキーの下位ビットで選び、1 スロットに
+1 局面だけを置く（衝突したら常に新しい方で上書きする）。容量は MB で指定し、
+探索中にメモリが増えることはない。
+
+評価値は評価関数ごとに異なるため、キャッシュは評価関数（エージェント）ごとに持つ。
+評価関数の重みを変えたら clear() すること。
+"""
+from array import array
+from typing import NamedTuple, Optional
+
+from .zobrist import TURN_KEY
+
+# 1 エントリのバイト数: キー Q(8) + 評価値 d(8)
+ENTRY_BYTES = 8 + 8
+
+DEFAULT_SIZE_MB = 1.0
+
+
+class EvalCacheStats(NamedTuple):
+    """評価キャッシュの利用統計。"""
+
+    probes: int  # probe の回数
+    hits: int  # 評価値が見つかった回数
+    stores: int  # store の回数
+
+    @property
+    def hit_rate(self) -> float:
+        """probe に対するヒット率。"""
+        return self.hits / self.probes if self.probes else 0.0
+
+
+def slot_count(size_mb: float) -> int:
+    """size_mb に収まる最大のスロット数（2 の冪、最低 2）を返す。"""
+    slots = max(2, int(size_mb * 2**20) // ENTRY_BYTES)
+    return 1 << (slots.bit_length() - 1)
+
+
+class EvalCache:
+    """ダイレクトマップの評価値キャッシュ。
+
+    Args:
+        size_mb: キャッシュの大きさ（MB）。
+    """
+
+    def __init__(self, size_mb: float = DEFAULT_SIZE_MB) -> None:
+        self.slots = slot_count(size_mb)
+        self._mask = self.slots - 1
+        self.nbytes = self.slots * ENTRY_BYTES
+        self.values = array("d", bytes(8 * self.slots))
+        self.keys = array("Q")
+        self.clear()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """利用統計を 0 に戻す。"""
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+
+    @property
+    def stats(self) -> EvalCacheStats:
+        """現在までの利用統計。"""
+        return EvalCacheStats(self._probes, self._hits, self._stores)
+
+    def clear(self) -> None:
+        """全エントリを空にする（統計はそのまま）。
+
+        スロット i に置かれるキーは下位ビットが i なので、空きスロットには
+        下位ビットが i と異なる値（i ^ 1）を入れておけば、どのキーとも一致しない。
+        """
+        self.keys = array("Q", [i ^ 1 for i in range(self.slots)])
+
+    def probe(self, h: int, turn: int) -> Optional[float]:
+        """局面の評価値を返す（なければ None）。
+
+        Args:
+            h: 局面の Zobrist ハッシュ（手番を含まない）。
+            turn: 手番（1=白, -1=黒）。
+
+        Returns:
+            store した評価値、または None。
+        """
+        self._probes += 1
+        key = h ^ TURN_KEY if turn == 1 else h
+        slot = key & self._mask
+        if self.keys[slot] != key:
+            return None
+        self._hits += 1
+        return self.values[slot]
+
+    def store(self, h: int, turn: int, value: float) -> None:
+        """局面の評価値を書き込む（同じスロットの別局面は追い出す）。
+
+        Args:
+            h: 局面の Zobrist ハッシュ（手番を含まない）。
+            turn: 手番（1=白, -1=黒）。
+            value: 手番側から見た評価値。
+        """
+        self._stores += 1
+        key = h ^ TURN_KEY if turn == 1 else h
+        slot = key & self._mask
+        self.keys[slot] = key
+        self.values[slot] = value
@@ -0,0 +1,70 @@
+"""探索の葉の評価関数（LeafEvaluator プロトコル）。
+
+探索（search_core.py の SearchCore）は、終盤の石差で評価しない葉の
+評価を LeafEvaluator に任せる。評価関数を足すときは evaluate を持つクラスを書き、
+エージェントの evaluator 引数に渡せばよい（探索側の変更は要らない）:
+
+    HeuristicEvaluator（search_primitives.py）  位置重み・mobility・角・確定石・石差
+    PatternLeafEvaluator                        PatternEvaluator（学習済みパターン評価）
+
+評価値は手番側から見た値（正=手番側が有利）で、終局の石差スコア
+（石差 × 10000）より十分小さい範囲に収めること。
+"""
+from typing import TYPE_CHECKING, List, Protocol
+
+if TYPE_CHECKING:
+    from .pattern_evaluator import PatternEvaluator
+    from .search_primitives import _EvalState, _MoveHelpers
+
+
+class LeafEvaluator(Protocol):
+    """探索の葉の評価関数。"""
+
+    def evaluate(
+        self,
+        board: List[List[int]],
+        n: int,
+        turn: int,
+        state: "_EvalState",
+        helpers: "_MoveHelpers",
+    ) -> float:
+        """手番 turn 側から見た board の評価値。
+
+        Args:
+            board: 盤面（探索中の盤面なので変更しないこと）。
+            n: 盤面サイズ。
+            turn: 手番（1=白, -1=黒）。
+            state: board と同期した差分更新済みの評価項（位置重み・石差・空きマス数・角）。
+            helpers: 探索中の着手生成ヘルパー（mobility などに使える）。
+
+        Returns:
+            評価値（正=有利, 負=不利）。
+        """
+        ...
+
+
+class PatternLeafEvaluator:
+    """PatternEvaluator を LeafEvaluator として使うアダプタ。
+
+    Args:
+        pattern: 評価に使う PatternEvaluator（重みを変えたら評価キャッシュを clear すること）。
+        negate: 値の符号を反転するか（手番側視点ではなくなる）。同梱の重みに合わせて
+            PatternAgent だけが使う（pattern_agent.py 参照）。
+    """
+
+    __slots__ = ("pattern", "sign")
+
+    def __init__(self, pattern: "PatternEvaluator", negate: bool = False) -> None:
+        self.pattern = pattern
+        self.sign = -1.0 if negate else 1.0
+
+    def evaluate(
+        self,
+        board: List[List[int]],
+        n: int,
+        turn: int,
+        state: "_EvalState",
+        helpers: "_MoveHelpers",
+    ) -> float:
+        """PatternEvaluator.evaluate の値（negate=False なら手番側視点）。"""
+        return self.sign * self.pattern.evaluate(board, turn)
@@ -0,0 +1,156 @@
+"""Lazy SMP 並列探索のヘルパープロセス。
+
+TranspositionNegamaxAgent(workers=N) は N - 1 個のヘルパープロセスを起動し、
+トランスポジションテーブルを multiprocessing.shared_memory 上に置いて共有する。
+ヘルパーは呼び出し元（メイン）と同じルート局面を独立に反復深化で探索し、
+奇数番のヘルパーは開始深さを 1 つずらす。ヘルパーが TT に書いた結果は
+メインの探索の手順付けと枝刈りに使われる。指す手はメインの探索結果だけで決め、
+ヘルパーの結果は到達深さとノード数の記録にしか使わない。
+
+テーブルの読み書きはロックしない。別プロセスの書き込みと重なると、まれに
+エントリの一部だけが新しい値になりうるため、共有 TT は checked=True で作る
+（transposition_table.py）。キーとエントリの内容のチェック値の XOR で照合し、
+一部だけ書き換わったエントリはミスとして扱うので、評価値・深さ・境界種別が
+ちぐはぐなエントリでカットすることはない。
+"""
+import multiprocessing
+import queue
+import weakref
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple
+
+from .transposition_table import TranspositionTable, table_bytes
+
+# stop 後にヘルパーの結果を待つ上限（秒）。ヘルパーは時間チェックの間隔ぶん
+# 探索した時点で止まるので、通常はすぐに返る
+_STOP_TIMEOUT = 5.0
+
+
+class HelperResult(NamedTuple):
+    """ヘルパー 1 つの探索結果。"""
+
+    depth: int  # 完了した最大深さ
+    nodes: int  # 探索したノード数
+
+
+class LazySMPPool:
+    """ヘルパープロセスの組と、共有メモリ上の TT。
+
+    プロセスは spawn で起動し、close() まで（または本オブジェクトが
+    回収されるまで）同じものを使い続ける。
+
+    Args:
+        helpers: ヘルパープロセスの数。
+        tt_size_mb: 共有する TT の大きさ（MB）。
+        agent_kwargs: ヘルパー側の TranspositionNegamaxAgent の引数。
+    """
+
+    def __init__(self, helpers: int, tt_size_mb: float, agent_kwargs: dict[str, Any]) -> None:
+        context = multiprocessing.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=table_bytes(tt_size_mb))
+        self.table = TranspositionTable(buffer=self._shm.buf, checked=True)
+        self._stop = context.Event()
+        self._results: Any = context.Queue()
+        self._tasks: list[Any] = [context.Queue() for _ in range(helpers)]
+        self._search_id = 0
+        self._processes = [
+            context.Process(
+                target=_helper_main,
+                args=(self._shm.name, index, tasks, self._results, self._stop, agent_kwargs),
+                daemon=True,
+            )
+            for index, tasks in enumerate(self._tasks, start=1)
+        ]
+        for process in self._processes:
+            process.start()
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._processes, self._tasks, self._shm, self.table
+        )
+
+    @property
+    def helpers(self) -> int:
+        """ヘルパープロセスの数。"""
+        return len(self._processes)
+
+    def start(
+        self, board: list[list[int]], turn: int, generation: int, deadline: float
+    ) -> None:
+        """全ヘルパーに局面を渡して探索を始めさせる。
+
+        Args:
+            board: ルート局面。
+            turn: 手番。
+            generation: メイン側 TT の現在の世代。
+            deadline: 探索を打ち切る time.monotonic() の期限（メインと同じ）。
+        """
+        self._search_id += 1
+        self._stop.clear()
+        for tasks in self._tasks:
+            tasks.put((self._search_id, board, turn, generation, deadline))
+
+    def stop(self) -> list[HelperResult]:
+        """ヘルパーの探索を止め、返ってきた結果を集める。
+
+        Returns:
+            _STOP_TIMEOUT 秒以内に返ってきたヘルパーの結果。
+        """
+        self._stop.set()
+        results: list[HelperResult] = []
+        while len(results) < len(self._processes):
+            try:
+                search_id, result = self._results.get(timeout=_STOP_TIMEOUT)
+            except queue.Empty:
+                break
+            if search_id == self._search_id:  # 以前の探索の遅れた結果は捨てる
+                results.append(HelperResult(*result))
+        return results
+
+    def close(self) -> None:
+        """ヘルパーを終了させ、共有メモリを解放する。以降 table は使えない。"""
+        self._finalizer()
+
+
+def _shutdown(
+    processes: list[Any],
+    tasks: list[Any],
+    shm: shared_memory.SharedMemory,
+    table: TranspositionTable,
+) -> None:
+    """ヘルパーに終了を伝えて待ち、共有メモリを閉じて削除する。"""
+    for task_queue in tasks:
+        task_queue.put(None)
+    for process in processes:
+        process.join(timeout=_STOP_TIMEOUT)
+        if process.is_alive():
+            process.terminate()
+    table.release()
+    shm.close()
+    shm.unlink()
+
+
+def _helper_main(
+    shm_name: str,
+    index: int,
+    tasks: Any,
+    results: Any,
+    stop: Any,
+    agent_kwargs: dict[str, Any],
+) -> None:
+    """ヘルパープロセスの本体。None を受け取るまで探索依頼を処理する。"""
+    # 親モジュールとの循環 import を避けるためここで読み込む
+    from .transposition_negamax_agent import TranspositionNegamaxAgent
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    table = TranspositionTable(buffer=shm.buf, checked=True)
+    agent = TranspositionNegamaxAgent(**agent_kwargs)
+    agent._attach_shared_tt(table, stop)
+    first_depth = 1 + index % 2
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        search_id, board, turn, generation, deadline = task
+        agent._helper_search(board, turn, generation, first_depth, deadline)
+        results.put((search_id, (agent._last_depth, agent._nodes_checked)))
+    table.release()
+    shm.close()
@@ -1,12 +1,15 @@
 # agents/mcts_agent.py
-import copy  # ゲーム状態のコピーに使用
 import logging
 import math
 import random
 import time
-from typing import Optional, Tuple, TYPE_CHECKING
+from typing import Any, List, Optional, Tuple, TYPE_CHECKING
+
+from board import MailboxBoard
 
 from .base_agent import Agent
+from .search_stats import SearchStats
+from .time_manager import TimeManager, finish_timer, start_timer
 
 if TYPE_CHECKING:
     from game import Game
@@ -15,11 +18,12 @@ logger = logging.getLogger(__name__)
 
 class Node:
     """モンテカルロ木探索のノード"""
-    def __init__(self, board, turn, parent=None, move=None):
-        self.board = board # Boardオブジェクトのコピー
+    def __init__(self, board, turn, parent=None, move=None, rng=random):
+        self.board = board # このノード専用の Board（親の clone に着手したもの）
         self.turn = turn   # このノードの手番プレイヤー
         self.parent = parent
         self.move = move # このノードに至った手 (row, col)
+        self.rng = rng # 手のシャッフルに使う乱数（random モジュールか random.Random）
         self.children = []
         self.wins = 0
         self.visits = 0
@@ -32,7 +36,10 @@ class Node:
             if opponent_moves:
                 self.turn = -self.turn
                 self.untried_moves = opponent_moves
-        random.shuffle(self.untried_moves) # 探索の偏りを減らすためシャッフル
+        # ノードの盤面は以後変わらないので、終端判定はここで一度だけ行う
+        # （選択フェーズで毎回両者の合法手を走査し直さない）
+        self._terminal = not self.untried_moves
+        rng.shuffle(self.untried_moves) # 探索の偏りを減らすためシャッフル
 
     def ucb1(self, exploration_weight=1.41):
         """UCB1スコアを計算する"""
@@ -64,10 +71,10 @@ class Node:
             return None # 展開できる手がない
 
         move = self.untried_moves.pop()
-        new_board = copy.deepcopy(self.board)
+        new_board = self.board.clone()
         new_board.place_stone(move[0], move[1], self.turn)
         next_turn = -self.turn
-        child_node = Node(new_board, next_turn, parent=self, move=move)
+        child_node = Node(new_board, next_turn, parent=self, move=move, rng=self.rng)
         self.children.append(child_node)
         return child_node
 
@@ -84,29 +91,73 @@ class Node:
 
     def is_terminal_node(self):
         """ゲーム終了状態か判定する"""
-        # 両プレイヤーに有効な手がない場合
-        return not self.board.get_valid_moves(-1) and not self.board.get_valid_moves(1)
+        # 両プレイヤーに有効な手がない場合（パス時は構築時に相手の手を取得済み）
+        return self._terminal
+
+def _tree_stats(root: Node, simulations: int) -> SearchStats:
+    """探索木のノード数・最大深さと、訪問回数の最も多い子をたどった読み筋。"""
+    nodes = 0
+    max_depth = 0
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        nodes += 1
+        max_depth = max(max_depth, depth)
+        stack.extend((child, depth + 1) for child in node.children)
+    pv = []
+    node = root
+    while node.children:
+        node = max(node.children, key=lambda child: child.visits)
+        pv.append(node.move)
+    return SearchStats(nodes=nodes, depth=max_depth, simulations=simulations, pv=tuple(pv))
 
-class MonteCarloTreeSearchAgent(Agent):
-    """モンテカルロ木探索エージェント."""
 
-    def __init__(self, iterations: int = 100, exploration_weight: float = 1.41, time_limit_ms: int = 1000) -> None:
+class MonteCarloTreeSearchAgent(Agent):
+    """モンテカルロ木探索エージェント.
+
+    time_limit_ms=None にして seed を渡すと、毎手 iterations 回ちょうど
+    シミュレーションし、同じ局面には実行環境の速さによらず同じ手を返す。
+    """
+
+    def __init__(
+        self,
+        iterations: int = 100,
+        exploration_weight: float = 1.41,
+        time_limit_ms: Optional[int] = 1000,
+        mailbox: bool = True,
+        time_manager: Optional[TimeManager] = None,
+        seed: Optional[int] = None,
+    ) -> None:
         """Monte Carlo Tree Search エージェントを初期化します。
 
         Args:
             iterations: シミュレーションの最大繰り返し回数。
             exploration_weight: UCB1 の探索パラメータ（C）。
             time_limit_ms: 思考時間の制限（ミリ秒）。iterations より優先されます。
+                None なら時間では打ち切らず、iterations 回シミュレーションします。
+            mailbox: 探索木とプレイアウトの盤面を MailboxBoard で持つか。
+                False なら game.board の型のまま clone する。
+            time_manager: 対局の持ち時間（time_manager.py）。指定すると
+                time_limit_ms の代わりに、残り時間と局面から配分した目安の時間を使う。
+            seed: 乱数のシード。指定すると毎手この値で初期化した random.Random で
+                手のシャッフルとプレイアウトを行う。None なら random モジュールの乱数を使う。
         """
         self.iterations = iterations
         self.exploration_weight = exploration_weight
         self.time_limit_ms = time_limit_ms
+        self.mailbox = mailbox
+        self.time_manager = time_manager
+        self.seed = seed
 
-    def play(self, game: 'Game') -> Optional[Tuple[int, int]]:
+    def play(
+        self, game: 'Game', time_manager: Optional[TimeManager] = None
+    ) -> Optional[Tuple[int, int]]:
         """MCTS を実行して最善の手を選択します。
 
         Args:
             game: 現在のゲーム状態。
+            time_manager: この手で使う持ち時間（省略時はコンストラクタの
+                time_manager、どちらもなければ time_limit_ms 固定）。
 
         Returns:
             (row, col) のタプル、または合法手がない場合は None。
@@ -114,12 +165,31 @@ class MonteCarloTreeSearchAgent(Agent):
         valid_moves = game.get_valid_moves()
         if not valid_moves:
             return None
-        if len(valid_moves) == 1:
-            return valid_moves[0] # 有効な手が1つなら探索不要
-
-        # ルートノードを作成 (現在のゲーム状態をコピー)
-        root_board = copy.deepcopy(game.board)
-        root = Node(root_board, game.turn)
+        clock = self.time_manager if time_manager is None else time_manager
+        empties = sum(row.count(0) for row in game.board.get_board())
+        timer = start_timer(clock, self.time_limit_ms, empties, len(valid_moves))
+        self.last_stats = None
+        try:
+            if len(valid_moves) == 1:
+                return valid_moves[0] # 有効な手が1つなら探索不要
+            return self._search(game, valid_moves, timer.soft_ms)
+        finally:
+            finish_timer(clock, timer)
+            if self.last_stats is not None:
+                self.last_stats = self.last_stats._replace(elapsed_ms=timer.elapsed_ms())
+
+    def _search(
+        self, game: 'Game', valid_moves: List[Tuple[int, int]], time_limit_ms: float
+    ) -> Optional[Tuple[int, int]]:
+        """time_limit_ms か iterations に達するまで探索し、最も訪問回数の多い手を返す。"""
+
+        # ルートノードを作成 (現在の盤面を複製。game はスナップショットでもよい)
+        if self.mailbox and not isinstance(game.board, MailboxBoard):
+            root_board = MailboxBoard.from_grid(game.board.get_board())
+        else:
+            root_board = game.board.clone()
+        rng: Any = random if self.seed is None else random.Random(self.seed)
+        root = Node(root_board, game.turn, rng=rng)
 
         start_time = time.time()
         elapsed_time_ms = 0.0
@@ -127,7 +197,7 @@ class MonteCarloTreeSearchAgent(Agent):
 
         # 時間制限または繰り返し回数に達するまで探索
         try:
-            while elapsed_time_ms < self.time_limit_ms and iteration_count < self.iterations:
+            while elapsed_time_ms < time_limit_ms and iteration_count < self.iterations:
                 node = self._select(root)
                 if node is None: # 選択で問題発生 or 探索完了?
                     break
@@ -161,7 +231,8 @@ class MonteCarloTreeSearchAgent(Agent):
                 best_move = child.move
 
         # print(f"Selected Move: {best_move}")
-        return best_move if best_move is not None else random.choice(valid_moves) # フォールバック
+        self.last_stats = _tree_stats(root, iteration_count)
+        return best_move if best_move is not None else rng.choice(valid_moves) # フォールバック
 
     def _select(self, node):
         """ルートから葉ノードまでUCB1で選択"""
@@ -183,7 +254,7 @@ class MonteCarloTreeSearchAgent(Agent):
 
     def _simulate(self, node):
         """ランダムプレイアウトを実行し、勝者 (-1: 黒, 1: 白, 0: 引き分け) を返す"""
-        current_board = copy.deepcopy(node.board)
+        current_board = node.board.clone()
         current_turn = node.turn
 
         while True:
@@ -196,7 +267,7 @@ class MonteCarloTreeSearchAgent(Agent):
                     # 両者パス -> ゲーム終了
                     break
             # ランダムに手を選択
-            move = random.choice(valid_moves)
+            move = node.rng.choice(valid_moves)
             current_board.place_stone(move[0], move[1], current_turn)
             current_turn *= -1
 
@@ -0,0 +1,156 @@
+"""探索の手順付け（Killer・History・カウンター手）。
+
+αβ探索は最善手を最初に調べるほど枝が刈れる。TT の最善手がない（または
+それ以外の）手を、過去にβカットを起こした手ほど先に調べるよう並べる。
+
+    Killer      ply（探索開始からの手数）ごとに 2 スロット。同じ ply の兄弟局面で
+                カットを起こした手。新しいものをスロット 0 に入れ、古い方を 1 に送る
+    カウンター手  相手の直前の手 → それにカットで応じた手（手番の色ごと）
+    History     手番の色ごとの、マス（row * n + col）ごとのカットの重み。
+                カットした残り深さが深いほど大きく加算する
+
+並べる優先度は TT の手 > Killer 0 > Killer 1 > カウンター手 > History の順で、
+History が同じ手は渡された順（呼び出し側の静的な並べ方）を保つ。
+
+静的な並べ方（位置重みなど）が十分よい探索では use_history=False にすると、
+History を付けずに Killer とカウンター手だけを前に出し、残りは渡された順に調べる。
+
+MoveOrdering は探索ごと（play ごと）に new_search() を呼び、Killer を捨てて
+History を減衰させる。盤面サイズが変わったら resize() で作り直す。
+"""
+from typing import Callable, List, Optional, Tuple
+
+Move = Tuple[int, int]
+
+# 着手なしを表すマス番号
+NO_MOVE = -1
+
+# 優先度の加点（History の値がこれらを超えない大きさにしておく）
+_TT_SCORE = 1 << 62
+_KILLER_SCORES = (1 << 61, 1 << 60)
+_COUNTER_SCORE = 1 << 59
+
+# Killer を持つ ply の数（これより深い ply は最後のスロットを共有する）
+DEFAULT_MAX_PLY = 128
+
+
+class MoveOrdering:
+    """Killer（ply ごとに 2 スロット）・History・カウンター手による手順付け。
+
+    Args:
+        n: 盤面サイズ。
+        max_ply: Killer を持つ ply の数。
+        use_history: History を記録して並べ替えに使うか。
+    """
+
+    def __init__(
+        self, n: int, max_ply: int = DEFAULT_MAX_PLY, use_history: bool = True
+    ) -> None:
+        self._max_ply = max_ply
+        self.use_history = use_history
+        self.resize(n)
+
+    def resize(self, n: int) -> None:
+        """盤面サイズ n 用にすべての表を作り直す。"""
+        self.n = n
+        squares = n * n
+        # 添字は turn > 0（0=黒, 1=白）
+        self.history: List[List[int]] = [[0] * squares, [0] * squares]
+        self.counters: List[List[int]] = [[NO_MOVE] * squares, [NO_MOVE] * squares]
+        self.killers: List[List[int]] = [[NO_MOVE, NO_MOVE] for _ in range(self._max_ply)]
+
+    def new_search(self, history_decay_shift: Optional[int] = None) -> None:
+        """次の探索向けに Killer を捨て、History を減衰させる（またはすべて捨てる）。
+
+        Killer は ply で引くため、ルート局面が変わると意味がなくなる。
+        History とカウンター手は局面によらないマス単位の傾向なので持ち越せる。
+
+        Args:
+            history_decay_shift: History の値を右シフトする量。None なら History と
+                カウンター手も捨てる。
+        """
+        for killers in self.killers:
+            killers[0] = killers[1] = NO_MOVE
+        if history_decay_shift is None:
+            self.resize(self.n)
+            return
+        for table in self.history:
+            for sq, score in enumerate(table):
+                if score:
+                    table[sq] = score >> history_decay_shift
+
+    def sort_key(
+        self,
+        ply: int,
+        turn: int,
+        tt_move: Optional[Move] = None,
+        prev: int = NO_MOVE,
+    ) -> Callable[[Move], int]:
+        """手の優先度を返すキー関数（大きいほど先に調べる）を作る。
+
+        ``moves.sort(key=..., reverse=True)`` で使う。sort は安定なので、
+        優先度が同じ手は渡した順に残る。
+
+        Args:
+            ply: 探索開始からの手数。
+            turn: 手番。
+            tt_move: TT の最善手（最優先）。
+            prev: 相手の直前の手のマス番号（パスや不明なら NO_MOVE）。
+
+        Returns:
+            (row, col) を受け取り優先度を返す関数。
+        """
+        n = self.n
+        color = turn > 0
+        history = self.history[color]
+        killer0, killer1 = self.killers[min(ply, self._max_ply - 1)]
+        counter = self.counters[color][prev] if prev >= 0 else NO_MOVE
+        tt_sq = NO_MOVE if tt_move is None else tt_move[0] * n + tt_move[1]
+
+        def key(move: Move) -> int:
+            sq = move[0] * n + move[1]
+            if sq == tt_sq:
+                return _TT_SCORE
+            if sq == killer0:
+                return _KILLER_SCORES[0]
+            if sq == killer1:
+                return _KILLER_SCORES[1]
+            if sq == counter:
+                return _COUNTER_SCORE
+            return history[sq]
+
+        return key
+
+    def sort(
+        self,
+        moves: List[Move],
+        ply: int,
+        turn: int,
+        tt_move: Optional[Move] = None,
+        prev: int = NO_MOVE,
+    ) -> List[Move]:
+        """moves を優先度の高い順に並べた新しいリストを返す（引数は sort_key と同じ）。"""
+        return sorted(moves, key=self.sort_key(ply, turn, tt_move, prev), reverse=True)
+
+    def record_cutoff(
+        self, move: Move, ply: int, turn: int, depth: int, prev: int = NO_MOVE
+    ) -> None:
+        """move がβカットを起こしたことを記録する。
+
+        Args:
+            move: カットを起こした手。
+            ply: 探索開始からの手数。
+            turn: move を指した手番。
+            depth: カットした局面の残り探索深さ。
+            prev: 相手の直前の手のマス番号（パスや不明なら NO_MOVE）。
+        """
+        sq = move[0] * self.n + move[1]
+        color = turn > 0
+        killers = self.killers[min(ply, self._max_ply - 1)]
+        if killers[0] != sq:
+            killers[1] = killers[0]
+            killers[0] = sq
+        if self.use_history:
+            self.history[color][sq] += 1 << (depth // 2)
+        if prev >= 0:
+            self.counters[color][prev] = sq
@@ -0,0 +1,273 @@
+"""定石ファイル（オープニングブック）の作成・参照と、定石を使うエージェント。
+
+序盤の局面は種類が少ないので、オフラインで深く探索した最善手を
+ファイルに保存しておき、対局中は探索せずに返す。
+
+局面は position_key.canonical_key で 8 対称性を正規化してから保存する。
+着手も代表元の座標で持ち、参照時に元の局面の座標へ戻す。
+
+ファイル形式（数値はすべてビッグエンディアン）:
+
+    ヘッダ 12 バイト  マジック b"RVOB" / 版 B / 盤面サイズ B / 予約 2 / 件数 I
+    レコード 18 バイト × 件数
+                      黒石 Q / 白石 Q / 手番 B（0=黒, 1=白） / 着手 B（row * size + col）
+
+レコードは先頭 17 バイト（局面）のバイト列順に並べる。ビッグエンディアンなので
+バイト列の順は (黒石, 白石, 手番) の数値順と一致し、参照は mmap 上で
+バイト列を直接比較する二分探索で済む（ファイル全体を読み込まない）。
+ビットマスクを 64 ビットに収めるため、盤面サイズは 8 以下に限る。
+"""
+import mmap
+import struct
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .base_agent import Agent
+from .search_stats import SearchStats
+from .position_key import (
+    PositionKey,
+    canonical_key,
+    canonicalize,
+    inverse_transform_move,
+    key_to_board,
+)
+from .search_primitives import _apply, _move_helpers
+
+if TYPE_CHECKING:
+    from game import Game
+
+MAGIC = b"RVOB"
+VERSION = 1
+
+# ビットマスクが 64 ビットに収まる最大の盤面サイズ
+MAX_SIZE = 8
+
+_HEADER = struct.Struct(">4sBB2xI")
+_RECORD = struct.Struct(">QQBB")
+# レコードのうち局面（比較に使う部分）のバイト数
+_KEY_BYTES = _RECORD.size - 1
+
+Move = Tuple[int, int]
+
+
+def _key_bytes(key: PositionKey) -> bytes:
+    """局面キーをレコード先頭の比較用バイト列にする。"""
+    return _RECORD.pack(key.black, key.white, 1 if key.turn == 1 else 0, 0)[:_KEY_BYTES]
+
+
+def write_book(path: str, size: int, entries: Dict[PositionKey, Move]) -> int:
+    """定石ファイルを書き出す。
+
+    Args:
+        path: 出力先のパス。
+        size: 盤面サイズ（MAX_SIZE 以下）。
+        entries: 正規化済みの局面キー -> 代表元の座標での着手。
+
+    Returns:
+        書き出したレコード数。
+
+    Raises:
+        ValueError: 盤面サイズが範囲外か、サイズの異なる局面を含む場合。
+    """
+    if not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"board size must be in [1, {MAX_SIZE}]: {size}")
+    records = []
+    for key, (row, col) in entries.items():
+        if key.size != size:
+            raise ValueError(f"position size {key.size} does not match book size {size}")
+        records.append(_RECORD.pack(
+            key.black, key.white, 1 if key.turn == 1 else 0, row * size + col
+        ))
+    records.sort()
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, size, len(records)))
+        f.writelines(records)
+    return len(records)
+
+
+class OpeningBook:
+    """定石ファイルを mmap で開き、局面から着手を引く。
+
+    Args:
+        path: write_book で書き出したファイルのパス。
+
+    Raises:
+        ValueError: ファイルの形式が正しくない場合。
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"not an opening book: {path}")
+            magic, version, size, count = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"not an opening book: {path}")
+            if version != VERSION:
+                raise ValueError(f"unsupported opening book version {version}: {path}")
+            if f.seek(0, 2) != _HEADER.size + count * _RECORD.size:
+                raise ValueError(f"truncated opening book: {path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size: int = size
+        self._count: int = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _find(self, key: bytes) -> int:
+        """key のレコードの着手バイトを返す（なければ -1）。"""
+        mm = self._mm
+        lo = 0
+        hi = self._count
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            offset = _HEADER.size + mid * _RECORD.size
+            probe = mm[offset:offset + _KEY_BYTES]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mm[offset + _KEY_BYTES]
+        return -1
+
+    def lookup(self, board: List[List[int]], turn: int) -> Optional[Move]:
+        """局面の定石手を返す。
+
+        Args:
+            board: n×n 盤面（0=空, 1=白, -1=黒）。
+            turn: 手番（1=白, -1=黒）。
+
+        Returns:
+            元の局面の座標での (row, col)。定石にない局面なら None。
+        """
+        if len(board) != self.size or not self._count:
+            return None
+        key, sym = canonical_key(board, turn)
+        sq = self._find(_key_bytes(key))
+        if sq < 0:
+            return None
+        return inverse_transform_move(sym, divmod(sq, self.size), self.size)
+
+    def close(self) -> None:
+        """mmap を閉じる。以降 lookup は使えない。"""
+        self._mm.close()
+
+
+class BookAgent(Agent):
+    """定石にある局面では定石手を即座に返し、ない局面は内側のエージェントに任せる。
+
+    定石手が合法手に含まれない場合（別の盤面サイズ用のファイルなど）も
+    内側のエージェントに任せる。属性の参照は内側のエージェントに委譲する。
+
+    Args:
+        agent: 定石にない局面で使うエージェント。
+        book: 定石（OpeningBook）。
+    """
+
+    def __init__(self, agent: Any, book: OpeningBook) -> None:
+        self.agent = agent
+        self.book = book
+
+    def _book_move(self, game: 'Game') -> Optional[Move]:
+        """合法な定石手（なければ None）。"""
+        move = self.book.lookup(game.get_board(), game.turn)
+        if move is not None and move in game.get_valid_moves():
+            return move
+        return None
+
+    def play(self, game: 'Game', **kwargs: Any) -> Optional[Tuple[int, int]]:
+        """定石手があればそれを、なければ内側のエージェントの手を返す。
+
+        キーワード引数（time_manager など）は内側のエージェントの play に渡す。
+        """
+        start = time.perf_counter()
+        move = self._book_move(game)
+        if move is not None:
+            self.last_stats = SearchStats(
+                elapsed_ms=(time.perf_counter() - start) * 1000.0, pv=(move,), source="book"
+            )
+            return move
+        move = self.agent.play(game, **kwargs)
+        self.last_stats = getattr(self.agent, "last_stats", None)
+        return move
+
+    def play_with_stats(
+        self, game: 'Game', **kwargs: Any
+    ) -> Tuple[Optional[Tuple[int, int]], SearchStats]:
+        """定石にない局面は、内側のエージェントの play_with_stats の結果をそのまま返す。"""
+        if self._book_move(game) is not None:
+            return super().play_with_stats(game, **kwargs)
+        move, stats = self.agent.play_with_stats(game, **kwargs)
+        self.last_stats = stats
+        return move, stats
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.agent, name)
+
+
+def _children(key: PositionKey) -> Iterable[PositionKey]:
+    """局面から 1 手（合法手がなければパス）進めた局面の正規化キーを返す。"""
+    n = key.size
+    board = key_to_board(key)
+    helpers = _move_helpers(n, True)
+    moves = helpers.valid_moves(board, n, key.turn)
+    if not moves:
+        if helpers.valid_moves(board, n, -key.turn):
+            yield canonicalize(key._replace(turn=-key.turn))[0]
+        return
+    for r, c in moves:
+        child = [row[:] for row in board]
+        _apply(child, (r, c), helpers.flips_for_move(child, n, r, c, key.turn), key.turn)
+        yield canonical_key(child, -key.turn)[0]
+
+
+def build_book(
+    agent: Any,
+    plies: int,
+    start: Tuple[List[List[int]], int],
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[PositionKey, Move]:
+    """start から plies 手以内に現れる全局面を agent で探索し、定石を作る。
+
+    対称な局面は 1 つにまとめて探索する。パスも 1 手と数え、
+    合法手のない局面は定石に入れない。
+
+    Args:
+        agent: 各局面の着手を決めるエージェント（play(game) を持つもの）。
+        plies: 定石に入れる手数（0 なら空）。
+        start: 開始局面 (盤面, 手番)。
+        progress: 局面を 1 つ探索するたびに (探索済み数, 総数) で呼ばれる関数。
+
+    Returns:
+        正規化済みの局面キー -> 代表元の座標での着手（write_book に渡せる形）。
+
+    Raises:
+        ValueError: 盤面サイズが MAX_SIZE を超える場合。
+    """
+    # 循環 import を避けるためここで読み込む
+    from game import Game
+
+    board, turn = start
+    n = len(board)
+    if n > MAX_SIZE:
+        raise ValueError(f"board size must be at most {MAX_SIZE}: {n}")
+    positions: List[PositionKey] = []
+    frontier = {canonical_key(board, turn)[0]}
+    for _ in range(plies):
+        positions.extend(sorted(frontier))
+        frontier = {child for key in frontier for child in _children(key)}
+
+    entries: Dict[PositionKey, Move] = {}
+    for i, key in enumerate(positions, start=1):
+        game = Game(board_size=n)
+        game.board.board = key_to_board(key)
+        game.turn = key.turn
+        if game.get_valid_moves():
+            move = agent.play(game)
+            if move is not None:
+                entries[key] = move
+        if progress is not None:
+            progress(i, len(positions))
+    return entries
+
@@ -1,122 +1,74 @@
 """パターン評価を使用したリバーシ AI エージェント。
 
 TD 学習によって学習済みのパターン重みを使用して評価する。
+探索は search_core.SearchCore（TT・Killer / History / カウンター手・時間管理）で、
+葉の評価だけを PatternEvaluator に差し替えたもの。
 """
-import time
-from typing import TYPE_CHECKING, Optional
+from typing import Optional
 
-from .negamax_agent import _apply, _flips_for_move, _undo, _valid_moves
+from .evaluators import PatternLeafEvaluator
 from .pattern_evaluator import PatternEvaluator
-from .base_agent import Agent
+from .search_core import SearchCore
+from .time_manager import TimeManager
+from .transposition_table import DEFAULT_SIZE_MB
 
-if TYPE_CHECKING:
-    from game import Game
 
-
-class PatternAgent(Agent):
+class PatternAgent(SearchCore):
     """パターンベースの評価関数を使用した negamax エージェント。
 
+    time_limit_ms=None にして max_depth（固定深さ）か node_limit で止めれば、
+    探索は実行環境の速さによらず決定論的（keep_tt=True なら、同じ手順で
+    play を呼んだ場合に限る）。
+
     Args:
         weights_path: 学習済み重み（JSON）のパス。
-        time_limit_ms: 思考時間上限（ミリ秒）。
+        time_limit_ms: 思考時間上限（ミリ秒）。None なら時間では打ち切らない。
         max_depth: 最大探索深さ。
+        use_bitboard: 8x8 盤面で着手生成にビットボードカーネルを使うか。
+        time_manager: 対局の持ち時間（time_manager.py）。指定すると
+            time_limit_ms の代わりに、残り時間・局面・反復ごとの最善手の
+            安定度から 1 手の思考時間を決める。
+        eval_cache_mb: 評価キャッシュ（eval_cache.py）の大きさ（MB）。0 なら使わない。
+            パターン評価の値を Zobrist ハッシュで覚え、反復深化の各深さや
+            手順違いで同じ葉に来たときは評価し直さない（0 でも葉の値は TT に残る）。
+        move_ordering: 各ノードの手を Killer / History / カウンター手
+            （move_ordering.py）で並べ替えるか。False なら TT の最善手だけを先に調べる。
+        node_limit: 1 手の探索ノード数の上限（512 ノードごとに確かめる）。超えたら
+            時間切れと同じく、最後に完了した深さの最善手を返す。None なら制限なし。
+        tt_size_mb: トランスポジションテーブルの大きさ（MB）。
+        keep_tt: play をまたいで TT と History を持ち越すか（SearchCore と同じ）。
     """
 
     def __init__(
         self,
         weights_path: Optional[str] = None,
-        time_limit_ms: int = 3000,
+        time_limit_ms: Optional[int] = 3000,
         max_depth: int = 60,
+        use_bitboard: bool = False,
+        time_manager: Optional[TimeManager] = None,
+        eval_cache_mb: float = 0.0,
+        move_ordering: bool = True,
+        node_limit: Optional[int] = None,
+        tt_size_mb: float = DEFAULT_SIZE_MB,
+        keep_tt: bool = True,
     ) -> None:
-        self._time_limit_ms = time_limit_ms
-        self._max_depth = max_depth
+        # 重みを変えたら（_evaluator を差し替えたら）評価キャッシュと TT を clear すること
         self._evaluator = PatternEvaluator(board_size=8, weights_path=weights_path)
-        self._start_time: float = 0.0
-        self._nodes_checked = 0
-
-    def _time_exceeded(self) -> bool:
-        """思考時間が超過したか確認。"""
-        return (time.monotonic() - self._start_time) * 1000 >= self._time_limit_ms
-
-    def _negamax(
-        self,
-        board: list[list[int]],
-        n: int,
-        turn: int,
-        depth: int,
-        alpha: float,
-        beta: float,
-        passed: bool,
-    ) -> tuple[float, Optional[tuple[int, int]]]:
-        """αβ枝刈り negamax（パターン評価版）。
-
-        Returns:
-            (評価値, 最善手)のタプル。
-        """
-        # 深さ 0
-        if depth == 0:
-            value = -self._evaluator.evaluate(board, turn)
-            return (value, None)
-
-        # 合法手取得
-        moves = _valid_moves(board, n, turn)
-
-        # パス処理
-        if not moves:
-            if passed:
-                # 両者パス→終局（石差で評価）
-                black = sum(1 for row in board for v in row if v == -1)
-                white = sum(1 for row in board for v in row if v == 1)
-                value = (black - white) * 10000
-                return (-value if turn == 1 else value, None)
-
-            value, _ = self._negamax(board, n, -turn, depth, -beta, -alpha, passed=True)
-            return (-value, None)
-
-        # αβ探索
-        best_value: float = -float('inf')
-        best_move: Optional[tuple[int, int]] = None
-
-        for move in moves:
-            self._nodes_checked += 1
-            if self._nodes_checked % 512 == 0:
-                if self._time_exceeded():
-                    break
-
-            flips = _flips_for_move(board, n, move[0], move[1], turn)
-            _apply(board, move, flips, turn)
-
-            value, _ = self._negamax(board, n, -turn, depth - 1, -beta, -alpha, False)
-            value = -value
-
-            _undo(board, move, flips, turn)
-
-            if value > best_value:
-                best_value = float(value)
-                best_move = move
-
-            alpha = max(alpha, best_value)
-            if alpha >= beta:
-                break
-
-        return (best_value, best_move)
-
-    def play(self, game: "Game") -> Optional[tuple[int, int]]:
-        """与えられたゲーム状態で最善手を返す。"""
-        self._start_time = time.monotonic()
-        self._nodes_checked = 0
-
-        board = game.board.board
-        n = game.board_size
-        turn = game.turn
-
-        best_move = None
-        for d in range(1, self._max_depth + 1):
-            try:
-                value, move = self._negamax(board, n, turn, d, -float('inf'), float('inf'), False)
-                if move is not None:
-                    best_move = move
-            except KeyboardInterrupt:
-                break
-
-        return best_move
+        # 同梱の重み（data/pattern_weights_8x8.json）は、深さ 0 の葉で手番側視点の値を
+        # 反転して返していた旧 PatternAgent の符号の方が強い（深さ 3 で 20 局 13-7）。
+        # TD 学習の視点をそろえて重みを学習し直すまでは旧実装の符号を保ち、
+        # 学習し直したら negate をやめて LeafEvaluator の規約（手番側視点）に合わせる。
+        # 石差で評価するのは盤面の埋まった葉と両者パスの終局だけ（endgame_empties=0）
+        super().__init__(
+            evaluator=PatternLeafEvaluator(self._evaluator, negate=True),
+            time_limit_ms=time_limit_ms,
+            max_depth=max_depth,
+            endgame_empties=0,
+            use_bitboard=use_bitboard,
+            tt_size_mb=tt_size_mb,
+            keep_tt=keep_tt,
+            time_manager=time_manager,
+            eval_cache_mb=eval_cache_mb,
+            node_limit=node_limit,
+            move_ordering=move_ordering,
+        )
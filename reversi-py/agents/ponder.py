@@ -0,0 +1,272 @@
+"""相手の手番のあいだも探索を続ける（ポンダー）エージェント。
+
+人間が考えている間も CPU を使い、TranspositionNegamaxAgent の TT を温めておく。
+自分が指した直後の局面（相手の手番）で ponder を呼ぶと、別スレッドで探索を始め、
+次の play で止める。2 つのモードがある:
+
+    predict  相手の予想手（直前の探索で TT に残った相手の最善手）を指した後の
+             局面を探索する。予想が当たれば（ponderhit）探索を止めずに
+             この手の思考時間だけ続け、そのまま結果を返す
+    all      相手の手番の局面そのものを探索する。相手のどの手にも
+             子局面の TT エントリと最善手が残る
+
+予想が外れた場合や all モードでは、探索を止めてから通常の play を行う。
+TT はそのまま残るので、外れても探索済みの局面は再利用される。
+ponderhit では、ポンダーを始めた時点からその局面を考えていたものとして
+思考時間を数える。ポンダーが 1 手分の思考時間より長く続いていれば、
+探索中の深さを打ち切って直前に完了した深さの最善手をすぐに返す。
+持ち時間（time_manager）から引くのは play が呼ばれてからの時間だけ。
+"""
+import copy
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from .analysis import MoveAnalysis
+from .base_agent import Agent
+from .search_primitives import _apply, _move_helpers
+from .time_manager import MoveTimer, TimeManager, finish_timer, start_timer
+from .transposition_negamax_agent import TranspositionNegamaxAgent
+
+if TYPE_CHECKING:
+    from game import Game
+
+PONDER_MODES = ("predict", "all")
+
+# ponder の探索を打ち切るまでの上限（ミリ秒）。相手が長考しても CPU を使い続けない
+DEFAULT_MAX_PONDER_MS = 60_000
+
+
+class _PonderTimer:
+    """ポンダー中の反復深化に渡す timer。
+
+    ポンダー中は止めず（上限は agent の deadline で打ち切る）、
+    ponderhit で本物の MoveTimer を渡されてからはその判断に従う。
+    それまでの反復の (最善手, 評価値) は、最善手の安定度の判断に使うため記録しておく。
+    探索の停止イベントも兼ね、ponderhit 後の期限は agent の deadline を
+    書き換えずにここから探索へ伝える。
+
+    Args:
+        stop: stop_pondering で立てる停止イベント。
+    """
+
+    def __init__(self, stop: threading.Event) -> None:
+        self.start = time.monotonic()
+        self.timer: Optional[MoveTimer] = None
+        self.iterations: list[tuple[Any, Optional[float]]] = []
+        self._stop = stop
+        # 反復の記録（ポンダーのスレッド）と ponderhit（play のスレッド）を排他にする
+        self._lock = threading.Lock()
+
+    def iteration_done(self, move: Any, score: Optional[float] = None) -> None:
+        with self._lock:
+            self.iterations.append((move, score))
+            if self.timer is not None:
+                self.timer.iteration_done(move, score)
+
+    def should_stop(self) -> bool:
+        timer = self.timer
+        return timer is not None and timer.should_stop()
+
+    def is_set(self) -> bool:
+        """探索を止めるか（止められたか、ponderhit 後に思考時間の上限を過ぎたか）。"""
+        if self._stop.is_set():
+            return True
+        timer = self.timer
+        return timer is not None and timer.expired()
+
+    def hit(self, timer: MoveTimer) -> None:
+        """ponderhit。これまでの反復を timer に記録し、以後の判断を timer に任せる。
+
+        iteration_done と同じロックの中で行い、その間に終わった反復を取りこぼさない。
+        """
+        with self._lock:
+            for move, score in self.iterations:
+                timer.iteration_done(move, score)
+            self.timer = timer
+
+
+class PonderingAgent(Agent):
+    """相手の手番にも探索を続ける TranspositionNegamaxAgent。
+
+    属性の参照は内側の TranspositionNegamaxAgent に委譲する。
+
+    Args:
+        mode: "predict"（予想手の後の局面を探索）または "all"（相手の全応手を探索）。
+        max_ponder_ms: 1 回のポンダーの探索時間の上限（ミリ秒）。
+        **kwargs: TranspositionNegamaxAgent に渡す引数。
+
+    Raises:
+        ValueError: mode が PONDER_MODES にない場合。
+    """
+
+    def __init__(
+        self, mode: str = "predict", max_ponder_ms: int = DEFAULT_MAX_PONDER_MS, **kwargs: Any
+    ) -> None:
+        if mode not in PONDER_MODES:
+            raise ValueError(f"mode must be one of {PONDER_MODES}: {mode}")
+        self.mode = mode
+        self.max_ponder_ms = max_ponder_ms
+        self.agent = TranspositionNegamaxAgent(**kwargs)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._timer = _PonderTimer(self._stop)
+        # predict モードで探索中の局面 (盤面, 手番)。all モードでは None
+        self._position: Optional[tuple[list[list[int]], int]] = None
+        self._result: Optional[tuple[int, int]] = None
+        # ポンダー開始時の TT の利用統計（ponderhit の SearchStats 用）
+        self._tt_before = self.agent._tt_stats()
+        # 直前の play が ponderhit だったか
+        self.last_ponderhit = False
+
+    def _predict(self, board: list[list[int]], n: int, turn: int) -> Optional[tuple[int, int]]:
+        """TT に残っている、board での turn 側の最善手（なければ None）。"""
+        h = self.agent._compute_initial_hash(board, n)
+        _, move = self.agent._tt_lookup(h, turn, 0, -float('inf'), float('inf'))
+        return move
+
+    def ponder(self, game: "Game") -> bool:
+        """自分が指した直後の局面（相手の手番）でポンダーを始める。
+
+        前のポンダーは止める。探索は別スレッドで行い、すぐに戻る。
+
+        Args:
+            game: 相手の手番の局面。
+
+        Returns:
+            ポンダーを始めたか（相手に合法手がない場合は始めない）。
+        """
+        self.stop_pondering()
+        valid_moves = game.get_valid_moves()
+        if not valid_moves:
+            return False
+
+        agent = self.agent
+        board = [row[:] for row in game.board.board]
+        turn = game.turn
+        n = len(board)
+        if agent._n != n:
+            agent._prepare_search(n)  # Zobrist 表を作り直してから予想手を引く
+        helpers = _move_helpers(n, agent._use_bitboard)
+
+        self._position = None
+        if self.mode == "predict":
+            move = self._predict(board, n, turn)
+            if move is not None and move in valid_moves:
+                _apply(board, move, helpers.flips_for_move(board, n, move[0], move[1], turn), turn)
+                turn = -turn
+                if helpers.valid_moves(board, n, turn):
+                    self._position = ([row[:] for row in board], turn)
+                else:
+                    # 予想手の後にこちらがパスする局面は探索しない（all モードで探索する）
+                    board = [row[:] for row in game.board.board]
+                    turn = game.turn
+
+        agent._prepare_search(n)
+        agent._helpers = helpers
+        agent._deadline = time.monotonic() + self.max_ponder_ms / 1000.0
+        agent._nodes_checked = 0
+        agent._tt_cutoffs = 0
+        agent._cutoffs = 0
+        agent._first_move_cutoffs = 0
+        agent._probcut_cuts = 0
+        agent._last_depth = 0
+        agent._helper_results = []
+        self._tt_before = agent._tt_stats()
+        self._stop = threading.Event()
+        self._timer = _PonderTimer(self._stop)
+        agent._stop_event = self._timer
+        self._result = None
+        self._thread = threading.Thread(
+            target=self._search, args=(board, n, turn, self._timer), daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _search(self, board: list[list[int]], n: int, turn: int, timer: _PonderTimer) -> None:
+        """ポンダーのスレッド本体。"""
+        self._result = self.agent._iterative_deepening(board, n, turn, timer=timer)  # type: ignore[arg-type]
+
+    def stop_pondering(self) -> None:
+        """ポンダー中なら探索を止め、スレッドの終了を待つ。"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._position = None
+        self.agent._stop_event = None
+
+    def play(
+        self, game: "Game", time_manager: Optional[TimeManager] = None
+    ) -> Optional[tuple[int, int]]:
+        """与えられたゲーム状態で最善手を返す。
+
+        ポンダーで予想した局面なら、その探索を思考時間の分だけ続けて結果を返す。
+        それ以外はポンダーを止めてから通常どおり探索する。
+
+        Args:
+            game: 現在のゲーム状態。
+            time_manager: この手で使う持ち時間（TranspositionNegamaxAgent.play と同じ）。
+
+        Returns:
+            (row, col) のタプル、または合法手がない場合は None。
+        """
+        self.last_ponderhit = False
+        position = self._position
+        if (
+            self._thread is not None
+            and position is not None
+            and game.turn == position[1]
+            and game.board.board == position[0]
+        ):
+            valid_moves = game.get_valid_moves()
+            empties = sum(row.count(0) for row in position[0])
+            clock = self.agent.time_manager if time_manager is None else time_manager
+            timer = start_timer(clock, self.agent._time_limit_ms, empties, len(valid_moves))
+            try:
+                # ponderhit: ポンダーを始めた時点からこの手を考えていたものとして
+                # 期限と反復の判断を決める（ポンダーが十分長ければすぐ返る）
+                search_timer = copy.copy(timer)
+                search_timer.start = self._timer.start
+                search_timer.deadline = min(
+                    timer.deadline, self._timer.start + timer.hard_ms / 1000.0
+                )
+                self._timer.hit(search_timer)
+                self._thread.join()
+                self._thread = None
+                self._position = None
+                self.agent._stop_event = None
+                move = self._result
+            finally:
+                finish_timer(clock, timer)
+            if move in valid_moves:
+                self.last_ponderhit = True
+                # ノード数はポンダー開始からの分なので、時間もポンダー開始から数える
+                stats = self.agent._search_stats(
+                    position[0], position[1], move, search_timer.elapsed_ms(), self._tt_before
+                )
+                self.last_stats = stats._replace(source="ponderhit")
+                return move
+
+        self.stop_pondering()
+        move = self.agent.play(game, time_manager=time_manager)
+        self.last_stats = self.agent.last_stats
+        return move
+
+    def analyze(
+        self, game: "Game", k: int = 1, time_manager: Optional[TimeManager] = None
+    ) -> list[MoveAnalysis]:
+        """ポンダーを止めてから上位 k 手を解析する（TranspositionNegamaxAgent.analyze と同じ）。"""
+        self.stop_pondering()
+        analysis = self.agent.analyze(game, k, time_manager)
+        self.last_stats = self.agent.last_stats
+        return analysis
+
+    def close(self) -> None:
+        """ポンダーを止め、内側のエージェントを終了させる。"""
+        self.stop_pondering()
+        self.agent.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.agent, name)
@@ -0,0 +1,252 @@
+"""局面キー（盤面 + 手番）と 8 対称性による正規化。
+
+TT・評価キャッシュ・定石・API の結果キャッシュなど、局面を辞書のキーに
+する処理で共通に使う。局面は黒石・白石のビットマスク 2 つと手番、
+盤面サイズをまとめた不変の ``PositionKey`` で表す
+（ビット位置は ``sq = row * size + col``。8x8 では bitboard.py と同じ）。
+
+盤面の 8 つの対称変換（回転・鏡映）で移り合う局面は評価値も最善手も
+対応するので、``canonical_key`` で代表元（辞書順最小のキー）に揃えれば
+キャッシュのヒットが最大 8 倍になる。キャッシュから取り出した着手は
+``inverse_transform_move`` で元の局面の座標に戻す。
+
+対称変換の番号 ``sym``（0-7）はビットの組で、次の順に適用する:
+    bit 0: 左右反転（col -> size-1-col）
+    bit 1: 上下反転（row -> size-1-row）
+    bit 2: 転置（row と col の入れ替え）
+"""
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+# 対称変換の数（恒等変換を含む）
+NUM_SYMMETRIES = 8
+
+# 8x8 のビット変換に使うマスク
+_FULL = 0xFFFFFFFFFFFFFFFF
+_K1 = 0x5555555555555555
+_K2 = 0x3333333333333333
+_K4 = 0x0F0F0F0F0F0F0F0F
+_D1 = 0x5500550055005500
+_D2 = 0x3333000033330000
+_D4 = 0x0F0F0F0F00000000
+
+
+class PositionKey(NamedTuple):
+    """局面のコンパクトな不変キー（ハッシュ可能・比較可能）。"""
+
+    size: int  # 盤面サイズ
+    black: int  # 黒石のビットマスク
+    white: int  # 白石のビットマスク
+    turn: int  # 手番（1=白, -1=黒）
+
+
+def position_key(board: List[List[int]], turn: int) -> PositionKey:
+    """盤面と手番から PositionKey を作る。
+
+    Args:
+        board: n×n 盤面（0=空, 1=白, -1=黒）。
+        turn: 手番（1=白, -1=黒）。
+
+    Returns:
+        局面キー。
+    """
+    black = 0
+    white = 0
+    bit = 1
+    for row in board:
+        for v in row:
+            if v == -1:
+                black |= bit
+            elif v == 1:
+                white |= bit
+            bit <<= 1
+    return PositionKey(len(board), black, white, turn)
+
+
+def key_to_board(key: PositionKey) -> List[List[int]]:
+    """PositionKey を 2 次元リストの盤面に戻す（position_key の逆変換）。
+
+    Args:
+        key: 局面キー。
+
+    Returns:
+        n×n 盤面（0=空, 1=白, -1=黒）。
+    """
+    n = key.size
+    return [
+        [
+            -1 if key.black >> (r * n + c) & 1 else 1 if key.white >> (r * n + c) & 1 else 0
+            for c in range(n)
+        ]
+        for r in range(n)
+    ]
+
+
+def transform_move(sym: int, move: Tuple[int, int], size: int) -> Tuple[int, int]:
+    """座標に対称変換 sym を適用する。
+
+    Args:
+        sym: 対称変換の番号（0-7）。
+        move: (row, col)。
+        size: 盤面サイズ。
+
+    Returns:
+        変換後の (row, col)。
+    """
+    row, col = move
+    if sym & 1:
+        col = size - 1 - col
+    if sym & 2:
+        row = size - 1 - row
+    if sym & 4:
+        row, col = col, row
+    return row, col
+
+
+def inverse_transform_move(sym: int, move: Tuple[int, int], size: int) -> Tuple[int, int]:
+    """transform_move の逆変換（変換後の座標を元の局面の座標に戻す）。
+
+    Args:
+        sym: 対称変換の番号（0-7）。
+        move: 変換後の局面での (row, col)。
+        size: 盤面サイズ。
+
+    Returns:
+        元の局面での (row, col)。
+    """
+    row, col = move
+    if sym & 4:
+        row, col = col, row
+    if sym & 2:
+        row = size - 1 - row
+    if sym & 1:
+        col = size - 1 - col
+    return row, col
+
+
+def _mirror_cols8(x: int) -> int:
+    """8x8 ビットボードの各行を左右反転する。"""
+    x = ((x >> 1) & _K1) | ((x & _K1) << 1)
+    x = ((x >> 2) & _K2) | ((x & _K2) << 2)
+    return ((x >> 4) & _K4) | ((x & _K4) << 4)
+
+
+def _flip_rows8(x: int) -> int:
+    """8x8 ビットボードの行の並びを上下反転する（バイト順の反転）。"""
+    return int.from_bytes(x.to_bytes(8, "little"), "big")
+
+
+def _transpose8(x: int) -> int:
+    """8x8 ビットボードを転置する（(row, col) -> (col, row)）。"""
+    t = _D4 & (x ^ (x << 28))
+    x ^= t ^ (t >> 28)
+    t = _D2 & (x ^ (x << 14))
+    x ^= t ^ (t >> 14)
+    t = _D1 & (x ^ (x << 7))
+    return (x ^ t ^ (t >> 7)) & _FULL
+
+
+def _transform_bits8(x: int, sym: int) -> int:
+    """8x8 ビットボードに対称変換 sym を適用する（シフトとマスクのみ）。"""
+    if sym & 1:
+        x = _mirror_cols8(x)
+    if sym & 2:
+        x = _flip_rows8(x)
+    if sym & 4:
+        x = _transpose8(x)
+    return x
+
+
+@lru_cache(maxsize=None)
+def _square_map(size: int, sym: int) -> Tuple[int, ...]:
+    """sq -> 変換後の sq の対応表（8x8 以外の盤面用）。"""
+    return tuple(
+        r * size + c
+        for sq in range(size * size)
+        for r, c in [transform_move(sym, divmod(sq, size), size)]
+    )
+
+
+def _transform_bits(x: int, sym: int, size: int) -> int:
+    """任意サイズのビットマスクに対称変換 sym を適用する。"""
+    if size == 8:
+        return _transform_bits8(x, sym)
+    table = _square_map(size, sym)
+    result = 0
+    while x:
+        low = x & -x
+        result |= 1 << table[low.bit_length() - 1]
+        x ^= low
+    return result
+
+
+def transform_key(key: PositionKey, sym: int) -> PositionKey:
+    """局面キーに対称変換 sym を適用する。
+
+    Args:
+        key: 局面キー。
+        sym: 対称変換の番号（0-7）。
+
+    Returns:
+        変換後の局面キー（手番は変わらない）。
+    """
+    if not sym:
+        return key
+    return PositionKey(
+        key.size,
+        _transform_bits(key.black, sym, key.size),
+        _transform_bits(key.white, sym, key.size),
+        key.turn,
+    )
+
+
+def canonicalize(key: PositionKey) -> Tuple[PositionKey, int]:
+    """8 対称変換のうち辞書順最小のキー（代表元）と、そこへ移す変換を返す。
+
+    同じ代表元になる局面が複数の sym から得られる（対称な局面）場合は
+    最小の sym を返す。
+
+    Args:
+        key: 局面キー。
+
+    Returns:
+        (代表元のキー, key を代表元へ移す sym)。
+    """
+    best = key
+    best_sym = 0
+    for sym in range(1, NUM_SYMMETRIES):
+        candidate = transform_key(key, sym)
+        if candidate < best:
+            best = candidate
+            best_sym = sym
+    return best, best_sym
+
+
+def canonical_key(board: List[List[int]], turn: int) -> Tuple[PositionKey, int]:
+    """盤面と手番から正規化したキーと変換番号を返す。
+
+    代表元の局面で得た着手 m は ``inverse_transform_move(sym, m, size)``
+    で元の局面の座標に戻せる。
+
+    Args:
+        board: n×n 盤面（0=空, 1=白, -1=黒）。
+        turn: 手番（1=白, -1=黒）。
+
+    Returns:
+        (代表元のキー, 元の局面を代表元へ移す sym)。
+    """
+    return canonicalize(position_key(board, turn))
+
+
+def move_to_canonical(
+    sym: int, move: Optional[Tuple[int, int]], size: int
+) -> Optional[Tuple[int, int]]:
+    """元の局面の着手を代表元の座標へ移す（None はパスとしてそのまま返す）。"""
+    return None if move is None else transform_move(sym, move, size)
+
+
+def move_from_canonical(
+    sym: int, move: Optional[Tuple[int, int]], size: int
+) -> Optional[Tuple[int, int]]:
+    """代表元の着手を元の局面の座標へ戻す（None はパスとしてそのまま返す）。"""
+    return None if move is None else inverse_transform_move(sym, move, size)
@@ -0,0 +1,226 @@
+"""Multi-ProbCut（浅い探索の値から深い探索の結果を予測する前向き枝刈り）。
+
+同じ局面の深さ d の探索値 v と浅い深さ d' の探索値 v' はほぼ線形に
+相関する（v ≈ a * v' + b、誤差の標準偏差 σ）。深さ d のノードで、まず
+深さ d' をヌルウィンドウで探索し、
+
+    a * v' + b >= beta + t * σ  なら  β を超える見込みが高いので beta を返す
+    a * v' + b <= alpha - t * σ なら  α を下回る見込みが高いので alpha を返す
+
+として深い探索を省く（t はカットの厳しさ。大きいほど安全で刈る量が減る）。
+Multi-ProbCut として、深さ d ごとに複数の d' を試せ、係数は局面の段階
+（空きマス数を phase_width ごとに区切ったもの）ごとに持つ。
+
+係数は評価関数と探索の実装ごとに異なるため、エージェントごとに
+scripts/calibrate_probcut.py で自己生成した局面から回帰して JSON に保存する::
+
+    {"version": 1, "board_size": 8, "phase_width": 10,
+     "pairs": [{"phase": 3, "depth": 6, "shallow": 2, "slope": 0.98,
+                "intercept": -1.5, "sigma": 41.2, "samples": 180}, ...]}
+"""
+import json
+import math
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+
+VERSION = 1
+
+# カットの閾値（σ の何倍離れていれば刈るか）の既定値
+DEFAULT_T = 1.5
+
+# 空きマス数を段階に区切る幅の既定値
+DEFAULT_PHASE_WIDTH = 10
+
+# 回帰に使う最小のサンプル数（これ未満の (段階, 深さの組) は表に入れない）
+MIN_SAMPLES = 20
+
+
+class ProbCutPair(NamedTuple):
+    """深さ depth の探索値を、浅い深さ shallow の探索値から予測する回帰係数。"""
+
+    depth: int
+    shallow: int
+    slope: float  # a
+    intercept: float  # b
+    sigma: float  # 残差の標準偏差
+    samples: int = 0  # 回帰に使った局面数
+
+    def high_bound(self, beta: float, t: float) -> float:
+        """浅い探索値がこれ以上なら、深い探索値が beta 以上と見なせる閾値。"""
+        return (beta + t * self.sigma - self.intercept) / self.slope
+
+    def low_bound(self, alpha: float, t: float) -> float:
+        """浅い探索値がこれ以下なら、深い探索値が alpha 以下と見なせる閾値。"""
+        return (alpha - t * self.sigma - self.intercept) / self.slope
+
+
+def fit_pair(
+    depth: int, shallow: int, xs: Sequence[float], ys: Sequence[float]
+) -> ProbCutPair:
+    """浅い探索値 xs から深い探索値 ys への最小二乗の回帰係数を求める。
+
+    Args:
+        depth: 深い探索の深さ。
+        shallow: 浅い探索の深さ。
+        xs: 浅い探索値。
+        ys: 同じ局面の深い探索値。
+
+    Returns:
+        回帰係数。
+
+    Raises:
+        ValueError: サンプルが 2 未満か、xs がすべて同じ値の場合。
+    """
+    count = len(xs)
+    if count < 2 or count != len(ys):
+        raise ValueError(f"need at least 2 paired samples: {count}")
+    mean_x = sum(xs) / count
+    mean_y = sum(ys) / count
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        raise ValueError("shallow values have no variance")
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    slope = cov / var_x
+    intercept = mean_y - slope * mean_x
+    residual = sum((y - slope * x - intercept) ** 2 for x, y in zip(xs, ys))
+    sigma = math.sqrt(residual / max(count - 2, 1))
+    return ProbCutPair(depth, shallow, slope, intercept, sigma, count)
+
+
+class ProbCutTable:
+    """段階・深さごとの ProbCut の回帰係数。
+
+    Args:
+        board_size: 回帰に使った盤面サイズ（ほかのサイズでは使わない）。
+        phase_width: 段階を区切る空きマス数の幅。
+        pairs: (段階, 回帰係数) の列。同じ段階・深さに複数あれば浅い順に試す。
+    """
+
+    def __init__(
+        self,
+        board_size: int,
+        phase_width: int = DEFAULT_PHASE_WIDTH,
+        pairs: Iterable[Tuple[int, ProbCutPair]] = (),
+    ) -> None:
+        if phase_width < 1:
+            raise ValueError(f"phase_width must be positive: {phase_width}")
+        self.board_size = board_size
+        self.phase_width = phase_width
+        grouped: Dict[Tuple[int, int], List[ProbCutPair]] = {}
+        for phase, pair in pairs:
+            grouped.setdefault((phase, pair.depth), []).append(pair)
+        self._checks: Dict[Tuple[int, int], Tuple[ProbCutPair, ...]] = {
+            key: tuple(sorted(group, key=lambda p: p.shallow))
+            for key, group in grouped.items()
+        }
+        self.min_depth = min((depth for _, depth in self._checks), default=0)
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self._checks.values())
+
+    def phase(self, empties: int) -> int:
+        """空きマス数 empties の段階。"""
+        return empties // self.phase_width
+
+    def checks(self, depth: int, empties: int) -> Tuple[ProbCutPair, ...]:
+        """深さ depth・空きマス数 empties のノードで試す回帰係数（なければ空）。"""
+        return self._checks.get((empties // self.phase_width, depth), ())
+
+    def pairs(self) -> List[Tuple[int, ProbCutPair]]:
+        """(段階, 回帰係数) の一覧（段階・深さ・浅い深さの順）。"""
+        return [
+            (phase, pair)
+            for (phase, _), group in sorted(self._checks.items())
+            for pair in group
+        ]
+
+    @classmethod
+    def fit(
+        cls,
+        records: Iterable[Tuple[int, Mapping[int, float]]],
+        depth_pairs: Sequence[Tuple[int, int]],
+        board_size: int,
+        phase_width: int = DEFAULT_PHASE_WIDTH,
+        min_samples: int = MIN_SAMPLES,
+    ) -> "ProbCutTable":
+        """局面ごとの各深さの探索値から回帰係数を求める。
+
+        予測の向きが逆（傾きが正でない）か、サンプルが min_samples 未満の
+        組は表に入れない。
+
+        Args:
+            records: (空きマス数, 深さ -> 探索値) の列。
+            depth_pairs: 回帰する (深い深さ, 浅い深さ) の組。
+            board_size: 盤面サイズ。
+            phase_width: 段階を区切る空きマス数の幅。
+            min_samples: 回帰に使う最小のサンプル数。
+
+        Returns:
+            回帰係数の表。
+        """
+        samples: Dict[Tuple[int, int, int], Tuple[List[float], List[float]]] = {}
+        for empties, values in records:
+            phase = empties // phase_width
+            for depth, shallow in depth_pairs:
+                if depth in values and shallow in values:
+                    xs, ys = samples.setdefault((phase, depth, shallow), ([], []))
+                    xs.append(values[shallow])
+                    ys.append(values[depth])
+        pairs = []
+        for (phase, depth, shallow), (xs, ys) in sorted(samples.items()):
+            if len(xs) < min_samples:
+                continue
+            try:
+                pair = fit_pair(depth, shallow, xs, ys)
+            except ValueError:
+                continue
+            if pair.slope > 0:
+                pairs.append((phase, pair))
+        return cls(board_size, phase_width, pairs)
+
+    def to_dict(self) -> dict:
+        """JSON に書ける dict にする。"""
+        return {
+            "version": VERSION,
+            "board_size": self.board_size,
+            "phase_width": self.phase_width,
+            "pairs": [{"phase": phase, **pair._asdict()} for phase, pair in self.pairs()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "ProbCutTable":
+        """to_dict() の dict から作る。
+
+        Raises:
+            ValueError: 版が異なるか、必要なキーがない場合。
+        """
+        if data.get("version") != VERSION:
+            raise ValueError(f"unsupported ProbCut table version: {data.get('version')}")
+        try:
+            pairs = [
+                (int(item["phase"]), ProbCutPair(
+                    int(item["depth"]), int(item["shallow"]), float(item["slope"]),
+                    float(item["intercept"]), float(item["sigma"]),
+                    int(item.get("samples", 0)),
+                ))
+                for item in data["pairs"]
+            ]
+            return cls(int(data["board_size"]), int(data["phase_width"]), pairs)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"invalid ProbCut table: {e}") from e
+
+    def save(self, path: str) -> None:
+        """JSON ファイルに保存する。"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "ProbCutTable":
+        """save() した JSON ファイルを読む。
+
+        Raises:
+            OSError: ファイルを読めない場合。
+            ValueError: 形式が正しくない場合。
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
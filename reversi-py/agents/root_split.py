@@ -0,0 +1,145 @@
+"""ルート分割による SearchCore（NegamaxAgent）の並列探索。
+
+SearchCore(root_workers=N) は、ルート局面の先頭の手（前の深さの最善手）を
+自プロセスで探索してから、残りの手を 1 手ずつ ProcessPoolExecutor の
+ワーカーに渡して同じ深さで探索させる。ワーカーは同じ設定の SearchCore を
+TT なしで作り、子局面を探索する。
+
+各ワーカーは、探索を始める時点でそれまでに確定した最善値（共有 alpha）を
+共有メモリ上の 1 つの double から読み、その直下を下限とした窓で探索する。
+共有 alpha の書き込みは呼び出し元だけが行う（結果を受け取るたびに更新）。
+
+下限を最善値ちょうどではなくその直下にするため、最善値と同点の手も正確な値が
+求まり、値が下限以下で返った手は最善値より真に小さいことが保証される。
+よって「最大値の手のうち最も前の手」は直列探索（use_aspiration=False）の
+結果と一致する（評価値も同じ）。ノード数は共有 alpha の読み出しの
+タイミングによって変わる。
+"""
+import math
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, List, NamedTuple, Tuple
+
+# ワーカー側: initializer で受け取る共有 alpha
+_shared_alpha: Any = None
+
+Move = Tuple[int, int]
+
+
+class MoveResult(NamedTuple):
+    """ワーカーが探索したルートの手 1 つの結果。"""
+
+    score: float  # 親（ルートの手番側）から見た評価値
+    alpha: float  # 探索に使った窓の下限（score <= alpha なら上界）
+    nodes: int  # 探索したノード数
+
+
+def _init_worker(alpha: Any) -> None:
+    """ワーカープロセスの初期化（共有 alpha を受け取る）。"""
+    global _shared_alpha
+    _shared_alpha = alpha
+
+
+def _search_move(
+    agent_kwargs: dict[str, Any],
+    board: List[List[int]],
+    turn: int,
+    move: Move,
+    flips: List[Move],
+    depth: int,
+    deadline: float,
+) -> MoveResult:
+    """ルートの手 move を指した局面を深さ depth - 1 で探索する（ワーカー側）。"""
+    # 親モジュールとの循環 import を避けるためここで読み込む
+    from .search_core import SearchCore
+    from .search_primitives import _apply, _EvalState, _move_helpers
+
+    n = len(board)
+    agent = SearchCore(time_limit_ms=None, **agent_kwargs)
+    agent._deadline = deadline
+    agent._prepare_search(n)
+    agent._helpers = _move_helpers(n, agent._use_bitboard)
+    agent._state = _EvalState(board, n)
+    h = agent._update_hash(agent._compute_initial_hash(board, n), move, flips, turn)
+    _apply(board, move, flips, turn, agent._state)
+    alpha = math.nextafter(_shared_alpha.value, -math.inf)
+    # 直列探索の 2 手目以降と同じく、PVS ならヌルウィンドウで調べてから再探索する
+    score = agent._search_child(
+        board, n, turn, depth, alpha, math.inf, h, False, 1, move[0] * n + move[1]
+    )
+    return MoveResult(score, alpha, agent._nodes_checked)
+
+
+class RootSplitPool:
+    """ルートの手を探索するワーカープロセスの組と共有 alpha。
+
+    プロセスは spawn で起動し、close() まで（または本オブジェクトが
+    回収されるまで）同じものを使い続ける。
+
+    Args:
+        workers: ワーカープロセスの数。
+    """
+
+    def __init__(self, workers: int) -> None:
+        context = multiprocessing.get_context("spawn")
+        self._alpha = context.RawValue("d", -math.inf)
+        self._executor = ProcessPoolExecutor(
+            workers, mp_context=context, initializer=_init_worker,
+            initargs=(self._alpha,),
+        )
+        self._finalizer = weakref.finalize(
+            self, self._executor.shutdown, wait=True, cancel_futures=True
+        )
+
+    def search(
+        self,
+        agent_kwargs: dict[str, Any],
+        board: List[List[int]],
+        turn: int,
+        moves: List[Tuple[Move, List[Move]]],
+        depth: int,
+        deadline: float,
+        alpha: float,
+    ) -> List[MoveResult]:
+        """moves の各手を並列に探索し、moves と同じ順の結果を返す。
+
+        Args:
+            agent_kwargs: ワーカー側の SearchCore の引数（time_limit_ms 以外）。
+            board: ルート局面（変更しない）。
+            turn: ルートの手番。
+            moves: 探索する (着手, 反転リスト) のリスト。
+            depth: ルートの探索深さ。
+            deadline: time.monotonic() の期限。
+            alpha: 探索開始時点の最善値（先頭の手の評価値）。
+
+        Returns:
+            各手の MoveResult。
+
+        Raises:
+            Exception: ワーカーの探索が送出した例外（時間切れなど）。
+                残りの手の探索は取り消す。
+        """
+        self._alpha.value = alpha
+        futures = {
+            self._executor.submit(
+                _search_move, agent_kwargs, board, turn, move, flips, depth, deadline,
+            ): i
+            for i, (move, flips) in enumerate(moves)
+        }
+        results: List[MoveResult] = [MoveResult(-math.inf, math.inf, 0)] * len(moves)
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if result.alpha < result.score and result.score > self._alpha.value:
+                    self._alpha.value = result.score
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return results
+
+    def close(self) -> None:
+        """ワーカーを終了させる。"""
+        self._finalizer()
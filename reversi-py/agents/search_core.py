@@ -0,0 +1,1174 @@
+"""評価関数を差し替えられる探索エンジン（反復深化 + αβ negamax + TT + 手順付け）。
+
+SearchCore は反復深化（アスピレーション窓）・αβ negamax（PVS）・トランスポジションテーブル・
+ETC・Killer / History / カウンター手・評価キャッシュ・Multi-ProbCut・終盤ソルバー・
+ルート分割・時間とノード数の管理・multi-PV の解析を持ち、終盤の石差で評価しない葉の
+評価だけを LeafEvaluator（evaluators.py）に任せる。探索エージェントはこの設定違いとして作る:
+
+    NegamaxAgent               HEURISTIC + PVS + アスピレーション窓 + 終盤ソルバー
+                               + 位置重み順の手順付け + ルート分割（TT なし）
+    TranspositionNegamaxAgent  HEURISTIC + TT + Lazy SMP
+    PatternAgent               PatternLeafEvaluator（学習済みパターン評価）+ TT
+"""
+import math
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from . import bitboard
+from .analysis import MoveAnalysis, multipv_search
+from .base_agent import Agent
+from .endgame_solver import EndgameSolver, EndgameTimeout
+from .eval_cache import EvalCache
+from .evaluators import LeafEvaluator
+from .lazy_smp import HelperResult
+from .move_ordering import MoveOrdering
+from .probcut import DEFAULT_T as DEFAULT_PROBCUT_T, ProbCutTable
+from .root_split import RootSplitPool
+from .search_primitives import (
+    _LIST_HELPERS,
+    HEURISTIC,
+    _apply,
+    _build_weight_table,
+    _EvalState,
+    _move_helpers,
+    _undo,
+)
+from .search_stats import SearchStats
+from .time_manager import MoveTimer, TimeManager, finish_timer, start_timer
+from .transposition_table import (
+    DEFAULT_SIZE_MB,
+    EXACT,
+    LOWERBOUND,
+    NO_MOVE,
+    UPPERBOUND,
+    TranspositionTable,
+    TTStats,
+)
+from .zobrist import TURN_KEY, ZobristTable, compute_hash, update_hash, zobrist_table
+
+if TYPE_CHECKING:
+    from game import Game
+
+# 終局（と終盤の葉）の石差スコアの倍率。評価関数の値と桁で区別する
+_TERMINAL_SCALE = 10000
+
+# 手をまたいで History heuristic を持ち越すときの減衰（右シフト量）
+_HISTORY_DECAY_SHIFT = 1
+
+# 浅い探索による手順付けの深さ = 残り深さ // _SHALLOW_DEPTH_DIVISOR（最低 1）
+_SHALLOW_DEPTH_DIVISOR = 4
+
+# 時刻とノード数の上限を確かめる間隔（ノード数）
+_NODES_PER_TIME_CHECK = 512
+
+# アスピレーション窓の初期半幅（評価値の単位）と、窓外れ時の拡大率
+_ASPIRATION_WINDOW = 50.0
+_ASPIRATION_GROWTH = 4.0
+# 窓外れがこの回数を超えたら外れた側の窓を無限に開く
+_ASPIRATION_MAX_RETRIES = 3
+
+# ルート分割で並列に探索する最小の深さ（浅い探索はプロセス間通信の方が高くつく）
+_SPLIT_MIN_DEPTH = 4
+
+# 終盤ソルバーに使わせる思考時間とノード数の割合（読み切れなければ残りで反復深化する）
+_SOLVER_BUDGET = 0.5
+
+# TT を使わない設定の SearchStats 用の統計
+_NO_TT_STATS = TTStats(0, 0, 0, 0, 0)
+
+
+class _SearchTimeout(Exception):
+    """探索時間超過例外。"""
+
+
+def _tt_key(h: int, turn: int) -> int:
+    """TT のキー（評価値は手番で変わるので、白番なら TURN_KEY を XOR する。eval_cache.py と同じ）。"""
+    return h ^ TURN_KEY if turn == 1 else h
+
+
+class SearchCore(Agent):
+    """評価関数を差し替えられる Negamax + TT + ETC + Killer / History / カウンター手。
+
+    time_limit_ms=None にして max_depth（固定深さ）か node_limit で止めれば、
+    探索は実行環境の速さによらず決定論的（keep_tt=True なら、同じ手順で
+    play を呼んだ場合に限る）。
+
+    use_pvs / use_aspiration は、TT なし（tt_size_mb=0）なら同じ深さの探索結果
+    （最善手と評価値）を変えずにノード数だけを減らす設定で、A/B 比較のため個別に切り替えられる。
+
+    Args:
+        evaluator: 葉の評価関数（evaluators.py の LeafEvaluator）。None なら HEURISTIC。
+        time_limit_ms: 思考時間上限（ミリ秒）。None なら時間では打ち切らない。
+        max_depth: 最大探索深さ。
+        endgame_empties: 空きマスがこれ以下の葉は評価関数ではなく石差で評価する。
+        use_bitboard: 8x8 盤面で着手生成にビットボードカーネルを使うか。
+        tt_size_mb: トランスポジションテーブルの大きさ（MB）。0 なら TT を使わない
+            （ETC と浅い探索による並べ替えも働かない）。
+        keep_tt: play をまたいで TT と History を持ち越すか。True なら
+            手ごとに TT の世代を進め（古いエントリから置換される）、
+            History の値を減衰させる。False なら毎手すべて捨てる。
+        time_manager: 対局の持ち時間（time_manager.py）。指定すると
+            time_limit_ms の代わりに、残り時間・局面・反復ごとの最善手の
+            安定度から 1 手の思考時間を決める。
+        eval_cache_mb: 評価キャッシュ（eval_cache.py）の大きさ（MB）。0 なら使わない。
+            使う場合、深さ 0 の葉の評価値は TT ではなくこちらに置く。
+        etc_min_depth: 残り深さがこれ以上の局面で、子局面の TT エントリだけで
+            βカットできないか先に調べる（Enhanced Transposition Cutoff）。0 なら使わない
+            （浅い局面では子の TT を引く手間の方が大きいので、使うなら 3 以上）。
+        shallow_min_depth: 残り深さがこれ以上で TT の最善手がない局面では、
+            各手を浅い探索の評価値順に並べる（0 なら使わず、Killer / History で並べる）。
+        probcut: この評価関数で回帰した ProbCut（probcut.py）の係数。中盤のノードで
+            浅い探索の値から深い探索の結果を予測して枝を刈る。None なら使わない。
+        probcut_t: ProbCut のカットの閾値（回帰誤差の標準偏差の何倍か）。
+        node_limit: 1 手の探索ノード数の上限（_NODES_PER_TIME_CHECK ノードごとに
+            確かめる。終盤ソルバーの分を含み、ルート分割のワーカーのノードは
+            その深さの探索が終わってから数える）。超えたら時間切れと同じく、
+            最後に完了した深さの最善手を返す。None なら制限なし。
+        move_ordering: 各ノードの手を Killer / History / カウンター手
+            （move_ordering.py）で並べ替えるか。False なら TT の最善手だけを先に調べる。
+        use_pvs: Principal Variation Search を使うか。各ノードの 2 手目以降を
+            ヌルウィンドウで調べ、fail-high した手だけ通常の窓で再探索する。
+        use_aspiration: 反復深化の各深さを、前の深さの評価値を中心とした
+            狭い窓（アスピレーション窓）で始めるか。窓を外れたら広げて再探索する。
+        aspiration_window: アスピレーション窓の初期半幅（評価値の単位）。
+        solver_empties: 8x8 盤面で空きマスがこれ以下なら、反復深化の前に
+            終盤ソルバー（endgame_solver.py）で最終石差を読み切る（0 で無効）。
+            ソルバーには思考時間とノード数の _SOLVER_BUDGET だけを使わせ、
+            読み切れなければ残りで反復深化する。
+        solver_wld_empties: 終盤ソルバーで勝敗だけを読み切る空きマス数の上限
+            （solver_empties 以下なら無効）。
+        root_workers: ルート分割の並列探索（root_split.py）に使うワーカープロセス数
+            （1 なら並列化しない）。深さ _SPLIT_MIN_DEPTH 以上の全窓のルート探索で
+            先頭以外の手をワーカーに分ける。このときアスピレーション窓は使わず、TT なしなら
+            結果は use_aspiration=False の直列探索と同じになる。プロセスは最初に必要になった
+            時点で起動する。HEURISTIC 以外の評価関数では並列化しない。
+        weight_ordering: 各ノードの手を、Killer などで並べ替える前に位置重みの高い順に
+            並べるか（同順位の手はこの順に調べる）。
+        use_history: 手順付けで History を記録して並べ替えに使うか
+            （位置重み順の方が効く探索では False にして Killer とカウンター手だけ使う）。
+    """
+
+    def __init__(
+        self,
+        evaluator: Optional[LeafEvaluator] = None,
+        time_limit_ms: Optional[int] = 3000,
+        max_depth: int = 60,
+        endgame_empties: int = 12,
+        use_bitboard: bool = False,
+        tt_size_mb: float = DEFAULT_SIZE_MB,
+        keep_tt: bool = True,
+        time_manager: Optional[TimeManager] = None,
+        eval_cache_mb: float = 0.0,
+        etc_min_depth: int = 0,
+        shallow_min_depth: int = 0,
+        probcut: Optional[ProbCutTable] = None,
+        probcut_t: float = DEFAULT_PROBCUT_T,
+        node_limit: Optional[int] = None,
+        move_ordering: bool = True,
+        use_pvs: bool = False,
+        use_aspiration: bool = False,
+        aspiration_window: float = _ASPIRATION_WINDOW,
+        solver_empties: int = 0,
+        solver_wld_empties: int = 0,
+        root_workers: int = 1,
+        weight_ordering: bool = False,
+        use_history: bool = True,
+    ) -> None:
+        self._leaf_evaluator: LeafEvaluator = HEURISTIC if evaluator is None else evaluator
+        self._time_limit_ms = time_limit_ms
+        self.time_manager = time_manager
+        self._max_depth = max_depth
+        self._endgame_empties = endgame_empties
+        self._use_bitboard = use_bitboard
+        self._keep_tt = keep_tt
+        self._helpers = _LIST_HELPERS
+        # 探索中の盤面と同期した評価項（play で探索局面から作り直す）
+        self._state = _EvalState([[0]], 1)
+
+        # Zobrist ハッシュテーブル（遅延初期化。空のタプルは未初期化）
+        self._zobrist: ZobristTable = ()
+
+        # トランスポジションテーブル（固定サイズ、着手は row * n + col で保持。0 MB なら使わない）
+        self._tt_size_mb = tt_size_mb
+        self._tt: Optional[TranspositionTable] = (
+            TranspositionTable(tt_size_mb) if tt_size_mb > 0 else None
+        )
+        self._n = 0
+        # 評価キャッシュ（葉の評価値。キーは TT と同じ Zobrist ハッシュ + 手番）
+        self._eval_cache = EvalCache(eval_cache_mb) if eval_cache_mb > 0 else None
+
+        # 直前の play での Lazy SMP のヘルパーの結果（TranspositionNegamaxAgent が置く）
+        self._helper_results: list[HelperResult] = []
+        # 外から探索を止めるイベント（Lazy SMP のヘルパーやポンダーで使う）
+        self._stop_event: Optional[Any] = None
+
+        # 手順付け（Killer・History・カウンター手。盤面サイズは _prepare_search で合わせる）
+        self._ordering = MoveOrdering(8, use_history=use_history) if move_ordering else None
+        # 位置重み順の並べ替え（_prepare_search で盤面サイズの重み表を置く）
+        self._weight_ordering = weight_ordering
+        self._weights: Optional[tuple[tuple[int, ...], ...]] = None
+        self._etc_min_depth = etc_min_depth
+        self._shallow_min_depth = shallow_min_depth
+        # Multi-ProbCut（_prepare_search で盤面サイズが合うときだけ _probcut に置く）
+        self._probcut_table = probcut
+        self._probcut_t = probcut_t
+        self._probcut: Optional[ProbCutTable] = None
+
+        # PVS・アスピレーション窓・終盤ソルバー
+        self._use_pvs = use_pvs
+        self._use_aspiration = use_aspiration
+        self._aspiration_window = aspiration_window
+        self._solver_empties = solver_empties
+        self._solver_wld_empties = solver_wld_empties
+        # ルート分割（ワーカーは HEURISTIC で作り直すので、それ以外の評価関数では使わない）
+        self._root_workers = root_workers if self._leaf_evaluator is HEURISTIC else 1
+        self._split: Optional[RootSplitPool] = None
+
+        # 時間管理（ノード数の上限は制限なしなら無限大）
+        self._deadline: float = 0
+        self._nodes_checked: int = 0
+        self._node_limit: float = math.inf if node_limit is None else node_limit
+        # TT の値だけで枝を打ち切った回数（ETC を含む）と、βカットの回数・
+        # そのうち最初に調べた手でカットした回数（SearchStats 用）
+        self._tt_cutoffs = 0
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+        self._probcut_cuts = 0
+        # 直前のルート探索の評価値と、直前の play で完了した最大深さ
+        self._root_score = 0.0
+        self._last_depth = 0
+
+    def _initialize_zobrist(self, n: int) -> None:
+        """Zobrist ハッシュテーブルを用意する（zobrist.py の共有表）。"""
+        if not self._zobrist:
+            self._zobrist = zobrist_table(n)
+
+    def _compute_initial_hash(self, board: list[list[int]], n: int) -> int:
+        """盤面から初期ハッシュを計算。"""
+        self._initialize_zobrist(n)
+        return compute_hash(board, n)
+
+    def _update_hash(
+        self,
+        h: int,
+        move: tuple[int, int],
+        flips: list[tuple[int, int]],
+        turn: int,
+    ) -> int:
+        """着手によるハッシュ更新（XOR で計算）。
+
+        Args:
+            h: 現在のハッシュ値。
+            move: 着手位置。
+            flips: 反転する石のリスト。
+            turn: 着手プレイヤー。
+
+        Returns:
+            更新後のハッシュ値。
+        """
+        return update_hash(h, self._zobrist, move, flips, turn)
+
+    def _tt_lookup(
+        self, h: int, turn: int, depth: int, alpha: float, beta: float
+    ) -> tuple[Optional[float], Optional[tuple[int, int]]]:
+        """盤面ハッシュ h・手番 turn の局面で TT を引き、(カットに使える値, 最善手) を返す。
+
+        値はエントリが depth 以上の深さで、境界種別が窓 (alpha, beta) に
+        対して確定している場合のみ返す（それ以外は None）。
+        最善手は深さに関係なく、エントリがあれば手の並べ替え用に返す。
+        TT を使わない設定では常に (None, None)。
+        """
+        tt = self._tt
+        if tt is None:
+            return None, None
+        key = _tt_key(h, turn)
+        slot = tt.probe(key)
+        if slot < 0:
+            return None, None
+        move, entry_depth, bound, v = tt.moves[slot], tt.depths[slot], tt.bounds[slot], tt.values[slot]
+        if tt.checked and not tt.verify(slot, key, v, move, entry_depth, bound):
+            return None, None
+
+        best_move = None if move == NO_MOVE else divmod(move, self._n)
+        if entry_depth < depth:
+            return None, best_move
+
+        if bound == EXACT:
+            return v, best_move
+        if bound == LOWERBOUND and v >= beta:
+            return v, best_move
+        if bound == UPPERBOUND and v <= alpha:
+            return v, best_move
+
+        return None, best_move
+
+    def _tt_store(
+        self,
+        h: int,
+        turn: int,
+        depth: int,
+        value: float,
+        bound: int,
+        best_move: Optional[tuple[int, int]] = None,
+    ) -> None:
+        """盤面ハッシュ h・手番 turn の局面のエントリを TT に書き込み（TT なしなら何もしない）。"""
+        if self._tt is None:
+            return
+        move = NO_MOVE if best_move is None else best_move[0] * self._n + best_move[1]
+        self._tt.store(_tt_key(h, turn), depth, bound, value, move)
+
+    def _tt_stats(self) -> TTStats:
+        """TT の利用統計（TT なしならすべて 0）。"""
+        return _NO_TT_STATS if self._tt is None else self._tt.stats
+
+    def _time_exceeded(self) -> bool:
+        """思考時間が超過したか（停止イベントがあれば、止められたか）確認。"""
+        if self._stop_event is not None and self._stop_event.is_set():
+            return True
+        return time.monotonic() >= self._deadline
+
+    def _limit_exceeded(self) -> bool:
+        """ノード数の上限か思考時間を超えたか確認。"""
+        return self._nodes_checked >= self._node_limit or self._time_exceeded()
+
+    def _evaluate(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        endgame: bool,
+    ) -> float:
+        """盤面を手番 turn 側から見て評価。
+
+        終局と、空きマスが endgame_empties 以下の葉は差分更新済みの石差で、
+        それ以外は評価関数（LeafEvaluator）で評価する。
+        """
+        state = self._state
+        if endgame or state.empties <= self._endgame_empties:
+            return turn * state.disc * _TERMINAL_SCALE
+        return self._leaf_evaluator.evaluate(board, n, turn, state, self._helpers)
+
+    def _order_moves(
+        self,
+        moves: list[tuple[int, int]],
+        ply: int,
+        turn: int,
+        tt_best: Optional[tuple[int, int]],
+        prev: int = NO_MOVE,
+    ) -> None:
+        """moves を有望な順に並べ替える（TT の最善手、手順付けがあれば Killer などの順）。
+
+        weight_ordering なら先に位置重みの高い順に並べる（sort は安定なので、
+        手順付けで同順位の手はこの順のまま残る）。
+        """
+        weights = self._weights
+        if weights is not None:
+            moves.sort(key=lambda move: weights[move[0]][move[1]], reverse=True)
+        ordering = self._ordering
+        if ordering is not None:
+            moves.sort(key=ordering.sort_key(ply, turn, tt_best, prev), reverse=True)
+        elif tt_best is not None and tt_best in moves:
+            moves.remove(tt_best)
+            moves.insert(0, tt_best)
+
+    def _negamax(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        depth: int,
+        alpha: float,
+        beta: float,
+        h: int,
+        passed: bool,
+        ply: int = 0,
+        prev: int = NO_MOVE,
+    ) -> tuple[float, Optional[tuple[int, int]]]:
+        """αβ枝刈り negamax（PVS）+ TT + ETC + Killer / History / カウンター手。
+
+        ply は探索開始からの手数、prev は相手の直前の手のマス番号
+        （row * n + col。パスなら NO_MOVE）で、手順付けに使う。
+
+        Returns:
+            (評価値, 最善手)のタプル。
+        """
+        # 深さ 0 の葉は TT ではなく評価キャッシュに置き、TT の枠を内部ノードに残す
+        cache = self._eval_cache
+        if depth == 0 and cache is not None:
+            value = cache.probe(h, turn)
+            if value is None:
+                value = self._evaluate(board, n, turn, endgame=False)
+                cache.store(h, turn, value)
+            return (value, None)
+
+        # TT ルックアップ
+        tt_value, tt_best = self._tt_lookup(h, turn, depth, alpha, beta)
+        if tt_value is not None:
+            self._tt_cutoffs += 1
+            return (tt_value, tt_best)
+
+        # 深さ 0
+        if depth == 0:
+            value = self._evaluate(board, n, turn, endgame=False)
+            self._tt_store(h, turn, depth, value, EXACT)
+            return (value, None)
+
+        # 合法手取得
+        moves = self._helpers.valid_moves(board, n, turn)
+
+        # パス処理
+        if not moves:
+            if passed:
+                value = self._evaluate(board, n, turn, endgame=True)
+                self._tt_store(h, turn, depth, value, EXACT)
+                return (value, None)
+
+            value, _ = self._negamax(board, n, -turn, depth, -beta, -alpha, h, True, ply + 1)
+            value = -value
+            # 子の値は窓 (alpha, beta) の外なら fail-soft の境界値
+            if value >= beta:
+                bound = LOWERBOUND
+            elif value <= alpha:
+                bound = UPPERBOUND
+            else:
+                bound = EXACT
+            self._tt_store(h, turn, depth, value, bound)
+            return (value, None)
+
+        # Multi-ProbCut（葉が終盤の評価に切り替わらない中盤のノードだけ）
+        probcut = self._probcut
+        if (
+            probcut is not None
+            and depth >= probcut.min_depth
+            and self._state.empties - depth > self._endgame_empties
+        ):
+            cut = self._probcut_search(board, n, turn, depth, alpha, beta, h, probcut, ply, prev)
+            if cut is not None:
+                return (cut, None)
+
+        # ETC: 子局面の TT だけでβカットできるなら探索しない
+        if depth >= self._etc_min_depth > 0:
+            cutoff = self._enhanced_cutoff(board, n, turn, depth, beta, h, moves)
+            if cutoff is not None:
+                self._tt_cutoffs += 1
+                return cutoff
+
+        # 手のオーダリング
+        if tt_best is None and depth >= self._shallow_min_depth > 0:
+            moves = self._shallow_order(board, n, turn, depth, h, moves, ply)
+        else:
+            self._order_moves(moves, ply, turn, tt_best, prev)
+
+        # αβ探索
+        orig_alpha = alpha
+        best_value = -float('inf')
+        best_move = None
+        ordering = self._ordering
+
+        for i, move in enumerate(moves):
+            # 時間チェック（_NODES_PER_TIME_CHECK ノードごと）
+            self._nodes_checked += 1
+            if self._nodes_checked % _NODES_PER_TIME_CHECK == 0:
+                if self._limit_exceeded():
+                    raise _SearchTimeout()
+
+            flips = self._helpers.flips_for_move(board, n, move[0], move[1], turn)
+            _apply(board, move, flips, turn, self._state)
+            value = self._search_child(
+                board, n, turn, depth, alpha, beta, self._update_hash(h, move, flips, turn),
+                i == 0, ply + 1, move[0] * n + move[1],
+            )
+            _undo(board, move, flips, turn, self._state)
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+
+            alpha = max(alpha, best_value)
+            if alpha >= beta:
+                self._cutoffs += 1
+                if i == 0:
+                    self._first_move_cutoffs += 1
+                if ordering is not None:
+                    ordering.record_cutoff(move, ply, turn, depth, prev)
+                break
+
+        # TT 書き込み
+        if best_value >= beta:
+            bound = LOWERBOUND
+        elif best_value <= orig_alpha:
+            bound = UPPERBOUND
+        else:
+            bound = EXACT
+
+        self._tt_store(h, turn, depth, best_value, bound, best_move)
+
+        return (best_value, best_move)
+
+    def _search_child(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        depth: int,
+        alpha: float,
+        beta: float,
+        h: int,
+        first: bool,
+        ply: int = 1,
+        prev: int = NO_MOVE,
+    ) -> float:
+        """着手済みの子局面（ハッシュ h）を探索し、親（turn 側）から見た評価値を返す。
+
+        use_pvs なら、先頭以外の手はまずヌルウィンドウ (alpha, alpha + 1) で
+        「alpha を超えるか」だけを調べ、超えた（かつ beta 未満の）場合に限り
+        窓 (alpha, beta) で再探索する。
+
+        Args:
+            board: 着手適用後の盤面。
+            n: 盤面サイズ。
+            turn: 着手した側（親局面の手番）。
+            depth: 親局面の残り探索深さ。
+            alpha: 親局面のアルファ値。
+            beta: 親局面のベータ値。
+            h: 子局面の盤面ハッシュ。
+            first: 親局面で最初に調べる手か。
+            ply: 子局面の探索開始からの手数（手順付け用）。
+            prev: 親局面で指した手のマス番号（row * n + col。手順付け用）。
+
+        Returns:
+            親の手番側から見た評価値。
+        """
+        if first or not self._use_pvs:
+            value, _ = self._negamax(board, n, -turn, depth - 1, -beta, -alpha, h, False, ply, prev)
+            return -value
+        value, _ = self._negamax(
+            board, n, -turn, depth - 1, -alpha - 1, -alpha, h, False, ply, prev
+        )
+        if alpha < -value < beta:
+            value, _ = self._negamax(
+                board, n, -turn, depth - 1, -beta, -alpha, h, False, ply, prev
+            )
+        return -value
+
+    def _probcut_search(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        depth: int,
+        alpha: float,
+        beta: float,
+        h: int,
+        probcut: ProbCutTable,
+        ply: int,
+        prev: int,
+    ) -> Optional[float]:
+        """浅い探索で深さ depth の結果が窓の外と予測できれば、その境界値を返す。
+
+        予測による値なので TT には書かない（浅い探索の結果は TT に残る）。
+
+        Returns:
+            beta（fail-high と予測）/ alpha（fail-low と予測）、または None。
+        """
+        t = self._probcut_t
+        for pair in probcut.checks(depth, self._state.empties):
+            if beta < math.inf:
+                bound = pair.high_bound(beta, t)
+                value, _ = self._negamax(
+                    board, n, turn, pair.shallow, bound - 1, bound, h, False, ply, prev
+                )
+                if value >= bound:
+                    self._probcut_cuts += 1
+                    return beta
+            if alpha > -math.inf:
+                bound = pair.low_bound(alpha, t)
+                value, _ = self._negamax(
+                    board, n, turn, pair.shallow, bound, bound + 1, h, False, ply, prev
+                )
+                if value <= bound:
+                    self._probcut_cuts += 1
+                    return alpha
+        return None
+
+    def _enhanced_cutoff(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        depth: int,
+        beta: float,
+        h: int,
+        moves: list[tuple[int, int]],
+    ) -> Optional[tuple[float, tuple[int, int]]]:
+        """Enhanced Transposition Cutoff: 子局面の TT エントリでβカットを探す。
+
+        残り深さ depth - 1 以上の子のエントリが上界（EXACT / UPPERBOUND）u を持ち、
+        -u >= beta なら、その手だけでこの局面はβカットする。
+
+        Returns:
+            カットできれば (評価値, 手)、できなければ None。
+        """
+        tt = self._tt
+        if tt is None:
+            return None
+        for move in moves:
+            flips = self._helpers.flips_for_move(board, n, move[0], move[1], turn)
+            key = _tt_key(self._update_hash(h, move, flips, turn), -turn)
+            slot = tt.probe(key)
+            if slot < 0:
+                continue
+            entry_depth, bound, value = tt.depths[slot], tt.bounds[slot], -tt.values[slot]
+            if tt.checked and not tt.verify(slot, key, -value, tt.moves[slot], entry_depth, bound):
+                continue
+            if entry_depth < depth - 1 or bound == LOWERBOUND:
+                continue
+            if value >= beta:
+                self._tt_store(h, turn, depth, value, LOWERBOUND, move)
+                return (value, move)
+        return None
+
+    def _shallow_order(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        depth: int,
+        h: int,
+        moves: list[tuple[int, int]],
+        ply: int,
+    ) -> list[tuple[int, int]]:
+        """各手を浅い深さ（depth // _SHALLOW_DEPTH_DIVISOR）で探索し、評価値の高い順に並べる。
+
+        TT の最善手がない深いノードで使う。浅い探索の結果は TT にも残る。
+        """
+        shallow = max(1, depth // _SHALLOW_DEPTH_DIVISOR)
+        inf = float('inf')
+        scored = []
+        for move in moves:
+            flips = self._helpers.flips_for_move(board, n, move[0], move[1], turn)
+            _apply(board, move, flips, turn, self._state)
+            h_new = self._update_hash(h, move, flips, turn)
+            value, _ = self._negamax(
+                board, n, -turn, shallow - 1, -inf, inf, h_new, False,
+                ply + 1, move[0] * n + move[1],
+            )
+            _undo(board, move, flips, turn, self._state)
+            scored.append((-value, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def _prepare_search(self, n: int, generation: Optional[int] = None) -> None:
+        """探索開始前に TT・Killer・History・位置重み・ProbCut を今回の手向けに整える。
+
+        TT のエントリは局面（盤面全体と手番）に対する結果なので、同じ
+        盤面サイズなら前の手・前の対局のものもそのまま正しい。持ち越す場合は
+        世代を進めて置換の優先度だけ下げ、History は減衰させて残す
+        （Killer は ply で引くため毎回捨てる）。盤面サイズが変わったときは Zobrist 表ごと作り直す。
+
+        Args:
+            n: 盤面サイズ。
+            generation: Lazy SMP のヘルパーとして探索する場合の、メイン側 TT の
+                世代。共有 TT のクリアや世代の更新はメインに任せ、世代を合わせるだけにする。
+        """
+        ordering = self._ordering
+        tt = self._tt
+        if generation is not None:
+            if n != self._n:
+                self._zobrist = ()
+                self._n = n
+            if tt is not None:
+                tt.generation = generation
+            if ordering is not None:
+                ordering.resize(n)
+        elif n != self._n:
+            self._zobrist = ()
+            self._n = n
+            if tt is not None:
+                tt.clear()
+            if ordering is not None:
+                ordering.resize(n)
+        elif self._keep_tt:
+            if tt is not None:
+                tt.new_search()
+            if ordering is not None:
+                ordering.new_search(_HISTORY_DECAY_SHIFT)
+        else:
+            if tt is not None:
+                tt.clear()
+            if ordering is not None:
+                ordering.new_search(None)
+        self._weights = _build_weight_table(n) if self._weight_ordering else None
+        table = self._probcut_table
+        self._probcut = table if table is not None and table.board_size == n else None
+        # 評価キャッシュの中身は局面だけで決まるので持ち越し、統計だけ手ごとに数える
+        if self._eval_cache is not None:
+            self._eval_cache.reset_stats()
+
+    def _iterative_deepening(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        first_depth: int = 1,
+        timer: Optional[MoveTimer] = None,
+    ) -> Optional[tuple[int, int]]:
+        """深さ first_depth から時間切れまで反復深化し、最後に完了した深さの最善手を返す。
+
+        各深さは前の深さの最善手から調べ、use_aspiration なら（ルート分割を使わない場合）
+        前の深さの評価値を中心とした窓で始める。空きマス数の深さまで読めば終局まで
+        読み切っているので止める。timer を渡すと、各深さの後で timer.should_stop() なら
+        次の深さを始めない。
+        """
+        h = self._compute_initial_hash(board, n)
+        self._state = _EvalState(board, n)
+        aspiration = self._use_aspiration and self._root_workers <= 1
+
+        best_move = None
+        value: Optional[float] = None
+        for d in range(first_depth, min(self._max_depth, self._state.empties) + 1):
+            try:
+                if aspiration and value is not None:
+                    value, move = self._aspiration_search(board, n, turn, d, h, best_move, value)
+                else:
+                    value, move = self._search_root(board, n, turn, d, h, pv=best_move)
+                if move is not None:
+                    best_move = move
+            except _SearchTimeout:
+                break
+            self._last_depth = d
+            if timer is not None:
+                timer.iteration_done(best_move, value)
+                if timer.should_stop():
+                    break
+
+        return best_move
+
+    def _aspiration_search(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        depth: int,
+        h: int,
+        pv: Optional[tuple[int, int]],
+        previous: float,
+    ) -> tuple[float, Optional[tuple[int, int]]]:
+        """前の深さの評価値 previous を中心とした窓で深さ depth のルートを探索する。
+
+        評価値が窓の外（fail-low / fail-high）なら、外れた側の窓を広げて
+        再探索する。_ASPIRATION_MAX_RETRIES 回を超えて外れた側は無限に開くため、
+        最終的には通常の窓と同じ最善手・評価値が得られる。
+
+        Returns:
+            (評価値, 最善手)。
+        """
+        delta = self._aspiration_window
+        alpha, beta = previous - delta, previous + delta
+        low_fails = high_fails = 0
+        while True:
+            value, move = self._search_root(board, n, turn, depth, h, alpha=alpha, beta=beta, pv=pv)
+            delta *= _ASPIRATION_GROWTH
+            if value <= alpha:
+                low_fails += 1
+                alpha = -math.inf if low_fails > _ASPIRATION_MAX_RETRIES else value - delta
+            elif value >= beta:
+                high_fails += 1
+                beta = math.inf if high_fails > _ASPIRATION_MAX_RETRIES else value + delta
+                pv = move  # fail-high させた手は有望なので次も先に読む
+            else:
+                return value, move
+
+    def _search_root(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        depth: int,
+        h: int,
+        alpha: float = -math.inf,
+        beta: float = math.inf,
+        pv: Optional[tuple[int, int]] = None,
+    ) -> tuple[float, Optional[tuple[int, int]]]:
+        """ルート局面を深さ depth・窓 (alpha, beta) で探索し、(評価値, 最善手) を返す。
+
+        手は pv（前の深さの最善手。なければ TT の最善手）を先頭に、手順付けの順で調べる。
+        窓の外に出た場合の評価値は fail-soft の境界値（fail-low なら上界、fail-high なら下界）。
+        ルート分割を使う設定で深さ _SPLIT_MIN_DEPTH 以上の全窓の探索なら、先頭以外の手を
+        ワーカーに分ける。評価値は self._root_score にも残す。
+        """
+        moves = self._helpers.valid_moves(board, n, turn)
+        if not moves:
+            # ルートでパス（ポンダーなど）。深さを消費せず手番を渡す
+            value, _ = self._negamax(board, n, turn, depth, alpha, beta, h, False)
+            self._root_score = value
+            return value, None
+        _, tt_best = self._tt_lookup(h, turn, depth, alpha, beta)
+        self._order_moves(moves, 0, turn, tt_best if pv is None else pv)
+
+        orig_alpha = alpha
+        if (
+            self._root_workers > 1
+            and depth >= _SPLIT_MIN_DEPTH
+            and len(moves) > 1
+            and alpha == -math.inf
+            and beta == math.inf
+        ):
+            best_value, best_move = self._search_root_split(board, n, turn, depth, h, moves)
+        else:
+            best_value = -math.inf
+            best_move = moves[0]
+            for i, move in enumerate(moves):
+                self._nodes_checked += 1
+                if self._nodes_checked % _NODES_PER_TIME_CHECK == 0:
+                    if self._limit_exceeded():
+                        raise _SearchTimeout()
+                flips = self._helpers.flips_for_move(board, n, move[0], move[1], turn)
+                _apply(board, move, flips, turn, self._state)
+                value = self._search_child(
+                    board, n, turn, depth, alpha, beta, self._update_hash(h, move, flips, turn),
+                    i == 0, 1, move[0] * n + move[1],
+                )
+                _undo(board, move, flips, turn, self._state)
+                if value > best_value:
+                    best_value = value
+                    best_move = move
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break  # fail-high（アスピレーション窓の上限超え）
+
+        if best_value >= beta:
+            bound = LOWERBOUND
+        elif best_value <= orig_alpha:
+            bound = UPPERBOUND
+        else:
+            bound = EXACT
+        self._tt_store(h, turn, depth, best_value, bound, best_move)
+        self._root_score = best_value
+        return best_value, best_move
+
+    def _search_root_split(
+        self,
+        board: list[list[int]],
+        n: int,
+        turn: int,
+        depth: int,
+        h: int,
+        moves: list[tuple[int, int]],
+    ) -> tuple[float, tuple[int, int]]:
+        """先頭の手を自プロセスで、残りの手をワーカー（root_split.py）で並列に探索する。
+
+        評価値が最大の手のうち最も前の手を選ぶため、結果は窓 (-inf, inf) の
+        直列探索と一致する（TT なしの場合）。
+
+        Returns:
+            (評価値, 最善手)。
+
+        Raises:
+            _SearchTimeout: 自プロセスかワーカーの探索が時間切れになった場合。
+        """
+        move = moves[0]
+        self._nodes_checked += 1
+        flips = self._helpers.flips_for_move(board, n, move[0], move[1], turn)
+        _apply(board, move, flips, turn, self._state)
+        best_value = self._search_child(
+            board, n, turn, depth, -math.inf, math.inf, self._update_hash(h, move, flips, turn),
+            True, 1, move[0] * n + move[1],
+        )
+        _undo(board, move, flips, turn, self._state)
+        best_move = move
+
+        if self._split is None:
+            self._split = RootSplitPool(self._root_workers)
+        ordering = self._ordering
+        worker_kwargs: dict[str, Any] = {
+            "endgame_empties": self._endgame_empties,
+            "use_bitboard": self._use_bitboard,
+            "tt_size_mb": 0,
+            "move_ordering": ordering is not None,
+            "use_history": ordering is not None and ordering.use_history,
+            "weight_ordering": self._weight_ordering,
+            "use_pvs": self._use_pvs,
+            "probcut": self._probcut,
+            "probcut_t": self._probcut_t,
+        }
+        rest = [
+            (move, self._helpers.flips_for_move(board, n, move[0], move[1], turn))
+            for move in moves[1:]
+        ]
+        results = self._split.search(
+            worker_kwargs, board, turn, rest, depth, self._deadline, best_value
+        )
+        for (move, _), result in zip(rest, results):
+            self._nodes_checked += result.nodes
+            # 上界で返った手は確定した最善値より真に小さいので、厳密な比較で足りる
+            if result.score > best_value:
+                best_value = result.score
+                best_move = move
+        return best_value, best_move
+
+    def _solve_endgame(
+        self, board: list[list[int]], turn: int, empties: int
+    ) -> Optional[tuple[int, int]]:
+        """思考時間とノード数の _SOLVER_BUDGET を使って終盤ソルバーで読み切り、最善手を返す。
+
+        空きが solver_empties 以下なら最終石差、それより多ければ勝敗だけを読む。
+        時間切れなら None（呼び出し側が残りの時間で反復深化する）。ルートで
+        読み終えた手の中の最善手は、まだ読んでいない手の方が良いかもしれないので使わない。
+
+        Args:
+            board: 8x8 盤面。
+            turn: 手番。
+            empties: 空きマス数。
+
+        Returns:
+            最善手、または None。
+        """
+        player, opponent = bitboard.from_board(board, turn)
+        now = time.monotonic()
+        deadline = now + (self._deadline - now) * _SOLVER_BUDGET
+        node_limit = (
+            None if self._node_limit == math.inf else int(self._node_limit * _SOLVER_BUDGET)
+        )
+        solver = EndgameSolver(deadline, node_limit)
+        try:
+            result = solver.solve(player, opponent, wld=empties > self._solver_empties)
+        except EndgameTimeout:
+            self._nodes_checked = solver.nodes
+            return None
+        self._nodes_checked = result.nodes
+        self._last_depth = empties
+        self._root_score = float(result.score * _TERMINAL_SCALE)
+        if result.move is None:
+            return None
+        return divmod(result.move, bitboard.SIZE)
+
+    def close(self) -> None:
+        """ルート分割のワーカーを終了させる（起動していなければ何もしない）。"""
+        if self._split is not None:
+            self._split.close()
+            self._split = None
+
+    def play(
+        self, game: "Game", time_manager: Optional[TimeManager] = None
+    ) -> Optional[tuple[int, int]]:
+        """与えられたゲーム状態で最善手を返す。
+
+        Args:
+            game: 現在のゲーム状態。
+            time_manager: この手で使う持ち時間（省略時はコンストラクタの
+                time_manager、どちらもなければ time_limit_ms 固定）。
+
+        Returns:
+            (row, col) のタプル、または合法手がない場合は None。
+        """
+        valid_moves = game.get_valid_moves()
+        if not valid_moves:
+            return None
+        self._before_play()
+
+        board = [row[:] for row in game.board.board]
+        empties = sum(row.count(0) for row in board)
+        clock = self.time_manager if time_manager is None else time_manager
+        timer = start_timer(clock, self._time_limit_ms, empties, len(valid_moves))
+        tt_before = self._tt_stats()
+        try:
+            if len(valid_moves) == 1:
+                self._reset_counters(timer)
+                move: Optional[tuple[int, int]] = valid_moves[0]  # 有効な手が 1 つなら探索不要
+            else:
+                move = self._play(board, game.turn, timer)
+        finally:
+            finish_timer(clock, timer)
+        if move is None:
+            move = valid_moves[0]  # 深さ 1 も読み終えないうちに打ち切った
+        # 時間切れで打ち切った探索は board を着手途中のまま残すので、読み筋は元の盤面からたどる
+        self.last_stats = self._search_stats(
+            game.board.board, game.turn, move, timer.elapsed_ms(), tt_before
+        )
+        return move
+
+    def _before_play(self) -> None:
+        """play の思考時間を測り始める前の準備（サブクラスがプロセスの起動などに使う）。"""
+
+    def analyze(
+        self, game: "Game", k: int = 1, time_manager: Optional[TimeManager] = None
+    ) -> list[MoveAnalysis]:
+        """反復深化で上位 k 手を正確な評価値付きで求める（analysis.py 参照）。
+
+        play と同じ時間・深さ・ノード数の上限で、TT を play と共有して探索し、
+        最後に完了した深さの結果を返す。終盤ソルバー・アスピレーション窓・
+        ルート分割・Lazy SMP のヘルパーは使わない。
+
+        Args:
+            game: 現在のゲーム状態。
+            k: 評価値を求める上位の手の数。合法手の数以上ならすべての手。
+            time_manager: この解析で使う持ち時間（play と同じ）。
+
+        Returns:
+            評価値の高い順の MoveAnalysis のリスト（最大 k 個。読み筋は TT からたどる）。
+            合法手がないか、深さ 1 も完了しなかった場合は空。
+
+        Raises:
+            ValueError: k が 1 未満の場合。
+        """
+        if k < 1:
+            raise ValueError(f"k must be positive: {k}")
+        valid_moves = game.get_valid_moves()
+        if not valid_moves:
+            return []
+
+        board = [row[:] for row in game.board.board]
+        empties = sum(row.count(0) for row in board)
+        clock = self.time_manager if time_manager is None else time_manager
+        timer = start_timer(clock, self._time_limit_ms, empties, len(valid_moves))
+        tt_before = self._tt_stats()
+        try:
+            ranked = self._analyze(board, game.turn, empties, k, timer)
+        finally:
+            finish_timer(clock, timer)
+        best = ranked[0][0] if ranked else None
+        self.last_stats = self._search_stats(
+            game.board.board, game.turn, best, timer.elapsed_ms(), tt_before
+        )
+        return [
+            MoveAnalysis(move, score, self._principal_variation(
+                game.board.board, game.turn, move, self._last_depth
+            ))
+            for move, score in ranked
+        ]
+
+    def _search_stats(
+        self,
+        board: list[list[int]],
+        turn: int,
+        move: Optional[tuple[int, int]],
+        elapsed_ms: float,
+        tt_before: TTStats,
+    ) -> SearchStats:
+        """直前の探索の SearchStats を作る（ノード数は Lazy SMP のヘルパーの分も含む）。"""
+        tt_after = self._tt_stats()
+        cache = self._eval_cache.stats if self._eval_cache is not None else None
+        nodes = self._nodes_checked + sum(result.nodes for result in self._helper_results)
+        return SearchStats(
+            nodes=nodes,
+            elapsed_ms=elapsed_ms,
+            depth=self._last_depth,
+            tt_probes=tt_after.probes - tt_before.probes,
+            tt_hits=tt_after.hits - tt_before.hits,
+            tt_cutoffs=self._tt_cutoffs,
+            cutoffs=self._cutoffs,
+            first_move_cutoffs=self._first_move_cutoffs,
+            probcut_cuts=self._probcut_cuts,
+            eval_probes=cache.probes if cache else 0,
+            eval_hits=cache.hits if cache else 0,
+            pv=self._principal_variation(board, turn, move, self._last_depth),
+        )
+
+    def _principal_variation(
+        self,
+        board: list[list[int]],
+        turn: int,
+        move: Optional[tuple[int, int]],
+        max_len: int,
+    ) -> tuple[tuple[int, int], ...]:
+        """move から始めて、TT の最善手をたどった読み筋を返す（board は変更しない）。
+
+        TT に最善手のない局面（パスや葉を含む）と、合法でない手（ハッシュ衝突や
+        置換による）で止める。TT を使わない設定では move だけ。
+        """
+        if move is None:
+            return ()
+        tt = self._tt
+        if tt is None:
+            return (move,)
+        n = len(board)
+        work = [row[:] for row in board]
+        h = self._compute_initial_hash(work, n)
+        pv: list[tuple[int, int]] = []
+        while move is not None and len(pv) < max(max_len, 1):
+            flips = self._helpers.flips_for_move(work, n, move[0], move[1], turn)
+            if not flips:
+                break
+            _apply(work, move, flips, turn)
+            h = self._update_hash(h, move, flips, turn)
+            pv.append(move)
+            turn = -turn
+            slot = tt.probe(_tt_key(h, turn))
+            move = None if slot < 0 or tt.moves[slot] == NO_MOVE else divmod(tt.moves[slot], n)
+        return tuple(pv)
+
+    def _play(
+        self, board: list[list[int]], turn: int, timer: MoveTimer
+    ) -> Optional[tuple[int, int]]:
+        """timer の時間内で反復深化し、最後に完了した深さの最善手を返す。
+
+        8x8 盤面で空きマスが solver_empties / solver_wld_empties 以下なら、
+        先に終盤ソルバーで読み切る（読み切れなければ残りの時間で反復深化する）。
+        """
+        self._reset_counters(timer)
+        n = len(board)
+        self._prepare_search(n)
+        self._helpers = _move_helpers(n, self._use_bitboard)
+        empties = sum(row.count(0) for row in board)
+        if n == bitboard.SIZE and empties <= max(self._solver_empties, self._solver_wld_empties):
+            move = self._solve_endgame(board, turn, empties)
+            if move is not None:
+                return move
+        return self._iterative_deepening(board, n, turn, timer=timer)
+
+    def _analyze(
+        self, board: list[list[int]], turn: int, empties: int, k: int, timer: MoveTimer
+    ) -> list[tuple[tuple[int, int], float]]:
+        """timer の時間内で反復深化し、最後に完了した深さの上位 k 手と評価値を返す。
+
+        各深さではルートの手を前の深さの評価値の高い順に multipv_search で探索する
+        （最初の深さは TT の最善手と手順付けの順）。時間切れの探索は board を
+        着手途中のまま残すので、board は呼び出し側の複製を渡す。
+        """
+        self._reset_counters(timer)
+        n = len(board)
+        self._prepare_search(n)
+        self._helpers = _move_helpers(n, self._use_bitboard)
+        h = self._compute_initial_hash(board, n)
+        self._state = _EvalState(board, n)
+
+        moves = self._helpers.valid_moves(board, n, turn)
+        _, tt_best = self._tt_lookup(h, turn, 0, -math.inf, math.inf)
+        self._order_moves(moves, 0, turn, tt_best)
+
+        def search(move: tuple[int, int], alpha: float) -> float:
+            self._nodes_checked += 1
+            flips = self._helpers.flips_for_move(board, n, move[0], move[1], turn)
+            _apply(board, move, flips, turn, self._state)
+            value = self._search_child(
+                board, n, turn, depth, alpha, math.inf, self._update_hash(h, move, flips, turn),
+                alpha == -math.inf, 1, move[0] * n + move[1],
+            )
+            _undo(board, move, flips, turn, self._state)
+            return value
+
+        ranked: list[tuple[tuple[int, int], float]] = []
+        for depth in range(1, min(self._max_depth, empties) + 1):
+            try:
+                result = multipv_search(moves, k, search)
+            except _SearchTimeout:
+                break
+            ranked = result[:k]
+            moves = [move for move, _ in result]
+            self._last_depth = depth
+            timer.iteration_done(moves[0], result[0][1])
+            if timer.should_stop():
+                break
+        return ranked
+
+    def _reset_counters(self, timer: MoveTimer) -> None:
+        """探索を始める前に、締め切りと SearchStats 用の数を今回の手向けに戻す。"""
+        self._deadline = timer.deadline
+        self._nodes_checked = 0
+        self._tt_cutoffs = 0
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+        self._probcut_cuts = 0
+        self._last_depth = 0
+        self._helper_results = []
@@ -0,0 +1,433 @@
+"""探索エージェント共通の部品（リスト盤面の着手生成・make / unmake・評価関数）。
+
+SearchCore 系のエージェント・定石・MCTS などが共有する。
+盤面は list[list[int]]（1=白, -1=黒, 0=空き）で、8x8 ならビットボード
+カーネル（bitboard.py）に切り替えられる着手生成ヘルパー（_MoveHelpers）を持つ。
+既定の葉の評価関数 HEURISTIC（_evaluate）もここに置く。
+"""
+from functools import lru_cache
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from . import bitboard
+from .zobrist import ZobristTable, compute_hash, update_hash, zobrist_table
+
+
+# マスの役割ごとの重み
+_WEIGHT_CORNER = 100   # 角
+_WEIGHT_X = -50        # X マス（角の斜め隣）
+_WEIGHT_C = -20        # C マス（角の縦横隣）
+_WEIGHT_EDGE = 10      # その他の辺
+_WEIGHT_INNER = -2     # 辺の 1 つ内側
+_WEIGHT_CENTER = 0     # 中央部
+
+# 8 方向の走査ベクトル
+_DIRECTIONS = (
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1), (0, 1),
+    (1, -1), (1, 0), (1, 1),
+)
+
+
+def _flips_for_move(
+    board: List[List[int]], n: int, row: int, col: int, turn: int
+) -> List[Tuple[int, int]]:
+    """着手 (row, col) で反転する石のリストを返す（空なら不合法手）。
+
+    board.py の Board._get_flipped_in_direction と同じ走査ロジックを
+    探索用に関数化したもの。Board クラスは変更しない。
+
+    Args:
+        board: 盤面（0=空, 1=白, -1=黒）。
+        n: 盤面サイズ。
+        row: 着手行。
+        col: 着手列。
+        turn: プレイヤー（1=白, -1=黒）。
+
+    Returns:
+        反転する石の座標リスト（着手が不合法なら空リスト）。
+    """
+    if board[row][col] != 0:
+        return []
+    flips: List[Tuple[int, int]] = []
+    for dr, dc in _DIRECTIONS:
+        line: List[Tuple[int, int]] = []
+        r, c = row + dr, col + dc
+        while 0 <= r < n and 0 <= c < n:
+            v = board[r][c]
+            if v == 0:
+                break
+            if v == turn:
+                flips.extend(line)
+                break
+            line.append((r, c))
+            r += dr
+            c += dc
+    return flips
+
+
+def _valid_moves(board: List[List[int]], n: int, turn: int) -> List[Tuple[int, int]]:
+    """turn 側の合法手を row-major 順で返す。
+
+    Args:
+        board: 盤面（0=空, 1=白, -1=黒）。
+        n: 盤面サイズ。
+        turn: プレイヤー（1=白, -1=黒）。
+
+    Returns:
+        合法手のリスト（座標のタプル）。
+    """
+    return [
+        (r, c)
+        for r in range(n)
+        for c in range(n)
+        if board[r][c] == 0 and _flips_for_move(board, n, r, c, turn)
+    ]
+
+
+def _apply(
+    board: List[List[int]],
+    move: Tuple[int, int],
+    flips: List[Tuple[int, int]],
+    turn: int,
+    state: Optional["_EvalState"] = None,
+) -> None:
+    """着手を盤面に破壊的に適用する（_undo と対で使う）。
+
+    Args:
+        board: 盤面（破壊的に変更される）。
+        move: 着手（行, 列）。
+        flips: 反転する石の座標リスト。
+        turn: プレイヤー（1=白, -1=黒）。
+        state: 盤面と一緒に差分更新する評価項（省略可）。
+    """
+    board[move[0]][move[1]] = turn
+    for r, c in flips:
+        board[r][c] = turn
+    if state is not None:
+        state.apply(move, flips, turn)
+
+
+def _undo(
+    board: List[List[int]],
+    move: Tuple[int, int],
+    flips: List[Tuple[int, int]],
+    turn: int,
+    state: Optional["_EvalState"] = None,
+) -> None:
+    """_apply の逆操作で盤面を元に戻す。
+
+    Args:
+        board: 盤面（破壊的に変更される）。
+        move: 着手（行, 列）。
+        flips: 反転する石の座標リスト。
+        turn: プレイヤー（1=白, -1=黒）。
+        state: _apply に渡したのと同じ評価項（省略可）。
+    """
+    board[move[0]][move[1]] = 0
+    for r, c in flips:
+        board[r][c] = -turn
+    if state is not None:
+        state.undo(move, flips, turn)
+
+
+def _mobility(board: List[List[int]], n: int, turn: int) -> int:
+    """手番側と相手側の合法手数の差。
+
+    Args:
+        board: 盤面。
+        n: 盤面サイズ。
+        turn: 手番（1=白, -1=黒）。
+
+    Returns:
+        手番側の合法手数 - 相手側の合法手数。
+    """
+    return len(_valid_moves(board, n, turn)) - len(_valid_moves(board, n, -turn))
+
+
+class _MoveHelpers(NamedTuple):
+    """着手生成ヘルパーの組。探索部はこの契約越しに呼び出す。"""
+
+    flips_for_move: Callable[[List[List[int]], int, int, int, int], List[Tuple[int, int]]]
+    valid_moves: Callable[[List[List[int]], int, int], List[Tuple[int, int]]]
+    mobility: Callable[[List[List[int]], int, int], int]
+
+
+_LIST_HELPERS = _MoveHelpers(_flips_for_move, _valid_moves, _mobility)
+_BITBOARD_HELPERS = _MoveHelpers(
+    bitboard.flips_for_move, bitboard.valid_moves, bitboard.mobility
+)
+
+
+def _move_helpers(n: int, use_bitboard: bool) -> _MoveHelpers:
+    """盤面サイズと設定に応じた着手生成ヘルパーを返す。
+
+    ビットボードは 8x8 専用のため、それ以外のサイズではリスト版に戻す。
+
+    Args:
+        n: 盤面サイズ。
+        use_bitboard: ビットボードカーネルを使うか。
+
+    Returns:
+        着手生成ヘルパーの組。
+    """
+    if use_bitboard and n == bitboard.SIZE:
+        return _BITBOARD_HELPERS
+    return _LIST_HELPERS
+
+
+# 終局時の確定スコアの倍率。ヒューリスティック値と桁で確実に区別する
+_TERMINAL_SCALE = 10000
+
+# ゲームフェーズ係数: (位置重み, mobility, 角, 確定石, 石差)
+_PHASE_COEFFS = (
+    (1.0, 8.0, 25.0, 10.0, 0.0),   # 序盤 (fill < 0.33)
+    (1.0, 6.0, 30.0, 15.0, 0.0),   # 中盤 (0.33 <= fill <= 0.70)
+    (0.3, 2.0, 30.0, 20.0, 5.0),   # 終盤 (fill > 0.70)
+)
+_EARLY_FILL = 0.33
+_MID_FILL = 0.70
+
+
+@lru_cache(maxsize=None)
+def _build_weight_table(n: int) -> Tuple[Tuple[int, ...], ...]:
+    """サイズ n の位置重みテーブルをマスの役割から生成する。
+
+    最寄りの辺までの距離 (er, ec) で役割を判定するため、
+    どの盤面サイズでも一貫した 4 回回転対称のテーブルになる。
+
+    Args:
+        n: 盤面サイズ。
+
+    Returns:
+        n x n の重みテーブル（イミュータブルなタプルの入れ子）。
+    """
+    table = [[_WEIGHT_CENTER] * n for _ in range(n)]
+    for r in range(n):
+        for c in range(n):
+            er = min(r, n - 1 - r)
+            ec = min(c, n - 1 - c)
+            if er == 0 and ec == 0:
+                w = _WEIGHT_CORNER
+            elif er == 1 and ec == 1:
+                w = _WEIGHT_X
+            elif {er, ec} == {0, 1}:
+                w = _WEIGHT_C
+            elif er == 0 or ec == 0:
+                w = _WEIGHT_EDGE
+            elif er == 1 or ec == 1:
+                w = _WEIGHT_INNER
+            else:
+                w = _WEIGHT_CENTER
+            table[r][c] = w
+    return tuple(tuple(row) for row in table)
+
+
+class _EvalState:
+    """着手ごとに差分更新する評価項（位置重みの和・石差・空きマス数・角）。
+
+    値はすべて白（1）から見た和で、手番側の値は turn を掛けて得る。
+    _apply / _undo に渡すと盤面と一緒に更新されるため、葉の評価で
+    盤面全体を走査し直す必要がなくなる（mobility だけは葉で数え直す）。
+    hashed なら盤面の Zobrist ハッシュ（zobrist.py）も hash に差分更新する。
+
+    Args:
+        board: 初期化に使う盤面。
+        n: 盤面サイズ。
+        hashed: Zobrist ハッシュも保持するか（評価キャッシュ用）。
+    """
+
+    __slots__ = (
+        "weights", "pos", "disc", "empties", "corners", "_corner_squares", "zobrist", "hash",
+    )
+
+    def __init__(self, board: List[List[int]], n: int, hashed: bool = False) -> None:
+        # 空のタプルはハッシュを保持しないことを表す
+        self.zobrist: ZobristTable = zobrist_table(n) if hashed else ()
+        self.hash = compute_hash(board, n) if hashed else 0
+        weights = _build_weight_table(n)
+        self.weights = weights
+        self.pos = 0
+        self.disc = 0
+        self.empties = 0
+        for r in range(n):
+            for c in range(n):
+                v = board[r][c]
+                if v == 0:
+                    self.empties += 1
+                else:
+                    self.pos += v * weights[r][c]
+                    self.disc += v
+        self._corner_squares = frozenset(
+            (r, c) for r in (0, n - 1) for c in (0, n - 1)
+        )
+        self.corners = sum(board[r][c] for r, c in self._corner_squares)
+
+    def apply(self, move: Tuple[int, int], flips: List[Tuple[int, int]], turn: int) -> None:
+        """着手 move（flips を反転）を評価項に反映する。
+
+        角の石は反転されないため、角の占有は着手したマスだけを見ればよい。
+        """
+        weights = self.weights
+        gain = 0
+        for r, c in flips:
+            gain += weights[r][c]
+        self.pos += turn * (weights[move[0]][move[1]] + 2 * gain)
+        self.disc += turn * (1 + 2 * len(flips))
+        self.empties -= 1
+        if move in self._corner_squares:
+            self.corners += turn
+        if self.zobrist:
+            self.hash = update_hash(self.hash, self.zobrist, move, flips, turn)
+
+    def undo(self, move: Tuple[int, int], flips: List[Tuple[int, int]], turn: int) -> None:
+        """apply の逆操作。"""
+        weights = self.weights
+        gain = 0
+        for r, c in flips:
+            gain += weights[r][c]
+        self.pos -= turn * (weights[move[0]][move[1]] + 2 * gain)
+        self.disc -= turn * (1 + 2 * len(flips))
+        self.empties += 1
+        if move in self._corner_squares:
+            self.corners -= turn
+        if self.zobrist:
+            self.hash = update_hash(self.hash, self.zobrist, move, flips, turn)
+
+
+def _phase_coeffs(board: List[List[int]], n: int) -> Tuple[float, ...]:
+    """盤面の埋まり具合からゲームフェーズの係数組を返す。
+
+    Args:
+        board: 盤面（0=空, 1=白, -1=黒）。
+        n: 盤面サイズ。
+
+    Returns:
+        (位置重み係数, mobility 係数, 角係数, 確定石係数, 石差係数) のタプル。
+    """
+    stones = sum(1 for row in board for v in row if v != 0)
+    return _phase_coeffs_for_stones(stones, n)
+
+
+def _phase_coeffs_for_stones(stones: int, n: int) -> Tuple[float, ...]:
+    """盤上の石数 stones からゲームフェーズの係数組を返す（_phase_coeffs 参照）。"""
+    fill = stones / (n * n)
+    if fill < _EARLY_FILL:
+        return _PHASE_COEFFS[0]
+    if fill <= _MID_FILL:
+        return _PHASE_COEFFS[1]
+    return _PHASE_COEFFS[2]
+
+
+def _stable_edge_count(board: List[List[int]], n: int, color: int) -> int:
+    """各角から辺に沿って連続する color の石を数える（簡易確定石カウント）。
+
+    Args:
+        board: 盤面。
+        n: 盤面サイズ。
+        color: カウント対象の色（1=白, -1=黒）。
+
+    Returns:
+        color の石で確定している数。
+    """
+    stable: set[tuple[int, int]] = set()
+    corners = (
+        (0, 0, (0, 1), (1, 0)),
+        (0, n - 1, (0, -1), (1, 0)),
+        (n - 1, 0, (0, 1), (-1, 0)),
+        (n - 1, n - 1, (0, -1), (-1, 0)),
+    )
+    for r0, c0, d1, d2 in corners:
+        if board[r0][c0] != color:
+            continue
+        for dr, dc in (d1, d2):
+            r, c = r0, c0
+            while 0 <= r < n and 0 <= c < n and board[r][c] == color:
+                stable.add((r, c))
+                r += dr
+                c += dc
+    return len(stable)
+
+
+def _disc_diff(board: List[List[int]], turn: int) -> int:
+    """手番側から見た石差。
+
+    Args:
+        board: 盤面。
+        turn: 手番（1=白, -1=黒）。
+
+    Returns:
+        手番側の石数 - 相手側の石数。
+    """
+    return turn * sum(v for row in board for v in row)
+
+
+def _terminal_score(board: List[List[int]], turn: int) -> float:
+    """終局局面の確定スコア（手番側視点）。
+
+    Args:
+        board: 盤面。
+        turn: 手番（1=白, -1=黒）。
+
+    Returns:
+        手番側視点の終局スコア。
+    """
+    return float(_disc_diff(board, turn) * _TERMINAL_SCALE)
+
+
+def _evaluate(
+    board: List[List[int]],
+    n: int,
+    turn: int,
+    helpers: _MoveHelpers = _LIST_HELPERS,
+    state: Optional[_EvalState] = None,
+) -> float:
+    """手番側から見たヒューリスティック評価値。
+
+    位置重み、着手可能数、角占有、確定石、石差の 5 要素を
+    ゲームフェーズに応じた係数で合成する。
+
+    Args:
+        board: 盤面。
+        n: 盤面サイズ。
+        turn: 手番（1=白, -1=黒）。
+        helpers: mobility 計算に使う着手生成ヘルパー。
+        state: board と同期した差分更新済みの評価項。省略時は盤面を走査して作る。
+
+    Returns:
+        評価値（正=有利, 負=不利）。
+    """
+    if state is None:
+        state = _EvalState(board, n)
+    w_pos, w_mob, w_corner, w_stable, w_disc = _phase_coeffs_for_stones(
+        n * n - state.empties, n
+    )
+    mobility = helpers.mobility(board, n, turn)
+    stable = _stable_edge_count(board, n, turn) - _stable_edge_count(board, n, -turn)
+    return (
+        w_pos * state.pos * turn
+        + w_mob * mobility
+        + w_corner * state.corners * turn
+        + w_stable * stable
+        + w_disc * state.disc * turn
+    )
+
+
+class HeuristicEvaluator:
+    """_evaluate による LeafEvaluator（evaluators.py）。探索エージェントの既定の評価関数。"""
+
+    __slots__ = ()
+
+    def evaluate(
+        self,
+        board: List[List[int]],
+        n: int,
+        turn: int,
+        state: _EvalState,
+        helpers: _MoveHelpers,
+    ) -> float:
+        """_evaluate の値（手番側視点）。"""
+        return _evaluate(board, n, turn, helpers, state)
+
+
+# 既定の評価関数（状態を持たないので共有する）
+HEURISTIC = HeuristicEvaluator()
@@ -0,0 +1,128 @@
+"""1 手分の探索の統計（ノード数・NPS・深さ・TT・評価キャッシュの利用状況・読み筋）。
+
+各エージェントは play の終わりに ``self.last_stats`` に SearchStats を置く。
+Agent.play_with_stats は着手と一緒にそれを返す（置かないエージェントでは
+経過時間だけの SearchStats を作る）。API サーバーは /play で ``include_stats`` を
+指定されると ``to_dict()`` を応答に含め、ApiAgent は ``from_dict`` で受け取る。
+
+ノード数の数え方はエージェントごとに異なる:
+
+    negamax / transposition / pattern  着手を試した回数（子ノードの数）
+    mcts / alphazero                   探索木に加えた（訪問した）ノードの数
+
+そのため NPS や実効分岐数の比較は同じ種類のエージェントの間で行う。
+"""
+from typing import Any, Dict, NamedTuple, Tuple
+
+Move = Tuple[int, int]
+
+
+class SearchStats(NamedTuple):
+    """1 手分の探索の統計。"""
+
+    nodes: int = 0  # 探索したノード数
+    elapsed_ms: float = 0.0  # 思考時間（ミリ秒）
+    depth: int = 0  # 完了した反復深化の深さ（MCTS 系は探索木の最大深さ）
+    simulations: int = 0  # MCTS 系のシミュレーション回数
+    tt_probes: int = 0  # この手での TT の probe 回数
+    tt_hits: int = 0  # そのうちエントリが見つかった回数
+    tt_cutoffs: int = 0  # TT の値だけで枝を打ち切った回数
+    eval_probes: int = 0  # この手での評価キャッシュの probe 回数
+    eval_hits: int = 0  # そのうち評価値が見つかった回数
+    cutoffs: int = 0  # βカットした局面の数
+    first_move_cutoffs: int = 0  # そのうち最初に調べた手でカットした数
+    probcut_cuts: int = 0  # ProbCut（浅い探索の予測）で深い探索を省いた回数
+    pv: Tuple[Move, ...] = ()  # 読み筋（返した手から）
+    source: str = "search"  # 着手の出どころ（search / book / ponderhit）
+
+    @property
+    def nps(self) -> float:
+        """1 秒あたりのノード数。"""
+        return self.nodes * 1000.0 / self.elapsed_ms if self.elapsed_ms > 0 else 0.0
+
+    @property
+    def branching_factor(self) -> float:
+        """実効分岐数（nodes の depth 乗根）。深さがなければ 0。"""
+        if self.depth <= 0 or self.nodes <= 0:
+            return 0.0
+        return float(self.nodes ** (1.0 / self.depth))
+
+    @property
+    def tt_hit_rate(self) -> float:
+        """TT の probe に対するヒット率。"""
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def eval_hit_rate(self) -> float:
+        """評価キャッシュの probe に対するヒット率。"""
+        return self.eval_hits / self.eval_probes if self.eval_probes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """βカットのうち最初に調べた手でカットした割合（手順付けのよさの目安）。"""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON にできる辞書（計算値の nps / branching_factor / tt_hit_rate /
+        eval_hit_rate / first_move_cutoff_rate を含む）。"""
+        data = self._asdict()
+        data["pv"] = [list(move) for move in self.pv]
+        data["nps"] = self.nps
+        data["branching_factor"] = self.branching_factor
+        data["tt_hit_rate"] = self.tt_hit_rate
+        data["eval_hit_rate"] = self.eval_hit_rate
+        data["first_move_cutoff_rate"] = self.first_move_cutoff_rate
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchStats":
+        """to_dict の辞書から作る（計算値と未知のキーは無視する）。
+
+        Raises:
+            ValueError: 値の型が正しくない場合。
+        """
+        try:
+            return cls(
+                nodes=int(data.get("nodes", 0)),
+                elapsed_ms=float(data.get("elapsed_ms", 0.0)),
+                depth=int(data.get("depth", 0)),
+                simulations=int(data.get("simulations", 0)),
+                tt_probes=int(data.get("tt_probes", 0)),
+                tt_hits=int(data.get("tt_hits", 0)),
+                tt_cutoffs=int(data.get("tt_cutoffs", 0)),
+                eval_probes=int(data.get("eval_probes", 0)),
+                eval_hits=int(data.get("eval_hits", 0)),
+                cutoffs=int(data.get("cutoffs", 0)),
+                first_move_cutoffs=int(data.get("first_move_cutoffs", 0)),
+                probcut_cuts=int(data.get("probcut_cuts", 0)),
+                pv=tuple((int(r), int(c)) for r, c in data.get("pv", ())),
+                source=str(data.get("source", "search")),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"invalid search stats: {data!r}") from e
+
+    def summary(self) -> str:
+        """ログ用の 1 行の要約。"""
+        parts = [
+            f"{self.source}",
+            f"nodes={self.nodes}",
+            f"time={self.elapsed_ms:.0f}ms",
+            f"nps={self.nps:.0f}",
+        ]
+        if self.depth:
+            parts.append(f"depth={self.depth}")
+            parts.append(f"ebf={self.branching_factor:.2f}")
+        if self.simulations:
+            parts.append(f"sims={self.simulations}")
+        if self.tt_probes:
+            parts.append(f"tt_hit={self.tt_hit_rate:.1%}")
+            parts.append(f"tt_cut={self.tt_cutoffs}")
+        if self.eval_probes:
+            parts.append(f"eval_hit={self.eval_hit_rate:.1%}")
+        if self.cutoffs:
+            parts.append(f"first_cut={self.first_move_cutoff_rate:.1%}")
+        if self.probcut_cuts:
+            parts.append(f"probcut={self.probcut_cuts}")
+        if self.pv:
+            parts.append("pv=" + " ".join(f"{r},{c}" for r, c in self.pv))
+        return " ".join(parts)
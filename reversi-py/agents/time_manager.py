@@ -0,0 +1,221 @@
+"""持ち時間（対局全体の時間 + 1 手ごとの加算）による思考時間の管理。
+
+TimeManager は対局の残り時間を持ち、手ごとに MoveTimer を作る。
+MoveTimer は 2 つの時間を持つ:
+
+    目安（soft）  次の深さの反復を始めるかの判断に使う。局面の段階と合法手の数で
+                 配分し、反復ごとの最善手の変化と評価値の変動で伸縮する
+    上限（hard）  探索を打ち切る期限（deadline）。過ぎたら探索の途中でも止める
+
+探索エージェントは反復深化の各深さを終えるたびに iteration_done(最善手, 評価値)
+を呼び、should_stop() が真なら次の深さを始めない。次の深さは少なくとも
+それまでの経過時間と同じだけかかるとみなし、終わる見込みの時刻が目安を
+超えるなら始めない。最善手が数回続けて変わらなければ目安を半分にし、
+最善手が変わったり評価値が大きく動いたりした直後は目安を伸ばす（上限は超えない）。
+
+持ち時間を使わない（time_limit_ms 固定の）エージェントは MoveTimer.fixed で
+目安 = 上限 = time_limit_ms の MoveTimer を使う。このときの打ち切り判断は
+「上限までの残り < 経過時間」（次の深さは今の深さ以上かかる）だけになる。
+time_limit_ms が None なら期限のない MoveTimer になり、時間では打ち切らない
+（固定深さ・ノード数の上限だけで止める決定論的な探索に使う）。
+
+``time.monotonic()`` はプロセス間で共通なので、deadline は並列探索の
+ワーカーにそのまま渡せる。
+"""
+import math
+import time
+from typing import Any, Optional, Tuple
+
+# 残り時間のうち、通信や盤面処理のために使わずに残す分（ミリ秒）
+_RESERVE_MS = 50
+
+# 自分の残り手数の見積もりの下限（終盤でも残り時間を使い切らない）
+_MIN_MOVES_LEFT = 4
+
+# 1 手の上限は目安の何倍までか、残り時間の何割までか
+_HARD_FACTOR = 4.0
+_MAX_HARD_FRACTION = 0.4
+
+# 最善手がこの回数続けて変わらなければ安定とみなし、目安を縮める
+_STABLE_ITERATIONS = 3
+_STABLE_SCALE = 0.5
+
+# 評価値がこれ以上動いた直後は目安を伸ばす
+_UNSTABLE_SCALE = 1.5
+
+# 次の深さが終わる時刻の見積もり = 経過時間 × この値
+_ITERATION_GROWTH = 2.0
+
+# 評価値の変動の大きさを測る単位の既定値（NegamaxAgent のアスピレーション窓と同じ）
+DEFAULT_SCORE_MARGIN = 50.0
+
+
+def _phase_factor(empties: int) -> float:
+    """局面の段階（空きマス数）による配分の倍率。
+
+    序盤は定石や浅い探索でも差が出にくく、終盤は読み切りで早く終わるため、
+    中盤に多く配分する。
+    """
+    if empties > 48:
+        return 0.7
+    if empties > 24:
+        return 1.3
+    return 1.0
+
+
+def _mobility_factor(num_moves: int) -> float:
+    """合法手の数による配分の倍率（8 手で 1.0、少ないほど短く、多いほど長く）。"""
+    return min(1.3, max(0.6, 0.6 + 0.05 * num_moves))
+
+
+class MoveTimer:
+    """1 手分の思考時間（目安と上限）と、反復ごとの最善手の安定度。
+
+    Args:
+        soft_ms: 目安の思考時間（ミリ秒）。
+        hard_ms: 上限の思考時間（ミリ秒）。
+        adaptive: 最善手の安定度と評価値の変動で目安を伸縮するか。
+        score_margin: 評価値の変動を「大きい」とみなす幅。
+    """
+
+    def __init__(
+        self,
+        soft_ms: float,
+        hard_ms: float,
+        adaptive: bool = True,
+        score_margin: float = DEFAULT_SCORE_MARGIN,
+    ) -> None:
+        self.start = time.monotonic()
+        self.deadline = self.start + hard_ms / 1000.0
+        self.soft_ms = soft_ms
+        self.hard_ms = hard_ms
+        self._adaptive = adaptive
+        self._score_margin = score_margin
+        self._best_move: Optional[Any] = None
+        self._score: Optional[float] = None
+        self._stable = 0
+        self._changes = 0.0
+        self._unstable = False
+
+    @classmethod
+    def fixed(cls, time_limit_ms: float) -> "MoveTimer":
+        """目安 = 上限 = time_limit_ms の MoveTimer（持ち時間を使わないとき）。"""
+        return cls(time_limit_ms, time_limit_ms, adaptive=False)
+
+    def elapsed_ms(self) -> float:
+        """開始からの経過時間（ミリ秒）。"""
+        return (time.monotonic() - self.start) * 1000.0
+
+    def expired(self) -> bool:
+        """上限を過ぎたか。"""
+        return time.monotonic() >= self.deadline
+
+    def iteration_done(self, move: Any, score: Optional[float] = None) -> None:
+        """反復深化の 1 つの深さが終わったことを記録する。
+
+        Args:
+            move: その深さの最善手。
+            score: その深さの評価値（分からなければ None）。
+        """
+        changed = self._best_move is not None and move != self._best_move
+        # 最近の最善手の変化ほど重く数える（1 反復ごとに半減）
+        self._changes = self._changes / 2 + (1.0 if changed else 0.0)
+        self._stable = 0 if changed else self._stable + 1
+        self._unstable = (
+            score is not None
+            and self._score is not None
+            and abs(score - self._score) >= self._score_margin
+        )
+        self._best_move = move
+        self._score = score
+
+    def should_stop(self) -> bool:
+        """次の深さの反復を始めずに止めるべきか。"""
+        now = time.monotonic()
+        elapsed = now - self.start
+        if self.deadline - now < elapsed:
+            return True  # 次の深さは上限までに終わらない見込み
+        if not self._adaptive:
+            return False
+        scale = 1.0 + self._changes
+        if self._unstable:
+            scale *= _UNSTABLE_SCALE
+        if self._stable >= _STABLE_ITERATIONS:
+            scale *= _STABLE_SCALE
+        return elapsed * 1000.0 * _ITERATION_GROWTH >= self.soft_ms * scale
+
+
+class TimeManager:
+    """対局全体の持ち時間から 1 手ごとの思考時間を配分する。
+
+    Args:
+        total_ms: 対局の持ち時間（ミリ秒）。
+        increment_ms: 1 手指すごとに加算される時間（ミリ秒）。
+        score_margin: MoveTimer に渡す評価値の変動の単位。
+    """
+
+    def __init__(
+        self,
+        total_ms: float,
+        increment_ms: float = 0,
+        score_margin: float = DEFAULT_SCORE_MARGIN,
+    ) -> None:
+        self.remaining_ms = float(total_ms)
+        self.increment_ms = float(increment_ms)
+        self.score_margin = score_margin
+
+    def budget(self, empties: int, num_moves: int) -> Tuple[float, float]:
+        """この手の (目安, 上限) の思考時間（ミリ秒）を返す。
+
+        Args:
+            empties: 空きマス数。
+            num_moves: 合法手の数。
+
+        Returns:
+            (目安, 上限)。
+        """
+        available = max(0.0, self.remaining_ms - _RESERVE_MS)
+        moves_left = max(_MIN_MOVES_LEFT, (empties + 1) // 2)
+        base = available / moves_left + self.increment_ms
+        soft = base * _phase_factor(empties) * _mobility_factor(num_moves)
+        hard = min(soft * _HARD_FACTOR, available * _MAX_HARD_FRACTION + self.increment_ms)
+        hard = min(hard, available)
+        return min(soft, hard), hard
+
+    def start_move(self, empties: int, num_moves: int) -> MoveTimer:
+        """この手の MoveTimer を作る（思考開始時に呼ぶ）。
+
+        Args:
+            empties: 空きマス数。
+            num_moves: 合法手の数。
+
+        Returns:
+            この手の MoveTimer。
+        """
+        soft, hard = self.budget(empties, num_moves)
+        return MoveTimer(soft, hard, score_margin=self.score_margin)
+
+    def finish_move(self, timer: MoveTimer) -> None:
+        """使った時間を残り時間から引き、加算分を足す（着手を返す直前に呼ぶ）。"""
+        self.remaining_ms = max(0.0, self.remaining_ms - timer.elapsed_ms()) + self.increment_ms
+
+
+def start_timer(
+    time_manager: Optional[TimeManager],
+    time_limit_ms: Optional[float],
+    empties: int,
+    num_moves: int,
+) -> MoveTimer:
+    """持ち時間があればそこから、なければ固定の time_limit_ms で MoveTimer を作る。
+
+    持ち時間がなく time_limit_ms も None なら、期限のない MoveTimer を作る。
+    """
+    if time_manager is None:
+        return MoveTimer.fixed(math.inf if time_limit_ms is None else time_limit_ms)
+    return time_manager.start_move(empties, num_moves)
+
+
+def finish_timer(time_manager: Optional[TimeManager], timer: MoveTimer) -> None:
+    """持ち時間があれば使った時間を精算する（start_timer と対で使う）。"""
+    if time_manager is not None:
+        time_manager.finish_move(timer)
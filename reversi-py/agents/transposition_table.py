@@ -0,0 +1,260 @@
+"""固定サイズ・配列実装のトランスポジションテーブル。
+
+エントリを dict ではなく、事前確保した 1 つのバッファ上の平行配列
+（キー / 評価値 / 着手 / 深さ / 境界種別）に置く。容量は MB で指定し、
+探索中にメモリが増えることはない。
+
+ハッシュの下位ビットでバケットを選び、各バケットは 2 スロット:
+
+    スロット 0  深さ優先: より深い（または同じ深さの）結果か、
+                古い世代のエントリなら上書きする
+    スロット 1  常に置換: スロット 0 に入れなかった結果を無条件に書く
+
+テーブルを複数の探索（対局の複数の手）にまたがって使うときは、探索の
+開始ごとに new_search() で世代を進める。前の探索の深いエントリは
+ヒットすれば再利用されるが、置換では新しい世代の結果が優先される。
+
+バッファは ``buffer`` 引数で外から渡せる（bytearray や
+multiprocessing.shared_memory の buf など、書き込み可能なバッファなら何でもよい）。
+複数のプロセスがロックせずに読み書きするテーブルは ``checked=True`` で作る。
+キー配列にはキーとエントリの内容から作ったチェック値の XOR を置き
+（lockless hashing）、別プロセスの書き込みと重なって一部だけ新しくなった
+エントリは、キーが一致しないものとして読み捨てる。
+"""
+from typing import NamedTuple, Optional
+
+# 境界種別（bounds 配列の値）。0 は空きスロット
+BOUND_NONE = 0
+EXACT = 1
+LOWERBOUND = 2
+UPPERBOUND = 3
+
+# 最善手なしを表す moves 配列の値
+NO_MOVE = -1
+
+# 1 バケットあたりのスロット数
+SLOTS_PER_BUCKET = 2
+
+# 世代カウンタの周期（generations 配列は 1 バイト）
+GENERATIONS = 256
+
+# 1 エントリのバイト数: キー Q(8) + 評価値 d(8) + 着手 h(2) + 深さ h(2)
+# + 境界 B(1) + 世代 B(1)。バッファ上は要素サイズの大きい順に並べ、
+# 各配列の先頭が自然にアラインされるようにする
+ENTRY_BYTES = 8 + 8 + 2 + 2 + 1 + 1
+
+DEFAULT_SIZE_MB = 16.0
+
+# キー（64-bit）の範囲
+_KEY_MASK = (1 << 64) - 1
+
+
+class TTEntry(NamedTuple):
+    """TranspositionTable.get が返すエントリの内容。"""
+
+    depth: int
+    bound: int  # EXACT | LOWERBOUND | UPPERBOUND
+    value: float
+    move: int  # 着手の row * n + col（NO_MOVE なら最善手なし）
+
+
+class TTStats(NamedTuple):
+    """トランスポジションテーブルの利用統計。"""
+
+    probes: int  # probe の回数
+    hits: int  # キーが一致したエントリが見つかった回数
+    collisions: int  # ミスのうち、バケットが別の局面で埋まっていた回数
+    stores: int  # store の回数
+    overwrites: int  # store で別の局面の有効なエントリを追い出した回数
+
+    @property
+    def hit_rate(self) -> float:
+        """probe に対するヒット率。"""
+        return self.hits / self.probes if self.probes else 0.0
+
+
+def entry_check(value: float, move: int, depth: int, bound: int) -> int:
+    """エントリの内容から作る 64-bit のチェック値（checked なテーブルのキーに XOR する）。
+
+    数値のハッシュは PYTHONHASHSEED によらないので、どのプロセスでも同じ値になる。
+    """
+    return hash((value, move, depth, bound)) & _KEY_MASK
+
+
+def bucket_count(nbytes: int) -> int:
+    """nbytes に収まる最大のバケット数（2 の冪、最低 1）を返す。"""
+    buckets = max(1, nbytes // (ENTRY_BYTES * SLOTS_PER_BUCKET))
+    return 1 << (buckets.bit_length() - 1)
+
+
+def table_bytes(size_mb: float) -> int:
+    """size_mb のテーブルが実際に使うバッファのバイト数。"""
+    return bucket_count(int(size_mb * 2**20)) * SLOTS_PER_BUCKET * ENTRY_BYTES
+
+
+class TranspositionTable:
+    """2 スロットバケットの固定サイズトランスポジションテーブル。
+
+    キーは 64-bit の Zobrist ハッシュをそのまま保持し、probe はキーの
+    完全一致で判定する（バケット内の別局面を誤って返さない）。
+
+    探索の内側ループでは ``probe`` で得たスロット番号で平行配列
+    （``keys`` / ``values`` / ``moves`` / ``depths`` / ``bounds`` /
+    ``generations``）を直接読む。
+    まとめて読みたい場合は ``get`` が TTEntry を返す。checked なテーブルの
+    評価値・深さ・境界種別は、読んだ値を ``verify`` で照合してから使う（``get`` は照合済み）。
+
+    Args:
+        size_mb: テーブルの大きさ（MB）。buffer 指定時は無視される。
+        buffer: エントリを置く書き込み可能なバッファ（省略時は新しく確保）。
+            長さは table_bytes(size_mb) 以上であること。
+        checked: キー配列にキーと entry_check の XOR を置き、読むときに照合するか。
+            同じバッファを共有するテーブルはすべて同じ値にすること。
+
+    Raises:
+        ValueError: buffer が 1 バケット分より小さい場合。
+    """
+
+    def __init__(
+        self,
+        size_mb: float = DEFAULT_SIZE_MB,
+        buffer: Optional[memoryview] = None,
+        checked: bool = False,
+    ) -> None:
+        if buffer is None:
+            buffer = memoryview(bytearray(table_bytes(size_mb)))
+        view = memoryview(buffer).cast("B")
+        if len(view) < SLOTS_PER_BUCKET * ENTRY_BYTES:
+            raise ValueError(f"buffer too small for one bucket: {len(view)} bytes")
+        buckets = bucket_count(len(view))
+        self.slots = buckets * SLOTS_PER_BUCKET
+        self._mask = buckets - 1
+        slots = self.slots
+        self.keys = view[:8 * slots].cast("Q")
+        self.values = view[8 * slots:16 * slots].cast("d")
+        self.moves = view[16 * slots:18 * slots].cast("h")
+        self.depths = view[18 * slots:20 * slots].cast("h")
+        self.bounds = view[20 * slots:21 * slots].cast("B")
+        self.generations = view[21 * slots:22 * slots].cast("B")
+        self.nbytes = slots * ENTRY_BYTES
+        self.checked = checked
+        self.generation = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """利用統計を 0 に戻す。"""
+        self._probes = 0
+        self._hits = 0
+        self._collisions = 0
+        self._stores = 0
+        self._overwrites = 0
+
+    @property
+    def stats(self) -> TTStats:
+        """現在までの利用統計。"""
+        return TTStats(self._probes, self._hits, self._collisions, self._stores, self._overwrites)
+
+    def clear(self) -> None:
+        """全エントリを空にする（統計はそのまま）。"""
+        self.bounds[:] = bytes(self.slots)
+
+    def release(self) -> None:
+        """バッファへの参照（配列ビュー）を手放す。以降このテーブルは使えない。
+
+        共有メモリなど、参照が残っていると閉じられないバッファを閉じる前に呼ぶ。
+        """
+        for view in (self.keys, self.values, self.moves, self.depths, self.bounds,
+                     self.generations):
+            view.release()
+
+    def new_search(self) -> None:
+        """世代を 1 つ進める。以降、それまでのエントリは置換で優先的に追い出される。"""
+        self.generation = (self.generation + 1) % GENERATIONS
+
+    def probe(self, key: int) -> int:
+        """key のエントリを探し、スロット番号を返す（なければ -1）。
+
+        Args:
+            key: 局面の 64-bit ハッシュ。
+
+        Returns:
+            スロット番号、または -1。
+        """
+        self._probes += 1
+        slot = (key & self._mask) * SLOTS_PER_BUCKET
+        bounds = self.bounds
+        keys = self.keys if not self.checked else self._checked_keys(slot)
+        if not (bounds[slot] and keys[slot] == key):
+            slot += 1
+            if not (bounds[slot] and keys[slot] == key):
+                if bounds[slot - 1] or bounds[slot]:
+                    self._collisions += 1
+                return -1
+        self._hits += 1
+        self.generations[slot] = self.generation  # 今回の探索でも使われたので守る
+        return slot
+
+    def get(self, key: int) -> Optional[TTEntry]:
+        """key のエントリを TTEntry で返す（なければ None）。"""
+        slot = self.probe(key)
+        if slot < 0:
+            return None
+        entry = TTEntry(self.depths[slot], self.bounds[slot], self.values[slot], self.moves[slot])
+        if self.checked and not self.verify(slot, key, entry.value, entry.move, entry.depth,
+                                            entry.bound):
+            return None  # probe の後に別プロセスが書き換えた
+        return entry
+
+    def verify(self, slot: int, key: int, value: float, move: int, depth: int, bound: int) -> bool:
+        """slot から読んだ内容が key のエントリのものか確かめる（checked なテーブル用）。
+
+        probe の後に別プロセスが slot を書き換えると、読んだ値の一部だけが新しいことがある。
+        値は読み直さず、呼び出し側が実際に使う値で照合すること。
+        """
+        return self.keys[slot] ^ entry_check(value, move, depth, bound) == key
+
+    def _checked_keys(self, slot: int) -> dict[int, int]:
+        """checked なテーブルで、slot のバケットの各スロットのキーをチェック値を外して返す。"""
+        keys = self.keys
+        return {
+            i: keys[i] ^ entry_check(self.values[i], self.moves[i], self.depths[i], self.bounds[i])
+            for i in range(slot, slot + SLOTS_PER_BUCKET)
+        }
+
+    def store(self, key: int, depth: int, bound: int, value: float, move: int = NO_MOVE) -> None:
+        """探索結果を書き込む。
+
+        同じ局面が深さ優先スロットにあるか、そのスロットが空か、
+        そのスロットが古い世代か、新しい結果の深さがそのスロット以上なら
+        深さ優先スロットへ、そうでなければ常に置換スロットへ書く。
+
+        Args:
+            key: 局面の 64-bit ハッシュ。
+            depth: 結果の残り探索深さ。
+            bound: EXACT / LOWERBOUND / UPPERBOUND。
+            value: 評価値。
+            move: 最善手（row * n + col）。NO_MOVE なら最善手なし。
+        """
+        self._stores += 1
+        slot = (key & self._mask) * SLOTS_PER_BUCKET
+        bounds = self.bounds
+        keys = self.keys if not self.checked else self._checked_keys(slot)
+        if (
+            bounds[slot]
+            and keys[slot] != key
+            and depth < self.depths[slot]
+            and self.generations[slot] == self.generation
+        ):
+            slot += 1  # 今回の探索の深い結果を守り、常に置換スロットへ
+        elif bounds[slot + 1] and keys[slot + 1] == key:
+            bounds[slot + 1] = BOUND_NONE  # 深さ優先スロットへ移すので重複を消す
+        if bounds[slot] and keys[slot] != key:
+            self._overwrites += 1
+        if self.checked:
+            key ^= entry_check(value, move, depth, bound)
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.moves[slot] = move
+        self.depths[slot] = depth
+        self.generations[slot] = self.generation
+        bounds[slot] = bound
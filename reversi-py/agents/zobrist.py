@@ -0,0 +1,90 @@
+"""Zobrist ハッシュ（盤面 → 64-bit 整数）。
+
+TT・評価キャッシュで局面を引くキーに使う。乱数表は盤面サイズごとに固定シードで
+作るため、どのエージェント・どのプロセス（Lazy SMP のヘルパー）でも同じ盤面は
+同じハッシュになる。
+
+表は ``table[row][col][v + 1]``（v は 0=空, 1=白, -1=黒）で、空きマスも寄与を持つ。
+ハッシュは手番を含まない。手番ごとに値の異なるもの（評価値）を引くときは、
+白番で ``TURN_KEY`` を XOR したキーを使う。
+"""
+import random
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+ZobristTable = Tuple[Tuple[Tuple[int, int, int], ...], ...]
+
+# 白番の局面のキーに XOR する値
+TURN_KEY = random.Random(1).getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def zobrist_table(n: int) -> ZobristTable:
+    """n×n 盤面の Zobrist 乱数表（シード固定、盤面サイズごとに 1 つ）。
+
+    Args:
+        n: 盤面サイズ。
+
+    Returns:
+        ``table[row][col][v + 1]`` の 64-bit 乱数。
+    """
+    rng = random.Random(0)
+    return tuple(
+        tuple(
+            (rng.getrandbits(64), rng.getrandbits(64), rng.getrandbits(64))
+            for _ in range(n)
+        )
+        for _ in range(n)
+    )
+
+
+def compute_hash(board: Sequence[Sequence[int]], n: int) -> int:
+    """盤面全体からハッシュを計算する。
+
+    Args:
+        board: n×n 盤面（0=空, 1=白, -1=黒）。
+        n: 盤面サイズ。
+
+    Returns:
+        64-bit ハッシュ（手番を含まない）。
+    """
+    table = zobrist_table(n)
+    h = 0
+    for r in range(n):
+        row = board[r]
+        keys = table[r]
+        for c in range(n):
+            h ^= keys[c][row[c] + 1]
+    return h
+
+
+def update_hash(
+    h: int,
+    table: ZobristTable,
+    move: Tuple[int, int],
+    flips: List[Tuple[int, int]],
+    turn: int,
+) -> int:
+    """着手 move（flips を反転）によるハッシュの差分更新。
+
+    XOR なので、同じ引数でもう一度呼ぶと着手前のハッシュに戻る（_undo 用）。
+
+    Args:
+        h: 着手前のハッシュ。
+        table: zobrist_table(n)。
+        move: 着手位置。
+        flips: 反転する石のリスト。
+        turn: 着手プレイヤー。
+
+    Returns:
+        着手後のハッシュ。
+    """
+    r, c = move
+    keys = table[r][c]
+    h ^= keys[1] ^ keys[turn + 1]  # 着手マス: 空 → turn
+    own = turn + 1
+    other = 1 - turn
+    for fr, fc in flips:
+        keys = table[fr][fc]
+        h ^= keys[other] ^ keys[own]  # 反転したマス: -turn → turn
+    return h
@@ -97,6 +97,46 @@ class Board:
                     valid_moves.append((row, col))
         return valid_moves
 
+    def has_valid_move(self, turn: int) -> bool:
+        """指定されたプレイヤーに合法手が 1 つでもあるかを判定します。
+
+        最初の合法手が見つかった時点で打ち切るため、
+        パス・終局判定では get_valid_moves より速い。
+
+        Args:
+            turn: プレイヤー（-1: 黒、1: 白）。
+
+        Returns:
+            True であれば合法手あり。
+        """
+        return any(
+            self.is_valid_move(row, col, turn)
+            for row in range(self.board_size)
+            for col in range(self.board_size)
+        )
+
+    def get_frontier(self) -> List[Tuple[int, int]]:
+        """石に隣接する空きマス（フロンティア）を row-major 順で取得します。
+
+        合法手は必ずフロンティアに含まれる。Board は board 属性への
+        直接書き込みを許すため、毎回盤面を走査して求める。
+
+        Returns:
+            (row, col) のタプルのリスト。
+        """
+        n = self.board_size
+        board = self.board
+        return [
+            (r, c)
+            for r in range(n)
+            for c in range(n)
+            if board[r][c] == 0 and any(
+                0 <= r + dr < n and 0 <= c + dc < n and board[r + dr][c + dc] != 0
+                for dr in (-1, 0, 1)
+                for dc in (-1, 0, 1)
+            )
+        ]
+
     def place_stone(self, row: int, col: int, turn: int) -> bool:
         """指定位置に石を配置し、反転処理を行います。
 
@@ -108,18 +148,68 @@ class Board:
         Returns:
             True であれば配置成功、False であれば配置失敗（不合法手）。
         """
+        return bool(self.play_move(row, col, turn))
+
+    def play_move(self, row: int, col: int, turn: int) -> List[Tuple[int, int]]:
+        """place_stone と同じ着手を行い、反転した石のリストを返します。
+
+        Game の差分履歴（undo_move / redo_move）に渡す反転リストを
+        着手と同じ走査で得るために使う。
+
+        Args:
+            row: 行番号（0-indexed）。
+            col: 列番号（0-indexed）。
+            turn: プレイヤー（-1: 黒、1: 白）。
+
+        Returns:
+            反転した (row, col) のリスト。不合法手なら空リストで盤面は変わらない。
+        """
         if not self.is_valid_move(row, col, turn):
-            return False
+            return []
+
+        flipped = self.get_flipped_stones(row, col, turn)
+        self.redo_move(row, col, flipped, turn)
+        return flipped
 
+    def undo_move(self, row: int, col: int, flips: List[Tuple[int, int]], turn: int) -> None:
+        """play_move の逆操作で着手前の盤面に戻します（O(反転数)）。
+
+        Args:
+            row: 着手した行。
+            col: 着手した列。
+            flips: play_move が返した反転リスト。
+            turn: 着手したプレイヤー。
+        """
+        self.board[row][col] = 0
+        for fr, fc in flips:
+            self.board[fr][fc] = -turn
+
+    def redo_move(self, row: int, col: int, flips: List[Tuple[int, int]], turn: int) -> None:
+        """記録済みの着手を合法性チェックと走査なしで再適用します（O(反転数)）。
+
+        Args:
+            row: 着手した行。
+            col: 着手した列。
+            flips: play_move が返した反転リスト。
+            turn: 着手したプレイヤー。
+        """
         self.board[row][col] = turn
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                to_flip = self._get_flipped_in_direction(row, col, dr, dc, turn)
-                for fr, fc in to_flip:
-                    self.board[fr][fc] = turn
-        return True
+        for fr, fc in flips:
+            self.board[fr][fc] = turn
+
+    def clone(self) -> "Board":
+        """盤面の配置だけを複製した独立な Board を返します。
+
+        copy.deepcopy と違い、盤面以外の状態の走査やメモ化を行わず
+        行リストを浅く複製するだけなので、探索中の局面コピーに使える。
+
+        Returns:
+            同じ型・同じ配置の Board。
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.board_size = self.board_size
+        clone.board = [row[:] for row in self.board]
+        return clone
 
     def count_stones(self) -> Tuple[int, int]:
         """盤面の黒石と白石の数を数えます。
@@ -160,3 +250,296 @@ class Board:
                     self._get_flipped_in_direction(row, col, dr, dc, turn)
                 )
         return flipped_stones
+
+
+# メールボックスの番兵値（盤外）。石の色 (-1, 1) とも空 (0) とも一致しない
+_SENTINEL = 2
+
+
+class MailboxBoard(Board):
+    """番兵付き 1 次元配列（メールボックス）で盤面を保持する Board。
+
+    n×n 盤面を (n+2)×(n+2) の平坦なリストに番兵で囲んで格納し、
+    8 方向を固定オフセットで走査する。盤外は番兵で止まるため
+    走査ごとの範囲チェックが不要になる。石数は place_stone で
+    差分更新するため count_stones は O(1)。
+
+    石に隣接する空きマス（フロンティア）の集合も place_stone で差分更新し、
+    合法手生成・パス判定はフロンティアだけを走査する
+    （合法手は必ず相手石に隣接するため取りこぼしはない）。
+
+    公開 API は Board と同一。``board`` 属性は 2 次元リストの
+    互換ビュー（読み出しごとに生成するコピー）で、代入すると
+    内部配列へ読み込み直す。ビューへの要素代入は盤面に反映されない。
+    """
+
+    def __init__(self, board_size: int = 8) -> None:
+        """MailboxBoard を初期化します（初期配置は Board と同じ）。
+
+        Args:
+            board_size: 盤面のサイズ（デフォルトは 8×8）。
+        """
+        self.board_size = board_size
+        width = board_size + 2
+        self._width = width
+        self._offsets = (
+            -width - 1, -width, -width + 1,
+            -1, 1,
+            width - 1, width, width + 1,
+        )
+        # 盤内マスのインデックス（row-major 順）と座標の対応
+        self._squares = [
+            ((r + 1) * width + c + 1, (r, c))
+            for r in range(board_size)
+            for c in range(board_size)
+        ]
+        h = board_size // 2
+        grid = [[0] * board_size for _ in range(board_size)]
+        grid[h - 1][h - 1] = grid[h][h] = 1  # 白
+        grid[h - 1][h] = grid[h][h - 1] = -1  # 黒
+        self._load(grid)
+
+    @classmethod
+    def from_grid(cls, grid: List[List[int]]) -> "MailboxBoard":
+        """2 次元リストの盤面から MailboxBoard を生成します。
+
+        Args:
+            grid: 正方形の盤面（0=空, -1=黒, 1=白）。
+
+        Returns:
+            同じ配置の MailboxBoard。
+        """
+        board = cls(len(grid))
+        board._load(grid)
+        return board
+
+    def _load(self, grid: List[List[int]]) -> None:
+        """2 次元リストを内部配列へ読み込み、石数を数え直す。"""
+        width = self._width
+        cells = [_SENTINEL] * (width * width)
+        for idx, (r, c) in self._squares:
+            cells[idx] = grid[r][c]
+        self._cells = cells
+        self._frontier = {
+            idx for idx, _ in self._squares
+            if cells[idx] == 0 and any(cells[idx + d] in (-1, 1) for d in self._offsets)
+        }
+        self.black_count = sum(row.count(-1) for row in grid)
+        self.white_count = sum(row.count(1) for row in grid)
+
+    @property  # type: ignore[override]
+    def board(self) -> List[List[int]]:
+        """2 次元リストの互換ビュー（毎回新しいリストを返す）。"""
+        n = self.board_size
+        width = self._width
+        cells = self._cells
+        return [
+            cells[(r + 1) * width + 1:(r + 1) * width + 1 + n]
+            for r in range(n)
+        ]
+
+    @board.setter
+    def board(self, grid: List[List[int]]) -> None:
+        self._load(grid)
+
+    def _index(self, row: int, col: int) -> int:
+        """盤面座標を内部配列のインデックスに変換する。"""
+        return (row + 1) * self._width + col + 1
+
+    def _flip_indices(self, idx: int, turn: int) -> List[int]:
+        """idx に turn が着手したとき反転するマスのインデックスを返す。"""
+        cells = self._cells
+        opponent = -turn
+        flips: List[int] = []
+        for d in self._offsets:
+            i = idx + d
+            if cells[i] != opponent:
+                continue
+            line = [i]
+            i += d
+            while cells[i] == opponent:
+                line.append(i)
+                i += d
+            if cells[i] == turn:
+                flips.extend(line)
+        return flips
+
+    def _is_legal(self, idx: int, turn: int) -> bool:
+        """idx への turn の着手が合法か（最初に見つかった方向で打ち切る）。"""
+        cells = self._cells
+        opponent = -turn
+        for d in self._offsets:
+            i = idx + d
+            if cells[i] != opponent:
+                continue
+            i += d
+            while cells[i] == opponent:
+                i += d
+            if cells[i] == turn:
+                return True
+        return False
+
+    def _get_flipped_in_direction(self, row: int, col: int, dr: int, dc: int, turn: int) -> List[Tuple[int, int]]:
+        """Board と同じ契約の方向別反転取得（オフセット走査版）。"""
+        d = dr * self._width + dc
+        cells = self._cells
+        width = self._width
+        to_flip: list[tuple[int, int]] = []
+        i = self._index(row, col) + d
+        while cells[i] == -turn:
+            to_flip.append((i // width - 1, i % width - 1))
+            i += d
+        return to_flip if cells[i] == turn else []
+
+    def is_valid_move(self, row: int, col: int, turn: int) -> bool:
+        """指定位置への石の配置が合法手かを判定します。"""
+        if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+            return False
+        idx = self._index(row, col)
+        return self._cells[idx] == 0 and self._is_legal(idx, turn)
+
+    def get_valid_moves(self, turn: int) -> List[Tuple[int, int]]:
+        """指定されたプレイヤーの合法手を row-major 順ですべて取得します。"""
+        width = self._width
+        is_legal = self._is_legal
+        # インデックス昇順は row-major 順と一致する
+        return [
+            (idx // width - 1, idx % width - 1)
+            for idx in sorted(self._frontier)
+            if is_legal(idx, turn)
+        ]
+
+    def has_valid_move(self, turn: int) -> bool:
+        """フロンティアだけを走査して合法手の有無を判定します。"""
+        is_legal = self._is_legal
+        return any(is_legal(idx, turn) for idx in self._frontier)
+
+    def get_frontier(self) -> List[Tuple[int, int]]:
+        """差分更新済みのフロンティアを row-major 順で取得します。"""
+        width = self._width
+        return [(idx // width - 1, idx % width - 1) for idx in sorted(self._frontier)]
+
+    def play_move(self, row: int, col: int, turn: int) -> List[Tuple[int, int]]:
+        """指定位置に石を配置して反転し、反転した石のリストを返します。"""
+        if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+            return []
+        idx = self._index(row, col)
+        if self._cells[idx] != 0:
+            return []
+        flips = self._flip_indices(idx, turn)
+        if not flips:
+            return []
+        self._set_move(idx, flips, turn)
+        width = self._width
+        return [(i // width - 1, i % width - 1) for i in flips]
+
+    def redo_move(self, row: int, col: int, flips: List[Tuple[int, int]], turn: int) -> None:
+        """記録済みの着手を走査なしで再適用します。"""
+        self._set_move(
+            self._index(row, col), [self._index(r, c) for r, c in flips], turn
+        )
+
+    def undo_move(self, row: int, col: int, flips: List[Tuple[int, int]], turn: int) -> None:
+        """play_move の逆操作で着手前の盤面・石数・フロンティアに戻します。"""
+        idx = self._index(row, col)
+        cells = self._cells
+        cells[idx] = 0
+        for r, c in flips:
+            cells[self._index(r, c)] = -turn
+        lost = len(flips) + 1
+        if turn == -1:
+            self.black_count -= lost
+            self.white_count += len(flips)
+        else:
+            self.white_count -= lost
+            self.black_count += len(flips)
+        # 着手マスは反転石に隣接するのでフロンティアに戻る。周囲の空きマスは
+        # 他の石に接していなければフロンティアから外れる
+        frontier = self._frontier
+        frontier.add(idx)
+        offsets = self._offsets
+        for d in offsets:
+            j = idx + d
+            if cells[j] == 0 and not any(cells[j + e] in (-1, 1) for e in offsets):
+                frontier.discard(j)
+
+    def _set_move(self, idx: int, flips: List[int], turn: int) -> None:
+        """着手と反転を内部配列に書き込み、石数とフロンティアを差分更新する。"""
+        cells = self._cells
+        cells[idx] = turn
+        for i in flips:
+            cells[i] = turn
+        # 反転は空きマスを変えないので、着手マスの周囲だけ更新すればよい
+        frontier = self._frontier
+        frontier.discard(idx)
+        for d in self._offsets:
+            if cells[idx + d] == 0:
+                frontier.add(idx + d)
+        gained = len(flips) + 1
+        if turn == -1:
+            self.black_count += gained
+            self.white_count -= len(flips)
+        else:
+            self.white_count += gained
+            self.black_count -= len(flips)
+
+    def clone(self) -> "MailboxBoard":
+        """内部配列・フロンティア・石数を複製した独立な MailboxBoard を返します。
+
+        オフセットとマス対応表は不変なので複製せずに共有する。
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.board_size = self.board_size
+        clone._width = self._width
+        clone._offsets = self._offsets
+        clone._squares = self._squares
+        clone._cells = self._cells[:]
+        clone._frontier = set(self._frontier)
+        clone.black_count = self.black_count
+        clone.white_count = self.white_count
+        return clone
+
+    def count_stones(self) -> Tuple[int, int]:
+        """(黒石数, 白石数) を差分更新済みのカウンタから返します。"""
+        return self.black_count, self.white_count
+
+    def get_board(self) -> List[List[int]]:
+        """現在の盤面の 2 次元リスト（互換ビュー）を取得します。"""
+        return self.board
+
+    def get_flipped_stones(self, row: int, col: int, turn: int) -> List[Tuple[int, int]]:
+        """指定位置に石を配置した場合に反転する石のリストを取得します。"""
+        width = self._width
+        return [
+            (i // width - 1, i % width - 1)
+            for i in self._flip_indices(self._index(row, col), turn)
+        ]
+
+
+# Game が選択できる盤面の保持方式
+BOARD_STORAGES = {
+    "list": Board,
+    "mailbox": MailboxBoard,
+}
+
+
+def create_board(board_size: int = 8, storage: str = "list") -> Board:
+    """保持方式を指定して盤面を生成します。
+
+    Args:
+        board_size: 盤面のサイズ。
+        storage: "list"（2 次元リスト）または "mailbox"（番兵付き 1 次元配列）。
+
+    Returns:
+        初期配置の盤面。
+
+    Raises:
+        ValueError: storage が未知の値の場合。
+    """
+    try:
+        board_cls = BOARD_STORAGES[storage]
+    except KeyError:
+        raise ValueError(
+            f"Unknown board storage: {storage!r} (expected one of {sorted(BOARD_STORAGES)})"
+        ) from None
+    return board_cls(board_size)
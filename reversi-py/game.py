@@ -1,9 +1,84 @@
 # game.py
-from board import Board
+from typing import List, NamedTuple, Tuple
+
+from board import Board, create_board
 # config.agents からヘルパー関数をインポート
 from config.agents_config import get_agent_class
 from config.agent_config_utils import get_agent_params
 
+# 履歴の何手ごとに盤面全体のチェックポイントを保存するか
+HISTORY_CHECKPOINT_INTERVAL = 16
+
+
+class HistoryEntry(NamedTuple):
+    """履歴 1 手分の差分。盤面全体ではなく着手と反転石だけを持つ。"""
+
+    move: Tuple[int, int]  # 着手位置 (row, col)
+    turn: int  # 着手したプレイヤー
+    flips: List[Tuple[int, int]]  # 反転した石
+
+
+class GameSnapshot:
+    """探索用の読み取り専用局面（盤面と手番だけを持つ Game の軽量コピー）。
+
+    Game.snapshot() が返す。エージェントが参照する Game の API
+    （board / turn / board_size / get_valid_moves / get_board など）を
+    同じ名前で提供するので、エージェントには Game の代わりにそのまま渡せる。
+    エージェント・履歴・メッセージは持たないため copy.deepcopy(game) より安い。
+
+    属性は再代入できない（AttributeError）。board は生成時に複製した
+    スナップショット専用の盤面で、元の Game の変更はもちろん、
+    探索側が board を書き換えても元の Game には影響しない。
+    """
+
+    __slots__ = ("board", "turn", "board_size", "game_over", "_valid_moves")
+
+    board: Board
+    turn: int
+    board_size: int
+    game_over: bool
+
+    def __init__(self, board: Board, turn: int, game_over: bool = False) -> None:
+        """スナップショットを生成します（board は複製せずにそのまま保持する）。
+
+        Args:
+            board: スナップショットが所有する盤面。
+            turn: 手番（-1=黒, 1=白）。
+            game_over: 終局済みか。
+        """
+        object.__setattr__(self, "board", board)
+        object.__setattr__(self, "turn", turn)
+        object.__setattr__(self, "board_size", board.board_size)
+        object.__setattr__(self, "game_over", game_over)
+        object.__setattr__(self, "_valid_moves", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"GameSnapshot is read-only (cannot set {name!r})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"GameSnapshot is read-only (cannot delete {name!r})")
+
+    def snapshot(self) -> "GameSnapshot":
+        """盤面を複製した別のスナップショットを返します。"""
+        return GameSnapshot(self.board.clone(), self.turn, self.game_over)
+
+    def get_valid_moves(self):
+        """手番側の合法手（初回だけ計算してキャッシュする）。"""
+        moves = self._valid_moves
+        if moves is None:
+            moves = self.board.get_valid_moves(self.turn)
+            object.__setattr__(self, "_valid_moves", moves)
+        return moves
+
+    def get_flipped_stones(self, row, col, turn):
+        return self.board.get_flipped_stones(row, col, turn)
+
+    def get_board(self):
+        return self.board.get_board()
+
+    def get_board_size(self):
+        return self.board_size
+
 
 class Game:
     """リバーシゲームの制御。ゲームロジックと盤面管理を担当。
@@ -13,7 +88,7 @@ class Game:
     - ターン管理：手番（黒=-1, 白=1）の切り替え
     - プレイヤー管理：各プレイヤーのエージェント（AI または人間）
     - ゲーム状態：勝敗判定、パス判定、ゲームオーバー
-    - 履歴管理：巻き戻し機能用の手数履歴
+    - 履歴管理：巻き戻し機能用の手数履歴（差分 + 定期チェックポイント）
 
     設計上の注記：
     - Board と Game を分離することで責務が明確（ボード操作 vs ゲーム流れ）
@@ -25,16 +100,20 @@ class Game:
         turn: 現在の手番（-1=黒, 1=白）
         agents: エージェントインスタンス {-1: agent_black, 1: agent_white}
         agent_ids: エージェント ID {-1: id_black, 1: id_white}
-        history: 手数履歴（盤面状態の列）
-        history_index: 履歴内の現在位置
+        history: 手数履歴（HistoryEntry の列。着手ごとの差分）
+        history_index: 履歴内の現在位置（現在の盤面はこの手を打った直後）
+        storage: 盤面の保持方式（"list" または "mailbox"。board.create_board 参照）
     """
-    def __init__(self, board_size=8):
-        self.board = Board(board_size)
+    def __init__(self, board_size=8, storage="list"):
+        self.storage = storage
+        self.board = create_board(board_size, storage)
         self.turn = -1  # 黒から開始
         self.game_over = False
         self.board_size = board_size
-        self.history = []  # プレイの履歴を保存するリスト
+        self.history: List[HistoryEntry] = []  # プレイの履歴（差分）を保存するリスト
         self.history_index = -1 #履歴のインデックス
+        # 履歴インデックス -> その手の直後の盤面。-1 は最初の着手前の盤面
+        self._checkpoints: dict = {}
         self.players = [-1, 1] #プレイヤーのタイプ
         self.agents = {
             -1: None,  # 黒のプレイヤー（デフォルトは人間）
@@ -55,11 +134,12 @@ class Game:
         self._valid_moves_turn = None
 
     def reset(self):
-        self.board = Board(self.board_size)
+        self.board = create_board(self.board_size, self.storage)
         self.turn = -1
         self.game_over = False
         self.history = []
         self.history_index = -1
+        self._checkpoints = {}
         self.message = "" #リセット時にメッセージをクリア
         # プレイヤー設定を初期化
         self.agents = {
@@ -77,7 +157,8 @@ class Game:
         self.turn *= -1
 
     def check_game_over(self):
-        if not self.board.get_valid_moves(-1) and not self.board.get_valid_moves(1):
+        # 合法手を列挙せず有無だけを調べる（最初の 1 手で打ち切れる）
+        if not self.board.has_valid_move(self.turn) and not self.board.has_valid_move(-self.turn):
             self.game_over = True
 
     def get_winner(self):
@@ -90,20 +171,38 @@ class Game:
             return 0  # 引き分け
 
     def place_stone(self, row, col):
-        if self.board.place_stone(row, col, self.turn):
+        if not self.history:
+            # 最初の着手前の盤面を記録する（盤面を外部から設定した局面にも対応）
+            self._checkpoints = {-1: [r[:] for r in self.board.get_board()]}
+        flips = self.board.play_move(row, col, self.turn)
+        if flips:
             self._invalidate_valid_moves_cache()
             # Undo 後に新しい手を打った場合、巻き戻した先の古い履歴を切り捨てる
             del self.history[self.history_index + 1:]
-            # 履歴には盤面のコピーを保存する
-            board_copy = [r[:] for r in self.board.get_board()] # ディープコピーを作成
-            self.history.append(((row, col), self.turn, board_copy)) # コピーを履歴に追加
+            for index in [i for i in self._checkpoints if i > self.history_index]:
+                del self._checkpoints[index]
+            # 履歴には盤面全体ではなく差分（着手・手番・反転石）を保存する
+            self.history.append(HistoryEntry((row, col), self.turn, flips))
             self.history_index = len(self.history) - 1
+            if len(self.history) % HISTORY_CHECKPOINT_INTERVAL == 0:
+                self._checkpoints[self.history_index] = [r[:] for r in self.board.get_board()]
             return True
         return False
 
     def get_flipped_stones(self, row, col, turn):
         return self.board.get_flipped_stones(row, col, turn)
 
+    def snapshot(self) -> GameSnapshot:
+        """現在の局面（盤面と手番）だけを複製した読み取り専用ビューを返します。
+
+        AI スレッドや探索に渡す用途で、エージェント・履歴・メッセージは
+        複製しない。返り値は以後の Game の変更（着手・Undo・Reset）の影響を受けない。
+
+        Returns:
+            GameSnapshot。
+        """
+        return GameSnapshot(self.board.clone(), self.turn, self.game_over)
+
     def get_valid_moves(self):
         # ターンが変わらなければキャッシュを使用
         # ローカル変数経由で返すことで、別スレッドからのキャッシュ無効化と
@@ -167,6 +266,26 @@ class Game:
     def get_message(self):
         return self.message
 
+    def _seek(self, index):
+        """盤面を履歴インデックス index の直後の状態へ移す。
+
+        現在位置から差分を 1 手ずつ undo / redo するか、index 以前で最も近い
+        チェックポイントを読み込んで redo するかの、手数が少ない方を選ぶ。
+        """
+        current = self.history_index
+        base = max(i for i in self._checkpoints if i <= index)
+        if abs(index - current) > index - base:
+            self.board.board = [row[:] for row in self._checkpoints[base]]
+            current = base
+        while current > index:
+            entry = self.history[current]
+            self.board.undo_move(entry.move[0], entry.move[1], entry.flips, entry.turn)
+            current -= 1
+        while current < index:
+            current += 1
+            entry = self.history[current]
+            self.board.redo_move(entry.move[0], entry.move[1], entry.flips, entry.turn)
+
     def replay(self, index):
         """指定されたインデックスの履歴状態に盤面と手番を復元する"""
         if index == -1:
@@ -174,17 +293,21 @@ class Game:
             agents_backup = self.agents.copy() # プレイヤー設定は維持
             agent_ids_backup = self.agent_ids.copy() # エージェント ID も維持
             history_backup = [entry for entry in self.history] # 履歴はやり直し用に維持
+            checkpoints_backup = self._checkpoints
             self.reset()
             self.agents = agents_backup
             self.agent_ids = agent_ids_backup
             self.history = history_backup
+            self._checkpoints = checkpoints_backup
+            if -1 in self._checkpoints:
+                self.board.board = [row[:] for row in self._checkpoints[-1]]
             return True
 
         if 0 <= index < len(self.history):
-            # 履歴から盤面状態を復元 (コピーを渡す)
-            self.board.board = [row[:] for row in self.history[index][2]]
+            # 差分を適用して盤面状態を復元
+            self._seek(index)
             # 履歴の手番はその手を打ったプレイヤーなので、次に打つのは相手
-            self.turn = -self.history[index][1]
+            self.turn = -self.history[index].turn
             self.history_index = index
             # ゲームオーバー状態もリセットしておく（履歴再生時は通常ゲームオーバーではない）
             self.game_over = False
@@ -1,11 +1,11 @@
 # main.py
-import copy
 import pygame
 import sys
 import logging
 from utils.logging_utils import ThrottlingFilter
 import threading
 import queue
+from agents.search_stats import SearchStats
 from game import Game
 from gui import GameGUI
 from config.i18n import _t
@@ -332,8 +332,8 @@ class App:
             self.is_ai_thinking = True
             self.game.set_message(_t("game.thinking", default="Thinking..."))
             # メインスレッドが Undo / Reset で盤面を書き換えても影響しないよう、
-            # ゲーム状態のスナップショットを渡す
-            game_snapshot = copy.deepcopy(self.game)
+            # 局面（盤面と手番）だけの読み取り専用スナップショットを渡す
+            game_snapshot = self.game.snapshot()
             self.ai_thread = threading.Thread(
                 target=self._run_ai_agent,
                 args=(current_agent, game_snapshot, self._ai_generation),
@@ -346,11 +346,39 @@ class App:
         """AIエージェントを実行するスレッドワーカー"""
         try:
             move = agent.play(game_snapshot)
+            stats = getattr(agent, "last_stats", None)
+            if isinstance(stats, SearchStats):
+                logging.info(f"AI search stats: {stats.summary()}")
             self.ai_queue.put((move, generation))
         except Exception as e:
             logging.error(f"Error in AI thread: {e}")
             self.ai_queue.put((None, generation))
 
+    def _start_pondering(self, agent) -> None:
+        """AI が指した直後、相手が人間なら AI にポンダー（相手の手番の先読み）を始めさせる。
+
+        人間が考えている間も AI 側で探索を続け、次の AI の手番の応答を速くする。
+        ポンダーに対応しないエージェント（ponder を持たない）では何もしない。
+        """
+        if agent is None or self.game.agents[self.game.turn] is not None:
+            return
+        ponder = getattr(agent, "ponder", None)
+        if ponder is None:
+            return
+        # ポンダーの開始（API 呼び出し）で描画を止めないよう別スレッドで呼ぶ
+        thread = threading.Thread(
+            target=self._run_ponder, args=(ponder, self.game.snapshot())
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _run_ponder(self, ponder, game_snapshot) -> None:
+        """ポンダーを開始するスレッドワーカー（失敗しても対局は続ける）"""
+        try:
+            ponder(game_snapshot)
+        except Exception as e:
+            logging.warning(f"Error starting ponder: {e}")
+
     def _handle_pass(self, current_turn: int):
         """パス処理"""
         pass_message = _t("game.black_pass") if current_turn == -1 else _t("game.white_pass")
@@ -390,6 +418,8 @@ class App:
                 self.game.check_game_over() # ゲームオーバーかチェック
                 if self.game.game_over:
                     logging.info("Game over detected after AI move.") # pragma: no cover
+                else:
+                    self._start_pondering(self.game.agents[-self.game.turn])
             else: # pragma: no cover
                 # 通常、AIがvalid_moves内の手を返すのでここには来ないはず
                 logging.error(f"Error: place_stone{move} returned False unexpectedly for AI agent.") # pragma: no cover
@@ -487,7 +517,8 @@ def main():
     Appのメインループを実行する。
     """
     pygame.init()
-    game_instance = Game()
+    # 盤面はメールボックス表現で持つ（手番処理と石数表示が軽くなる）
+    game_instance = Game(storage="mailbox")
     # Allow the application to shrink window width to reduce side padding by default
     gui_instance = GameGUI(allow_width_shrink=True)
     app = App(game_instance, gui_instance)
@@ -5,8 +5,28 @@
     uv run python scripts/benchmark_agents.py
     uv run python scripts/benchmark_agents.py --opponent gain --games 5
     uv run python scripts/benchmark_agents.py --mcts-iterations 100 --time-limit-ms 1000
+    uv run python scripts/benchmark_agents.py --game-time-ms 20000 --opponent fixed --games 20
+    uv run python scripts/benchmark_agents.py --probcut data/probcut_negamax_8x8.json \
+        --opponent baseline --opening-plies 6 --games 20
+    uv run python scripts/benchmark_agents.py --max-depth 4 --mcts-iterations 200
+    uv run python scripts/benchmark_agents.py --node-limit 20000 --opponent gain
 
 受け入れ基準: --opponent mcts 時に Negamax が 80% 以上の勝率。
+
+--game-time-ms を指定すると、テスト対象は 1 局ごとの持ち時間（+ --increment-ms）を
+TimeManager（agents/time_manager.py）で配分して指す。--opponent fixed は
+同じエージェントで、同じ持ち時間を自分の手数で等分した固定の思考時間で指す相手で、
+同じ総思考時間での時間配分の効果を比べられる（各局の思考時間の合計も表示する）。
+
+--probcut を指定すると、テスト対象は Multi-ProbCut（agents/probcut.py）の係数ファイルを
+使って探索する。--opponent baseline は同じエージェント・同じ思考時間で ProbCut を
+使わない相手で、ProbCut による強さの差を比べられる。決定論的なエージェント同士でも
+対局が分かれるよう、--opening-plies で序盤をランダムに進め、同じ序盤を先後入れ替えて 2 局ずつ指す。
+
+--max-depth / --node-limit を指定すると、テスト対象（と fixed / baseline の相手）は
+思考時間ではなく固定深さ・1 手のノード数の上限で探索し、MCTS の相手も時間ではなく
+--mcts-iterations 回（局ごとのシードで）シミュレーションする。対局結果は実行環境の
+速さによらず再現するので、性能の変化は勝敗ではなく表示する nodes/s の変化に表れる。
 """
 import argparse
 import random
@@ -20,17 +40,36 @@ from agents.alpha_zero_agent import AlphaZeroAgent  # noqa: E402
 from agents.gain_agent import GainAgent  # noqa: E402
 from agents.mcts_agent import MonteCarloTreeSearchAgent  # noqa: E402
 from agents.negamax_agent import NegamaxAgent  # noqa: E402
+from agents.probcut import DEFAULT_T as DEFAULT_PROBCUT_T, ProbCutTable  # noqa: E402
 from agents.random_agent import RandomAgent  # noqa: E402
+from agents.time_manager import TimeManager  # noqa: E402
 from agents.transposition_negamax_agent import TranspositionNegamaxAgent  # noqa: E402
 from game import Game  # noqa: E402
 
 
-def play_one_game(black_agent, white_agent, board_size: int) -> int:
-    """1 局対戦し、石差（黒 - 白）を返す。"""
+def play_one_game(
+    black_agent, white_agent, board_size: int, think_s=None, opening=(), nodes=None
+) -> int:
+    """1 局対戦し、石差（黒 - 白）を返す。
+
+    think_s に {-1: 0.0, 1: 0.0} を渡すと、手番ごとの思考時間（秒）を足し込む。
+    nodes に {-1: 0, 1: 0} を渡すと、手番ごとの探索ノード数（last_stats）を足し込む。
+    opening の手（パスは None）を指した局面から始める。
+    """
     game = Game(board_size=board_size)
+    for move in opening:
+        if move is not None:
+            game.place_stone(move[0], move[1])
+        game.switch_turn()
     while not game.game_over:
         agent = black_agent if game.turn == -1 else white_agent
+        t0 = time.monotonic()
         move = agent.play(game)
+        if think_s is not None:
+            think_s[game.turn] += time.monotonic() - t0
+        stats = getattr(agent, "last_stats", None)
+        if nodes is not None and stats is not None:
+            nodes[game.turn] += stats.nodes
         if move is not None:
             game.place_stone(move[0], move[1])
         game.switch_turn()
@@ -39,18 +78,66 @@ def play_one_game(black_agent, white_agent, board_size: int) -> int:
     return black - white
 
 
-def make_opponent(args: argparse.Namespace):
+def random_opening(board_size: int, plies: int, rng: random.Random) -> list:
+    """初期局面からランダムに plies 手進める手順（パスは None）。"""
+    game = Game(board_size=board_size)
+    moves: list = []
+    for _ in range(plies):
+        valid = game.get_valid_moves()
+        move = rng.choice(valid) if valid else None
+        if move is not None:
+            game.place_stone(move[0], move[1])
+        moves.append(move)
+        game.switch_turn()
+    return moves
+
+
+def deterministic(args: argparse.Namespace) -> bool:
+    """思考時間ではなく固定深さ・ノード数の上限で探索するか。"""
+    return args.max_depth is not None or args.node_limit is not None
+
+
+def make_agent(args: argparse.Namespace, time_limit_ms: int, probcut=None):
+    """--agent のエージェントを作る（固定深さ・ノード数の上限の指定があれば時間制限なし）。"""
+    kwargs = {
+        "time_limit_ms": None if deterministic(args) else time_limit_ms,
+        "max_depth": args.max_depth or 60,
+        "node_limit": args.node_limit,
+        "probcut": probcut,
+        "probcut_t": args.probcut_t,
+    }
+    if args.agent == "transposition":
+        # 手をまたいで TT を持ち越すと、結果が直前の対局に依存する
+        return TranspositionNegamaxAgent(keep_tt=not deterministic(args), **kwargs)
+    return NegamaxAgent(**kwargs)
+
+
+def make_opponent(args: argparse.Namespace, game_index: int = 0):
     """--opponent 引数からエージェントインスタンスを生成する。"""
     if args.opponent == "mcts":
+        if deterministic(args):
+            return MonteCarloTreeSearchAgent(
+                iterations=args.mcts_iterations, time_limit_ms=None, seed=game_index
+            )
         return MonteCarloTreeSearchAgent(
             iterations=args.mcts_iterations,
             time_limit_ms=args.time_limit_ms,
         )
     if args.opponent == "gain":
         return GainAgent()
+    if args.opponent == "fixed":
+        return make_agent(args, fixed_time_limit_ms(args))
+    if args.opponent == "baseline":
+        return make_agent(args, args.time_limit_ms)
     return RandomAgent()
 
 
+def fixed_time_limit_ms(args: argparse.Namespace) -> int:
+    """持ち時間を自分の手数（空きマスの半分）で等分した 1 手の思考時間。"""
+    moves = (args.board_size ** 2 - 4 + 1) // 2
+    return int(args.game_time_ms / moves + args.increment_ms)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--games", type=int, default=10,
@@ -63,24 +150,68 @@ def main() -> None:
     parser.add_argument("--agent", choices=["negamax", "transposition"],
                         default="negamax",
                         help="テスト対象エージェント（デフォルト: negamax）")
-    parser.add_argument("--opponent", choices=["mcts", "gain", "random", "alphazero_n6k", "alphazero_n6k_v2"],
+    parser.add_argument("--game-time-ms", type=int, default=None,
+                        help="テスト対象の 1 局の持ち時間 ms（指定時は --time-limit-ms の代わり）")
+    parser.add_argument("--increment-ms", type=int, default=0,
+                        help="--game-time-ms 使用時の 1 手ごとの加算 ms（デフォルト: 0）")
+    parser.add_argument("--opponent",
+                        choices=["mcts", "gain", "random", "fixed", "baseline",
+                                 "alphazero_n6k", "alphazero_n6k_v2"],
                         default="mcts",
                         help="対戦相手（デフォルト: mcts）")
     parser.add_argument("--alphazero-simulations", type=int, default=200,
                         help="AlphaZero の MCTS シミュレーション数（デフォルト: 200）")
+    parser.add_argument("--probcut", type=str, default=None,
+                        help="テスト対象が使う Multi-ProbCut の係数ファイル"
+                             "（scripts/calibrate_probcut.py で作成）")
+    parser.add_argument("--probcut-t", type=float, default=DEFAULT_PROBCUT_T,
+                        help=f"ProbCut のカットの閾値（σ の倍数、デフォルト: {DEFAULT_PROBCUT_T}）")
+    parser.add_argument("--max-depth", type=int, default=None,
+                        help="テスト対象を時間制限なしの固定深さで探索させる")
+    parser.add_argument("--node-limit", type=int, default=None,
+                        help="テスト対象を時間制限なしの 1 手のノード数の上限で探索させる")
+    parser.add_argument("--opening-plies", type=int, default=0,
+                        help="ランダムに進める序盤の手数。0 より大きければ同じ序盤を"
+                             "先後入れ替えて 2 局ずつ指す（デフォルト: 0）")
     args = parser.parse_args()
+    if args.opponent == "fixed" and args.game_time_ms is None:
+        parser.error("--opponent fixed requires --game-time-ms")
+    if args.opponent == "baseline" and args.probcut is None:
+        parser.error("--opponent baseline requires --probcut")
+    if deterministic(args) and args.game_time_ms is not None:
+        parser.error("--max-depth / --node-limit cannot be combined with --game-time-ms")
 
     # テスト対象エージェントを生成
-    if args.agent == "transposition":
-        agent: object = TranspositionNegamaxAgent(time_limit_ms=args.time_limit_ms)
-        agent_name = f"Transposition({args.time_limit_ms}ms)"
+    probcut = ProbCutTable.load(args.probcut) if args.probcut else None
+    agent = make_agent(args, args.time_limit_ms, probcut)
+    agent_name = "Transposition" if args.agent == "transposition" else "Negamax"
+    if deterministic(args):
+        limits = []
+        if args.max_depth is not None:
+            limits.append(f"depth {args.max_depth}")
+        if args.node_limit is not None:
+            limits.append(f"{args.node_limit} nodes")
+        agent_name += f"({', '.join(limits)})"
     else:
-        agent = NegamaxAgent(time_limit_ms=args.time_limit_ms)  # type: ignore[assignment]
-        agent_name = f"Negamax({args.time_limit_ms}ms)"
+        agent_name += f"({args.time_limit_ms}ms)"
+    if probcut is not None:
+        agent_name += f"+ProbCut(t={args.probcut_t})"
+
+    if args.game_time_ms is not None:
+        agent_name = agent_name.replace(
+            f"{args.time_limit_ms}ms", f"clock {args.game_time_ms}+{args.increment_ms}ms"
+        )
 
     # 対戦相手を生成
-    if args.opponent == "mcts":
-        opponent_name = f"mcts(iterations={args.mcts_iterations})"
+    if args.opponent == "fixed":
+        opponent_name = f"{args.agent}({fixed_time_limit_ms(args)}ms/move)"
+        win_threshold = 0.50
+    elif args.opponent == "baseline":
+        opponent_name = f"{args.agent}(same limits, no ProbCut)"
+        win_threshold = 0.50
+    elif args.opponent == "mcts":
+        opponent_name = f"mcts(iterations={args.mcts_iterations}"
+        opponent_name += ", no time limit)" if deterministic(args) else ")"
         win_threshold = 0.80
     elif args.opponent == "gain":
         opponent_name = "gain"
@@ -102,6 +233,8 @@ def main() -> None:
     print("-" * 50)
 
     wins = losses = draws = 0
+    agent_nodes = 0
+    agent_think_s = 0.0
     start = time.monotonic()
 
     for i in range(args.games):
@@ -117,12 +250,25 @@ def main() -> None:
                 model_path="models/alpha_zero_nega6000_v2.pth",
             )
         else:
-            opponent = make_opponent(args)
+            opponent = make_opponent(args, i)
+        if args.game_time_ms is not None:
+            agent.time_manager = TimeManager(args.game_time_ms, args.increment_ms)
+        # 同じ序盤を先後入れ替えて 2 局ずつ
+        opening = random_opening(
+            args.board_size, args.opening_plies, random.Random(i // 2)
+        ) if args.opening_plies > 0 else []
+        think_s = {-1: 0.0, 1: 0.0}
+        nodes = {-1: 0, 1: 0}
         t0 = time.monotonic()
         if i % 2 == 0:
-            diff = play_one_game(agent, opponent, args.board_size)
+            diff = play_one_game(agent, opponent, args.board_size, think_s, opening, nodes)
+            agent_s, opponent_s = think_s[-1], think_s[1]
+            agent_nodes += nodes[-1]
         else:
-            diff = -play_one_game(opponent, agent, args.board_size)
+            diff = -play_one_game(opponent, agent, args.board_size, think_s, opening, nodes)
+            agent_s, opponent_s = think_s[1], think_s[-1]
+            agent_nodes += nodes[1]
+        agent_think_s += agent_s
         elapsed_game = time.monotonic() - t0
         if diff > 0:
             wins += 1
@@ -131,6 +277,7 @@ def main() -> None:
         else:
             draws += 1
         print(f"game {i + 1:3d}: 石差 {diff:+4d}  {elapsed_game:.1f}s  "
+              f"(思考 {agent_s:.1f}s / {opponent_s:.1f}s)  "
               f"(W{wins} / L{losses} / D{draws})")
 
     elapsed = time.monotonic() - start
@@ -138,6 +285,8 @@ def main() -> None:
     print("-" * 50)
     print(f"勝率 {rate:.0f}%  (W{wins} / L{losses} / D{draws})  "
           f"合計 {elapsed:.0f}s  平均 {elapsed / args.games:.1f}s/game")
+    print(f"{agent_name}: {agent_nodes:,} nodes  "
+          f"{agent_nodes / max(agent_think_s, 1e-9):,.0f} nodes/s")
     print(f"受け入れ基準 (>= {win_threshold * 100:.0f}%): {'PASS' if rate >= win_threshold * 100 else 'FAIL'}")
 
 
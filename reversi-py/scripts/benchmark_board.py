@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""盤面表現ごとの 1 手あたりコストのベンチマーク。
+
+ランダム着手の対局を Game 経由で最後まで進め、GUI / スクリプトと同じ
+手番処理（合法手取得 → 着手 → 手番交代 → 終局判定 → 石数取得）の
+1 手あたりの平均時間を盤面の保持方式ごとに比較する。
+最後に training.batch_engine.BatchEngine で同じ局数をまとめて
+進めた場合（学習スクリプトのランダム対局）も表示する。
+
+使い方:
+    uv run python scripts/benchmark_board.py
+    uv run python scripts/benchmark_board.py --games 500 --board-size 10
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from board import BOARD_STORAGES  # noqa: E402
+from game import Game  # noqa: E402
+from training.batch_engine import MAX_BOARD_SIZE, BatchEngine, play_games, random_policy  # noqa: E402
+
+
+def play_random_games(storage: str, games: int, board_size: int, seed: int) -> tuple[int, float]:
+    """ランダム対局を games 局行い (総手数, 総秒) を返す。"""
+    rng = random.Random(seed)
+    moves_played = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        game = Game(board_size=board_size, storage=storage)
+        while not game.game_over:
+            moves = game.get_valid_moves()
+            if moves:
+                row, col = rng.choice(moves)
+                game.place_stone(row, col)
+                moves_played += 1
+            game.switch_turn()
+            game.check_game_over()
+            game.board.count_stones()
+    return moves_played, time.perf_counter() - start
+
+
+def play_batched_games(games: int, board_size: int, seed: int) -> tuple[int, float]:
+    """BatchEngine で games 局を同時に進め (総手数, 総秒) を返す。"""
+    start = time.perf_counter()
+    engine = BatchEngine(games, board_size)
+    play_games(engine, random_policy(seed), record=False)
+    return int(engine.plies.sum()), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=200,
+                        help="対局数（デフォルト: 200）")
+    parser.add_argument("--board-size", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"random games={args.games}  board={args.board_size}x{args.board_size}")
+    print("-" * 50)
+    baseline = 0.0
+    for storage in BOARD_STORAGES:
+        moves, elapsed = play_random_games(storage, args.games, args.board_size, args.seed)
+        per_move = elapsed / moves * 1e6
+        baseline = baseline or per_move
+        print(f"{storage:<8} moves={moves:>7}  {per_move:7.1f} us/move  "
+              f"x{baseline / per_move:.2f}")
+    if args.board_size <= MAX_BOARD_SIZE:
+        moves, elapsed = play_batched_games(args.games, args.board_size, args.seed)
+        per_move = elapsed / moves * 1e6
+        print(f"{'batched':<8} moves={moves:>7}  {per_move:7.1f} us/move  "
+              f"x{baseline / per_move:.2f}  ({args.games / elapsed:.0f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
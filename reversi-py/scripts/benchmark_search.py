@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""探索エンジンの速度ベンチマーク（ノード数 / 秒）。
+
+固定深さで同じ局面集合を探索し、設定ごとのノード数・時間・NPS を比較する。
+強さではなく探索部の速さを測るため、勝敗を見る benchmark_agents.py とは別に置く。
+
+--compare pvs では NegamaxAgent の PVS / アスピレーション窓の有無 4 通りについて、
+固定深さでのノード数と、--time-limit-ms の持ち時間で各局面（1 手）ごとに
+読み切れた深さを比較する。
+
+--compare persist では TranspositionNegamaxAgent が TT を手をまたいで
+持ち越す場合（keep_tt=True）と毎手捨てる場合について、同じ対局の
+2 手目以降の各局面で --time-limit-ms 内に読み切れた深さと、--depth を
+読み切るまでのノード数を比較する。
+
+--compare smp では TranspositionNegamaxAgent の Lazy SMP（workers）について、
+ワーカー数 1, 2, 4, ...（--workers まで）ごとに、--time-limit-ms の持ち時間で
+各局面を読み切れた深さと、全プロセス合計のノード数 / 秒を比較する。
+
+--compare split では NegamaxAgent のルート分割（root_workers）について、
+深さごとに、その深さまで反復深化し終えるまでの時間を直列探索
+（use_aspiration=False）と並べ、最善手と評価値が一致することも確かめる。
+
+--compare eval では葉の評価 1 回あたりの時間を、評価項を盤面の走査で
+求める場合（_evaluate に state を渡さない）と、_apply / _undo で差分更新した
+_EvalState を渡す場合（探索中の経路）で比較する。
+
+--compare evalcache では negamax / transposition / pattern のそれぞれについて、
+評価キャッシュ（agents/eval_cache.py）なし（eval_cache_mb=0）とあり（--eval-mb）で
+--depth の固定深さ探索の時間・キャッシュのヒット率を比べ、選んだ手が一致することも確かめる。
+
+--compare ordering では手順付け（agents/move_ordering.py）について、negamax の
+move_ordering なし / あり、transposition の既定（Killer・History・カウンター手）と
+ETC・浅い探索による並べ替えを加えた場合で、--depth の固定深さ探索のノード数・時間・
+最初の手でβカットした割合を比べ、選んだ手が基準と一致することも確かめる。
+
+--compare probcut では --agent の Multi-ProbCut（agents/probcut.py。係数は --probcut、
+省略時は data/probcut_<agent>_8x8.json）について、なし / ありで --depth の固定深さ探索の
+ノード数・時間と選んだ手の一致率、--time-limit-ms の持ち時間で各局面を読み切れた深さを比べる。
+
+--compare multipv では --agent の analyze（agents/analysis.py）について、--depth の
+固定深さで上位 1 手・--k 手・全手の評価値を求めるノード数を、ルートの各手の子局面を
+別々に（深さ --depth - 1 で）探索する場合と比べ、上位の手が play と一致することも確かめる。
+
+--compare core では探索コア（agents/search_core.py）の設定違いの 3 エージェント
+（negamax・transposition・pattern。pattern の重みは --weights）について、--depth の
+固定深さ探索（pattern は --depth - 1。同程度の時間になる）のノード数・時間・NPS を比べる。
+
+--compare endgame では終盤ソルバー（agents/endgame_solver.py）について、
+空きマス数ごとに完全読み（石差）と勝敗読み（WLD）の所要時間・ノード数と、
+--time-limit-ms 内に読み切れた局面の数を表示する。
+
+使い方:
+    uv run python scripts/benchmark_search.py
+    uv run python scripts/benchmark_search.py --agent transposition --depth 5
+    uv run python scripts/benchmark_search.py --agent transposition --depth 6 --tt-mb 1
+    uv run python scripts/benchmark_search.py --positions 20 --plies 20
+    uv run python scripts/benchmark_search.py --compare pvs --depth 6 --time-limit-ms 1000
+    uv run python scripts/benchmark_search.py --compare persist --positions 12 --depth 6
+    uv run python scripts/benchmark_search.py --compare smp --workers 8 --time-limit-ms 2000
+    uv run python scripts/benchmark_search.py --compare split --workers 8 --depth 6 --plies 24
+    uv run python scripts/benchmark_search.py --compare eval --positions 30
+    uv run python scripts/benchmark_search.py --compare evalcache --depth 5 --eval-mb 1
+    uv run python scripts/benchmark_search.py --compare ordering --depth 6 --positions 12
+    uv run python scripts/benchmark_search.py --compare probcut --depth 7 --time-limit-ms 1000
+    uv run python scripts/benchmark_search.py --compare probcut --agent transposition --probcut-t 2.0
+    uv run python scripts/benchmark_search.py --compare multipv --agent transposition --depth 6 --k 3
+    uv run python scripts/benchmark_search.py --compare core --depth 6
+    uv run python scripts/benchmark_search.py --compare endgame --positions 5 --time-limit-ms 3000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents import bitboard  # noqa: E402
+from agents.endgame_solver import EndgameSolver, EndgameTimeout  # noqa: E402
+from agents.negamax_agent import (  # noqa: E402
+    NegamaxAgent,
+    _EvalState,
+    _evaluate,
+    _move_helpers,
+)
+from agents.pattern_agent import PatternAgent  # noqa: E402
+from agents.probcut import DEFAULT_T as DEFAULT_PROBCUT_T, ProbCutTable  # noqa: E402
+from agents.search_core import SearchCore  # noqa: E402
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent  # noqa: E402
+from game import Game  # noqa: E402
+
+
+def sample_positions(count: int, plies: int, seed: int) -> list[Game]:
+    """初期局面からランダムに plies 手進めた局面を count 個作る。"""
+    rng = random.Random(seed)
+    games: list[Game] = []
+    while len(games) < count:
+        game = Game(board_size=8)
+        for _ in range(plies):
+            moves = game.get_valid_moves()
+            if moves:
+                move = rng.choice(moves)
+                game.place_stone(move[0], move[1])
+            game.switch_turn()
+            game.check_game_over()
+            if game.game_over:
+                break
+        if not game.game_over and len(game.get_valid_moves()) > 1:
+            games.append(game)
+    return games
+
+
+def make_agent(kind: str, depth: int, use_bitboard: bool, tt_mb: float) -> SearchCore:
+    """時間制限を実質無効化した固定深さのエージェントを作る。"""
+    if kind == "transposition":
+        return TranspositionNegamaxAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=use_bitboard,
+            tt_size_mb=tt_mb,
+        )
+    return NegamaxAgent(time_limit_ms=10**9, max_depth=depth, use_bitboard=use_bitboard)
+
+
+# --compare pvs の設定: ラベル -> (use_pvs, use_aspiration)
+SEARCH_MODES = {
+    "plain": (False, False),
+    "pvs": (True, False),
+    "aspiration": (False, True),
+    "pvs+asp": (True, True),
+}
+
+
+def run(label: str, agent: SearchCore, games: list[Game]) -> tuple[int, float]:
+    """全局面を探索し (合計ノード数, 合計秒) を表示して返す。"""
+    nodes = 0
+    start = time.perf_counter()
+    for game in games:
+        agent.play(game)
+        nodes += agent._nodes_checked
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} nodes={nodes:>9}  time={elapsed:7.2f}s  "
+          f"nps={nodes / elapsed:>10.0f}")
+    if agent._tt is not None:
+        stats = agent._tt.stats
+        print(f"{'':<12} tt: {agent._tt.nbytes / 2**20:.2f}MB  "
+              f"hit={stats.hit_rate:6.1%}  collisions={stats.collisions}  "
+              f"overwrites={stats.overwrites}/{stats.stores}")
+    return nodes, elapsed
+
+
+def depth_reached(
+    label: str, use_pvs: bool, use_aspiration: bool, games: list[Game],
+    time_limit_ms: int,
+) -> list[int]:
+    """持ち時間 time_limit_ms で各局面を探索し、完了した深さを表示して返す。"""
+    agent = NegamaxAgent(time_limit_ms=time_limit_ms, use_bitboard=True,
+                         use_pvs=use_pvs, use_aspiration=use_aspiration)
+    depths = []
+    for game in games:
+        agent.play(game)
+        depths.append(agent._last_depth)
+    print(f"{label:<12} mean={sum(depths) / len(depths):5.2f}  "
+          f"per move: {' '.join(str(d) for d in depths)}")
+    return depths
+
+
+def compare_search_modes(games: list[Game], depth: int, time_limit_ms: int) -> None:
+    """PVS / アスピレーション窓の有無ごとのノード数と到達深さを比較する。"""
+    print(f"[fixed depth {depth}]")
+    base = None
+    for label, (use_pvs, use_aspiration) in SEARCH_MODES.items():
+        agent = NegamaxAgent(time_limit_ms=10**9, max_depth=depth, use_bitboard=True,
+                             use_pvs=use_pvs, use_aspiration=use_aspiration)
+        nodes, _ = run(label, agent, games)
+        base = base or nodes
+        print(f"{'':<12} nodes vs plain x{nodes / base:.2f}")
+    print("-" * 60)
+    print(f"[depth reached per move, {time_limit_ms} ms]")
+    for label, (use_pvs, use_aspiration) in SEARCH_MODES.items():
+        depth_reached(label, use_pvs, use_aspiration, games, time_limit_ms)
+
+
+def compare_tt_persistence(moves: int, depth: int, time_limit_ms: int, seed: int) -> None:
+    """TT を持ち越す / 捨てる場合の、2 手目以降の探索量を比較する。
+
+    黒を持ち越し側のエージェントが指し（その手で対局を進める）、白は
+    ランダムに応じる。黒番の各局面について、持ち時間内に読み切れた深さと、
+    固定深さ depth を読み切るまでのノード数を、TT を持ち越すエージェントと
+    毎手捨てるエージェントで並べる。moves 手に達する前に終局したら次の対局を
+    始める（各対局の初手は比較に含めない）。
+    """
+    def pair(time_limit: int, max_depth: int = 60) -> tuple[TranspositionNegamaxAgent, ...]:
+        return tuple(
+            TranspositionNegamaxAgent(time_limit_ms=time_limit, max_depth=max_depth,
+                                      use_bitboard=True, keep_tt=keep_tt)
+            for keep_tt in (True, False)
+        )
+
+    rng = random.Random(seed)
+    game = Game(board_size=8)
+    timed = pair(time_limit_ms)
+    fixed = pair(10**9, depth)
+    rows: list[tuple[int, int, int, int, int]] = []
+    searched = 0
+    while len(rows) < moves:
+        if game.game_over:
+            game = Game(board_size=8)
+            searched = 0
+        valid = game.get_valid_moves()
+        if valid:
+            if game.turn == -1:
+                # 持ち越し側は前の手の探索を覚えているので毎手必ず探索させる
+                fixed[0].play(game)
+                move = timed[0].play(game)
+                if searched:
+                    timed[1].play(game)
+                    fixed[1].play(game)
+                    rows.append((searched + 1,
+                                 timed[0]._last_depth, timed[1]._last_depth,
+                                 fixed[0]._nodes_checked, fixed[1]._nodes_checked))
+                searched += 1
+            else:
+                move = rng.choice(valid)
+            if move is not None:
+                game.place_stone(move[0], move[1])
+        game.switch_turn()
+        game.check_game_over()
+
+    print(f"[move N+1: depth reached in {time_limit_ms} ms / nodes to depth {depth}]")
+    print(f"{'move':>4}  {'keep_tt':>7}  {'clear':>5}  {'keep nodes':>10}  {'clear nodes':>11}")
+    for move_no, keep_depth, clear_depth, keep_nodes, clear_nodes in rows:
+        print(f"{move_no:>4}  {keep_depth:>7}  {clear_depth:>5}  "
+              f"{keep_nodes:>10}  {clear_nodes:>11}")
+    keep_mean = sum(r[1] for r in rows) / len(rows)
+    clear_mean = sum(r[2] for r in rows) / len(rows)
+    keep_nodes = sum(r[3] for r in rows)
+    clear_nodes = sum(r[4] for r in rows)
+    print(f"mean  {keep_mean:>7.2f}  {clear_mean:>5.2f}  "
+          f"nodes x{keep_nodes / clear_nodes:.2f}  "
+          f"(depth {keep_mean - clear_mean:+.2f} plies)")
+
+
+def compare_lazy_smp(games: list[Game], max_workers: int, time_limit_ms: int) -> None:
+    """Lazy SMP のワーカー数ごとの到達深さと合計 NPS を比較する。"""
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    print(f"[depth reached per move, {time_limit_ms} ms, cpus={os.cpu_count()}]")
+    for workers in counts:
+        agent = TranspositionNegamaxAgent(time_limit_ms=time_limit_ms, use_bitboard=True,
+                                          keep_tt=False, workers=workers)
+        try:
+            agent.play(games[0])  # ヘルパーの起動を計測から外す
+            depths = []
+            nodes = 0
+            start = time.perf_counter()
+            for game in games:
+                agent.play(game)
+                depths.append(agent._last_depth)
+                nodes += agent._nodes_checked + sum(r.nodes for r in agent._helper_results)
+            elapsed = time.perf_counter() - start
+        finally:
+            agent.close()
+        print(f"workers={workers:<3} mean depth={sum(depths) / len(depths):5.2f}  "
+              f"nps={nodes / elapsed:>9.0f}  per move: {' '.join(str(d) for d in depths)}")
+
+
+def compare_root_split(games: list[Game], max_depth: int, workers: int) -> None:
+    """ルート分割の並列探索と直列探索の、深さごとの所要時間を比較する。"""
+    print(f"[time to finish depth d, workers={workers}, cpus={os.cpu_count()}]")
+    parallel = NegamaxAgent(time_limit_ms=10**9, use_bitboard=True, use_aspiration=False,
+                            solver_empties=0, solver_wld_empties=0, root_workers=workers)
+    try:
+        parallel._max_depth = 4
+        parallel.play(games[0])  # ワーカーの起動を計測から外す
+        for depth in range(4, max_depth + 1):
+            serial = NegamaxAgent(time_limit_ms=10**9, max_depth=depth, use_bitboard=True,
+                                  use_aspiration=False, solver_empties=0,
+                                  solver_wld_empties=0)
+            parallel._max_depth = depth
+            times = [0.0, 0.0]
+            nodes = [0, 0]
+            same = True
+            for game in games:
+                results = []
+                for i, agent in enumerate((serial, parallel)):
+                    start = time.perf_counter()
+                    move = agent.play(game)
+                    times[i] += time.perf_counter() - start
+                    nodes[i] += agent._nodes_checked
+                    results.append((move, agent._root_score))
+                same = same and results[0] == results[1]
+            # 並列側のノード数は全プロセスの合計（共有 alpha が遅れるぶん直列より増える）
+            print(f"depth {depth}  serial={times[0]:7.2f}s  parallel={times[1]:7.2f}s  "
+                  f"x{times[0] / times[1]:.2f}  nodes x{nodes[1] / nodes[0]:.2f}  "
+                  f"{'same results' if same else 'RESULTS DIFFER'}")
+    finally:
+        parallel.close()
+
+
+def compare_eval(games: list[Game], repeat: int = 50) -> None:
+    """葉の評価 1 回あたりの時間を、盤面走査と差分更新済みの評価項で比較する。"""
+    positions = [(game.board.board, game.turn) for game in games]
+    states = [_EvalState(board, 8) for board, _ in positions]
+    for label, use_bitboard in (("list", False), ("bitboard", True)):
+        helpers = _move_helpers(8, use_bitboard)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for board, turn in positions:
+                _evaluate(board, 8, turn, helpers)
+        scan = (time.perf_counter() - start) / (repeat * len(positions))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for (board, turn), state in zip(positions, states):
+                _evaluate(board, 8, turn, helpers, state)
+        incremental = (time.perf_counter() - start) / (repeat * len(positions))
+        print(f"{label:<12} scan={scan * 1e6:7.1f}us  incremental={incremental * 1e6:7.1f}us  "
+              f"x{scan / incremental:.2f}")
+
+
+def compare_eval_cache(games: list[Game], depth: int, eval_mb: float) -> None:
+    """評価キャッシュの有無で、固定深さ探索の時間と選んだ手を比較する。"""
+    kinds = {
+        "negamax": lambda mb: NegamaxAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=True, eval_cache_mb=mb),
+        "transposition": lambda mb: TranspositionNegamaxAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=True, eval_cache_mb=mb),
+        "pattern": lambda mb: PatternAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=True, eval_cache_mb=mb),
+    }
+    for kind, factory in kinds.items():
+        timings = []
+        moves = []
+        hits = probes = 0
+        for mb in (0.0, eval_mb):
+            agent = factory(mb)
+            start = time.perf_counter()
+            played = []
+            for game in games:
+                played.append(agent.play(game))
+                if mb > 0 and agent.last_stats is not None:
+                    hits += agent.last_stats.eval_hits
+                    probes += agent.last_stats.eval_probes
+            timings.append(time.perf_counter() - start)
+            moves.append(played)
+        rate = hits / probes if probes else 0.0
+        print(f"{kind:<14} off={timings[0]:6.2f}s  on={timings[1]:6.2f}s  "
+              f"x{timings[0] / timings[1]:.2f}  hit={rate:6.1%}  "
+              f"{'same moves' if moves[0] == moves[1] else 'MOVES DIFFER'}")
+
+
+def compare_ordering(games: list[Game], depth: int) -> None:
+    """手順付けの設定ごとに、固定深さ探索のノード数・時間・最初の手のカット率を比較する。"""
+    configs = {
+        "negamax": lambda: NegamaxAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=True, move_ordering=False),
+        "negamax+ord": lambda: NegamaxAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=True, move_ordering=True),
+        "tt": lambda: TranspositionNegamaxAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=True, keep_tt=False),
+        "tt+etc": lambda: TranspositionNegamaxAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=True, keep_tt=False,
+            etc_min_depth=3),
+        "tt+shallow": lambda: TranspositionNegamaxAgent(
+            time_limit_ms=10**9, max_depth=depth, use_bitboard=True, keep_tt=False,
+            shallow_min_depth=4),
+    }
+    baseline: dict[str, list] = {}
+    for label, factory in configs.items():
+        agent = factory()
+        nodes = cutoffs = first = 0
+        played = []
+        start = time.perf_counter()
+        for game in games:
+            move, stats = agent.play_with_stats(game)
+            played.append(move)
+            nodes += stats.nodes
+            cutoffs += stats.cutoffs
+            first += stats.first_move_cutoffs
+        elapsed = time.perf_counter() - start
+        # negamax 系は "negamax"、transposition 系は "tt" の手と比べる
+        same = baseline.setdefault(label.split("+")[0], played) == played
+        print(f"{label:<12} nodes={nodes:>9}  time={elapsed:7.2f}s  "
+              f"first_cut={first / cutoffs if cutoffs else 0.0:6.1%}  "
+              f"{'same moves' if same else 'MOVES DIFFER'}")
+
+
+def compare_probcut(
+    games: list[Game], kind: str, depth: int, time_limit_ms: int, table: ProbCutTable, t: float
+) -> None:
+    """ProbCut の有無で、固定深さのノード数・手の一致率と、持ち時間内の到達深さを比較する。"""
+
+    def make(probcut: Optional[ProbCutTable], time_limit_ms: int, max_depth: int = 60) -> object:
+        if kind == "transposition":
+            return TranspositionNegamaxAgent(
+                time_limit_ms=time_limit_ms, max_depth=max_depth, use_bitboard=True,
+                keep_tt=False, probcut=probcut, probcut_t=t)
+        return NegamaxAgent(time_limit_ms=time_limit_ms, max_depth=max_depth,
+                            use_bitboard=True, probcut=probcut, probcut_t=t)
+
+    print(f"[fixed depth {depth}]")
+    played: dict[str, list] = {}
+    for label, probcut in (("off", None), ("probcut", table)):
+        agent = make(probcut, time_limit_ms=10**9, max_depth=depth)
+        nodes = cuts = 0
+        moves = []
+        start = time.perf_counter()
+        for game in games:
+            move, stats = agent.play_with_stats(game)  # type: ignore[attr-defined]
+            moves.append(move)
+            nodes += stats.nodes
+            cuts += stats.probcut_cuts
+        elapsed = time.perf_counter() - start
+        played[label] = moves
+        print(f"{label:<12} nodes={nodes:>9}  time={elapsed:7.2f}s  probcut cuts={cuts}")
+    same = sum(a == b for a, b in zip(played["off"], played["probcut"]))
+    print(f"{'':<12} same move as off: {same}/{len(games)}")
+    print("-" * 60)
+    print(f"[depth reached per move, {time_limit_ms} ms]")
+    for label, probcut in (("off", None), ("probcut", table)):
+        agent = make(probcut, time_limit_ms=time_limit_ms)
+        depths = []
+        for game in games:
+            _, stats = agent.play_with_stats(game)  # type: ignore[attr-defined]
+            depths.append(stats.depth)
+        print(f"{label:<12} mean={sum(depths) / len(depths):5.2f}  "
+              f"per move: {' '.join(str(d) for d in depths)}")
+
+
+def compare_multipv(games: list[Game], kind: str, depth: int, k: int) -> None:
+    """analyze で上位 k 手を求めるノード数を、ルートの各手を別々に探索する場合と比べる。"""
+
+    def make(max_depth: int) -> object:
+        if kind == "transposition":
+            return TranspositionNegamaxAgent(
+                time_limit_ms=None, max_depth=max_depth, use_bitboard=True, keep_tt=False)
+        return NegamaxAgent(time_limit_ms=None, max_depth=max_depth, use_bitboard=True)
+
+    # 子局面を別々に探索する場合: 全手の評価値を求めないと上位 k 手は決まらない
+    separate = 0
+    start = time.perf_counter()
+    for game in games:
+        for move in game.get_valid_moves():
+            child = Game(board_size=8)
+            child.board.board = [row[:] for row in game.board.board]
+            child.turn = game.turn
+            child.place_stone(move[0], move[1])
+            child.switch_turn()
+            if not child.get_valid_moves():
+                child.switch_turn()  # 相手はパス
+            _, stats = make(depth - 1).play_with_stats(child)  # type: ignore[attr-defined]
+            separate += stats.nodes
+    elapsed = time.perf_counter() - start
+    print(f"{'separate':<12} nodes={separate:>9}  time={elapsed:7.2f}s")
+
+    played = [make(depth).play(game) for game in games]  # type: ignore[attr-defined]
+    for label, top in (("k=1", 1), (f"k={k}", k), ("all", 64)):
+        nodes = 0
+        same = 0
+        start = time.perf_counter()
+        for game, move in zip(games, played):
+            agent = make(depth)
+            result = agent.analyze(game, k=top)  # type: ignore[attr-defined]
+            nodes += agent.last_stats.nodes  # type: ignore[attr-defined]
+            same += result[0].move == move
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} nodes={nodes:>9}  time={elapsed:7.2f}s  "
+              f"vs separate x{nodes / separate:.2f}  same best move as play: {same}/{len(games)}")
+
+
+def compare_core(games: list[Game], depth: int, weights: str) -> None:
+    """探索コアの設定違いの 3 エージェントで、固定深さ探索の NPS を比べる。"""
+    kinds = {
+        "negamax": lambda: NegamaxAgent(time_limit_ms=None, max_depth=depth, use_bitboard=True),
+        "transposition": lambda: TranspositionNegamaxAgent(
+            time_limit_ms=None, max_depth=depth, use_bitboard=True, keep_tt=False),
+        # パターン評価は葉 1 つが重いので、1 段浅くして同程度の時間にする
+        "pattern": lambda: PatternAgent(
+            weights_path=weights, time_limit_ms=None, max_depth=max(1, depth - 1),
+            use_bitboard=True, keep_tt=False),
+    }
+    for kind, factory in kinds.items():
+        agent = factory()
+        nodes = 0
+        start = time.perf_counter()
+        for game in games:
+            _, stats = agent.play_with_stats(game)
+            nodes += stats.nodes
+        elapsed = time.perf_counter() - start
+        print(f"{kind:<14} nodes={nodes:>9}  time={elapsed:7.2f}s  nps={nodes / elapsed:>8.0f}")
+
+
+# --compare endgame で計測する空きマス数
+ENDGAME_EMPTIES = (10, 12, 14, 16, 18)
+
+
+def compare_endgame(count: int, time_limit_ms: int, seed: int) -> None:
+    """空きマス数ごとに終盤ソルバーの完全読み / 勝敗読みの所要時間を比較する。
+
+    各局面は持ち時間 time_limit_ms で打ち切り、時間内に読み切れた局面だけの
+    平均時間と、読み切れた局面数を表示する。
+    """
+    print(f"{'empties':>7}  {'mode':<5}  {'solved':>6}  {'mean time':>9}  {'nodes':>10}  {'nps':>8}")
+    for empties in ENDGAME_EMPTIES:
+        # パスがなければ 60 - empties 手で空きが empties 個になる
+        games = [
+            game for game in sample_positions(count * 2, 60 - empties, seed)
+            if game.board.board_size ** 2 - sum(v != 0 for row in game.board.board for v in row)
+            == empties
+        ][:count]
+        for mode, wld in (("exact", False), ("wld", True)):
+            solved = 0
+            nodes = 0
+            elapsed = 0.0
+            for game in games:
+                player, opponent = bitboard.from_board(game.board.board, game.turn)
+                start = time.perf_counter()
+                solver = EndgameSolver(time.monotonic() + time_limit_ms / 1000)
+                try:
+                    solver.solve(player, opponent, wld=wld)
+                except EndgameTimeout:
+                    continue
+                elapsed += time.perf_counter() - start
+                nodes += solver.nodes
+                solved += 1
+            mean = f"{elapsed / solved:8.2f}s" if solved else f"{'-':>9}"
+            nps = f"{nodes / elapsed:>8.0f}" if elapsed > 0 else f"{'-':>8}"
+            print(f"{empties:>7}  {mode:<5}  {solved:>3}/{len(games):<2}  {mean}  "
+                  f"{nodes:>10}  {nps}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agent", choices=["negamax", "transposition"],
+                        default="negamax", help="計測対象（デフォルト: negamax）")
+    parser.add_argument("--depth", type=int, default=4,
+                        help="固定探索深さ（デフォルト: 4）")
+    parser.add_argument("--positions", type=int, default=10,
+                        help="計測局面数（デフォルト: 10）")
+    parser.add_argument("--plies", type=int, default=16,
+                        help="局面生成時にランダムに進める手数（デフォルト: 16）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tt-mb", type=float, default=16.0,
+                        help="transposition のトランスポジションテーブルの大きさ（MB、デフォルト: 16）")
+    parser.add_argument("--compare",
+                        choices=["bitboard", "pvs", "persist", "smp", "split", "eval",
+                                 "evalcache", "ordering", "probcut", "multipv", "core",
+                                 "endgame"],
+                        default="bitboard",
+                        help="比較対象: list/bitboard の着手生成、negamax の "
+                             "PVS/アスピレーション窓、transposition の TT 持ち越し、"
+                             "transposition の Lazy SMP、negamax のルート分割、"
+                             "葉の評価の差分更新、評価キャッシュの有無、手順付け、"
+                             "Multi-ProbCut の有無、multi-PV の解析、探索コアの 3 設定、"
+                             "または終盤ソルバー"
+                             "（デフォルト: bitboard）")
+    parser.add_argument("--time-limit-ms", type=int, default=1000,
+                        help="--compare pvs / persist / smp / probcut / endgame の持ち時間"
+                             "（デフォルト: 1000）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="--compare smp で試す最大ワーカー数、--compare split の"
+                             "ワーカー数（デフォルト: CPU 数）")
+    parser.add_argument("--eval-mb", type=float, default=1.0,
+                        help="--compare evalcache の評価キャッシュの大きさ（MB、デフォルト: 1）")
+    parser.add_argument("--probcut", type=str, default=None,
+                        help="--compare probcut の係数ファイル"
+                             "（デフォルト: data/probcut_<agent>_8x8.json）")
+    parser.add_argument("--probcut-t", type=float, default=DEFAULT_PROBCUT_T,
+                        help=f"--compare probcut のカットの閾値（σ の倍数、デフォルト: {DEFAULT_PROBCUT_T}）")
+    parser.add_argument("--k", type=int, default=3,
+                        help="--compare multipv で評価値を求める上位の手の数（デフォルト: 3）")
+    parser.add_argument("--weights", type=str, default="data/pattern_weights_8x8.json",
+                        help="--compare core の pattern の重み"
+                             "（デフォルト: data/pattern_weights_8x8.json）")
+    args = parser.parse_args()
+
+    if args.compare == "persist":
+        print(f"transposition  moves={args.positions}  seed={args.seed}")
+        print("-" * 60)
+        compare_tt_persistence(args.positions, args.depth, args.time_limit_ms, args.seed)
+        return
+
+    if args.compare == "endgame":
+        print(f"endgame solver  positions={args.positions}  seed={args.seed}  "
+              f"time limit={args.time_limit_ms} ms")
+        print("-" * 60)
+        compare_endgame(args.positions, args.time_limit_ms, args.seed)
+        return
+
+    games = sample_positions(args.positions, args.plies, args.seed)
+    if args.compare == "smp":
+        print(f"transposition  positions={len(games)}  plies={args.plies}")
+        print("-" * 60)
+        compare_lazy_smp(games, args.workers, args.time_limit_ms)
+        return
+    if args.compare == "split":
+        print(f"negamax  positions={len(games)}  plies={args.plies}")
+        print("-" * 60)
+        compare_root_split(games, args.depth, args.workers)
+        return
+    if args.compare == "eval":
+        print(f"leaf evaluation  positions={len(games)}  plies={args.plies}")
+        print("-" * 60)
+        compare_eval(games)
+        return
+    if args.compare == "evalcache":
+        print(f"eval cache  depth={args.depth}  positions={len(games)}  plies={args.plies}")
+        print("-" * 60)
+        compare_eval_cache(games, args.depth, args.eval_mb)
+        return
+    if args.compare == "ordering":
+        print(f"move ordering  depth={args.depth}  positions={len(games)}  plies={args.plies}")
+        print("-" * 60)
+        compare_ordering(games, args.depth)
+        return
+    if args.compare == "probcut":
+        path = args.probcut or f"data/probcut_{args.agent}_8x8.json"
+        print(f"{args.agent}  probcut={path}  t={args.probcut_t}  positions={len(games)}  "
+              f"plies={args.plies}")
+        print("-" * 60)
+        compare_probcut(games, args.agent, args.depth, args.time_limit_ms,
+                        ProbCutTable.load(path), args.probcut_t)
+        return
+    if args.compare == "multipv":
+        if args.depth < 2:
+            parser.error("--compare multipv needs --depth >= 2")
+        print(f"{args.agent}  multipv  depth={args.depth}  k={args.k}  positions={len(games)}  "
+              f"plies={args.plies}")
+        print("-" * 60)
+        compare_multipv(games, args.agent, args.depth, args.k)
+        return
+    if args.compare == "core":
+        print(f"search core  depth={args.depth}  positions={len(games)}  plies={args.plies}")
+        print("-" * 60)
+        compare_core(games, args.depth, args.weights)
+        return
+    if args.compare == "pvs":
+        print(f"negamax  depth={args.depth}  positions={len(games)}  plies={args.plies}")
+        print("-" * 60)
+        compare_search_modes(games, args.depth, args.time_limit_ms)
+        return
+    print(f"{args.agent}  depth={args.depth}  positions={len(games)}  plies={args.plies}")
+    print("-" * 60)
+    _, before = run("list", make_agent(args.agent, args.depth, False, args.tt_mb), games)
+    _, after = run("bitboard", make_agent(args.agent, args.depth, True, args.tt_mb), games)
+    print("-" * 60)
+    print(f"speedup x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""局面コピーのマイクロベンチマーク（copy.deepcopy と snapshot / clone の比較）。
+
+GUI が AI スレッドへ渡す Game のコピー（Game.snapshot）と、
+MCTS がノード展開・プレイアウトごとに行う Board のコピー（Board.clone）を、
+置き換え前の copy.deepcopy と 1 回あたりの時間で比較する。
+対局途中の局面（履歴とエージェント付き）を使うので、
+deepcopy が Game の付随状態まで複製するコストも含めて計測される。
+
+使い方:
+    uv run python scripts/benchmark_snapshot.py
+    uv run python scripts/benchmark_snapshot.py --plies 40 --repeat 20000
+"""
+import argparse
+import copy
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.negamax_agent import NegamaxAgent  # noqa: E402
+from board import BOARD_STORAGES  # noqa: E402
+from game import Game  # noqa: E402
+
+
+def midgame(storage: str, plies: int, seed: int) -> Game:
+    """AI 対局中の GUI に近い、履歴とエージェントを持つ対局途中の Game を作る。"""
+    rng = random.Random(seed)
+    game = Game(storage=storage)
+    game.agents = {-1: NegamaxAgent(), 1: NegamaxAgent()}
+    for _ in range(plies):
+        moves = game.get_valid_moves()
+        if moves:
+            game.place_stone(*rng.choice(moves))
+        game.switch_turn()
+    return game
+
+
+def per_call_us(stmt, repeat: int) -> float:
+    """stmt を repeat 回呼んだ 1 回あたりの時間（マイクロ秒、3 回計測の最小値）。"""
+    return min(timeit.repeat(stmt, number=repeat, repeat=3)) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plies", type=int, default=30,
+                        help="局面生成時にランダムに進める手数（デフォルト: 30）")
+    parser.add_argument("--repeat", type=int, default=5000,
+                        help="計測 1 回あたりの呼び出し回数（デフォルト: 5000）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"plies={args.plies}  repeat={args.repeat}")
+    print("-" * 60)
+    for storage in BOARD_STORAGES:
+        game = midgame(storage, args.plies, args.seed)
+        for label, before, after in (
+            ("Game", lambda g=game: copy.deepcopy(g), game.snapshot),
+            ("Board", lambda b=game.board: copy.deepcopy(b), game.board.clone),
+        ):
+            slow = per_call_us(before, args.repeat)
+            fast = per_call_us(after, args.repeat)
+            print(f"{storage:<8} {label:<6} deepcopy={slow:8.2f} us  "
+                  f"{'snapshot' if label == 'Game' else 'clone':>8}={fast:7.2f} us  "
+                  f"x{slow / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
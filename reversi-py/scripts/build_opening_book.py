@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""定石ファイル（agents/opening_book.py の形式）を作る。
+
+初期局面から --plies 手以内に現れる全局面（8 対称性で同一視したもの）を
+NegamaxAgent または TranspositionNegamaxAgent で深さ --depth まで探索し、
+最善手を定石ファイルに書き出す。探索は時間制限なしの固定深さなので、
+同じ引数からは同じファイルができる。最後に書き出したファイルを開き直し、
+全局面の参照にかかる平均時間を表示する。
+
+正規化後の局面数は 8x8 で 1, 1, 3, 14, 60, 322, 1773, ...（0 手目から）。
+
+使い方:
+    uv run python scripts/build_opening_book.py
+    uv run python scripts/build_opening_book.py --plies 7 --depth 10
+    uv run python scripts/build_opening_book.py --agent transposition --depth 10
+    uv run python scripts/build_opening_book.py --size 6 --plies 10 --output data/opening_book_6x6.bin
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.base_agent import Agent  # noqa: E402
+from agents.negamax_agent import NegamaxAgent  # noqa: E402
+from agents.opening_book import MAX_SIZE, OpeningBook, build_book, write_book  # noqa: E402
+from agents.position_key import key_to_board, transform_key  # noqa: E402
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent  # noqa: E402
+from utils.perft import initial_position  # noqa: E402
+
+# 固定深さで探索させるための（事実上無制限の）思考時間
+_NO_TIME_LIMIT_MS = 10 ** 9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", choices=["negamax", "transposition"],
+                        default="negamax", help="探索に使うエージェント（デフォルト: negamax）")
+    parser.add_argument("--plies", type=int, default=6,
+                        help="定石に入れる手数（デフォルト: 6）")
+    parser.add_argument("--depth", type=int, default=8,
+                        help="各局面の固定探索深さ（デフォルト: 8）")
+    parser.add_argument("--size", type=int, default=8,
+                        help=f"盤面サイズ（4-{MAX_SIZE}、デフォルト: 8）")
+    parser.add_argument("--tt-mb", type=float, default=64.0,
+                        help="transposition のトランスポジションテーブルの大きさ（MB、デフォルト: 64）")
+    parser.add_argument("--output", type=str, default=None,
+                        help="出力先（デフォルト: data/opening_book_<size>x<size>.bin）")
+    args = parser.parse_args()
+
+    if not 4 <= args.size <= MAX_SIZE:
+        parser.error(f"--size must be in [4, {MAX_SIZE}]")
+    output = args.output or f"data/opening_book_{args.size}x{args.size}.bin"
+
+    agent: Agent
+    if args.agent == "negamax":
+        agent = NegamaxAgent(
+            time_limit_ms=_NO_TIME_LIMIT_MS, max_depth=args.depth, use_bitboard=True
+        )
+    else:
+        agent = TranspositionNegamaxAgent(
+            time_limit_ms=_NO_TIME_LIMIT_MS, max_depth=args.depth, use_bitboard=True,
+            tt_size_mb=args.tt_mb,
+        )
+
+    print(f"{args.agent}  size={args.size}  plies={args.plies}  depth={args.depth}")
+    print("-" * 60)
+    start = time.perf_counter()
+
+    def progress(done: int, total: int) -> None:
+        if done == total or done % 50 == 0:
+            elapsed = time.perf_counter() - start
+            print(f"  {done:>6}/{total}  {elapsed:8.1f} s", flush=True)
+
+    entries = build_book(agent, args.plies, initial_position(args.size), progress)
+    count = write_book(output, args.size, entries)
+    print(f"wrote {count} positions to {output}")
+
+    book = OpeningBook(output)
+    # 正規化前の向きでも引けることを確かめるため、左右反転した盤面で引く
+    queries = [(key_to_board(transform_key(key, 1)), key.turn) for key in entries]
+    start = time.perf_counter()
+    misses = sum(book.lookup(board, turn) is None for board, turn in queries)
+    elapsed = time.perf_counter() - start
+    print(f"lookup: {elapsed / max(len(queries), 1) * 1e6:.1f} us/position  misses={misses}")
+    book.close()
+
+
+if __name__ == "__main__":
+    main()
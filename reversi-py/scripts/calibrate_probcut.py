@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Multi-ProbCut（agents/probcut.py）の回帰係数を自己生成した局面から求める。
+
+浅い探索（深さ 1-2 の NegamaxAgent に --epsilon の確率でランダムな手を混ぜる）で
+自己対局して中盤の局面を集め、各局面を --agent の探索で深さ 1 から --pairs の
+最大の深さまで全窓で探索する。--pairs の (深い深さ:浅い深さ) ごと・段階（空きマス数を --phase-width
+ごとに区切ったもの）ごとに、浅い探索値から深い探索値への回帰係数と誤差の標準偏差を求めて
+JSON に保存し、表にして表示する。
+
+探索値の尺度と符号は評価関数と探索の実装で異なるため、係数はエージェントごとに作り、
+同じエージェントの probcut 引数に渡す。探索の葉が終盤の評価（石差）に切り替わらないよう、
+局面は空きマス数が endgame_empties + 最大の深さより多いものに限る。
+
+使い方:
+    uv run python scripts/calibrate_probcut.py
+    uv run python scripts/calibrate_probcut.py --agent transposition --positions 300
+    uv run python scripts/calibrate_probcut.py --pairs 4:2,6:2,8:4,8:2 --phase-width 8
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.negamax_agent import NegamaxAgent, _EvalState, _move_helpers  # noqa: E402
+from agents.probcut import DEFAULT_PHASE_WIDTH, MIN_SAMPLES, ProbCutTable  # noqa: E402
+from agents.search_core import SearchCore  # noqa: E402
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent  # noqa: E402
+from game import Game  # noqa: E402
+
+Board = List[List[int]]
+
+# 固定深さで探索させるための（事実上無制限の）思考時間
+_NO_TIME_LIMIT_MS = 10 ** 9
+
+# 深さ d の組（深い深さ, 浅い深さ）の既定値。浅い方は 2 か 4 浅く、偶奇をそろえる
+DEFAULT_PAIRS = "3:1,4:2,5:1,6:2,7:3,8:4"
+
+# 勝敗の確定（両者パス）を含む探索値。回帰の外れ値になるので使わない
+_TERMINAL_VALUE = 10000
+
+
+def parse_pairs(text: str) -> List[Tuple[int, int]]:
+    """"8:4,6:2" を [(8, 4), (6, 2)] にする。"""
+    pairs = []
+    for item in text.split(","):
+        depth, shallow = (int(v) for v in item.split(":"))
+        if not 1 <= shallow < depth:
+            raise ValueError(f"shallow depth must be in [1, depth): {item}")
+        pairs.append((depth, shallow))
+    return pairs
+
+
+def self_play_positions(
+    count: int, min_empties: int, epsilon: float, seed: int
+) -> List[Tuple[Board, int]]:
+    """浅い探索 + ランダム手の自己対局から、空きマス数が min_empties より多い局面を集める。
+
+    1 局から段階の偏らないよう数局面ずつ取り、count 個になるまで対局を続ける。
+    """
+    rng = random.Random(seed)
+    players = [
+        NegamaxAgent(time_limit_ms=_NO_TIME_LIMIT_MS, max_depth=depth, use_bitboard=True)
+        for depth in (1, 2)
+    ]
+    positions: List[Tuple[Board, int]] = []
+    while len(positions) < count:
+        game = Game(board_size=8)
+        candidates = []
+        # 集める範囲（空きマス数 > min_empties）を過ぎたら終局まで指さない
+        while not game.game_over and sum(row.count(0) for row in game.board.board) > min_empties:
+            moves = game.get_valid_moves()
+            if len(moves) > 1:
+                candidates.append(([row[:] for row in game.board.board], game.turn))
+            if moves:
+                if rng.random() < epsilon:
+                    move = rng.choice(moves)
+                else:
+                    move = rng.choice(players).play(game)
+                game.place_stone(*move)
+            game.switch_turn()
+            game.check_game_over()
+        positions.extend(rng.sample(candidates, min(4, len(candidates))))
+    return positions[:count]
+
+
+def search_values(agent: SearchCore, board: Board, turn: int, max_depth: int) -> Dict[int, float]:
+    """局面を深さ 1..max_depth で全窓探索したときの探索値（agent の _negamax の値）。"""
+    board = [row[:] for row in board]
+    n = len(board)
+    values: Dict[int, float] = {}
+    assert isinstance(agent, SearchCore)
+    agent._deadline = math.inf
+    agent._prepare_search(n)  # TT は keep_tt=False（NegamaxAgent は TT なし）なので局面ごとに空
+    agent._helpers = _move_helpers(n, True)
+    agent._state = _EvalState(board, n)
+    h = agent._compute_initial_hash(board, n)
+    for depth in range(1, max_depth + 1):
+        values[depth], _ = agent._negamax(board, n, turn, depth, -math.inf, math.inf, h, False)
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", choices=["negamax", "transposition"],
+                        default="negamax", help="係数を求めるエージェント（デフォルト: negamax）")
+    parser.add_argument("--positions", type=int, default=200,
+                        help="回帰に使う局面数（デフォルト: 200）")
+    parser.add_argument("--pairs", type=str, default=DEFAULT_PAIRS,
+                        help=f"回帰する 深い深さ:浅い深さ の組（デフォルト: {DEFAULT_PAIRS}）")
+    parser.add_argument("--phase-width", type=int, default=DEFAULT_PHASE_WIDTH,
+                        help=f"段階を区切る空きマス数の幅（デフォルト: {DEFAULT_PHASE_WIDTH}）")
+    parser.add_argument("--min-samples", type=int, default=MIN_SAMPLES,
+                        help=f"段階・組ごとの最小サンプル数（デフォルト: {MIN_SAMPLES}）")
+    parser.add_argument("--epsilon", type=float, default=0.25,
+                        help="自己対局でランダムな手を指す確率（デフォルト: 0.25）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None,
+                        help="出力先（デフォルト: data/probcut_<agent>_8x8.json）")
+    args = parser.parse_args()
+
+    try:
+        pairs = parse_pairs(args.pairs)
+    except ValueError as e:
+        parser.error(f"--pairs: {e}")
+    max_depth = max(depth for depth, _ in pairs)
+    output = args.output or f"data/probcut_{args.agent}_8x8.json"
+
+    agent: SearchCore
+    if args.agent == "transposition":
+        agent = TranspositionNegamaxAgent(
+            time_limit_ms=_NO_TIME_LIMIT_MS, use_bitboard=True, keep_tt=False
+        )
+    else:
+        agent = NegamaxAgent(time_limit_ms=_NO_TIME_LIMIT_MS, use_bitboard=True)
+    endgame_empties = agent._endgame_empties
+
+    start = time.perf_counter()
+    positions = self_play_positions(
+        args.positions, endgame_empties + max_depth, args.epsilon, args.seed
+    )
+    print(f"{args.agent}  positions={len(positions)}  max depth={max_depth}  "
+          f"({time.perf_counter() - start:.1f}s to generate)")
+
+    records = []
+    skipped = 0
+    start = time.perf_counter()
+    for i, (board, turn) in enumerate(positions, 1):
+        values = search_values(agent, board, turn, max_depth)
+        if any(abs(v) >= _TERMINAL_VALUE for v in values.values()):
+            skipped += 1
+            continue
+        records.append((sum(row.count(0) for row in board), values))
+        if i % 20 == 0:
+            print(f"  {i}/{len(positions)}  {time.perf_counter() - start:.0f}s", flush=True)
+    if skipped:
+        print(f"  skipped {skipped} positions with terminal scores")
+
+    table = ProbCutTable.fit(records, pairs, 8, args.phase_width, args.min_samples)
+    print("-" * 72)
+    print(f"{'empties':>9}  {'pair':>5}  {'samples':>7}  {'slope':>7}  {'intercept':>9}  {'sigma':>8}")
+    for phase, pair in table.pairs():
+        low = phase * args.phase_width
+        print(f"{low:>4}-{low + args.phase_width - 1:<4}  {pair.depth}:{pair.shallow:<3}  "
+              f"{pair.samples:>7}  {pair.slope:7.3f}  {pair.intercept:9.2f}  {pair.sigma:8.2f}")
+    table.save(output)
+    print("-" * 72)
+    print(f"wrote {len(table)} pairs to {output}")
+
+
+if __name__ == "__main__":
+    main()
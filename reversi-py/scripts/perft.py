@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""perft: 着手生成の正しさ（葉ノード数の相互チェック）と速さ（NPS）の計測。
+
+初期局面または指定局面から深さ 1..--depth の葉ノード数を各バックエンドで
+数え、バックエンド間で数が一致するか、8x8 初期局面なら既知の値
+（utils.perft.PERFT_8X8）とも一致するかを確かめる。不一致があれば
+終了コード 1 で終わるので、着手生成の高速化作業の回帰ゲートとして使える。
+
+使い方:
+    uv run python scripts/perft.py
+    uv run python scripts/perft.py --depth 8 --backends bitboard batched
+    uv run python scripts/perft.py --size 6 --depth 9
+    uv run python scripts/perft.py --position "...................X.......XX......XO...........................O"
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.perft import (  # noqa: E402
+    PERFT_8X8,
+    PERFT_BACKENDS,
+    format_position,
+    initial_position,
+    parse_position,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=8,
+                        help="初期局面の盤面サイズ（4-16、デフォルト: 8）")
+    parser.add_argument("--depth", type=int, default=6,
+                        help="最大深さ（デフォルト: 6）")
+    parser.add_argument("--position", type=str, default=None,
+                        help="開始局面（n*n 文字の X/O/. + 手番 X/O）。指定時は --size を無視")
+    parser.add_argument("--backends", nargs="+", choices=sorted(PERFT_BACKENDS),
+                        default=None, help="計測するバックエンド（デフォルト: 対応するすべて）")
+    args = parser.parse_args()
+
+    if args.position is not None:
+        grid, turn = parse_position(args.position)
+    else:
+        if not 4 <= args.size <= 16:
+            parser.error("--size must be in [4, 16]")
+        grid, turn = initial_position(args.size)
+    n = len(grid)
+    is_start = args.position is None and n == 8
+
+    names = [
+        name for name in (args.backends or PERFT_BACKENDS)
+        if PERFT_BACKENDS[name].supports(n)
+    ]
+    if not names:
+        parser.error(f"no selected backend supports {n}x{n}")
+
+    print(f"position {format_position(grid, turn)}  ({n}x{n})")
+    print(f"{'depth':>5} {'nodes':>12}  " + "  ".join(f"{name:>14}" for name in names))
+    print("-" * (20 + 16 * len(names)))
+    ok = True
+    for depth in range(1, args.depth + 1):
+        counts = []
+        cells = []
+        for name in names:
+            start = time.perf_counter()
+            nodes = PERFT_BACKENDS[name].run(grid, turn, depth)
+            elapsed = time.perf_counter() - start
+            counts.append(nodes)
+            cells.append(f"{nodes / elapsed:>10.0f} nps" if elapsed > 0 else f"{'-':>14}")
+        expected = PERFT_8X8[depth] if is_start and depth < len(PERFT_8X8) else counts[0]
+        status = ""
+        if any(count != expected for count in counts):
+            ok = False
+            status = "  MISMATCH " + ", ".join(
+                f"{name}={count}" for name, count in zip(names, counts)
+            )
+            if is_start:
+                status += f" (expected {expected})"
+        print(f"{depth:>5} {counts[0]:>12}  " + "  ".join(cells) + status)
+    print("-" * (20 + 16 * len(names)))
+    print("OK" if ok else "FAILED: node counts differ between backends")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
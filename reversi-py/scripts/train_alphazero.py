@@ -14,27 +14,25 @@
 from __future__ import annotations
 
 import argparse
+import random
 import sys
 from dataclasses import dataclass
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import numpy as np
 import torch
 import torch.optim as optim
 from torch.utils.data import DataLoader, TensorDataset
 
 from agents.alphazero.encoding import board_to_tensor
-from agents.alphazero.mcts import MCTS, PASS_ACTION
-from agents.negamax_agent import (
-    NegamaxAgent,
-    _apply,
-    _flips_for_move,
-    _valid_moves,
-)
+from agents.alphazero.mcts import MCTS
+from agents.negamax_agent import NegamaxAgent
 from agents.networks.othello_net import OthelloNNet
 from training.alphazero.checkpoint import load_checkpoint, save_best
 from training.alphazero.losses import alphazero_loss
+from training.batch_engine import NO_ACTION, BatchEngine
 
 
 @dataclass
@@ -58,24 +56,18 @@ class TrainConfig:
     best_model: str = "models/alpha_zero_latest.pth"
 
 
-def _initial_board(board_size: int = 8) -> list[list[int]]:
-    board = [[0] * board_size for _ in range(board_size)]
-    mid = board_size // 2
-    board[mid - 1][mid - 1] = 1
-    board[mid][mid] = 1
-    board[mid - 1][mid] = -1
-    board[mid][mid - 1] = -1
-    return board
-
-
-def play_one_selfplay_game(
+def play_selfplay_games(
     net: OthelloNNet,
     cfg: TrainConfig,
-) -> list[tuple[torch.Tensor, torch.Tensor, int]]:
-    """自己対戦を 1 局行い、学習サンプルのリストを返す。
+    n_games: int,
+) -> list[list[tuple[torch.Tensor, torch.Tensor, float]]]:
+    """自己対戦を n_games 局同時に進め、局ごとの学習サンプルを返す。
+
+    盤面・合法手・パス・終局判定は BatchEngine が全局まとめて処理し、
+    各局の着手だけを MCTS で選ぶ。
 
     Returns:
-        [(盤面テンソル (1,1,8,8), π (65,), turn)] のリスト（z は未付与）。
+        局ごとの [(盤面テンソル (1,1,8,8), π (65,), z)] のリスト。
     """
     mcts = MCTS(
         net=net,
@@ -86,67 +78,61 @@ def play_one_selfplay_game(
         dirichlet_eps=cfg.dirichlet_eps,
     )
 
-    board = _initial_board(cfg.board_size)
-    turn = -1
-    samples: list[tuple[torch.Tensor, torch.Tensor, int]] = []
-    move_no = 0
-
-    while True:
-        moves = _valid_moves(board, cfg.board_size, turn)
-        if not moves:
-            if not _valid_moves(board, cfg.board_size, -turn):
-                break
-            turn = -turn
-            continue
+    engine = BatchEngine(n_games, cfg.board_size)
+    samples: list[list[tuple[torch.Tensor, torch.Tensor, int]]] = [[] for _ in range(n_games)]
+
+    while not engine.done.all():
+        actions = np.full(n_games, NO_ACTION, dtype=np.int64)
+        for i in np.flatnonzero(~engine.done):
+            board = engine.boards[i].tolist()
+            turn = int(engine.turns[i])
+            counts = mcts.run(board, turn)
+
+            pi_arr = [0.0] * 65
+            total = sum(counts.values()) or 1
+            for a, n in counts.items():
+                pi_arr[a] = n / total
+            pi_tensor = torch.tensor(pi_arr, dtype=torch.float32)
+            board_tensor = board_to_tensor(board, turn)
+            samples[i].append((board_tensor, pi_tensor, turn))
+
+            # 温度サンプリング（序盤 τ=1、終盤 argmax）
+            if engine.plies[i] < cfg.temp_moves:
+                moves = list(counts.keys())
+                weights = [counts[a] for a in moves]
+                actions[i] = random.choices(moves, weights=weights, k=1)[0]
+            else:
+                actions[i] = max(counts, key=lambda a: counts[a])
 
-        counts = mcts.run(board, turn)
-
-        pi_arr = [0.0] * 65
-        total = sum(counts.values()) or 1
-        for a, n in counts.items():
-            pi_arr[a] = n / total
-        pi_tensor = torch.tensor(pi_arr, dtype=torch.float32)
-        board_tensor = board_to_tensor(board, turn)
-        samples.append((board_tensor, pi_tensor, turn))
-
-        # 温度サンプリング（序盤 τ=1、終盤 argmax）
-        if move_no < cfg.temp_moves:
-            import random
-            actions = list(counts.keys())
-            weights = [counts[a] for a in actions]
-            best_action = random.choices(actions, weights=weights, k=1)[0]
-        else:
-            best_action = max(counts, key=lambda a: counts[a])
+        # 合法手がある局面では MCTS はパスを返さない（パスは engine が処理する）
+        engine.step(actions)
 
-        if best_action != PASS_ACTION:
-            r, c = divmod(best_action, cfg.board_size)
-            flips = _flips_for_move(board, cfg.board_size, r, c, turn)
-            _apply(board, (r, c), flips, turn)
+    # 終局後、z を手番視点で割当
+    results = []
+    for game_samples, winner in zip(samples, engine.winners()):
+        result = []
+        for board_t, pi, t in game_samples:
+            if winner == 0:
+                z = 0.0
+            elif winner == t:
+                z = 1.0
+            else:
+                z = -1.0
+            result.append((board_t, pi, z))
+        results.append(result)
+    return results
 
-        turn = -turn
-        move_no += 1
 
-    # 終局後、z を手番視点で割当
-    black = sum(cell == -1 for row in board for cell in row)
-    white = sum(cell == 1 for row in board for cell in row)
-    if black > white:
-        winner = -1
-    elif white > black:
-        winner = 1
-    else:
-        winner = 0
-
-    result = []
-    for board_t, pi, t in samples:
-        if winner == 0:
-            z = 0.0
-        elif winner == t:
-            z = 1.0
-        else:
-            z = -1.0
-        result.append((board_t, pi, z))
+def play_one_selfplay_game(
+    net: OthelloNNet,
+    cfg: TrainConfig,
+) -> list[tuple[torch.Tensor, torch.Tensor, int]]:
+    """自己対戦を 1 局行い、学習サンプルのリストを返す。
 
-    return result  # type: ignore[return-value]
+    Returns:
+        [(盤面テンソル (1,1,8,8), π (65,), z)] のリスト。
+    """
+    return play_selfplay_games(net, cfg, 1)[0]  # type: ignore[return-value]
 
 
 def arena_vs_negamax(net: OthelloNNet, n_games: int, cfg: TrainConfig) -> float:
@@ -244,11 +230,9 @@ def main(cfg: TrainConfig) -> None:
         # Self-play（推論モードで生成）
         net.eval()
         buffer: list[tuple[torch.Tensor, torch.Tensor, float]] = []
-        for g in range(cfg.games_per_iter):
-            samples = play_one_selfplay_game(net, cfg)
-            buffer.extend(samples)  # type: ignore[arg-type]
-            if (g + 1) % max(1, cfg.games_per_iter // 2) == 0:
-                print(f"  self-play: {g + 1}/{cfg.games_per_iter} 局完了")
+        for game_samples in play_selfplay_games(net, cfg, cfg.games_per_iter):
+            buffer.extend(game_samples)
+        print(f"  self-play: {cfg.games_per_iter}/{cfg.games_per_iter} 局完了")
 
         print(f"  総サンプル数: {len(buffer)}")
 
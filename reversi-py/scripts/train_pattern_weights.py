@@ -5,45 +5,57 @@
     uv run python scripts/train_pattern_weights.py --episodes 1000 --output data/pattern_weights.json
 
 TD(0) アルゴリズムでエッジ・コーナー・対角線パターンの重みを学習する。
+ランダム対戦の棋譜は training.batch_engine.BatchEngine で
+--batch-size 局ずつまとめて生成する。
 """
 import argparse
 import sys
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from agents.random_agent import RandomAgent
 from agents.pattern_evaluator import PatternEvaluator
 from game import Game
+from training.batch_engine import BatchEngine, play_games, random_policy
 
 
-def play_self_play_game(board_size: int = 8) -> list[tuple[list[list[int]], int]]:
-    """ランダム対戦で 1 ゲームを実施し、(盤面, 手番) のリストを返す。
+def play_self_play_games(
+    n_games: int,
+    board_size: int = 8,
+    rng: np.random.Generator | None = None,
+) -> list[tuple[list[tuple[list[list[int]], int]], float]]:
+    """ランダム対戦を n_games 局まとめて実施する。
 
     Args:
+        n_games: 局数。
         board_size: 盤面サイズ。
+        rng: 乱数生成器（None なら毎回異なる乱数）。
 
     Returns:
-        各手の (盤面コピー, 手番) のリスト。
+        局ごとの (各手の (盤面, 手番) のリスト, 最終値（黒視点）) のリスト。
+        パスした手番は記録しない。
     """
-    game = Game(board_size=board_size)
-    black_agent = RandomAgent()
-    white_agent = RandomAgent()
+    engine = BatchEngine(n_games, board_size)
+    trajectories, winners = play_games(engine, random_policy(rng))
+    # winners は -1=黒勝ち / 1=白勝ち なので、黒視点の最終値は符号を反転する
+    return [
+        ([(board.tolist(), turn) for board, turn in states], float(-winner))
+        for states, winner in zip(trajectories, winners)
+    ]
 
-    states = []
-    while not game.game_over:
-        board_copy = [row[:] for row in game.board.board]
-        states.append((board_copy, game.turn))
 
-        agent = black_agent if game.turn == -1 else white_agent
-        move = agent.play(game)
+def play_self_play_game(board_size: int = 8) -> list[tuple[list[list[int]], int]]:
+    """ランダム対戦で 1 ゲームを実施し、(盤面, 手番) のリストを返す。
 
-        if move is not None:
-            game.place_stone(move[0], move[1])
-        game.switch_turn()
-        game.check_game_over()
+    Args:
+        board_size: 盤面サイズ。
 
-    return states
+    Returns:
+        各手の (盤面コピー, 手番) のリスト。
+    """
+    return play_self_play_games(1, board_size)[0][0]
 
 
 def get_final_value(game: Game) -> float:
@@ -72,6 +84,10 @@ def main() -> None:
                         help="出力パス（デフォルト: data/pattern_weights.json）")
     parser.add_argument("--alpha", type=float, default=0.001,
                         help="学習率（デフォルト: 0.001）")
+    parser.add_argument("--batch-size", type=int, default=256,
+                        help="同時に生成する対局数（デフォルト: 256）")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="乱数シード（デフォルト: なし）")
     args = parser.parse_args()
 
     output_path = Path(args.output)
@@ -84,50 +100,29 @@ def main() -> None:
     print(f"学習率: {alpha}")
     print(f"出力: {output_path}")
 
-    for episode in range(args.episodes):
-        # 1 ゲーム実施（ランダム対戦）
-        game = Game(board_size=8)
-        black_agent = RandomAgent()
-        white_agent = RandomAgent()
-
-        states = []
-        while not game.game_over:
-            board_copy = [row[:] for row in game.board.board]
-            states.append((board_copy, game.turn))
-
-            agent = black_agent if game.turn == -1 else white_agent
-            move = agent.play(game)
-
-            if move is not None:
-                game.place_stone(move[0], move[1])
-            game.switch_turn()
-            game.check_game_over()
-
-        # 最終値（黒視点）
-        black, white = game.board.count_stones()
-        if black > white:
-            final_value = 1.0
-        elif white > black:
-            final_value = -1.0
-        else:
-            final_value = 0.0
-
-        # TD(0) 更新
-        for t in range(len(states) - 1):
-            board_t, turn_t = states[t]
-            board_t1, turn_t1 = states[t + 1]
-
-            v_t = evaluator.evaluate(board_t, turn_t)
-            v_t1 = evaluator.evaluate(board_t1, turn_t1) if t + 1 < len(states) else final_value
-            error = v_t1 - v_t
-
-            # 各パターンの重みを更新
-            for pattern_name, squares in evaluator.patterns.items():
-                idx = evaluator.pattern_index(board_t, squares, turn_t)
-                evaluator.weights[pattern_name][idx] += alpha * error
-
-        if (episode + 1) % 100 == 0:
-            print(f"エピソード {episode + 1}/{args.episodes} 完了")
+    rng = np.random.default_rng(args.seed)
+    episode = 0
+    while episode < args.episodes:
+        # ランダム対戦をまとめて生成し、1 局ずつ学習する
+        batch = min(args.batch_size, args.episodes - episode)
+        for states, final_value in play_self_play_games(batch, 8, rng):
+            # TD(0) 更新
+            for t in range(len(states) - 1):
+                board_t, turn_t = states[t]
+                board_t1, turn_t1 = states[t + 1]
+
+                v_t = evaluator.evaluate(board_t, turn_t)
+                v_t1 = evaluator.evaluate(board_t1, turn_t1) if t + 1 < len(states) else final_value
+                error = v_t1 - v_t
+
+                # 各パターンの重みを更新
+                for pattern_name, squares in evaluator.patterns.items():
+                    idx = evaluator.pattern_index(board_t, squares, turn_t)
+                    evaluator.weights[pattern_name][idx] += alpha * error
+
+            episode += 1
+            if episode % 100 == 0:
+                print(f"エピソード {episode}/{args.episodes} 完了")
 
     # 重みを保存
     evaluator.save_weights(str(output_path))
@@ -1,8 +1,11 @@
+import functools
 import logging
 import os
 import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, status
 from fastapi.responses import JSONResponse
@@ -22,12 +25,36 @@ GUI アプリから ApiAgent 経由で REST API で着手を取得する。
 
 REST API：
     POST /play
-        Request: board (List[List[int]]), turn (int), agent_type (str)
+        Request: board (List[List[int]]), turn (int), agent_type (str),
+                 time_left_ms (int, 省略可), increment_ms (int, 省略可),
+                 include_stats (bool, 省略可), session_id (str, 省略可)
         Response: {move: [row, col]} or error
+                  include_stats なら {move, stats: SearchStats.to_dict()}
+    POST /ponder
+        Request: board (List[List[int]]), turn (int), agent_type (str),
+                 session_id (str, 省略可)
+        Response: {pondering: bool}
+        自分が指した直後の局面（相手の手番）を送ると、対応するエージェント
+        （TRANSPOSITION_PONDER を設定した transposition）が次の /play まで探索を続ける
+    POST /analyze
+        Request: board (List[List[int]]), turn (int), agent_type (str),
+                 k (int, 省略可。既定 1), time_left_ms (int, 省略可),
+                 increment_ms (int, 省略可), include_stats (bool, 省略可),
+                 session_id (str, 省略可)
+        Response: {moves: [{move: [row, col], score, pv: [[row, col], ...]}, ...], depth}
+                  include_stats なら {moves, depth, stats: SearchStats.to_dict()}
+        上位 k 手を評価値（手番側から見た値）の高い順に返す（ANALYZE_AGENT_TYPES のみ。
+        定石は引かない）。transposition と pattern は /play と TT を共有する
+
+    transposition と pattern のエージェント（TT とポンダー）は session_id ごとに
+    使い回す。対局ごとに別の session_id を送れば、同時に対局するクライアントどうしの
+    ポンダーと TT は干渉しない。session_id を省略したリクエストはすべて 1 つの
+    エージェントを共有する（1 対局だけを想定した使い方）。
 
 設計：
 - PlayRequest (Pydantic): リクエスト検証
 - _select_agent: agent_type → エージェントインスタンス → 着手
+- _analysis_agent: agent_type → 解析に使うエージェント → 上位 k 手
 """
 
 logger = logging.getLogger(__name__)
@@ -43,6 +70,9 @@ try:
     from agents.gain_agent import GainAgent
     from agents.mcts_agent import MonteCarloTreeSearchAgent
     from agents.negamax_agent import NegamaxAgent
+    from agents.opening_book import BookAgent, OpeningBook
+    from agents.ponder import PONDER_MODES, PonderingAgent
+    from agents.time_manager import TimeManager
     from agents.transposition_negamax_agent import TranspositionNegamaxAgent
     from agents.pattern_agent import PatternAgent
     from agents.alpha_zero_agent import AlphaZeroAgent
@@ -58,15 +88,59 @@ VALID_AGENT_TYPES = frozenset({
     "alphazero_nega6000", "alphazero_nega6000_v2"
 })
 
+# 持ち時間（time_left_ms / increment_ms）で思考時間を決められるエージェント
+CLOCK_AGENT_TYPES = frozenset({"mcts", "negamax", "transposition", "pattern"})
+
+# /ponder でポンダーを始められるエージェント（TRANSPOSITION_PONDER が off なら始めない）
+PONDER_AGENT_TYPES = frozenset({"transposition"})
+
+# /analyze で上位の手を解析できるエージェント
+ANALYZE_AGENT_TYPES = frozenset({"negamax", "transposition", "pattern"})
+
+# session_id の最大長
+MAX_SESSION_ID_LENGTH = 64
+
+# 使い回すエージェントの数の上限の既定値（環境変数 MAX_SHARED_AGENTS で変更）。
+# 超えたら最も長く使われていないものを閉じる
+DEFAULT_MAX_SHARED_AGENTS = 8
+
 # 盤面サイズの許容範囲。巨大盤面による CPU/メモリ枯渇（DoS）を防ぐ
 MIN_BOARD_SIZE = 4
 MAX_BOARD_SIZE = 16
 
 
+class PonderRequest(BaseModel):
+    board: List[List[int]]
+    turn: int
+    agent_type: str = "random"
+    # 使い回すエージェントを分ける対局の識別子（/play と同じ値を送る）
+    session_id: Optional[str] = None
+
+
 class PlayRequest(BaseModel):
     board: List[List[int]]
     turn: int
     agent_type: str = "random"
+    # 対局の残り持ち時間と 1 手ごとの加算（ミリ秒）。指定すると
+    # CLOCK_AGENT_TYPES のエージェントは固定の思考時間の代わりにこれを配分する
+    time_left_ms: Optional[int] = None
+    increment_ms: int = 0
+    # true なら応答に探索統計（SearchStats.to_dict）を含める
+    include_stats: bool = False
+    # 使い回すエージェント（TT・ポンダー）を分ける対局の識別子。省略時は全体で 1 つ
+    session_id: Optional[str] = None
+
+
+class AnalyzeRequest(BaseModel):
+    board: List[List[int]]
+    turn: int
+    agent_type: str = "negamax"
+    # 評価値を求める上位の手の数（合法手の数以上ならすべての手）
+    k: int = 1
+    time_left_ms: Optional[int] = None
+    increment_ms: int = 0
+    include_stats: bool = False
+    session_id: Optional[str] = None
 
 
 def _create_game(board_data: List[List[int]], turn: int) -> Game:
@@ -77,8 +151,139 @@ def _create_game(board_data: List[List[int]], turn: int) -> Game:
     return game
 
 
-def _select_agent(agent_type: str):
-    """agent_type 文字列に対応するエージェントインスタンスを返す。"""
+class _SharedAgent:
+    """リクエストをまたいで 1 つのエージェントを使い回すラッパー。
+
+    TranspositionNegamaxAgent のように前の手の探索結果（TT）を次の手で
+    再利用するエージェント向け。同時に別のリクエストが使用中の場合は、
+    探索状態を壊さないよう使い捨てのエージェントで応答する。
+    属性の参照は内側のエージェントに委譲する。
+
+    Args:
+        factory: 使い回すエージェントを作る関数。
+        fallback: 使用中のときの使い捨てエージェントを作る関数（省略時は factory）。
+    """
+
+    def __init__(
+        self, factory: Callable[[], Any], fallback: Optional[Callable[[], Any]] = None
+    ) -> None:
+        self._factory = fallback or factory
+        self._agent = factory()
+        self._lock = threading.Lock()
+
+    def play(self, game: Game, **kwargs: Any):
+        if not self._lock.acquire(blocking=False):
+            return self._factory().play(game, **kwargs)
+        try:
+            return self._agent.play(game, **kwargs)
+        finally:
+            self._lock.release()
+
+    def play_with_stats(self, game: Game, **kwargs: Any):
+        if not self._lock.acquire(blocking=False):
+            return self._factory().play_with_stats(game, **kwargs)
+        try:
+            return self._agent.play_with_stats(game, **kwargs)
+        finally:
+            self._lock.release()
+
+    def analyze_with_stats(self, game: Game, **kwargs: Any):
+        """analyze を呼び、解析結果とその探索統計を返す（play_with_stats と同じく使用中なら使い捨て）。"""
+        agent = self._agent if self._lock.acquire(blocking=False) else None
+        if agent is None:
+            fallback = self._factory()
+            return fallback.analyze(game, **kwargs), fallback.last_stats
+        try:
+            return agent.analyze(game, **kwargs), agent.last_stats
+        finally:
+            self._lock.release()
+
+    def ponder(self, game: Game) -> bool:
+        """内側のエージェントがポンダーに対応していれば始める（使用中なら始めない）。"""
+        ponder = getattr(self._agent, "ponder", None)
+        if ponder is None or not self._lock.acquire(blocking=False):
+            return False
+        try:
+            return ponder(game)
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        """使用中のリクエストが終わるのを待ってから、内側のエージェントを終了させる。
+
+        ポンダーを止め、ヘルパープロセスを持つエージェントはそれも止める。
+        """
+        close = getattr(self._agent, "close", None)
+        if close is None:
+            return
+        with self._lock:
+            close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._agent, name)
+
+
+# (session_id, エージェントクラス, 引数) -> 使い回すエージェント（最近使った順）
+_shared_agents: "OrderedDict[Tuple[Any, ...], _SharedAgent]" = OrderedDict()
+_shared_agents_lock = threading.Lock()
+
+
+def _shared_agent(
+    agent_class: Callable[..., Any], session_id: Optional[str] = None, **kwargs: Any
+) -> _SharedAgent:
+    """同じ session_id の agent_class(**kwargs) を生成済みなら同じインスタンスを返す。
+
+    workers を指定した場合、使用中のときの使い捨てエージェントは
+    ヘルパープロセスを起動しないよう workers=1 で作る。使い回すエージェントが
+    MAX_SHARED_AGENTS を超えたら、最も長く使われていないものを閉じる。
+    """
+    key = (session_id, agent_class, *sorted(kwargs.items()))
+    limit = max(1, int(os.getenv("MAX_SHARED_AGENTS", str(DEFAULT_MAX_SHARED_AGENTS))))
+    evicted = []
+    with _shared_agents_lock:
+        shared = _shared_agents.get(key)
+        if shared is None:
+            fallback = None
+            if kwargs.get("workers", 1) > 1:
+                fallback = functools.partial(agent_class, **{**kwargs, "workers": 1})
+            shared = _SharedAgent(lambda: agent_class(**kwargs), fallback)
+            _shared_agents[key] = shared
+        else:
+            _shared_agents.move_to_end(key)
+        while len(_shared_agents) > limit:
+            evicted.append(_shared_agents.popitem(last=False)[1])
+    # 使用中なら終わるまで待つので、一覧のロックの外で閉じる
+    for agent in evicted:
+        agent.close()
+    return shared
+
+
+@functools.lru_cache(maxsize=None)
+def _opening_book(path: str) -> Optional[OpeningBook]:
+    """定石ファイルを開く（パスごとに 1 回）。開けなければ警告して None を返す。"""
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"定石ファイルを開けません（定石なしで続行します）: {e}")
+        return None
+
+
+def _with_book(agent: Any) -> Any:
+    """OPENING_BOOK_PATH が設定されていれば、agent を定石付きにして返す。"""
+    path = os.getenv("OPENING_BOOK_PATH")
+    book = _opening_book(path) if path else None
+    return agent if book is None else BookAgent(agent, book)
+
+
+def _select_agent(agent_type: str, session_id: Optional[str] = None):
+    """agent_type 文字列に対応するエージェントインスタンスを返す。
+
+    探索系のエージェント（negamax / transposition / pattern）は、
+    OPENING_BOOK_PATH が設定されていれば定石を引いてから探索する。
+    transposition は TRANSPOSITION_PONDER が predict / all なら、
+    相手の手番にも探索を続ける PonderingAgent を使う。
+    transposition と pattern は session_id ごとに同じエージェントを使い回す。
+    """
     if agent_type == "first":
         return FirstAgent()
     if agent_type == "random":
@@ -88,18 +293,23 @@ def _select_agent(agent_type: str):
     if agent_type == "mcts":
         return MonteCarloTreeSearchAgent()
     if agent_type == "negamax":
-        return NegamaxAgent(
+        return _with_book(NegamaxAgent(
             time_limit_ms=int(os.getenv("NEGAMAX_TIME_LIMIT_MS", "3000"))
-        )
+        ))
     if agent_type == "transposition":
-        return TranspositionNegamaxAgent(
-            time_limit_ms=int(os.getenv("TRANSPOSITION_TIME_LIMIT_MS", "3000"))
+        # TT を手をまたいで持ち越すため、同じ設定のエージェントを使い回す
+        kwargs = _transposition_kwargs()
+        ponder_mode = os.getenv("TRANSPOSITION_PONDER", "off")
+        if ponder_mode in PONDER_MODES:
+            return _with_book(
+                _shared_agent(PonderingAgent, session_id, mode=ponder_mode, **kwargs)
+            )
+        return _with_book(
+            _shared_agent(TranspositionNegamaxAgent, session_id, **kwargs)
         )
     if agent_type == "pattern":
-        return PatternAgent(
-            weights_path=os.getenv("PATTERN_WEIGHTS_PATH", "data/pattern_weights_8x8.json"),
-            time_limit_ms=int(os.getenv("PATTERN_TIME_LIMIT_MS", "3000"))
-        )
+        # transposition と同じ探索コアなので、TT を持ち越すよう使い回す
+        return _with_book(_shared_agent(PatternAgent, session_id, **_pattern_kwargs()))
     if agent_type == "alphazero":
         return AlphaZeroAgent(
             n_simulations=int(os.getenv("ALPHAZERO_N_SIMULATIONS", "50"))
@@ -127,80 +337,150 @@ def _select_agent(agent_type: str):
     return None
 
 
-@app.post("/play")
-def play(request: PlayRequest) -> JSONResponse:
-    """
-    ゲームの盤面・手番・エージェント種別を受け取り、選択された戦略で着手を返すAPIエンドポイント。
+def _transposition_kwargs() -> Dict[str, Any]:
+    """transposition のエージェントの引数（環境変数から）。"""
+    return {
+        "time_limit_ms": int(os.getenv("TRANSPOSITION_TIME_LIMIT_MS", "3000")),
+        "workers": int(os.getenv("TRANSPOSITION_WORKERS", "1")),
+    }
 
-    注記: CPU バウンドな探索（MCTS など）でイベントループをブロックしないよう、
-    あえて同期関数 (def) として定義し、FastAPI のスレッドプールで実行させる。
+
+def _pattern_kwargs() -> Dict[str, Any]:
+    """pattern のエージェントの引数（環境変数から）。"""
+    return {
+        "weights_path": os.getenv("PATTERN_WEIGHTS_PATH", "data/pattern_weights_8x8.json"),
+        "time_limit_ms": int(os.getenv("PATTERN_TIME_LIMIT_MS", "3000")),
+    }
+
+
+def _analysis_agent(agent_type: str, session_id: Optional[str] = None) -> Any:
+    """/analyze で使うエージェントを返す（ANALYZE_AGENT_TYPES のみ）。
+
+    定石は引かずに探索する。transposition と pattern は同じ session_id の /play と
+    同じ使い回しのエージェント（ポンダー中ならポンダーを止めてから解析する）で、
+    TT を /play と共有する。
     """
-    try:
-        data = request.model_dump()
+    if agent_type == "negamax":
+        return NegamaxAgent(time_limit_ms=int(os.getenv("NEGAMAX_TIME_LIMIT_MS", "3000")))
+    if agent_type == "pattern":
+        return _shared_agent(PatternAgent, session_id, **_pattern_kwargs())
+    kwargs = _transposition_kwargs()
+    ponder_mode = os.getenv("TRANSPOSITION_PONDER", "off")
+    if ponder_mode in PONDER_MODES:
+        return _shared_agent(PonderingAgent, session_id, mode=ponder_mode, **kwargs)
+    return _shared_agent(TranspositionNegamaxAgent, session_id, **kwargs)
 
-        board_data = data['board']
-        turn = data['turn']
-        agent_type = data.get('agent_type', 'random')
 
-        if turn not in [-1, 1]:
+def _validated_game(
+    board_data: Any, turn: int, agent_type: str, session_id: Optional[str] = None
+) -> Game:
+    """リクエストの盤面・手番・エージェント種別・session_id を検証し、Game を生成する。
+
+    Raises:
+        HTTPException: 入力が不正な場合（400）、盤面の生成に失敗した場合（500）。
+    """
+    if turn not in [-1, 1]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid input: 'turn' must be -1 or 1."
+        )
+    if session_id is not None and not 0 < len(session_id) <= MAX_SESSION_ID_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Invalid input: 'session_id' must be 1 to "
+                f"{MAX_SESSION_ID_LENGTH} characters."
+            )
+        )
+    if agent_type not in VALID_AGENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Invalid input: 'agent_type' must be one of "
+                f"{sorted(VALID_AGENT_TYPES)}."
+            )
+        )
+    if not isinstance(board_data, list) or not all(
+        isinstance(row, list) for row in board_data
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid input: 'board' must be a list of lists."
+        )
+
+    try:
+        if not board_data or not board_data[0]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid input: 'turn' must be -1 or 1."
+                detail="Invalid input: 'board' cannot be empty."
             )
-        if agent_type not in VALID_AGENT_TYPES:
+        board_size = len(board_data)
+        if not (MIN_BOARD_SIZE <= board_size <= MAX_BOARD_SIZE):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=(
-                    f"Invalid input: 'agent_type' must be one of "
-                    f"{sorted(VALID_AGENT_TYPES)}."
+                    f"Invalid input: 'board' size must be between "
+                    f"{MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}."
                 )
             )
-        if not isinstance(board_data, list) or not all(
-            isinstance(row, list) for row in board_data
-        ):
+        if not all(len(row) == board_size for row in board_data):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid input: 'board' must be a square matrix."
+            )
+        if any(cell not in (-1, 0, 1) for row in board_data for cell in row):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid input: 'board' must be a list of lists."
+                detail="Invalid input: 'board' must contain only -1, 0, or 1."
             )
+        game = _create_game(board_data, turn)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"ボードオブジェクト生成エラー: {e}", exc_info=False)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error processing board data."
+        )
+    return game
 
-        try:
-            if not board_data or not board_data[0]:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid input: 'board' cannot be empty."
-                )
-            board_size = len(board_data)
-            if not (MIN_BOARD_SIZE <= board_size <= MAX_BOARD_SIZE):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=(
-                        f"Invalid input: 'board' size must be between "
-                        f"{MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}."
-                    )
-                )
-            if not all(len(row) == board_size for row in board_data):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid input: 'board' must be a square matrix."
-                )
-            if any(cell not in (-1, 0, 1) for row in board_data for cell in row):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid input: 'board' must contain only -1, 0, or 1."
-                )
-            game = _create_game(board_data, turn)
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"ボードオブジェクト生成エラー: {e}", exc_info=False)
+
+@app.post("/play")
+def play(request: PlayRequest) -> JSONResponse:
+    """
+    ゲームの盤面・手番・エージェント種別を受け取り、選択された戦略で着手を返すAPIエンドポイント。
+
+    注記: CPU バウンドな探索（MCTS など）でイベントループをブロックしないよう、
+    あえて同期関数 (def) として定義し、FastAPI のスレッドプールで実行させる。
+    """
+    try:
+        data = request.model_dump()
+
+        board_data = data['board']
+        turn = data['turn']
+        agent_type = data.get('agent_type', 'random')
+        time_left_ms = data.get('time_left_ms')
+        increment_ms = data.get('increment_ms', 0)
+
+        if (time_left_ms is not None and time_left_ms < 0) or increment_ms < 0:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal server error processing board data."
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid input: 'time_left_ms' and 'increment_ms' must be >= 0."
             )
+        session_id = data.get('session_id')
+        game = _validated_game(board_data, turn, agent_type, session_id)
 
         try:
-            agent = _select_agent(agent_type)
-            move = agent.play(game)
+            agent = _select_agent(agent_type, session_id)
+            kwargs: Dict[str, Any] = {}
+            if time_left_ms is not None and agent_type in CLOCK_AGENT_TYPES:
+                kwargs["time_manager"] = TimeManager(time_left_ms, increment_ms)
+            stats = None
+            if data.get('include_stats'):
+                move, stats = agent.play_with_stats(game, **kwargs)
+                logger.debug(f"探索統計 ({agent_type}): {stats.summary()}")
+            else:
+                move = agent.play(game, **kwargs)
         except Exception as e:
             logger.error(f"エージェント実行エラー: {e}", exc_info=False)
             raise HTTPException(
@@ -209,6 +489,8 @@ def play(request: PlayRequest) -> JSONResponse:
             )
 
         response_move = list(move) if move is not None else None
+        if stats is not None:
+            return JSONResponse({"move": response_move, "stats": stats.to_dict()})
         return JSONResponse({"move": response_move})
 
     except HTTPException:
@@ -221,6 +503,89 @@ def play(request: PlayRequest) -> JSONResponse:
         )
 
 
+@app.post("/analyze")
+def analyze(request: AnalyzeRequest) -> JSONResponse:
+    """
+    盤面・手番・エージェント種別を受け取り、上位 k 手を評価値と読み筋付きで返すAPIエンドポイント。
+
+    /play と同じく CPU バウンドな探索を行うため、同期関数 (def) として定義する。
+    """
+    if request.agent_type not in ANALYZE_AGENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Invalid input: 'agent_type' must be one of "
+                f"{sorted(ANALYZE_AGENT_TYPES)}."
+            )
+        )
+    if request.k < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid input: 'k' must be >= 1."
+        )
+    if (
+        request.time_left_ms is not None and request.time_left_ms < 0
+    ) or request.increment_ms < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid input: 'time_left_ms' and 'increment_ms' must be >= 0."
+        )
+    game = _validated_game(
+        request.board, request.turn, request.agent_type, request.session_id
+    )
+
+    try:
+        agent = _analysis_agent(request.agent_type, request.session_id)
+        kwargs: Dict[str, Any] = {"k": request.k}
+        if request.time_left_ms is not None:
+            kwargs["time_manager"] = TimeManager(request.time_left_ms, request.increment_ms)
+        if isinstance(agent, _SharedAgent):
+            analysis, stats = agent.analyze_with_stats(game, **kwargs)
+        else:
+            analysis = agent.analyze(game, **kwargs)
+            stats = agent.last_stats
+    except Exception as e:
+        logger.error(f"解析エラー: {e}", exc_info=False)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error analyzing position."
+        )
+
+    response: Dict[str, Any] = {
+        "moves": [item.to_dict() for item in analysis],
+        "depth": stats.depth if stats is not None else 0,
+    }
+    if request.include_stats and stats is not None:
+        logger.debug(f"探索統計 ({request.agent_type}, analyze): {stats.summary()}")
+        response["stats"] = stats.to_dict()
+    return JSONResponse(response)
+
+
+@app.post("/ponder")
+def ponder(request: PonderRequest) -> JSONResponse:
+    """
+    自分が指した直後の局面（相手の手番）を受け取り、ポンダーを始めるAPIエンドポイント。
+
+    探索は別スレッドで行うため、すぐに応答する。ポンダーに対応していない
+    エージェント種別では何もせず pondering=false を返す。
+    """
+    game = _validated_game(
+        request.board, request.turn, request.agent_type, request.session_id
+    )
+    if request.agent_type not in PONDER_AGENT_TYPES:
+        return JSONResponse({"pondering": False})
+    try:
+        agent = _select_agent(request.agent_type, request.session_id)
+        start = getattr(agent, "ponder", None)
+        pondering = bool(start(game)) if start is not None else False
+    except Exception as e:
+        logger.error(f"ポンダー開始エラー: {e}", exc_info=False)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error starting ponder."
+        )
+    return JSONResponse({"pondering": pondering})
+
 if __name__ == "__main__":
     import uvicorn
     api_host = os.getenv("API_HOST", "127.0.0.1")
@@ -0,0 +1,127 @@
+"""agents/analysis.py（multi-PV）と、探索エージェントの analyze のテスト。"""
+from typing import Optional, Tuple
+
+import pytest
+
+from agents.analysis import MoveAnalysis, multipv_search
+from agents.negamax_agent import NegamaxAgent
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from game import Game
+from tests.conftest import random_game
+
+DEPTH = 4
+
+FACTORIES = [
+    lambda depth=DEPTH: NegamaxAgent(time_limit_ms=None, max_depth=depth, use_bitboard=True),
+    lambda depth=DEPTH: TranspositionNegamaxAgent(time_limit_ms=None, max_depth=depth,
+                                                  use_bitboard=True, keep_tt=False),
+]
+IDS = ["negamax", "transposition"]
+
+# multipv_search のテストで使う各手の正確な評価値
+VALUES = {(0, 0): 3.0, (0, 1): 9.0, (0, 2): 1.0, (0, 3): 7.0, (0, 4): 9.0, (0, 5): -2.0}
+
+
+def _child(game: Game, move: Tuple[int, int]) -> Game:
+    """game で move を指した後の局面。"""
+    child = Game(board_size=8)
+    child.board.board = [row[:] for row in game.board.board]
+    child.turn = game.turn
+    child.place_stone(*move)
+    child.switch_turn()
+    return child
+
+
+def _child_score(game: Game, move: Tuple[int, int]) -> Optional[float]:
+    """move の評価値を、子局面を素のαβで深さ DEPTH - 1 まで読んで求める（game の手番から見た値）。
+
+    子局面の合法手が 1 つ以下（play が探索しない）なら None。
+    """
+    child = _child(game, move)
+    if len(child.get_valid_moves()) < 2:
+        return None
+    agent = NegamaxAgent(time_limit_ms=None, max_depth=DEPTH - 1, use_bitboard=True,
+                         use_pvs=False, use_aspiration=False, move_ordering=False)
+    agent.play(child)
+    return -agent._root_score
+
+
+class TestMultiPVSearch:
+    """multipv_search の窓の使い方のテスト。"""
+
+    def _search(self, calls: list):
+        def search(move: Tuple[int, int], alpha: float) -> float:
+            calls.append(alpha)
+            return max(VALUES[move], alpha)  # fail-low なら上界（alpha）だけ返す
+        return search
+
+    def test_top_k_are_exact_and_sorted(self) -> None:
+        calls: list = []
+        result = multipv_search(list(VALUES), 2, self._search(calls))
+        # (0, 5) の上界 9.0 は正確な 9.0 の後ろに並ぶ
+        assert result[:3] == [((0, 1), 9.0), ((0, 4), 9.0), ((0, 5), 9.0)]
+        assert [score for _, score in result] == sorted(
+            (score for _, score in result), reverse=True)
+        # 2 手そろうまでは下限なし、その後は 2 番目の評価値を下限にする
+        assert calls == [-float("inf"), -float("inf"), 3.0, 3.0, 7.0, 9.0]
+
+    def test_k_covering_all_moves_gives_exact_scores(self) -> None:
+        result = multipv_search(list(VALUES), 10, self._search([]))
+        assert dict(result) == VALUES
+
+    def test_to_dict(self) -> None:
+        item = MoveAnalysis((2, 3), 1.5, ((2, 3), (2, 2)))
+        assert item.to_dict() == {"move": [2, 3], "score": 1.5, "pv": [[2, 3], [2, 2]]}
+
+
+class TestAnalyze:
+    """探索エージェントの analyze のテスト。"""
+
+    @pytest.mark.parametrize("factory", FACTORIES, ids=IDS)
+    def test_scores_match_separate_searches(self, factory) -> None:
+        checked = 0
+        for seed in range(3):
+            game = random_game(seed, 12)
+            analysis = factory().analyze(game, k=3)
+            assert len(analysis) == 3
+            assert analysis[0].move == factory().play(game)
+            for item in analysis:
+                assert item.pv[0] == item.move
+                expected = _child_score(game, item.move)
+                if expected is not None:
+                    assert item.score == pytest.approx(expected)
+                    checked += 1
+        assert checked >= 6
+
+    @pytest.mark.parametrize("factory", FACTORIES, ids=IDS)
+    def test_large_k_covers_all_moves(self, factory) -> None:
+        game = random_game(4, 12)
+        agent = factory()
+        analysis = agent.analyze(game, k=64)
+        assert sorted(item.move for item in analysis) == sorted(game.get_valid_moves())
+        scores = [item.score for item in analysis]
+        assert scores == sorted(scores, reverse=True)
+        assert agent.last_stats.depth == DEPTH
+        assert agent.last_stats.pv[0] == analysis[0].move
+
+    @pytest.mark.parametrize("factory", FACTORIES, ids=IDS)
+    def test_fewer_nodes_than_separate_searches(self, factory) -> None:
+        # 上位 k 手を決めるには、別々に探索するなら全手の子局面を読む必要がある
+        nodes = separate = 0
+        for seed in range(3):
+            game = random_game(seed, 12)
+            agent = factory(DEPTH + 1)
+            agent.analyze(game, k=2)
+            nodes += agent.last_stats.nodes
+            for move in game.get_valid_moves():
+                _, stats = factory(DEPTH).play_with_stats(_child(game, move))
+                separate += stats.nodes
+        assert nodes < separate
+
+    @pytest.mark.parametrize("factory", FACTORIES, ids=IDS)
+    def test_rejects_bad_k_and_handles_no_moves(self, factory) -> None:
+        with pytest.raises(ValueError):
+            factory().analyze(random_game(0, 4), k=0)
+        game = Game(board_size=8)
+        game.board.board = [[-1] * 8 for _ in range(8)]
+        assert factory().analyze(game, k=3) == []
@@ -99,7 +99,8 @@ class TestApiAgent(unittest.TestCase):
         # 検証
         self.assertEqual(move, (3, 4))
         # requests.post が正しい引数で呼び出されたか確認
-        expected_payload = {'board': [[0]*8]*8, 'turn': -1, 'agent_type': 'random'}
+        expected_payload = {'board': [[0]*8]*8, 'turn': -1, 'agent_type': 'random',
+                            'session_id': self.agent.session_id, 'include_stats': True}
         mock_post.assert_called_once_with(
             self.api_url,
             json=expected_payload,
@@ -125,7 +126,9 @@ class TestApiAgent(unittest.TestCase):
         agent_default_timeout.play(self.mock_game)
 
         # requests.post がデフォルトのtimeout値(5)で呼び出されたか確認
-        expected_payload = {'board': [[0]*8]*8, 'turn': -1, 'agent_type': 'random'}
+        expected_payload = {'board': [[0]*8]*8, 'turn': -1, 'agent_type': 'random',
+                            'session_id': agent_default_timeout.session_id,
+                            'include_stats': True}
         mock_post.assert_called_once_with(
             self.api_url,
             json=expected_payload,
@@ -317,6 +320,60 @@ class TestApiAgent(unittest.TestCase):
             result = self.agent.play(self.mock_game)
             self.assertIsNone(result)
 
+    # --- 探索統計のテスト ---
+    @patch('agents.api_agent.requests.post')
+    def test_play_stores_stats_from_response(self, mock_post):
+        """応答の stats を last_stats に置き、不正な stats は無視する"""
+        mock_post.return_value = Mock(json=Mock(return_value={
+            'move': [3, 4], 'stats': {'nodes': 100, 'elapsed_ms': 50.0, 'depth': 3, 'pv': [[3, 4]]}
+        }))
+        self.assertEqual(self.agent.play(self.mock_game), (3, 4))
+        self.assertEqual(self.agent.last_stats.nodes, 100)
+        self.assertEqual(self.agent.last_stats.pv, ((3, 4),))
+
+        mock_post.return_value = Mock(json=Mock(return_value={'move': [3, 4], 'stats': {'nodes': 'x'}}))
+        self.assertEqual(self.agent.play(self.mock_game), (3, 4))
+        self.assertIsNone(self.agent.last_stats)
+
+    @patch('agents.api_agent.requests.post')
+    def test_play_without_stats_request(self, mock_post):
+        """include_stats=False なら統計を要求しない"""
+        mock_post.return_value = Mock(json=Mock(return_value={'move': [3, 4]}))
+        ApiAgent(api_url=self.api_url, include_stats=False).play(self.mock_game)
+        self.assertNotIn('include_stats', mock_post.call_args.kwargs['json'])
+
+    # --- ponder メソッドのテスト ---
+    @patch('agents.api_agent.requests.post')
+    def test_ponder_posts_to_ponder_endpoint(self, mock_post):
+        """ponder() は同じサーバーの /ponder に局面を送る"""
+        mock_post.return_value = Mock(json=Mock(return_value={'pondering': True}))
+
+        self.assertTrue(self.agent.ponder(self.mock_game))
+
+        expected_payload = {'board': [[0]*8]*8, 'turn': -1, 'agent_type': 'random',
+                            'session_id': self.agent.session_id}
+        mock_post.assert_called_once_with(
+            'http://fake-api.com/ponder',
+            json=expected_payload,
+            timeout=10,
+            verify=True
+        )
+
+    def test_session_id_is_unique_per_agent(self):
+        """session_id を省略したらインスタンスごとに別の値を使う"""
+        self.assertNotEqual(ApiAgent(api_url=self.api_url).session_id, self.agent.session_id)
+        self.assertEqual(ApiAgent(api_url=self.api_url, session_id='game-1').session_id, 'game-1')
+
+    @patch('agents.api_agent.requests.post')
+    def test_ponder_returns_false_on_error(self, mock_post):
+        """通信エラーや /play 以外の URL では False を返す"""
+        mock_post.side_effect = requests.exceptions.ConnectionError()
+        self.assertFalse(self.agent.ponder(self.mock_game))
+
+        mock_post.reset_mock()
+        self.assertFalse(ApiAgent(api_url='http://fake-api.com/move').ponder(self.mock_game))
+        mock_post.assert_not_called()
+
     def test_play_with_invalid_log_level(self):
         """無効なログレベルが設定されている場合をテスト"""
         import os
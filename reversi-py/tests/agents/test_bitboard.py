@@ -0,0 +1,118 @@
+"""agents/bitboard.py（ビットボード着手生成カーネル）のテスト。"""
+import random
+
+import pytest
+
+from agents import bitboard
+from agents.negamax_agent import (
+    NegamaxAgent,
+    _apply,
+    _flips_for_move,
+    _mobility,
+    _move_helpers,
+    _valid_moves,
+)
+from tests.conftest import initial_board
+
+
+def _random_positions(count: int, seed: int = 0) -> list[tuple[list[list[int]], int]]:
+    """初期局面からランダムに進めた (盤面, 手番) を集める（パスも含む）。"""
+    rng = random.Random(seed)
+    positions: list[tuple[list[list[int]], int]] = []
+    board = initial_board()
+    turn = -1
+    while len(positions) < count:
+        positions.append(([row[:] for row in board], turn))
+        moves = _valid_moves(board, 8, turn)
+        if not moves:
+            if not _valid_moves(board, 8, -turn):
+                board, turn = initial_board(), -1   # 終局したら最初から
+                continue
+            turn = -turn
+            continue
+        move = rng.choice(moves)
+        _apply(board, move, _flips_for_move(board, 8, move[0], move[1], turn), turn)
+        turn = -turn
+    return positions
+
+
+class TestConversion:
+    """リスト盤面との相互変換のテスト。"""
+
+    def test_initial_position_bits(self) -> None:
+        player, opponent = bitboard.from_board(initial_board(), -1)
+        assert player == (1 << 28) | (1 << 35)     # 黒: (3, 4), (4, 3)
+        assert opponent == (1 << 27) | (1 << 36)   # 白: (3, 3), (4, 4)
+
+    def test_roundtrip(self) -> None:
+        for board, turn in _random_positions(50):
+            player, opponent = bitboard.from_board(board, turn)
+            assert bitboard.to_board(player, opponent, turn) == board
+
+    def test_iter_bits_ascending(self) -> None:
+        assert list(bitboard.iter_bits(0b1010_0001)) == [0, 5, 7]
+        assert list(bitboard.iter_bits(0)) == []
+
+
+class TestMoveGeneration:
+    """リスト版ヘルパーとの一致を確認する。"""
+
+    def test_initial_legal_moves(self) -> None:
+        player, opponent = bitboard.from_board(initial_board(), -1)
+        moves = bitboard.legal_moves(player, opponent)
+        assert sorted(bitboard.iter_bits(moves)) == [19, 26, 37, 44]
+
+    def test_valid_moves_matches_list_helper(self) -> None:
+        for board, turn in _random_positions(300):
+            assert bitboard.valid_moves(board, 8, turn) == _valid_moves(board, 8, turn)
+
+    def test_flips_match_list_helper(self) -> None:
+        for board, turn in _random_positions(300, seed=1):
+            for r in range(8):
+                for c in range(8):
+                    expected = sorted(_flips_for_move(board, 8, r, c, turn))
+                    assert bitboard.flips_for_move(board, 8, r, c, turn) == expected
+
+    def test_mobility_matches_list_helper(self) -> None:
+        for board, turn in _random_positions(200, seed=3):
+            assert bitboard.mobility(board, 8, turn) == _mobility(board, 8, turn)
+
+    def test_no_wraparound_across_edges(self) -> None:
+        """行の端をまたいで挟んだことにしない。"""
+        board = [[0] * 8 for _ in range(8)]
+        board[0][7] = 1     # 白（0 行目の右端）
+        board[1][0] = -1    # 黒（1 行目の左端 = ビット上は隣）
+        assert bitboard.flips_for_move(board, 8, 1, 1, -1) == []
+        assert bitboard.valid_moves(board, 8, -1) == []
+
+    def test_moves_with_flips(self) -> None:
+        for board, turn in _random_positions(100, seed=2):
+            expected = [
+                (m, sorted(_flips_for_move(board, 8, m[0], m[1], turn)))
+                for m in _valid_moves(board, 8, turn)
+            ]
+            assert bitboard.moves_with_flips(board, turn) == expected
+
+
+class TestAgentOptIn:
+    """エージェントのビットボード切り替えのテスト。"""
+
+    def test_move_helpers_fall_back_on_other_sizes(self) -> None:
+        assert _move_helpers(8, True).valid_moves is bitboard.valid_moves
+        assert _move_helpers(6, True).valid_moves is _valid_moves
+        assert _move_helpers(8, False).valid_moves is _valid_moves
+
+    @pytest.mark.parametrize("index", [0, 10, 25])
+    def test_negamax_same_move_with_bitboard(self, index: int) -> None:
+        """固定深さなら着手生成を切り替えても同じ手を選ぶ。"""
+        from game import Game
+        board, turn = _random_positions(30, seed=3)[index]
+        game = Game(board_size=8)
+        game.board.board = board
+        game.turn = turn
+        if not game.get_valid_moves():
+            pytest.skip("パス局面")
+        plain = NegamaxAgent(time_limit_ms=10**9, max_depth=3)
+        fast = NegamaxAgent(time_limit_ms=10**9, max_depth=3, use_bitboard=True)
+        assert fast.play(game) == plain.play(game)
+        assert fast._nodes_checked == plain._nodes_checked
@@ -0,0 +1,137 @@
+"""agents/endgame_solver.py（終盤完全読み切り）のテスト。"""
+import random
+
+import pytest
+
+from agents import bitboard
+from agents.endgame_solver import EndgameSolver, EndgameTimeout, solve_board
+from agents.negamax_agent import NegamaxAgent
+
+
+def _minimax(player: int, opponent: int, passed: bool = False) -> int:
+    """枝刈りなしの全探索による最終石差（参照実装）。"""
+    moves = bitboard.legal_moves(player, opponent)
+    if not moves:
+        if passed:
+            return player.bit_count() - opponent.bit_count()
+        return -_minimax(opponent, player, passed=True)
+    best = -65
+    for sq in bitboard.iter_bits(moves):
+        f = bitboard.flips(player, opponent, sq)
+        best = max(best, -_minimax(opponent ^ f, player | f | (1 << sq)))
+    return best
+
+
+def _random_position(empties: int, seed: int) -> tuple[int, int]:
+    """初期局面からランダムに進め、空きが empties 個の局面（手番側, 相手側）を返す。"""
+    rng = random.Random(seed)
+    while True:
+        player, opponent = 0x0000000810000000, 0x0000001008000000
+        while 64 - (player | opponent).bit_count() > empties:
+            moves = bitboard.legal_moves(player, opponent)
+            if not moves:
+                if not bitboard.legal_moves(opponent, player):
+                    break   # 途中で終局したらやり直す
+                player, opponent = opponent, player
+                continue
+            sq = rng.choice(list(bitboard.iter_bits(moves)))
+            f = bitboard.flips(player, opponent, sq)
+            player, opponent = opponent ^ f, player | f | (1 << sq)
+        else:
+            return player, opponent
+
+
+class TestEndgameSolver:
+    """参照実装との一致と各モードのテスト。"""
+
+    @pytest.mark.parametrize("seed", range(40))
+    def test_matches_minimax(self, seed: int) -> None:
+        # 空き 1-3 の専用ルーチン、パリティ順の浅いノード、fastest-first の深いノードを通す
+        player, opponent = _random_position(1 + seed % 9, seed)
+        expected = _minimax(player, opponent)
+        result = EndgameSolver().solve(player, opponent)
+        assert result.score == expected
+        if result.move is not None:
+            f = bitboard.flips(player, opponent, result.move)
+            assert f
+            child = -_minimax(opponent ^ f, player | f | (1 << result.move))
+            assert child == expected   # 最善手は実際にその石差を達成する
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_wld_sign(self, seed: int) -> None:
+        player, opponent = _random_position(2 + seed % 7, seed + 100)
+        expected = _minimax(player, opponent)
+        score = EndgameSolver().solve(player, opponent, wld=True).score
+        assert (score > 0) == (expected > 0)
+        assert (score < 0) == (expected < 0)
+
+    def test_pass_and_unfillable_square(self) -> None:
+        # 空きは (0, 0) のみで、白 1 石はその縦横斜めの線上にない。
+        # 黒は打てず、白も打てない → そのまま終局
+        board = [[-1] * 8 for _ in range(8)]
+        board[0][0] = 0
+        board[6][7] = 1
+        score, move = solve_board(board, 1)
+        assert move is None
+        assert score == 1 - 62
+
+    def test_side_to_move_passes(self) -> None:
+        # 手番側（白）に合法手がなく、黒だけが最後の 1 マスに打てる
+        board = [[-1] * 8 for _ in range(8)]
+        board[0][0] = 0
+        board[0][1] = 1
+        score, move = solve_board(board, 1)
+        assert move is None
+        assert score == 0 - 64
+
+    def test_timeout(self) -> None:
+        player, opponent = _random_position(20, 0)
+        with pytest.raises(EndgameTimeout):
+            EndgameSolver(deadline=0.0).solve(player, opponent)
+
+    def test_node_limit(self) -> None:
+        player, opponent = _random_position(20, 0)
+        solver = EndgameSolver(node_limit=10_000)
+        with pytest.raises(EndgameTimeout):
+            solver.solve(player, opponent)
+        assert 10_000 <= solver.nodes < 10_000 + 4096
+
+
+class TestNegamaxAgentEndgame:
+    """NegamaxAgent からの終盤ソルバー利用のテスト。"""
+
+    def _game(self, empties: int, seed: int):
+        from game import Game
+        player, opponent = _random_position(empties, seed)
+        game = Game(board_size=8)
+        game.board.board = bitboard.to_board(player, opponent, -1)
+        game.turn = -1
+        return game, player, opponent
+
+    def test_solver_move_is_optimal(self) -> None:
+        game, player, opponent = self._game(9, 3)
+        agent = NegamaxAgent(time_limit_ms=10**9)
+        move = agent.play(game)
+        assert move is not None
+        expected = _minimax(player, opponent)
+        sq = move[0] * 8 + move[1]
+        f = bitboard.flips(player, opponent, sq)
+        assert -_minimax(opponent ^ f, player | f | (1 << sq)) == expected
+        assert agent._last_depth == 9
+
+    def test_wld_mode_keeps_result(self) -> None:
+        # 勝敗だけを読む設定でも、選んだ手の勝敗は最善と同じ
+        game, player, opponent = self._game(8, 5)
+        agent = NegamaxAgent(time_limit_ms=10**9, solver_empties=0, solver_wld_empties=8)
+        move = agent.play(game)
+        assert move is not None
+        sq = move[0] * 8 + move[1]
+        f = bitboard.flips(player, opponent, sq)
+        value = -_minimax(opponent ^ f, player | f | (1 << sq))
+        expected = _minimax(player, opponent)
+        assert (value > 0, value < 0) == (expected > 0, expected < 0)
+
+    def test_solver_timeout_falls_back_to_search(self) -> None:
+        game, _, _ = self._game(24, 1)
+        agent = NegamaxAgent(time_limit_ms=1, solver_empties=30)
+        assert agent.play(game) in game.get_valid_moves()
@@ -0,0 +1,107 @@
+"""agents/eval_cache.py（評価キャッシュ）と、それを使う探索エージェントのテスト。"""
+
+import pytest
+
+from agents.eval_cache import ENTRY_BYTES, EvalCache, slot_count
+from agents.negamax_agent import NegamaxAgent, _EvalState, _apply, _undo
+from agents.pattern_agent import PatternAgent
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from agents.zobrist import compute_hash
+from game import Game
+from tests.conftest import random_game
+
+
+class TestEvalCache:
+    """格納・置換・統計のテスト。"""
+
+    def test_size_is_power_of_two_within_limit(self) -> None:
+        cache = EvalCache(1)
+        assert cache.nbytes == cache.slots * ENTRY_BYTES <= 2**20
+        assert cache.slots & (cache.slots - 1) == 0
+        assert slot_count(0) == 2
+
+    def test_empty_cache_misses_every_key(self) -> None:
+        cache = EvalCache(0.001)
+        for key in range(2 * cache.slots):
+            assert cache.probe(key, -1) is None
+            assert cache.probe(key, 1) is None
+
+    def test_store_and_probe_by_side_to_move(self) -> None:
+        cache = EvalCache(0.001)
+        cache.store(12345, -1, 2.5)
+        assert cache.probe(12345, -1) == 2.5
+        assert cache.probe(12345, 1) is None
+        cache.store(12345, 1, -7.0)
+        assert cache.probe(12345, 1) == -7.0
+
+    def test_collision_replaces_entry(self) -> None:
+        cache = EvalCache(0.001)
+        other = 5 + cache.slots  # 同じスロット
+        cache.store(5, -1, 1.0)
+        cache.store(other, -1, 2.0)
+        assert cache.probe(5, -1) is None
+        assert cache.probe(other, -1) == 2.0
+
+    def test_stats_and_clear(self) -> None:
+        cache = EvalCache(0.001)
+        cache.store(3, -1, 1.0)
+        cache.probe(3, -1)
+        cache.probe(4, -1)
+        stats = cache.stats
+        assert (stats.probes, stats.hits, stats.stores) == (2, 1, 1)
+        assert stats.hit_rate == 0.5
+        cache.clear()
+        assert cache.probe(3, -1) is None
+        cache.reset_stats()
+        assert cache.stats.probes == 0
+
+
+class TestEvalStateHash:
+    """_EvalState のハッシュの差分更新のテスト。"""
+
+    def test_hash_follows_apply_and_undo(self) -> None:
+        game = random_game(3, 10)
+        board = [row[:] for row in game.board.board]
+        state = _EvalState(board, 8, hashed=True)
+        start = state.hash
+        assert start == compute_hash(board, 8)
+        move = game.get_valid_moves()[0]
+        flips = NegamaxAgent()._helpers.flips_for_move(board, 8, move[0], move[1], game.turn)
+        _apply(board, move, flips, game.turn, state)
+        assert state.hash == compute_hash(board, 8)
+        _undo(board, move, flips, game.turn, state)
+        assert state.hash == start
+
+    def test_unhashed_state_keeps_zero(self) -> None:
+        board = Game(board_size=8).board.board
+        state = _EvalState(board, 8)
+        assert state.hash == 0
+
+
+class TestAgentsWithEvalCache:
+    """評価キャッシュの有無で探索結果が変わらないことのテスト。"""
+
+    @pytest.mark.parametrize("factory", [
+        lambda mb: NegamaxAgent(time_limit_ms=10**6, max_depth=4, use_bitboard=True,
+                                eval_cache_mb=mb),
+        lambda mb: TranspositionNegamaxAgent(time_limit_ms=10**6, max_depth=4,
+                                             use_bitboard=True, eval_cache_mb=mb),
+        lambda mb: PatternAgent(time_limit_ms=10**6, max_depth=3, use_bitboard=True,
+                                eval_cache_mb=mb),
+    ], ids=["negamax", "transposition", "pattern"])
+    def test_same_moves_and_reports_hits(self, factory) -> None:
+        games = [random_game(seed, 12) for seed in range(3)]
+        without = factory(0)
+        with_cache = factory(1)
+        hits = 0
+        for game in games:
+            assert without.play(game) == with_cache.play(game)
+            assert without.last_stats.eval_probes == 0
+            assert with_cache.last_stats.eval_probes > 0
+            hits += with_cache.last_stats.eval_hits
+        assert hits > 0
+
+    def test_negamax_uses_cache_by_default(self) -> None:
+        agent = NegamaxAgent(time_limit_ms=10**6, max_depth=3)
+        _, stats = agent.play_with_stats(random_game(0, 8))
+        assert stats.eval_probes > 0
@@ -0,0 +1,75 @@
+"""agents/lazy_smp.py（Lazy SMP 並列探索）のテスト。"""
+import threading
+import time
+
+from agents.lazy_smp import LazySMPPool
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from agents.transposition_table import EXACT
+from game import Game
+
+
+class TestLazySMPPool:
+    """ヘルパープロセスと共有 TT のテスト。"""
+
+    def test_helpers_write_into_shared_table(self) -> None:
+        pool = LazySMPPool(2, 1.0, {"time_limit_ms": 10**9, "max_depth": 4,
+                                    "use_bitboard": True, "tt_size_mb": 0})
+        try:
+            game = Game(board_size=8)
+            pool.start(game.board.get_board(), game.turn, pool.table.generation,
+                       time.monotonic() + 60)
+            threading.Event().wait(0.5)
+            results = pool.stop()
+            assert len(results) == 2
+            assert all(r.depth >= 1 for r in results)
+            # メイン側では何も書いていないので、埋まったエントリはヘルパーが書いたもの
+            assert any(pool.table.bounds[i] for i in range(pool.table.slots))
+        finally:
+            pool.close()
+        assert all(not p.is_alive() for p in pool._processes)
+
+
+class TestLazySMPAgent:
+    """TranspositionNegamaxAgent(workers=N) のテスト。"""
+
+    def test_play_with_workers(self) -> None:
+        agent = TranspositionNegamaxAgent(time_limit_ms=300, use_bitboard=True, workers=3)
+        try:
+            game = Game(board_size=8)
+            for _ in range(2):
+                move = agent.play(game)
+                assert move is not None and move in game.get_valid_moves()
+                assert agent._last_depth >= 1
+                assert len(agent._helper_results) == 2
+                game.place_stone(*move)
+                game.switch_turn()
+            assert agent._pool is not None and agent._tt is agent._pool.table
+        finally:
+            agent.close()
+        assert agent._pool is None
+        assert agent.play(Game(board_size=8)) is not None   # close 後は単独で探索する
+
+    def test_stop_event_ends_helper_search(self) -> None:
+        agent = TranspositionNegamaxAgent()
+        agent._deadline = float("inf")
+        stop = threading.Event()
+        assert agent._tt is not None
+        agent._attach_shared_tt(agent._tt, stop)
+        assert not agent._time_exceeded()
+        stop.set()
+        assert agent._time_exceeded()
+
+    def test_helper_prepare_keeps_shared_entries(self) -> None:
+        """ヘルパーは共有 TT を消さず、世代だけメインに合わせる。"""
+        agent = TranspositionNegamaxAgent()
+        agent._prepare_search(8)
+        tt = agent._tt
+        assert tt is not None
+        tt.store(12345, 3, EXACT, 1.0)
+        agent._prepare_search(8, generation=7)
+        assert tt.generation == 7
+        assert tt.get(12345) is not None
+        other = TranspositionNegamaxAgent()
+        other._tt = tt
+        other._prepare_search(6, generation=7)   # 初回（盤面サイズ変更）でも消さない
+        assert tt.get(12345) is not None
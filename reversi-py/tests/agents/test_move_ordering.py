@@ -0,0 +1,106 @@
+"""agents/move_ordering.py（Killer・History・カウンター手）と、それを使う探索のテスト。"""
+import random
+
+import pytest
+
+from agents.move_ordering import NO_MOVE, MoveOrdering
+from agents.negamax_agent import NegamaxAgent
+from agents.pattern_agent import PatternAgent
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from tests.conftest import random_game
+
+
+class TestMoveOrdering:
+    """記録と並べ替えのテスト。"""
+
+    def test_killers_keep_two_newest_per_ply(self) -> None:
+        ordering = MoveOrdering(8)
+        ordering.record_cutoff((2, 3), ply=1, turn=-1, depth=3)
+        ordering.record_cutoff((2, 3), ply=1, turn=-1, depth=3)
+        assert ordering.killers[1] == [19, NO_MOVE]  # 同じ手は 2 つ目に入らない
+        ordering.record_cutoff((5, 4), ply=1, turn=-1, depth=3)
+        ordering.record_cutoff((0, 0), ply=1, turn=-1, depth=3)
+        assert ordering.killers[1] == [0, 44]
+        assert ordering.killers[0] == [NO_MOVE, NO_MOVE]
+
+    def test_history_and_counters_are_per_color(self) -> None:
+        ordering = MoveOrdering(8)
+        ordering.record_cutoff((2, 3), ply=0, turn=1, depth=4, prev=37)
+        assert ordering.history[1][19] == 1 << 2
+        assert ordering.history[0][19] == 0
+        assert ordering.counters[1][37] == 19
+        assert ordering.counters[0][37] == NO_MOVE
+
+    def test_sort_priority(self) -> None:
+        ordering = MoveOrdering(8)
+        ordering.killers[2] = [3 * 8 + 3, 4 * 8 + 4]
+        ordering.counters[0][10] = 5 * 8 + 5
+        ordering.history[0][6 * 8 + 6] = 100
+        moves = [(0, 1), (6, 6), (5, 5), (4, 4), (3, 3), (0, 0)]
+        ordered = ordering.sort(moves, ply=2, turn=-1, tt_move=(0, 0), prev=10)
+        assert ordered == [(0, 0), (3, 3), (4, 4), (5, 5), (6, 6), (0, 1)]
+        # 優先度のない手は渡した順のまま
+        assert ordering.sort([(0, 2), (0, 1)], ply=0, turn=-1) == [(0, 2), (0, 1)]
+
+    def test_new_search_decays_or_clears(self) -> None:
+        ordering = MoveOrdering(8)
+        ordering.record_cutoff((2, 3), ply=0, turn=-1, depth=6, prev=1)
+        ordering.new_search(1)
+        assert ordering.killers[0] == [NO_MOVE, NO_MOVE]
+        assert ordering.history[0][19] == 4
+        assert ordering.counters[0][1] == 19
+        ordering.new_search(None)
+        assert ordering.history[0][19] == 0
+        assert ordering.counters[0][1] == NO_MOVE
+
+    def test_without_history_only_killers_and_counters_move_up(self) -> None:
+        ordering = MoveOrdering(8, use_history=False)
+        ordering.record_cutoff((2, 3), ply=0, turn=-1, depth=6)
+        assert ordering.history[0][19] == 0
+        assert ordering.sort([(0, 1), (2, 3)], ply=0, turn=-1) == [(2, 3), (0, 1)]
+        assert ordering.sort([(0, 1), (2, 3)], ply=1, turn=-1) == [(0, 1), (2, 3)]
+
+
+class TestSearchWithOrdering:
+    """手順付けの有無・ETC・浅い探索による並べ替えで最善手が変わらないことのテスト。"""
+
+    @pytest.mark.parametrize("kwargs", [
+        {"etc_min_depth": 2},
+        {"shallow_min_depth": 3},
+    ], ids=["etc", "shallow"])
+    def test_transposition_options_keep_best_move(self, kwargs) -> None:
+        for seed in range(3):
+            game = random_game(seed, 12)
+            base = TranspositionNegamaxAgent(time_limit_ms=10**6, max_depth=4,
+                                             use_bitboard=True, keep_tt=False)
+            other = TranspositionNegamaxAgent(time_limit_ms=10**6, max_depth=4,
+                                              use_bitboard=True, keep_tt=False, **kwargs)
+            assert base.play(game) == other.play(game)
+
+    @pytest.mark.parametrize("factory", [
+        lambda on: NegamaxAgent(time_limit_ms=10**6, max_depth=4, use_bitboard=True,
+                                move_ordering=on),
+        lambda on: PatternAgent(time_limit_ms=10**6, max_depth=3, use_bitboard=True,
+                                move_ordering=on),
+    ], ids=["negamax", "pattern"])
+    def test_same_move_and_reports_cutoffs(self, factory) -> None:
+        # パターン重みが 0 だと全手同値で、並べ方次第で選ぶ手が変わる
+        game = random_game(1, 12)
+        without = factory(False)
+        with_ordering = factory(True)
+        for agent in (without, with_ordering):
+            evaluator = getattr(agent, "_evaluator", None)
+            if evaluator is not None:
+                rng = random.Random(0)
+                for weights in evaluator.weights.values():
+                    weights[:] = [rng.uniform(-1, 1) for _ in range(len(weights))]
+        assert without.play(game) == with_ordering.play(game)
+        stats = with_ordering.last_stats
+        assert 0 < stats.first_move_cutoffs <= stats.cutoffs
+        assert 0.0 < stats.first_move_cutoff_rate <= 1.0
+
+    def test_transposition_reports_first_move_cutoffs(self) -> None:
+        agent = TranspositionNegamaxAgent(time_limit_ms=10**6, max_depth=5)
+        _, stats = agent.play_with_stats(random_game(2, 10))
+        assert 0 < stats.first_move_cutoffs <= stats.cutoffs
+        assert stats.to_dict()["first_move_cutoff_rate"] == stats.first_move_cutoff_rate
@@ -43,23 +43,16 @@ class TestBuildWeightTable:
         assert _build_weight_table(8) is _build_weight_table(8)
 
 
-def _initial_board(n: int = 8) -> list:
-    """初期配置の盤面を作る（board.py の Board.__init__ と同一配置）。"""
-    board = [[0] * n for _ in range(n)]
-    h = n // 2
-    board[h - 1][h - 1] = board[h][h] = 1       # 白
-    board[h - 1][h] = board[h][h - 1] = -1      # 黒
-    return board
-
-
 from agents.negamax_agent import (
     _PHASE_COEFFS,
+    _EvalState,
     _disc_diff,
     _evaluate,
     _phase_coeffs,
     _stable_edge_count,
     _terminal_score,
 )
+from tests.conftest import initial_board, random_game
 
 
 class TestEvaluation:
@@ -67,7 +60,7 @@ class TestEvaluation:
 
     def test_phase_coeffs_three_stages(self) -> None:
         n = 8
-        early = _initial_board(n)                      # 4 石 → fill 0.0625
+        early = initial_board(n)                       # 4 石 → fill 0.0625
         mid = [[-1] * n for _ in range(4)] + [[0] * n for _ in range(4)]  # fill 0.5
         late = [[-1] * n for _ in range(7)] + [[0] * n]                   # fill 0.875
         assert _phase_coeffs(early, n) == _PHASE_COEFFS[0]
@@ -87,34 +80,85 @@ class TestEvaluation:
         assert _stable_edge_count(board, 8, -1) == 0
 
     def test_disc_diff(self) -> None:
-        board = _initial_board(8)
+        board = initial_board(8)
         board[0][0] = -1
         assert _disc_diff(board, -1) == 1
         assert _disc_diff(board, 1) == -1
 
     def test_terminal_score_scale(self) -> None:
-        board = _initial_board(8)
+        board = initial_board(8)
         board[0][0] = -1
         assert _terminal_score(board, -1) == 10000
         assert _terminal_score(board, 1) == -10000
 
     def test_evaluate_is_symmetric(self) -> None:
         """同一局面で手番を入れ替えると符号が反転する。"""
-        board = _initial_board(8)
+        board = initial_board(8)
         board[2][3] = -1
         assert _evaluate(board, 8, -1) == pytest.approx(-_evaluate(board, 8, 1))
 
     def test_evaluate_prefers_corner(self) -> None:
         """角を持つ側の評価が高い。"""
-        board = _initial_board(8)
+        board = initial_board(8)
         with_corner = [row[:] for row in board]
         with_corner[0][0] = -1
         assert _evaluate(with_corner, 8, -1) > _evaluate(board, 8, -1)
 
 
+class TestEvalState:
+    """差分更新する評価項（_EvalState）のテスト。"""
+
+    @staticmethod
+    def _assert_matches_scan(state: _EvalState, board: list, n: int) -> None:
+        fresh = _EvalState(board, n)
+        assert (state.pos, state.disc, state.empties, state.corners) == (
+            fresh.pos, fresh.disc, fresh.empties, fresh.corners
+        )
+
+    @pytest.mark.parametrize("n", [6, 8, 10])
+    def test_apply_undo_tracks_board(self, n: int) -> None:
+        """ランダムな手順の _apply / _undo で走査し直した値と一致し続ける。"""
+        import random
+        rng = random.Random(n)
+        board = initial_board(n)
+        state = _EvalState(board, n)
+        history = []
+        turn = -1
+        for _ in range(n * n):
+            moves = _valid_moves(board, n, turn)
+            if not moves:
+                if not _valid_moves(board, n, -turn):
+                    break
+                turn = -turn
+                continue
+            move = rng.choice(moves)
+            flips = _flips_for_move(board, n, move[0], move[1], turn)
+            _apply(board, move, flips, turn, state)
+            history.append((move, flips, turn))
+            self._assert_matches_scan(state, board, n)
+            turn = -turn
+        while history:
+            move, flips, turn = history.pop()
+            _undo(board, move, flips, turn, state)
+            self._assert_matches_scan(state, board, n)
+        assert board == initial_board(n)
+
+    def test_evaluate_with_state_matches_scan(self) -> None:
+        board = initial_board(8)
+        board[0][0] = -1
+        board[2][3] = 1
+        state = _EvalState(board, 8)
+        for turn in (-1, 1):
+            assert _evaluate(board, 8, turn, state=state) == _evaluate(board, 8, turn)
+
+
+import time
 from unittest.mock import Mock
 
-from agents.negamax_agent import NegamaxAgent, _SearchTimeout
+from agents.endgame_solver import EndgameSolver, EndgameTimeout
+from agents.negamax_agent import NegamaxAgent
+from agents.search_core import _SearchTimeout
+from agents.search_primitives import _move_helpers
 
 
 def _make_game(board: list, turn: int) -> Mock:
@@ -137,6 +181,17 @@ def _deterministic_agent(depth: int = 3) -> NegamaxAgent:
     return NegamaxAgent(time_limit_ms=10**9, max_depth=depth)
 
 
+def _search(agent: NegamaxAgent, board: list, n: int, turn: int, depth: int) -> float:
+    """agent の _negamax で board を全窓探索した評価値（手番 turn 側から見た値）。"""
+    agent._deadline = float("inf")
+    agent._prepare_search(n)
+    agent._helpers = _move_helpers(n, False)
+    agent._state = _EvalState(board, n)
+    value, _ = agent._negamax(board, n, turn, depth, float("-inf"), float("inf"),
+                              agent._compute_initial_hash(board, n), False)
+    return value
+
+
 class TestNegamaxAgentPlay:
     """NegamaxAgent.play の振る舞いテスト。"""
 
@@ -146,12 +201,12 @@ class TestNegamaxAgentPlay:
         assert _deterministic_agent().play(game) is None
 
     def test_single_move_returned_without_search(self) -> None:
-        game = _make_game(_initial_board(8), turn=-1)
+        game = _make_game(initial_board(8), turn=-1)
         game.get_valid_moves.return_value = [(2, 3)]
         assert _deterministic_agent().play(game) == (2, 3)
 
     def test_returns_legal_move_from_initial_position(self) -> None:
-        game = _make_game(_initial_board(8), turn=-1)
+        game = _make_game(initial_board(8), turn=-1)
         move = _deterministic_agent().play(game)
         assert move in game.board.get_valid_moves(-1)
 
@@ -170,13 +225,13 @@ class TestNegamaxAgentPlay:
     def test_returns_legal_move_with_tiny_time_limit(self) -> None:
         """time_limit_ms=1 でも depth 1 の結果で合法手を返す。"""
         agent = NegamaxAgent(time_limit_ms=1)
-        game = _make_game(_initial_board(8), turn=-1)
+        game = _make_game(initial_board(8), turn=-1)
         move = agent.play(game)
         assert move in game.board.get_valid_moves(-1)
 
     def test_deterministic_same_input_same_output(self) -> None:
-        game1 = _make_game(_initial_board(8), turn=-1)
-        game2 = _make_game(_initial_board(8), turn=-1)
+        game1 = _make_game(initial_board(8), turn=-1)
+        game2 = _make_game(initial_board(8), turn=-1)
         assert _deterministic_agent().play(game1) == _deterministic_agent().play(game2)
 
 
@@ -199,8 +254,37 @@ class TestEndgameAndPass:
         n = 4
         inner = [row[:] for row in board]
         agent._deadline = float("inf")
-        agent._node_count = 0
-        assert agent._search_root(inner, n, -1, depth=1, endgame=True) == (2, 2)
+        agent._prepare_search(n)
+        agent._helpers = _move_helpers(n, False)
+        agent._state = _EvalState(inner, n)
+        h = agent._compute_initial_hash(inner, n)
+        value, move = agent._search_root(inner, n, -1, 1, h)
+        assert move == (2, 2)
+        assert value == 160000.0   # 黒視点: 石差 +16 × 10000
+
+    def test_solver_timeout_falls_back_to_search(self, monkeypatch) -> None:
+        """終盤ソルバーは思考時間の一部だけを使い、時間切れなら反復深化の手を返す。
+
+        時間切れのソルバーがルートで読み終えた手（best_move）は最善とは限らないので使わない。
+        """
+        game = random_game(2, 46)   # 空き 14（勝敗読みの範囲）
+        expected = NegamaxAgent(time_limit_ms=None, max_depth=3, solver_empties=0,
+                                solver_wld_empties=0).play(game)
+        other = next(move for move in game.get_valid_moves() if move != expected)
+        deadlines = []
+
+        def timeout(solver, player, opponent, wld=False, alpha=-64, beta=64):
+            deadlines.append(solver.deadline)
+            solver.best_move = other[0] * 8 + other[1]
+            raise EndgameTimeout()
+
+        monkeypatch.setattr(EndgameSolver, "solve", timeout)
+        agent = NegamaxAgent(time_limit_ms=10**6, max_depth=3)
+        start = time.monotonic()
+        move, stats = agent.play_with_stats(game)
+        assert (move, stats.depth) == (expected, 3)
+        assert len(deadlines) == 1
+        assert deadlines[0] < start + 10**3 * 0.6   # 持ち時間 1000 秒の半分まで
 
     def test_negamax_pass_switches_turn_without_consuming_depth(self) -> None:
         """手番側に合法手がなく相手にある局面では手番交代して探索を続ける。
@@ -214,10 +298,7 @@ class TestEndgameAndPass:
         # 黒に合法手なし、白に (0, 2) の合法手あり
         # 白が着手後、黒にも合法手がない（ダブルパス）→ 終局スコアが返される
         agent = _deterministic_agent()
-        agent._deadline = float("inf")
-        agent._node_count = 0
-        value = agent._negamax(board, 4, -1, 2, float("-inf"), float("inf"),
-                               endgame=False, passed=False)
+        value = _search(agent, board, 4, -1, 2)
         # ダブルパス → 終局スコア（10000 倍）が返される
         # 黒視点で石差 -3（白 3 石、黒 0 石） → -30000
         assert value == -30000.0
@@ -227,29 +308,84 @@ class TestEndgameAndPass:
         board = [[0] * 4 for _ in range(4)]
         board[0][0] = -1   # 黒石 1 つのみ → どちらも着手不能
         agent = _deterministic_agent()
-        agent._deadline = float("inf")
-        agent._node_count = 0
-        value = agent._negamax(board, 4, -1, 3, float("-inf"), float("inf"),
-                               endgame=False, passed=False)
+        value = _search(agent, board, 4, -1, 3)
         assert value == 10000.0   # 黒視点: 石差 +1 × 10000
 
 
+class TestPrincipalVariationSearch:
+    """PVS とアスピレーション窓のテスト（結果を変えずに切り替えられること）。"""
+
+    @pytest.mark.parametrize("use_pvs, use_aspiration", [
+        (True, False), (False, True), (True, True),
+    ])
+    @pytest.mark.parametrize("seed, plies", [(0, 12), (1, 20), (2, 44)])
+    def test_same_result_as_plain_search(
+        self, use_pvs: bool, use_aspiration: bool, seed: int, plies: int
+    ) -> None:
+        game = random_game(seed, plies)
+        # 終盤ソルバーを切り、固定深さの探索どうしを比べる
+        plain = NegamaxAgent(time_limit_ms=10**9, max_depth=4, solver_empties=0,
+                             solver_wld_empties=0, use_pvs=False, use_aspiration=False)
+        agent = NegamaxAgent(time_limit_ms=10**9, max_depth=4, solver_empties=0,
+                             solver_wld_empties=0, use_pvs=use_pvs,
+                             use_aspiration=use_aspiration)
+        assert agent.play(game) == plain.play(game)
+        assert agent._root_score == plain._root_score
+        assert agent._last_depth == plain._last_depth == 4
+
+    def test_narrow_aspiration_window_researches(self, monkeypatch) -> None:
+        """窓を外しても広げて再探索し、通常の窓と同じ結果になる。"""
+        game = random_game(3, 16)
+        plain = NegamaxAgent(time_limit_ms=10**9, max_depth=3, use_aspiration=False)
+        agent = NegamaxAgent(time_limit_ms=10**9, max_depth=3, aspiration_window=0.01)
+        windows = []
+        original = agent._search_root
+
+        def spy(*args, **kwargs):
+            windows.append((kwargs.get("alpha"), kwargs.get("beta")))
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(agent, "_search_root", spy)
+        assert agent.play(game) == plain.play(game)
+        assert agent._root_score == plain._root_score
+        assert len(windows) > 3   # 深さ 2, 3 のどこかで窓を外して再探索した
+
+    def test_pvs_null_window_fail_low_skips_research(self, monkeypatch) -> None:
+        """ヌルウィンドウで alpha を超えない手は再探索しない。"""
+        agent = _deterministic_agent()
+        agent._deadline = float("inf")
+        calls = []
+
+        def fake_negamax(board, n, turn, depth, alpha, beta, h, passed, ply, prev):
+            calls.append((alpha, beta))
+            return 5.0, None   # 親から見て -5（alpha=0 を超えない）
+
+        monkeypatch.setattr(agent, "_negamax", fake_negamax)
+        board = initial_board(8)
+        score = agent._search_child(board, 8, -1, 3, 0.0, 10.0, 0, first=False)
+        assert score == -5.0
+        assert calls == [(-1.0, -0.0)]
+
+
 class TestTimeManagement:
     """時間管理と _SearchTimeout のテスト。"""
 
     def test_negamax_raises_timeout_when_deadline_passed(self) -> None:
         agent = NegamaxAgent(time_limit_ms=10**9)
+        board = initial_board(8)
+        agent._prepare_search(8)
+        agent._helpers = _move_helpers(8, False)
+        agent._state = _EvalState(board, 8)
         agent._deadline = 0.0           # 過去のデッドライン
-        agent._node_count = 511         # 次のノードで時刻チェックが走る
-        board = _initial_board(8)
+        agent._nodes_checked = 511      # 次のノードで時刻チェックが走る
         with pytest.raises(_SearchTimeout):
             agent._negamax(board, 8, -1, 3, float("-inf"), float("inf"),
-                           endgame=False, passed=False)
+                           agent._compute_initial_hash(board, 8), False)
 
     def test_play_survives_mid_search_timeout(self, monkeypatch) -> None:
         """深さ 2 以降で時間切れになっても depth 1 の手を返す。"""
         agent = NegamaxAgent(time_limit_ms=10**9, max_depth=10)
-        game = _make_game(_initial_board(8), turn=-1)
+        game = _make_game(initial_board(8), turn=-1)
         original = agent._search_root
         calls = {"n": 0}
 
@@ -271,22 +407,22 @@ class TestSearchPrimitives:
         """モジュール内の合法手生成が Board.get_valid_moves と一致する。"""
         from board import Board
         b = Board(board_size=8)
-        board = _initial_board(8)
+        board = initial_board(8)
         assert _valid_moves(board, 8, -1) == b.get_valid_moves(-1)
         assert _valid_moves(board, 8, 1) == b.get_valid_moves(1)
 
     def test_flips_for_move_initial_position(self) -> None:
-        board = _initial_board(8)
+        board = initial_board(8)
         # 黒 (turn=-1) が (2, 3) に打つと (3, 3) の白が返る
         assert _flips_for_move(board, 8, 2, 3, -1) == [(3, 3)]
 
     def test_flips_for_occupied_cell_is_empty(self) -> None:
-        board = _initial_board(8)
+        board = initial_board(8)
         assert _flips_for_move(board, 8, 3, 3, -1) == []
 
     def test_apply_undo_roundtrip(self) -> None:
         """_apply して _undo すると盤面が完全に元へ戻る。"""
-        board = _initial_board(8)
+        board = initial_board(8)
         snapshot = [row[:] for row in board]
         flips = _flips_for_move(board, 8, 2, 3, -1)
         _apply(board, (2, 3), flips, -1)
@@ -0,0 +1,146 @@
+"""agents/opening_book.py（定石ファイルと BookAgent）のテスト。"""
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import Mock
+
+import pytest
+
+from agents import position_key as pk
+from agents.negamax_agent import NegamaxAgent
+from agents.opening_book import BookAgent, OpeningBook, build_book, write_book
+from game import Game
+from utils.perft import initial_position
+
+
+def _game(board: list[list[int]], turn: int) -> Game:
+    game = Game(board_size=len(board))
+    game.board.board = [row[:] for row in board]
+    game.turn = turn
+    return game
+
+
+@pytest.fixture(scope="module")
+def entries() -> dict[pk.PositionKey, tuple[int, int]]:
+    """8x8 の 4 手分の定石（深さ 2 の NegamaxAgent）。"""
+    agent = NegamaxAgent(time_limit_ms=10 ** 6, max_depth=2, use_bitboard=True)
+    return build_book(agent, 4, initial_position(8))
+
+
+@pytest.fixture
+def book(tmp_path: Path, entries: dict[pk.PositionKey, tuple[int, int]]) -> Iterator[OpeningBook]:
+    path = tmp_path / "book.bin"
+    write_book(str(path), 8, entries)
+    book = OpeningBook(str(path))
+    yield book
+    book.close()
+
+
+class TestBuildBook:
+    """定石の作成のテスト。"""
+
+    def test_counts_canonical_positions(self, entries: dict[pk.PositionKey, tuple[int, int]]) -> None:
+        # 0-3 手目の正規化後の局面数は 1, 1, 3, 14
+        assert len(entries) == 19
+
+    def test_moves_are_legal(self, entries: dict[pk.PositionKey, tuple[int, int]]) -> None:
+        for key, move in entries.items():
+            assert move in _game(pk.key_to_board(key), key.turn).get_valid_moves()
+
+    def test_zero_plies_is_empty(self) -> None:
+        assert build_book(Mock(), 0, initial_position(8)) == {}
+
+    def test_rejects_large_board(self) -> None:
+        with pytest.raises(ValueError):
+            build_book(Mock(), 1, initial_position(10))
+
+
+class TestOpeningBook:
+    """ファイルの書き出しと参照のテスト。"""
+
+    def test_len(self, book: OpeningBook) -> None:
+        assert len(book) == 19
+
+    def test_lookup_matches_entries(
+        self, book: OpeningBook, entries: dict[pk.PositionKey, tuple[int, int]]
+    ) -> None:
+        for key, move in entries.items():
+            assert book.lookup(pk.key_to_board(key), key.turn) == move
+
+    @pytest.mark.parametrize("sym", range(pk.NUM_SYMMETRIES))
+    def test_lookup_in_any_orientation(
+        self, book: OpeningBook, entries: dict[pk.PositionKey, tuple[int, int]], sym: int
+    ) -> None:
+        for key in entries:
+            board = pk.key_to_board(pk.transform_key(key, sym))
+            move = book.lookup(board, key.turn)
+            assert move is not None
+            assert move in _game(board, key.turn).get_valid_moves()
+
+    def test_miss(self, book: OpeningBook) -> None:
+        board, turn = initial_position(8)
+        assert book.lookup(board, -turn) is None  # 手番違い
+        board[0][0] = 1
+        assert book.lookup(board, turn) is None
+        assert book.lookup(initial_position(6)[0], turn) is None  # サイズ違い
+
+    def test_empty_book(self, tmp_path: Path) -> None:
+        path = tmp_path / "empty.bin"
+        assert write_book(str(path), 8, {}) == 0
+        book = OpeningBook(str(path))
+        assert len(book) == 0
+        assert book.lookup(*initial_position(8)) is None
+        book.close()
+
+    def test_small_board(self, tmp_path: Path) -> None:
+        agent = NegamaxAgent(time_limit_ms=10 ** 6, max_depth=2)
+        path = tmp_path / "book6.bin"
+        write_book(str(path), 6, build_book(agent, 3, initial_position(6)))
+        book = OpeningBook(str(path))
+        board, turn = initial_position(6)
+        assert book.lookup(board, turn) in _game(board, turn).get_valid_moves()
+        assert book.lookup(*initial_position(8)) is None
+        book.close()
+
+    def test_rejects_mismatched_size(self, tmp_path: Path) -> None:
+        key = pk.position_key(initial_position(6)[0], -1)
+        with pytest.raises(ValueError):
+            write_book(str(tmp_path / "bad.bin"), 8, {key: (1, 2)})
+
+    @pytest.mark.parametrize("data", [b"", b"XXXX" + bytes(8), b"RVOB\x01\x08\x00\x00\x00\x00\x00\x02"])
+    def test_rejects_invalid_file(self, tmp_path: Path, data: bytes) -> None:
+        path = tmp_path / "bad.bin"
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            OpeningBook(str(path))
+
+
+class TestBookAgent:
+    """BookAgent のテスト。"""
+
+    def test_hit_skips_search(self, book: OpeningBook) -> None:
+        inner = Mock()
+        board, turn = initial_position(8)
+        move = BookAgent(inner, book).play(_game(board, turn))
+        assert move in _game(board, turn).get_valid_moves()
+        inner.play.assert_not_called()
+
+    def test_miss_falls_through(self, book: OpeningBook) -> None:
+        inner = Mock(**{"play.return_value": (2, 3)})
+        board, turn = initial_position(8)
+        game = _game(board, -turn)
+        assert BookAgent(inner, book).play(game) == (2, 3)
+        inner.play.assert_called_once_with(game)
+
+    def test_illegal_book_move_falls_through(self, tmp_path: Path) -> None:
+        board, turn = initial_position(8)
+        key, _ = pk.canonical_key(board, turn)
+        path = tmp_path / "bad_move.bin"
+        write_book(str(path), 8, {key: (0, 0)})
+        book = OpeningBook(str(path))
+        inner = Mock(**{"play.return_value": (2, 3)})
+        assert BookAgent(inner, book).play(_game(board, turn)) == (2, 3)
+        book.close()
+
+    def test_delegates_attributes(self, book: OpeningBook) -> None:
+        inner = NegamaxAgent(time_limit_ms=123)
+        assert BookAgent(inner, book).time_limit_ms == 123
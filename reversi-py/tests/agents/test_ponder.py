@@ -0,0 +1,146 @@
+"""agents/ponder.py（相手の手番のあいだも探索を続けるエージェント）のテスト。"""
+import threading
+import time
+
+import pytest
+
+from agents.ponder import PonderingAgent, _PonderTimer
+from agents.time_manager import MoveTimer, TimeManager
+from game import Game
+
+
+def _after(game: Game, move: tuple[int, int]) -> Game:
+    """game の局面で move を指した後の局面を返す。"""
+    child = Game(board_size=game.board_size)
+    child.board.board = [row[:] for row in game.board.board]
+    child.turn = game.turn
+    assert child.place_stone(*move)
+    child.switch_turn()
+    return child
+
+
+@pytest.fixture
+def agent():
+    agent = PonderingAgent(time_limit_ms=100, max_ponder_ms=2000, use_bitboard=True)
+    yield agent
+    agent.close()
+
+
+def _pondered(agent: PonderingAgent) -> Game:
+    """初期局面で 1 手指してポンダーを始め、相手の手番の局面を返す。"""
+    game = Game(board_size=8)
+    move = agent.play(game)
+    assert move is not None
+    game = _after(game, move)
+    assert agent.ponder(game)
+    time.sleep(0.2)
+    return game
+
+
+def test_rejects_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        PonderingAgent(mode="none")
+
+
+def test_ponderhit_returns_pondered_move(agent: PonderingAgent) -> None:
+    game = _pondered(agent)
+    assert agent._position is not None
+    predicted = Game(board_size=8)
+    predicted.board.board = [row[:] for row in agent._position[0]]
+    predicted.turn = agent._position[1]
+
+    start = time.monotonic()
+    move = agent.play(predicted)
+    elapsed = time.monotonic() - start
+
+    assert agent.last_ponderhit
+    assert move in predicted.get_valid_moves()
+    assert agent._thread is None
+    # ポンダーで思考時間（100 ms）を使い切っているので、すぐに返る
+    assert elapsed < 0.1
+    assert predicted.board.board != game.board.board
+
+
+def test_ponderhit_timer_keeps_every_iteration() -> None:
+    """ponderhit の前後に終わった反復をすべて本物の timer に渡し、期限で探索を止める。"""
+    stop = threading.Event()
+    ponder_timer = _PonderTimer(stop)
+    recorded = []
+
+    class _Recorder(MoveTimer):
+        def iteration_done(self, move, score=None) -> None:
+            recorded.append(move)
+            super().iteration_done(move, score)
+
+    def iterate() -> None:
+        for depth in range(2000):
+            ponder_timer.iteration_done((depth % 8, 0), float(depth))
+
+    thread = threading.Thread(target=iterate)
+    thread.start()
+    timer = _Recorder.fixed(10**6)
+    ponder_timer.hit(timer)
+    thread.join()
+    assert recorded == [(depth % 8, 0) for depth in range(2000)]
+    assert not ponder_timer.is_set()
+    timer.deadline = time.monotonic()
+    assert ponder_timer.is_set()
+
+
+def test_miss_stops_and_searches(agent: PonderingAgent) -> None:
+    game = _pondered(agent)
+    assert agent._position is not None
+    replies = [m for m in game.get_valid_moves() if _after(game, m).board.board != agent._position[0]]
+    child = _after(game, replies[0])
+
+    move = agent.play(child)
+
+    assert not agent.last_ponderhit
+    assert move in child.get_valid_moves()
+    assert agent._thread is None
+    assert agent._stop_event is None
+
+
+def test_all_mode_warms_every_reply() -> None:
+    agent = PonderingAgent(mode="all", time_limit_ms=100, max_ponder_ms=2000, use_bitboard=True)
+    game = _pondered(agent)
+    assert agent._position is None
+    assert agent._last_depth > 0
+    child = _after(game, game.get_valid_moves()[-1])
+    assert agent.play(child) in child.get_valid_moves()
+    assert not agent.last_ponderhit
+    agent.close()
+
+
+def test_ponderhit_charges_only_time_after_play(agent: PonderingAgent) -> None:
+    _pondered(agent)
+    assert agent._position is not None
+    predicted = Game(board_size=8)
+    predicted.board.board = [row[:] for row in agent._position[0]]
+    predicted.turn = agent._position[1]
+    tm = TimeManager(10_000)
+
+    start = time.monotonic()
+    assert agent.play(predicted, time_manager=tm) in predicted.get_valid_moves()
+    elapsed_ms = (time.monotonic() - start) * 1000
+    assert agent.last_ponderhit
+    # ポンダーした 200 ms は持ち時間から引かない
+    assert 10_000 - elapsed_ms <= tm.remaining_ms < 10_000
+
+
+def test_no_ponder_without_opponent_moves(agent: PonderingAgent) -> None:
+    game = Game(board_size=8)
+    game.board.board = [[1] * 8 for _ in range(8)]
+    game.board.board[0][0] = 0
+    assert not agent.ponder(game)
+    assert agent._thread is None
+
+
+def test_max_ponder_ms_stops_search() -> None:
+    agent = PonderingAgent(time_limit_ms=100, max_ponder_ms=50, use_bitboard=True)
+    game = Game(board_size=8)
+    agent.ponder(game)
+    assert agent._thread is not None
+    agent._thread.join(timeout=2.0)
+    assert not agent._thread.is_alive()
+    agent.close()
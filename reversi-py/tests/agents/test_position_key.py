@@ -0,0 +1,115 @@
+"""agents/position_key.py（局面キーと対称性による正規化）のテスト。"""
+import random
+
+import pytest
+
+from agents import position_key as pk
+from agents.negamax_agent import _apply, _flips_for_move, _valid_moves
+from tests.conftest import initial_board
+
+
+def _random_board(n: int, rng: random.Random) -> list[list[int]]:
+    """石をランダムに置いた n×n 盤面（合法性は問わない）。"""
+    return [[rng.choice((-1, 0, 0, 1)) for _ in range(n)] for _ in range(n)]
+
+
+def _transform_board(board: list[list[int]], sym: int) -> list[list[int]]:
+    """座標変換 transform_move で盤面を素直に写す（検証用の参照実装）。"""
+    n = len(board)
+    result = [[0] * n for _ in range(n)]
+    for r in range(n):
+        for c in range(n):
+            tr, tc = pk.transform_move(sym, (r, c), n)
+            result[tr][tc] = board[r][c]
+    return result
+
+
+class TestPositionKey:
+    """キー生成と逆変換のテスト。"""
+
+    def test_initial_position(self) -> None:
+        board = initial_board(8)
+        key = pk.position_key(board, -1)
+        assert key == pk.PositionKey(8, (1 << 28) | (1 << 35), (1 << 27) | (1 << 36), -1)
+
+    @pytest.mark.parametrize("n", [4, 6, 8, 10])
+    def test_roundtrip(self, n: int) -> None:
+        rng = random.Random(n)
+        for _ in range(20):
+            board = _random_board(n, rng)
+            assert pk.key_to_board(pk.position_key(board, 1)) == board
+
+    def test_turn_distinguishes_keys(self) -> None:
+        board = _random_board(8, random.Random(0))
+        assert pk.position_key(board, 1) != pk.position_key(board, -1)
+        assert len({pk.position_key(board, 1), pk.position_key(board, 1)}) == 1
+
+
+class TestSymmetry:
+    """対称変換と正規化のテスト。"""
+
+    @pytest.mark.parametrize("n", [4, 5, 8, 9])
+    def test_transform_key_matches_board_transform(self, n: int) -> None:
+        # 8x8 のシフト版と汎用の対応表版がどちらも座標変換と一致すること
+        rng = random.Random(n)
+        for _ in range(10):
+            board = _random_board(n, rng)
+            key = pk.position_key(board, -1)
+            for sym in range(pk.NUM_SYMMETRIES):
+                expected = pk.position_key(_transform_board(board, sym), -1)
+                assert pk.transform_key(key, sym) == expected
+
+    @pytest.mark.parametrize("n", [6, 8])
+    def test_inverse_transform_move(self, n: int) -> None:
+        for sym in range(pk.NUM_SYMMETRIES):
+            for r in range(n):
+                for c in range(n):
+                    moved = pk.transform_move(sym, (r, c), n)
+                    assert pk.inverse_transform_move(sym, moved, n) == (r, c)
+
+    def test_eight_distinct_transforms(self) -> None:
+        board = _random_board(8, random.Random(1))
+        key = pk.position_key(board, 1)
+        assert len({pk.transform_key(key, sym) for sym in range(8)}) == 8
+
+    def test_symmetric_positions_share_canonical_key(self) -> None:
+        rng = random.Random(2)
+        for n in (4, 8):
+            board = _random_board(n, rng)
+            canonical, _ = pk.canonical_key(board, 1)
+            for sym in range(pk.NUM_SYMMETRIES):
+                other, _ = pk.canonical_key(_transform_board(board, sym), 1)
+                assert other == canonical
+
+    def test_canonical_sym_maps_to_canonical(self) -> None:
+        board = _random_board(8, random.Random(3))
+        canonical, sym = pk.canonical_key(board, -1)
+        assert pk.transform_key(pk.position_key(board, -1), sym) == canonical
+        assert canonical == min(
+            pk.transform_key(pk.position_key(board, -1), s) for s in range(8)
+        )
+
+    def test_initial_position_folds_openings(self) -> None:
+        # 初手 4 通りは対称変換で全て同じ局面になる
+        board = initial_board(8)
+        keys = set()
+        for r, c in _valid_moves(board, 8, -1):
+            after = [row[:] for row in board]
+            _apply(after, (r, c), _flips_for_move(after, 8, r, c, -1), -1)
+            keys.add(pk.canonical_key(after, 1)[0])
+        assert len(keys) == 1
+
+    def test_moves_map_back_to_legal_moves(self) -> None:
+        # 代表元の合法手を元の座標に戻すと、元の局面の合法手集合と一致する
+        rng = random.Random(4)
+        for _ in range(20):
+            board = _random_board(8, rng)
+            canonical, sym = pk.canonical_key(board, 1)
+            moves = _valid_moves(pk.key_to_board(canonical), 8, 1)
+            mapped = sorted(pk.inverse_transform_move(sym, m, 8) for m in moves)
+            assert mapped == _valid_moves(board, 8, 1)
+            assert sorted(pk.move_to_canonical(sym, m, 8) for m in mapped) == moves  # type: ignore[type-var]
+
+    def test_pass_move_is_preserved(self) -> None:
+        assert pk.move_from_canonical(5, None, 8) is None
+        assert pk.move_to_canonical(5, None, 8) is None
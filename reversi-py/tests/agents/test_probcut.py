@@ -0,0 +1,130 @@
+"""agents/probcut.py（Multi-ProbCut の回帰係数）と、それを使う探索エージェントのテスト。"""
+import random
+
+import pytest
+
+from agents.negamax_agent import NegamaxAgent
+from agents.probcut import ProbCutPair, ProbCutTable, fit_pair
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from tests.conftest import random_game
+
+
+def _table(sigma: float, size: int = 8) -> ProbCutTable:
+    """全段階で v = v' の 4:2 / 3:1 の係数（sigma が大きいほど刈らない）。"""
+    return ProbCutTable(size, 10, [
+        (phase, ProbCutPair(depth, depth - 2, 1.0, 0.0, sigma, 100))
+        for phase in range(7)
+        for depth in (3, 4)
+    ])
+
+
+class TestFit:
+    """回帰と表の組み立てのテスト。"""
+
+    def test_fit_pair_recovers_line(self) -> None:
+        xs = [float(x) for x in range(-10, 11)]
+        ys = [2.0 * x + 3.0 for x in xs]
+        pair = fit_pair(6, 2, xs, ys)
+        assert pair.slope == pytest.approx(2.0)
+        assert pair.intercept == pytest.approx(3.0)
+        assert pair.sigma == pytest.approx(0.0, abs=1e-9)
+        assert pair.samples == len(xs)
+
+    def test_fit_pair_rejects_degenerate_samples(self) -> None:
+        with pytest.raises(ValueError):
+            fit_pair(6, 2, [1.0], [1.0])
+        with pytest.raises(ValueError):
+            fit_pair(6, 2, [1.0, 1.0, 1.0], [0.0, 1.0, 2.0])
+
+    def test_bounds(self) -> None:
+        pair = ProbCutPair(6, 2, 2.0, 10.0, 5.0)
+        # a * v' + b >= beta + t * sigma  <=>  v' >= (beta + t * sigma - b) / a
+        assert pair.high_bound(100.0, 2.0) == pytest.approx(50.0)
+        assert pair.low_bound(-100.0, 2.0) == pytest.approx(-60.0)
+
+    def test_table_fit_groups_by_phase_and_drops_weak_pairs(self) -> None:
+        rng = random.Random(0)
+        records = []
+        for _ in range(60):
+            x = rng.uniform(-50, 50)
+            records.append((35, {2: x, 6: x + rng.gauss(0, 1), 4: -x}))
+        records.append((55, {2: 1.0, 6: 2.0, 4: 0.0}))
+        table = ProbCutTable.fit(records, [(6, 2), (4, 2)], 8, phase_width=10, min_samples=20)
+        # 4:2 は傾きが負、空き 55 の段階はサンプル不足なので入らない
+        assert [(phase, pair.depth, pair.shallow) for phase, pair in table.pairs()] == [(3, 6, 2)]
+        assert table.checks(6, 39) == table.checks(6, 30) != ()
+        assert table.checks(6, 40) == ()
+        assert table.min_depth == 6
+
+    def test_checks_are_tried_shallow_first(self) -> None:
+        table = ProbCutTable(8, 10, [
+            (3, ProbCutPair(8, 4, 1.0, 0.0, 1.0)),
+            (3, ProbCutPair(8, 2, 1.0, 0.0, 1.0)),
+        ])
+        assert [pair.shallow for pair in table.checks(8, 30)] == [2, 4]
+        assert len(table) == 2
+
+
+class TestPersistence:
+    """JSON への保存と読み込みのテスト。"""
+
+    def test_round_trip(self, tmp_path) -> None:
+        table = _table(12.5)
+        path = str(tmp_path / "probcut.json")
+        table.save(path)
+        loaded = ProbCutTable.load(path)
+        assert loaded.board_size == 8
+        assert loaded.phase_width == 10
+        assert loaded.pairs() == table.pairs()
+
+    def test_rejects_unknown_version_and_missing_keys(self) -> None:
+        data = _table(1.0).to_dict()
+        with pytest.raises(ValueError):
+            ProbCutTable.from_dict({**data, "version": 99})
+        with pytest.raises(ValueError):
+            ProbCutTable.from_dict({"version": data["version"], "pairs": []})
+
+
+class TestAgentsWithProbCut:
+    """ProbCut を使う探索のテスト。"""
+
+    @pytest.mark.parametrize("factory", [
+        lambda table: NegamaxAgent(time_limit_ms=10**6, max_depth=5, use_bitboard=True,
+                                   probcut=table),
+        lambda table: TranspositionNegamaxAgent(time_limit_ms=10**6, max_depth=5,
+                                                use_bitboard=True, keep_tt=False, probcut=table),
+    ], ids=["negamax", "transposition"])
+    def test_never_cutting_table_keeps_move(self, factory) -> None:
+        for seed in range(3):
+            game = random_game(seed, 10)
+            move = factory(None).play(game)
+            agent = factory(_table(1e9))
+            assert agent.play(game) == move
+            assert agent.last_stats.probcut_cuts == 0
+
+    @pytest.mark.parametrize("factory", [
+        lambda table: NegamaxAgent(time_limit_ms=10**6, max_depth=5, use_bitboard=True,
+                                   probcut=table),
+        lambda table: TranspositionNegamaxAgent(time_limit_ms=10**6, max_depth=5,
+                                                use_bitboard=True, keep_tt=False, probcut=table),
+    ], ids=["negamax", "transposition"])
+    def test_cutting_table_prunes_nodes(self, factory) -> None:
+        nodes = {False: 0, True: 0}
+        cuts = 0
+        for seed in range(3):
+            game = random_game(seed, 10)
+            for use in (False, True):
+                agent = factory(_table(0.0) if use else None)
+                move, stats = agent.play_with_stats(game)
+                assert move in game.get_valid_moves()
+                nodes[use] += stats.nodes
+                if use:
+                    cuts += stats.probcut_cuts
+        assert cuts > 0
+        assert nodes[True] < nodes[False]
+
+    def test_other_board_size_is_not_pruned(self) -> None:
+        agent = NegamaxAgent(time_limit_ms=10**6, max_depth=4, probcut=_table(0.0, size=8))
+        agent.play(random_game(0, 4, board_size=6))
+        assert agent.last_stats is not None
+        assert agent.last_stats.probcut_cuts == 0
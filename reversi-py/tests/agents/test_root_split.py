@@ -0,0 +1,44 @@
+"""agents/root_split.py（NegamaxAgent のルート分割並列探索）のテスト。"""
+
+import pytest
+
+from agents.negamax_agent import NegamaxAgent
+from tests.conftest import random_game
+
+
+@pytest.fixture(scope="module")
+def parallel():
+    agent = NegamaxAgent(time_limit_ms=10**9, max_depth=4, solver_empties=0,
+                         solver_wld_empties=0, root_workers=2)
+    yield agent
+    agent.close()
+
+
+class TestRootSplit:
+    """直列探索との一致と時間切れのテスト。"""
+
+    @pytest.mark.parametrize("seed, plies", [(0, 0), (1, 12), (2, 20), (3, 28), (4, 40)])
+    def test_same_result_as_serial(self, parallel: NegamaxAgent, seed: int, plies: int) -> None:
+        # plies=0 は 4 手とも同じ評価値になる初期局面（同点は前の手を選ぶ）
+        game = random_game(seed, plies)
+        serial = NegamaxAgent(time_limit_ms=10**9, max_depth=4, solver_empties=0,
+                              solver_wld_empties=0, use_aspiration=False)
+        assert parallel.play(game) == serial.play(game)
+        assert parallel._root_score == serial._root_score
+        assert parallel._last_depth == serial._last_depth == 4
+        assert parallel._split is not None   # 深さ 4 はワーカーで探索している
+
+    def test_timeout_returns_shallower_move(self, parallel: NegamaxAgent) -> None:
+        game = random_game(5, 20)
+        agent = NegamaxAgent(time_limit_ms=50, root_workers=2)
+        agent._split = parallel._split   # 起動済みのワーカーを借りる
+        try:
+            assert agent.play(game) in game.get_valid_moves()
+            assert agent._last_depth < 60
+        finally:
+            agent._split = None
+
+    def test_shallow_depths_stay_serial(self) -> None:
+        agent = NegamaxAgent(time_limit_ms=10**9, max_depth=3, root_workers=4)
+        agent.play(random_game(6, 16))
+        assert agent._split is None   # 深さ 3 まではワーカーを起動しない
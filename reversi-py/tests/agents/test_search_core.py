@@ -0,0 +1,138 @@
+"""agents/search_core.py（評価関数を差し替えられる探索コア）と evaluators.py のテスト。"""
+import random
+from typing import List
+
+import pytest
+
+from agents.evaluators import PatternLeafEvaluator
+from agents.negamax_agent import HEURISTIC, NegamaxAgent, _EvalState, _MoveHelpers
+from agents.pattern_agent import PatternAgent
+from agents.pattern_evaluator import PatternEvaluator
+from agents.search_core import SearchCore
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from game import Game
+from tests.conftest import random_game
+
+
+class _DiscEvaluator:
+    """手番側から見た石差で評価する LeafEvaluator（呼ばれた回数も数える）。"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def evaluate(
+        self,
+        board: List[List[int]],
+        n: int,
+        turn: int,
+        state: _EvalState,
+        helpers: _MoveHelpers,
+    ) -> float:
+        self.calls += 1
+        return float(turn * state.disc)
+
+
+def _pattern_agent(**kwargs) -> PatternAgent:
+    """重みを乱数（シード固定）で埋めた、固定深さの PatternAgent（重みが 0 だと全手同値になる）。"""
+    agent = PatternAgent(time_limit_ms=None, max_depth=4, use_bitboard=True, **kwargs)
+    rng = random.Random(0)
+    for weights in agent._evaluator.weights.values():
+        weights[:] = [rng.uniform(-1, 1) for _ in range(len(weights))]
+    return agent
+
+
+def _greedy_moves(game: Game) -> List[tuple]:
+    """反転数が最大の手（1 手読みで石差が最大になる手）。"""
+    counts = {move: len(game.board.get_flipped_stones(*move, game.turn)) for move in game.get_valid_moves()}
+    best = max(counts.values())
+    return [move for move, count in counts.items() if count == best]
+
+
+class TestEvaluatorProtocol:
+    """LeafEvaluator を差し替えたときの探索のテスト。"""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_core_leaf_is_side_to_move_view(self, seed: int) -> None:
+        game = random_game(seed, 10)
+        evaluator = _DiscEvaluator()
+        agent = SearchCore(evaluator=evaluator, time_limit_ms=None, max_depth=1, endgame_empties=0)
+        assert agent.play(game) in _greedy_moves(game)
+        assert evaluator.calls > 0
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_negamax_uses_the_same_protocol(self, seed: int) -> None:
+        game = random_game(seed, 10)
+        evaluator = _DiscEvaluator()
+        agent = NegamaxAgent(time_limit_ms=None, max_depth=1, evaluator=evaluator,
+                             solver_empties=0, solver_wld_empties=0)
+        assert agent.play(game) in _greedy_moves(game)
+        assert evaluator.calls > 0
+
+    def test_default_core_matches_transposition_agent(self) -> None:
+        for seed in range(3):
+            game = random_game(seed, 14)
+            core = SearchCore(time_limit_ms=None, max_depth=4, use_bitboard=True, keep_tt=False)
+            agent = TranspositionNegamaxAgent(time_limit_ms=None, max_depth=4, use_bitboard=True,
+                                              keep_tt=False)
+            assert core._leaf_evaluator is HEURISTIC
+            move, stats = core.play_with_stats(game)
+            expected_move, expected = agent.play_with_stats(game)
+            assert (move, stats.nodes) == (expected_move, expected.nodes)
+
+    def test_pattern_leaf_evaluator_matches_pattern_evaluator(self) -> None:
+        pattern = PatternEvaluator(board_size=8)
+        rng = random.Random(0)
+        for weights in pattern.weights.values():
+            weights[:] = [rng.uniform(-1, 1) for _ in range(len(weights))]
+        game = random_game(1, 12)
+        board = game.board.board
+        leaf = PatternLeafEvaluator(pattern)
+        state = _EvalState(board, 8)
+        for turn in (1, -1):
+            assert leaf.evaluate(board, 8, turn, state, None) == pytest.approx(  # type: ignore[arg-type]
+                pattern.evaluate(board, turn))
+
+        # NegamaxAgent の pattern_evaluator 引数と evaluator 引数は同じ探索になる
+        def play(**kwargs) -> tuple:
+            agent = NegamaxAgent(time_limit_ms=None, max_depth=3, use_bitboard=True, **kwargs)
+            move, stats = agent.play_with_stats(game)
+            return move, stats.nodes, agent._root_score
+        assert play(pattern_evaluator=pattern) == play(evaluator=leaf)
+
+
+class TestPatternAgentOnCore:
+    """PatternAgent が探索コアの TT・手順付けを使うことのテスト。"""
+
+    def test_keeps_legacy_leaf_sign(self) -> None:
+        # 同梱の重みを学習し直すまでは、旧 PatternAgent と同じく葉の値を反転する
+        agent = _pattern_agent()
+        board = random_game(1, 12).board.board
+        state = _EvalState(board, 8)
+        for turn in (1, -1):
+            assert agent._leaf_evaluator.evaluate(board, 8, turn, state, None) == pytest.approx(  # type: ignore[arg-type]
+                -agent._evaluator.evaluate(board, turn))
+
+    def test_uses_transposition_table(self) -> None:
+        game = random_game(2, 12)
+        agent = _pattern_agent()
+        move, stats = agent.play_with_stats(game)
+        assert stats.depth == 4
+        assert 0 < stats.tt_hits <= stats.tt_probes
+        assert stats.tt_cutoffs > 0
+        assert stats.pv[0] == move
+
+    def test_tt_and_ordering_reduce_nodes(self) -> None:
+        nodes = {True: 0, False: 0}
+        for seed in range(3):
+            game = random_game(seed, 12)
+            for ordering in (True, False):
+                agent = _pattern_agent(move_ordering=ordering, keep_tt=False)
+                nodes[ordering] += agent.play_with_stats(game)[1].nodes
+        assert nodes[True] < nodes[False]
+
+    def test_keep_tt_carries_entries_over(self) -> None:
+        game = random_game(3, 12)
+        agent = _pattern_agent()
+        first = agent.play_with_stats(game)[1].nodes
+        second = agent.play_with_stats(game)[1].nodes
+        assert second < first
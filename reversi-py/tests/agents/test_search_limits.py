@@ -0,0 +1,105 @@
+"""時間制限なしの固定深さ・ノード数の上限・シミュレーション数による決定論的な探索のテスト。"""
+import random
+from unittest.mock import patch
+
+import pytest
+
+from agents.mcts_agent import MonteCarloTreeSearchAgent
+from agents.negamax_agent import NegamaxAgent
+from agents.pattern_agent import PatternAgent
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from tests.conftest import random_game
+
+try:
+    import torch  # noqa: F401
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+_SEARCH_AGENTS = [
+    lambda **kw: NegamaxAgent(time_limit_ms=None, use_bitboard=True, **kw),
+    lambda **kw: TranspositionNegamaxAgent(time_limit_ms=None, use_bitboard=True,
+                                           keep_tt=False, **kw),
+    lambda **kw: PatternAgent(time_limit_ms=None, use_bitboard=True, **kw),
+]
+_SEARCH_IDS = ["negamax", "transposition", "pattern"]
+
+
+class TestSearchAgents:
+    """αβ探索のエージェントの固定深さ・ノード数の上限のテスト。"""
+
+    @pytest.mark.parametrize("factory", _SEARCH_AGENTS, ids=_SEARCH_IDS)
+    def test_node_limit_is_deterministic(self, factory) -> None:
+        game = random_game(0, 16)
+        runs = []
+        for _ in range(2):
+            agent = factory(node_limit=3000)
+            move, stats = agent.play_with_stats(game)
+            runs.append((move, stats.nodes, stats.depth, stats.pv))
+        assert runs[0] == runs[1]
+        move, nodes, depth, _ = runs[0]
+        assert move in game.get_valid_moves()
+        assert 3000 <= nodes < 3000 + 512
+        assert 1 <= depth < 60
+
+    @pytest.mark.parametrize("factory", _SEARCH_AGENTS, ids=_SEARCH_IDS)
+    def test_results_do_not_depend_on_the_clock(self, factory) -> None:
+        # 時刻が大きく進んでも、時間制限なしなら打ち切らない
+        game = random_game(1, 14)
+        expected = factory(max_depth=3).play_with_stats(game)
+        clock = iter(range(0, 10**9, 1000))
+        with patch("time.monotonic", side_effect=lambda: float(next(clock))):
+            move, stats = factory(max_depth=3).play_with_stats(game)
+        assert (move, stats.nodes, stats.depth) == (expected[0], expected[1].nodes, 3)
+
+    def test_negamax_solver_respects_node_limit(self) -> None:
+        game = random_game(2, 44)  # 空き 16
+        agent = NegamaxAgent(time_limit_ms=None, use_bitboard=True, node_limit=5000,
+                             solver_wld_empties=16)
+        move, stats = agent.play_with_stats(game)
+        assert move in game.get_valid_moves()
+        assert stats.nodes < 5000 + 4096 + 512
+        # ソルバーは上限の半分で打ち切られ、残りのノードで反復深化する
+        assert stats.depth >= 1
+
+
+class TestMonteCarloTreeSearch:
+    """MCTS のシミュレーション数とシードのテスト。"""
+
+    def test_seeded_iterations_are_deterministic(self) -> None:
+        game = random_game(3, 12)
+        runs = []
+        for _ in range(2):
+            agent = MonteCarloTreeSearchAgent(iterations=60, time_limit_ms=None, seed=7)
+            move, stats = agent.play_with_stats(game)
+            runs.append((move, stats.simulations, stats.nodes, stats.pv))
+        assert runs[0] == runs[1]
+        assert runs[0][1] == 60
+
+    def test_without_seed_uses_module_random(self) -> None:
+        game = random_game(3, 12)
+        moves = []
+        for _ in range(2):
+            random.seed(5)
+            agent = MonteCarloTreeSearchAgent(iterations=40, time_limit_ms=None)
+            moves.append(agent.play_with_stats(game))
+        assert moves[0][0] == moves[1][0]
+        assert moves[0][1].pv == moves[1][1].pv
+
+
+@pytest.mark.skipif(not TORCH_AVAILABLE, reason="PyTorch not installed")
+class TestAlphaZero:
+    """AlphaZero のシミュレーション数による探索のテスト。"""
+
+    def test_simulation_budget_is_deterministic(self) -> None:
+        from agents.alpha_zero_agent import AlphaZeroAgent
+
+        torch.manual_seed(0)
+        agent = AlphaZeroAgent(n_simulations=16)
+        game = random_game(4, 10)
+        first = agent.play_with_stats(game)
+        second = agent.play_with_stats(game)
+        assert first[0] == second[0]
+        assert first[1].simulations == second[1].simulations == 16
+        assert first[1].pv == second[1].pv
@@ -0,0 +1,114 @@
+"""agents/search_stats.py（探索統計）と、各エージェントが置く SearchStats のテスト。"""
+import pytest
+
+from agents.first_agent import FirstAgent
+from agents.mcts_agent import MonteCarloTreeSearchAgent
+from agents.negamax_agent import NegamaxAgent
+from agents.pattern_agent import PatternAgent
+from agents.search_stats import SearchStats
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from game import Game
+
+
+def _replay(game: Game, pv: tuple) -> None:
+    """pv を game の局面から順に指す（合法でなければ失敗）。"""
+    for move in pv:
+        if not game.get_valid_moves():
+            game.switch_turn()
+        assert move in game.get_valid_moves()
+        game.place_stone(*move)
+        game.switch_turn()
+
+
+class TestSearchStats:
+    """SearchStats の計算値と変換のテスト。"""
+
+    def test_derived_values(self) -> None:
+        stats = SearchStats(nodes=1000, elapsed_ms=500.0, depth=3, tt_probes=10, tt_hits=4)
+        assert stats.nps == 2000.0
+        assert stats.branching_factor == pytest.approx(10.0)
+        assert stats.tt_hit_rate == 0.4
+
+    def test_zero_values(self) -> None:
+        stats = SearchStats()
+        assert stats.nps == 0.0
+        assert stats.branching_factor == 0.0
+        assert stats.tt_hit_rate == 0.0
+
+    def test_dict_round_trip(self) -> None:
+        stats = SearchStats(nodes=5, elapsed_ms=1.5, depth=2, simulations=3, tt_probes=4,
+                            tt_hits=2, tt_cutoffs=1, cutoffs=6, first_move_cutoffs=5,
+                            probcut_cuts=2, pv=((2, 3), (4, 5)), source="book")
+        data = stats.to_dict()
+        assert data["pv"] == [[2, 3], [4, 5]]
+        assert data["nps"] == stats.nps
+        assert SearchStats.from_dict(data) == stats
+
+    def test_from_dict_rejects_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            SearchStats.from_dict({"nodes": "many"})
+        with pytest.raises(ValueError):
+            SearchStats.from_dict({"pv": [[1]]})
+
+    def test_summary(self) -> None:
+        summary = SearchStats(nodes=10, elapsed_ms=5.0, depth=2, pv=((2, 3),)).summary()
+        assert "nodes=10" in summary
+        assert "depth=2" in summary
+        assert "pv=2,3" in summary
+
+
+class TestAgentStats:
+    """各エージェントの play_with_stats のテスト。"""
+
+    def test_negamax(self) -> None:
+        game = Game(board_size=8)
+        move, stats = NegamaxAgent(time_limit_ms=10 ** 6, max_depth=3, use_bitboard=True).play_with_stats(game)
+        assert stats.depth == 3
+        assert stats.nodes > 0
+        assert stats.elapsed_ms > 0
+        assert stats.pv == (move,)
+
+    def test_transposition_reports_tt_and_pv(self) -> None:
+        game = Game(board_size=8)
+        agent = TranspositionNegamaxAgent(time_limit_ms=10 ** 6, max_depth=6, use_bitboard=True)
+        move, stats = agent.play_with_stats(game)
+        assert stats.depth == 6
+        assert stats.nodes > 0
+        assert 0 < stats.tt_hits <= stats.tt_probes
+        assert stats.tt_cutoffs > 0
+        assert stats.pv[0] == move
+        assert 1 < len(stats.pv) <= 6
+        _replay(game, stats.pv)
+
+    def test_transposition_pv_after_timeout(self) -> None:
+        """時間切れで打ち切っても読み筋は元の局面から合法にたどる。"""
+        game = Game(board_size=8)
+        agent = TranspositionNegamaxAgent(time_limit_ms=30, use_bitboard=True)
+        move, stats = agent.play_with_stats(game)
+        assert stats.pv[0] == move
+        _replay(game, stats.pv)
+
+    def test_pattern_reports_tt_and_pv(self) -> None:
+        game = Game(board_size=8)
+        move, stats = PatternAgent(time_limit_ms=10 ** 6, max_depth=2).play_with_stats(game)
+        assert stats.depth == 2
+        assert stats.nodes > 0
+        assert 0 < stats.tt_probes
+        assert stats.pv[0] == move
+        assert 1 <= len(stats.pv) <= 2
+        _replay(game, stats.pv)
+
+    def test_mcts_reports_tree(self) -> None:
+        game = Game(board_size=8)
+        move, stats = MonteCarloTreeSearchAgent(iterations=50, time_limit_ms=10 ** 6).play_with_stats(game)
+        assert stats.simulations == 50
+        assert stats.nodes == 51  # ルート + シミュレーションごとに 1 つ展開
+        assert stats.depth >= 1
+        assert stats.pv[0] == move
+        _replay(game, stats.pv)
+
+    def test_agent_without_search_reports_time(self) -> None:
+        move, stats = FirstAgent().play_with_stats(Game(board_size=8))
+        assert move is not None
+        assert stats.nodes == 0
+        assert stats.elapsed_ms >= 0
@@ -0,0 +1,145 @@
+"""agents/time_manager.py（持ち時間による思考時間の管理）のテスト。"""
+import time
+from unittest.mock import patch
+
+from agents.mcts_agent import MonteCarloTreeSearchAgent
+from agents.negamax_agent import NegamaxAgent
+from agents.pattern_agent import PatternAgent
+from agents.time_manager import MoveTimer, TimeManager, finish_timer, start_timer
+from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from game import Game
+
+
+def _at(timer: MoveTimer, elapsed_ms: float):
+    """timer の開始から elapsed_ms 経過した時刻に time.monotonic を固定する。"""
+    return patch("agents.time_manager.time.monotonic",
+                 return_value=timer.start + elapsed_ms / 1000.0)
+
+
+class TestTimeManager:
+    """持ち時間の配分のテスト。"""
+
+    def test_budget_within_remaining(self) -> None:
+        tm = TimeManager(10_000)
+        for empties in (60, 40, 20, 4):
+            soft, hard = tm.budget(empties, 8)
+            assert 0 < soft <= hard <= tm.remaining_ms
+
+    def test_midgame_gets_more_than_opening(self) -> None:
+        tm = TimeManager(60_000)
+        opening = tm.budget(58, 8)[0]
+        midgame = tm.budget(40, 8)[0]
+        # 残り手数の違い（29 手と 20 手）を除いても中盤の方が長い
+        assert midgame * 20 > opening * 29
+
+    def test_more_moves_get_more_time(self) -> None:
+        tm = TimeManager(60_000)
+        assert tm.budget(40, 2)[0] < tm.budget(40, 8)[0] < tm.budget(40, 14)[0]
+
+    def test_increment_adds_to_budget(self) -> None:
+        assert TimeManager(10_000, 500).budget(40, 8)[0] > TimeManager(10_000).budget(40, 8)[0]
+
+    def test_never_exceeds_remaining_when_low(self) -> None:
+        tm = TimeManager(30)
+        assert tm.budget(20, 8) == (0.0, 0.0)
+
+    def test_finish_move_charges_elapsed_and_adds_increment(self) -> None:
+        tm = TimeManager(10_000, 200)
+        timer = tm.start_move(40, 8)
+        with _at(timer, 1000):
+            tm.finish_move(timer)
+        assert tm.remaining_ms == 10_000 - 1000 + 200
+
+    def test_start_timer_without_clock_is_fixed(self) -> None:
+        timer = start_timer(None, 300, 40, 8)
+        assert timer.soft_ms == timer.hard_ms == 300
+        finish_timer(None, timer)  # 何もしない
+
+    def test_start_timer_without_limit_never_stops(self) -> None:
+        timer = start_timer(None, None, 40, 8)
+        timer.iteration_done((2, 3), 0.0)
+        assert not timer.expired()
+        assert not timer.should_stop()
+
+
+class TestMoveTimer:
+    """反復ごとの打ち切り判断のテスト。"""
+
+    def test_fixed_stops_only_when_next_iteration_cannot_finish(self) -> None:
+        timer = MoveTimer.fixed(1000)
+        for _ in range(5):
+            timer.iteration_done((2, 3), 0.0)  # 安定していても固定なら縮めない
+        with _at(timer, 400):
+            assert not timer.should_stop()
+        with _at(timer, 600):
+            assert timer.should_stop()
+
+    def test_next_iteration_must_fit_in_soft(self) -> None:
+        timer = MoveTimer(1000, 4000)
+        timer.iteration_done((2, 3), 10.0)
+        with _at(timer, 400):
+            assert not timer.should_stop()
+        with _at(timer, 600):
+            assert timer.should_stop()  # 次の深さは 1200 ms 頃に終わる見込み
+
+    def test_stable_best_move_stops_early(self) -> None:
+        timer = MoveTimer(1000, 4000)
+        for _ in range(3):
+            timer.iteration_done((2, 3), 10.0)
+        with _at(timer, 300):
+            assert timer.should_stop()
+
+    def test_changed_best_move_extends(self) -> None:
+        timer = MoveTimer(1000, 4000)
+        timer.iteration_done((2, 3), 10.0)
+        timer.iteration_done((3, 2), 10.0)
+        with _at(timer, 900):
+            assert not timer.should_stop()
+        with _at(timer, 2100):
+            assert timer.should_stop()  # 上限までに次の深さが終わらない
+
+    def test_score_swing_extends(self) -> None:
+        timer = MoveTimer(1000, 4000, score_margin=50.0)
+        timer.iteration_done((2, 3), 10.0)
+        timer.iteration_done((2, 3), 100.0)
+        with _at(timer, 700):
+            assert not timer.should_stop()
+        timer.iteration_done((2, 3), 110.0)
+        with _at(timer, 700):
+            assert timer.should_stop()
+
+    def test_expired(self) -> None:
+        timer = MoveTimer(0, 0)
+        time.sleep(0.001)
+        assert timer.expired()
+
+
+class TestAgentsWithClock:
+    """各エージェントが持ち時間を使い、残り時間を精算するか。"""
+
+    def test_search_agents_charge_the_clock(self) -> None:
+        for agent in (
+            NegamaxAgent(use_bitboard=True),
+            TranspositionNegamaxAgent(use_bitboard=True),
+            PatternAgent(use_bitboard=True),
+            MonteCarloTreeSearchAgent(iterations=10),
+        ):
+            tm = TimeManager(2000, 10)
+            game = Game(board_size=8)
+            move = agent.play(game, time_manager=tm)
+            assert move in game.get_valid_moves()
+            assert 0 < tm.remaining_ms <= 2010
+
+    def test_constructor_clock_used_across_moves(self) -> None:
+        tm = TimeManager(3000)
+        agent = NegamaxAgent(use_bitboard=True, time_manager=tm)
+        game = Game(board_size=8)
+        start = time.monotonic()
+        for _ in range(4):
+            move = agent.play(game)
+            assert move is not None
+            game.place_stone(*move)
+            game.switch_turn()
+        used = (time.monotonic() - start) * 1000
+        assert tm.remaining_ms < 3000
+        assert used < 3000
@@ -1,18 +1,30 @@
 """TranspositionNegamaxAgent（TT + PVS + Killer + History）のテスト。"""
+import random
+
 import pytest
 
 from agents.negamax_agent import _apply, _flips_for_move, _undo
+from agents.move_ordering import NO_MOVE
 from agents.transposition_negamax_agent import TranspositionNegamaxAgent
+from tests.conftest import initial_board
+
 
+def _pass_position(seed: int) -> tuple:
+    """ランダムな手順で、着手の直後に相手がパスする局面を探す。
 
-def _initial_board() -> list[list[int]]:
-    """8x8 の初期盤面を返す。"""
-    board = [[0] * 8 for _ in range(8)]
-    board[3][3] = 1   # 白
-    board[4][4] = 1   # 白
-    board[3][4] = -1  # 黒
-    board[4][3] = -1  # 黒
-    return board
+    Returns:
+        (パスさせる手を指す前の局面, 相手のパス後の局面) の GameSnapshot。
+    """
+    from game import Game
+    rng = random.Random(seed)
+    game = Game(board_size=8)
+    while True:
+        before = game.snapshot()
+        game.place_stone(*rng.choice(game.get_valid_moves()))
+        game.switch_turn()
+        if not game.get_valid_moves():
+            game.switch_turn()
+            return before, game.snapshot()
 
 
 class TestZobristHash:
@@ -29,14 +41,14 @@ class TestZobristHash:
         """同じ盤面から計算したハッシュは一定。"""
         agent1 = TranspositionNegamaxAgent()
         agent2 = TranspositionNegamaxAgent()
-        board = _initial_board()
+        board = initial_board()
         h1 = agent1._compute_initial_hash(board, 8)
         h2 = agent2._compute_initial_hash(board, 8)
         assert h1 == h2
 
     def test_zobrist_symmetry(self) -> None:
         """同じ着手を make → undo すると、盤面が元に戻る。"""
-        board = _initial_board()
+        board = initial_board()
         original = [row[:] for row in board]
 
         move = (2, 3)
@@ -49,38 +61,133 @@ class TestZobristHash:
         assert board == original
 
 
+class TestIncrementalHash:
+    """差分ハッシュと全体計算ハッシュの一致（TT を手をまたいで引くための前提）。"""
+
+    def test_update_hash_matches_recomputed_hash(self) -> None:
+        agent = TranspositionNegamaxAgent()
+        board = initial_board()
+        h = agent._compute_initial_hash(board, 8)
+        turn = -1
+        for move in [(2, 3), (2, 2), (3, 2), (2, 4)]:
+            flips = _flips_for_move(board, 8, move[0], move[1], turn)
+            assert flips
+            h = agent._update_hash(h, move, flips, turn)
+            _apply(board, move, flips, turn)
+            assert h == agent._compute_initial_hash(board, 8)
+            turn = -turn
+
+
 class TestTranspositionTable:
     """トランスポジションテーブル関連のテスト。"""
 
     def test_tt_stores_entry(self) -> None:
-        """TT にエントリを格納・取得できる。"""
-        from agents.transposition_negamax_agent import TTEntry
+        """TT にエントリを格納・取得できる（最善手は row * n + col で往復する）。"""
+        from agents.transposition_table import EXACT
         agent = TranspositionNegamaxAgent()
+        agent._n = 8
         hash_val = 12345
-        entry: TTEntry = {'flag': 'EXACT', 'depth': 3, 'value': 10.0, 'best_move': (2, 3)}
-        agent._tt[hash_val] = entry
+        agent._tt_store(hash_val, -1, 3, 10.0, EXACT, (2, 3))
 
-        retrieved = agent._tt.get(hash_val)
-        assert retrieved is not None
-        assert retrieved['flag'] == 'EXACT'
-        assert retrieved['value'] == 10.0
+        value, best_move = agent._tt_lookup(hash_val, -1, 3, -float('inf'), float('inf'))
+        assert value == 10.0
+        assert best_move == (2, 3)
+        # 要求深さに足りないエントリは値を返さないが、最善手は並べ替えに使える
+        assert agent._tt_lookup(hash_val, -1, 4, -float('inf'), float('inf')) == (None, (2, 3))
+        # 同じ盤面でも手番が違えば別の局面
+        assert agent._tt_lookup(hash_val, 1, 3, -float('inf'), float('inf')) == (None, None)
 
     def test_tt_lookup_miss(self) -> None:
-        """TT miss で None が返される。"""
+        """TT miss で (None, None) が返される。"""
         agent = TranspositionNegamaxAgent()
-        retrieved = agent._tt.get(99999)
-        assert retrieved is None
+        assert agent._tt_lookup(99999, -1, 0, -float('inf'), float('inf')) == (None, None)
+
+    def test_tt_size_is_bounded(self) -> None:
+        """tt_size_mb で指定した大きさを超えない。"""
+        agent = TranspositionNegamaxAgent(tt_size_mb=0.5)
+        assert agent._tt is not None
+        assert agent._tt.nbytes <= 0.5 * 2**20
+
+
+class TestPersistence:
+    """TT と History を手をまたいで持ち越すテスト。"""
+
+    def test_keep_tt_keeps_entries_and_decays_history(self) -> None:
+        agent = TranspositionNegamaxAgent(time_limit_ms=10**9, max_depth=3)
+        from game import Game
+        game = Game(board_size=8)
+        agent.play(game)
+        tt, ordering = agent._tt, agent._ordering
+        assert tt is not None and ordering is not None
+        stores = tt.stats.stores
+        history = [table[:] for table in ordering.history]
+        generation = tt.generation
+        agent._prepare_search(8)
+        assert tt.generation == generation + 1
+        assert any(any(table) for table in history)
+        assert ordering.history == [[v >> 1 for v in table] for table in history]
+        h = agent._compute_initial_hash(game.board.get_board(), 8)
+        assert stores > 0 and tt.get(h) is not None
+
+    def test_keep_tt_false_clears_every_move(self) -> None:
+        from game import Game
+        agent = TranspositionNegamaxAgent(time_limit_ms=10**9, max_depth=3, keep_tt=False)
+        game = Game(board_size=8)
+        agent.play(game)
+        agent._prepare_search(8)
+        tt, ordering = agent._tt, agent._ordering
+        assert tt is not None and ordering is not None
+        assert not any(any(table) for table in ordering.history)
+        h = agent._compute_initial_hash(game.board.get_board(), 8)
+        assert tt.get(h) is None
+
+    def test_board_size_change_resets_zobrist(self) -> None:
+        from game import Game
+        agent = TranspositionNegamaxAgent(time_limit_ms=10**9, max_depth=2)
+        assert agent.play(Game(board_size=6)) is not None
+        assert agent.play(Game(board_size=8)) in Game(board_size=8).get_valid_moves()
+        assert len(agent._zobrist) == 8
+
+    def test_last_depth_recorded(self) -> None:
+        from game import Game
+        agent = TranspositionNegamaxAgent(time_limit_ms=10**9, max_depth=3)
+        agent.play(Game(board_size=8))
+        assert agent._last_depth == 3
+
+    @pytest.mark.parametrize("seed", [26, 36, 45])
+    def test_position_after_pass_matches_fresh_search(self, seed: int) -> None:
+        """パスした側の手番で読んだエントリを、パス後に同じ盤面で引かない。
+
+        前の手の探索はパスの局面（相手の手番）と同じ盤面を手番違いで読んでいる。
+        TT のキーに手番が入っていないと、パス後のルートで相手側のエントリ
+        （最善手なし・相手から見た値）を引いてしまう。
+        """
+        before, after = _pass_position(seed)
+        warm = TranspositionNegamaxAgent(time_limit_ms=None, max_depth=4, use_bitboard=True)
+        warm.play(before)
+        h = warm._compute_initial_hash(after.board.board, 8)
+        _, tt_move = warm._tt_lookup(h, after.turn, 0, -float('inf'), float('inf'))
+        assert tt_move in after.get_valid_moves()
+
+        move, stats = warm.play_with_stats(after)
+        fresh = TranspositionNegamaxAgent(time_limit_ms=None, max_depth=4, use_bitboard=True)
+        ranked = fresh.analyze(after, k=64)
+        assert move in [a.move for a in ranked if a.score == ranked[0].score]
+        # 空きが 4 マス未満なら空きマス数の深さで読み切る
+        assert fresh.last_stats is not None
+        assert stats.depth == fresh.last_stats.depth and stats.pv[0] == move
 
 
 class TestKillerMoveHeuristic:
     """Killer move heuristic のテスト。"""
 
     def test_killer_moves_initialized(self) -> None:
-        """Killer move スロットが初期化される。"""
+        """Killer move スロットが ply ごとに 2 つずつ空で初期化される。"""
         agent = TranspositionNegamaxAgent()
-        assert len(agent._killers) > 0
-        for slot in agent._killers:
-            assert isinstance(slot, set)
+        assert agent._ordering is not None
+        assert len(agent._ordering.killers) > 0
+        for slot in agent._ordering.killers:
+            assert slot == [NO_MOVE, NO_MOVE]
 
 
 class TestTranspositionNegamaxAgentBasic:
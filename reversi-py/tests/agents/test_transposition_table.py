@@ -0,0 +1,141 @@
+"""agents/transposition_table.py（固定サイズ TT）のテスト。"""
+import pytest
+
+from agents.transposition_table import (
+    ENTRY_BYTES,
+    EXACT,
+    LOWERBOUND,
+    NO_MOVE,
+    UPPERBOUND,
+    TranspositionTable,
+    TTEntry,
+    table_bytes,
+)
+
+
+def _table(buckets: int = 4, checked: bool = False) -> TranspositionTable:
+    return TranspositionTable(buffer=memoryview(bytearray(buckets * 2 * ENTRY_BYTES)),
+                              checked=checked)
+
+
+class TestTranspositionTable:
+    """格納・置換方式・統計のテスト。"""
+
+    def test_size_is_power_of_two_buckets_within_limit(self) -> None:
+        tt = TranspositionTable(1)
+        assert tt.nbytes == table_bytes(1) <= 2**20
+        assert tt.nbytes > 2**19
+        assert tt.slots & (tt.slots - 1) == 0
+
+    @pytest.mark.parametrize("checked", [False, True])
+    def test_store_and_get(self, checked: bool) -> None:
+        tt = _table(checked=checked)
+        key = (1 << 63) | 5
+        assert tt.get(key) is None
+        tt.store(key, 3, LOWERBOUND, -12.5, 19)
+        assert tt.get(key) == TTEntry(3, LOWERBOUND, -12.5, 19)
+        tt.store(key, 1, EXACT, 4.0)
+        # 同じ局面は深さが浅くても上書きし、重複させない
+        assert tt.get(key) == TTEntry(1, EXACT, 4.0, NO_MOVE)
+        assert tt.stats.overwrites == 0
+
+    @pytest.mark.parametrize("checked", [False, True])
+    def test_depth_preferred_and_always_replace_slots(self, checked: bool) -> None:
+        tt = _table(buckets=4, checked=checked)
+        deep, shallow, newer = 1, 1 + 4, 1 + 8   # すべて同じバケット
+        tt.store(deep, 6, EXACT, 1.0)
+        tt.store(shallow, 2, UPPERBOUND, 2.0)
+        assert tt.probe(deep) == 2 and tt.probe(shallow) == 3
+        # 浅い結果は常に置換スロットを上書きし、深い結果は残る
+        tt.store(newer, 3, EXACT, 3.0)
+        assert tt.get(shallow) is None
+        assert tt.get(deep) == TTEntry(6, EXACT, 1.0, NO_MOVE)
+        assert tt.get(newer) == TTEntry(3, EXACT, 3.0, NO_MOVE)
+        # 同じ深さ以上なら深さ優先スロットを置き換える
+        tt.store(shallow, 6, EXACT, 4.0)
+        assert tt.probe(shallow) == 2
+        assert tt.get(deep) is None
+        assert tt.stats.overwrites == 2
+
+    @pytest.mark.parametrize("checked", [False, True])
+    def test_stale_generation_is_replaced_first(self, checked: bool) -> None:
+        tt = _table(buckets=1, checked=checked)
+        tt.store(1, 8, EXACT, 1.0)
+        tt.new_search()
+        # 前の探索の深いエントリは引けるが、置換では新しい世代が優先される
+        assert tt.get(1) == TTEntry(8, EXACT, 1.0, NO_MOVE)
+        tt.new_search()
+        tt.store(2, 1, EXACT, 2.0)
+        assert tt.probe(2) == 0
+        assert tt.get(1) is None
+
+    def test_probe_hit_refreshes_generation(self) -> None:
+        tt = _table(buckets=1)
+        tt.store(1, 8, EXACT, 1.0)
+        tt.new_search()
+        assert tt.probe(1) == 0        # 今回の探索でも使われた
+        tt.store(2, 1, EXACT, 2.0)
+        assert tt.probe(1) == 0 and tt.probe(2) == 1
+
+    @pytest.mark.parametrize("checked", [False, True])
+    def test_promotion_removes_duplicate(self, checked: bool) -> None:
+        tt = _table(buckets=1, checked=checked)
+        tt.store(10, 5, EXACT, 0.0)
+        tt.store(11, 1, EXACT, 1.0)    # 常に置換スロットへ
+        tt.store(11, 7, EXACT, 2.0)    # 深くなったので深さ優先スロットへ
+        assert tt.probe(11) == 0
+        assert tt.bounds[1] == 0
+
+    @pytest.mark.parametrize("checked", [False, True])
+    def test_stats(self, checked: bool) -> None:
+        tt = _table(buckets=2, checked=checked)
+        tt.probe(0)                    # 空バケット: ミス（衝突ではない）
+        tt.store(0, 1, EXACT, 0.0)
+        tt.probe(0)                    # ヒット
+        tt.probe(2)                    # 別局面で埋まったバケット: 衝突
+        stats = tt.stats
+        assert (stats.probes, stats.hits, stats.collisions, stats.stores) == (3, 1, 1, 1)
+        assert stats.hit_rate == pytest.approx(1 / 3)
+        tt.reset_stats()
+        assert tt.stats.probes == 0
+
+    def test_clear(self) -> None:
+        tt = _table()
+        tt.store(7, 2, EXACT, 1.0)
+        tt.clear()
+        assert tt.get(7) is None
+
+    def test_shares_external_buffer(self) -> None:
+        buffer = bytearray(table_bytes(0.01))
+        writer = TranspositionTable(buffer=memoryview(buffer))
+        reader = TranspositionTable(buffer=memoryview(buffer))
+        writer.store(123456789, 4, UPPERBOUND, -3.0, 7)
+        assert reader.get(123456789) == TTEntry(4, UPPERBOUND, -3.0, 7)
+
+    def test_checked_table_drops_torn_entry(self) -> None:
+        """別プロセスの書き込みで一部だけ新しくなったエントリは引かない。"""
+        tt = _table(checked=True)
+        tt.store(7, 5, EXACT, 1.0, 3)
+        slot = tt.probe(7)
+        assert slot >= 0 and tt.keys[slot] != 7   # キーはチェック値との XOR で置く
+        tt.values[slot] = 9.0                      # 評価値だけが書き換わった状態
+        assert tt.probe(7) == -1 and tt.get(7) is None
+        tt.store(7, 5, EXACT, 9.0, 3)
+        slot = tt.probe(7)
+        # probe の後に書き換わったら、読んだ値は照合に通らない
+        value = tt.values[slot]
+        tt.depths[slot] = 12
+        assert not tt.verify(slot, 7, value, tt.moves[slot], tt.depths[slot], tt.bounds[slot])
+        assert tt.get(7) is None
+
+    def test_release_drops_buffer_references(self) -> None:
+        buffer = bytearray(table_bytes(0.01))
+        tt = TranspositionTable(buffer=memoryview(buffer))
+        tt.release()
+        buffer.extend(b"\0")   # 参照が残っていると BufferError になる
+        with pytest.raises(ValueError):
+            tt.get(1)
+
+    def test_rejects_tiny_buffer(self) -> None:
+        with pytest.raises(ValueError):
+            TranspositionTable(buffer=memoryview(bytearray(ENTRY_BYTES)))
@@ -0,0 +1,42 @@
+"""agents/zobrist.py（Zobrist ハッシュ）のテスト。"""
+import random
+
+from agents.negamax_agent import _apply, _flips_for_move, _valid_moves
+from agents.zobrist import compute_hash, update_hash, zobrist_table
+from tests.conftest import initial_board
+
+
+class TestZobrist:
+    """乱数表と差分更新のテスト。"""
+
+    def test_table_is_shared_and_deterministic(self) -> None:
+        assert zobrist_table(8) is zobrist_table(8)
+        state = random.getstate()
+        table = zobrist_table.__wrapped__(8)
+        assert table == zobrist_table(8)
+        assert random.getstate() == state  # グローバルな乱数の状態を変えない
+
+    def test_update_matches_recomputed_hash_and_undoes(self) -> None:
+        rng = random.Random(0)
+        for n in (6, 8):
+            table = zobrist_table(n)
+            board = initial_board(n)
+            h = compute_hash(board, n)
+            turn = -1
+            for _ in range(20):
+                moves = _valid_moves(board, n, turn)
+                if moves:
+                    move = rng.choice(moves)
+                    flips = _flips_for_move(board, n, move[0], move[1], turn)
+                    before = h
+                    _apply(board, move, flips, turn)
+                    h = update_hash(h, table, move, flips, turn)
+                    assert h == compute_hash(board, n)
+                    assert update_hash(h, table, move, flips, turn) == before
+                turn = -turn
+
+    def test_different_positions_differ(self) -> None:
+        board = initial_board(8)
+        other = [row[:] for row in board]
+        other[2][3] = -1
+        assert compute_hash(board, 8) != compute_hash(other, 8)
@@ -1,8 +1,13 @@
 # tests/conftest.py
 import sys
 import os
+import random
+from typing import TYPE_CHECKING
 from unittest.mock import MagicMock
 
+if TYPE_CHECKING:
+    from game import Game
+
 # GUI テスト用の環境変数を先に設定
 os.environ['SDL_VIDEODRIVER'] = 'dummy'
 os.environ['SDL_AUDIODRIVER'] = 'dummy'
@@ -38,3 +43,35 @@ def pytest_configure(config):
     """pytest セッション開始時に実行"""
     # テスト用のグローバル設定
     sys.modules['test_gui_mocks'] = sys.modules[__name__]
+
+
+def initial_board(n: int = 8) -> list[list[int]]:
+    """n×n の初期盤面（board.py の Board.__init__ と同じ配置）。"""
+    board = [[0] * n for _ in range(n)]
+    h = n // 2
+    board[h - 1][h - 1] = board[h][h] = 1       # 白
+    board[h - 1][h] = board[h][h - 1] = -1      # 黒
+    return board
+
+
+def random_game(seed: int, plies: int, board_size: int = 8) -> "Game":
+    """初期局面からシード固定の乱数で plies 手進めた Game。
+
+    パスは 1 手として数え、途中で終局したらそこで止める。最後に手番側に
+    合法手がなければ手番を渡す（終局でなければ合法手のある局面を返す）。
+    """
+    from game import Game
+
+    rng = random.Random(seed)
+    game = Game(board_size=board_size)
+    for _ in range(plies):
+        moves = game.get_valid_moves()
+        if moves:
+            game.place_stone(*rng.choice(moves))
+        game.switch_turn()
+        game.check_game_over()
+        if game.game_over:
+            break
+    if not game.get_valid_moves():
+        game.switch_turn()
+    return game
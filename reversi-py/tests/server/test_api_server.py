@@ -106,6 +106,55 @@ class TestApiServer(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["move"], [2, 3])
 
+    def test_play_with_game_clock(self) -> None:
+        """time_left_ms を渡すと持ち時間から思考時間を決める。"""
+        payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "negamax",
+                   "time_left_ms": 5000, "increment_ms": 100}
+        with patch("server.api_server.NegamaxAgent") as MockNegamax:
+            MockNegamax.return_value.play.return_value = (2, 3)
+            response = self.client.post("/play", json=payload)
+        self.assertEqual(response.status_code, 200)
+        time_manager = MockNegamax.return_value.play.call_args.kwargs["time_manager"]
+        self.assertEqual(time_manager.remaining_ms, 5000)
+        self.assertEqual(time_manager.increment_ms, 100)
+
+    def test_game_clock_ignored_by_agents_without_search(self) -> None:
+        payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "gain", "time_left_ms": 5000}
+        with patch("server.api_server.GainAgent") as MockGain:
+            MockGain.return_value.play.return_value = (2, 3)
+            response = self.client.post("/play", json=payload)
+        self.assertEqual(response.status_code, 200)
+        MockGain.return_value.play.assert_called_once()
+        self.assertEqual(MockGain.return_value.play.call_args.kwargs, {})
+
+    def test_play_include_stats(self) -> None:
+        """include_stats を指定すると探索統計を応答に含める。"""
+        payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "first", "include_stats": True}
+        response = self.client.post("/play", json=payload)
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()["stats"]
+        self.assertEqual(stats["source"], "search")
+        self.assertIn("nps", stats)
+        self.assertGreaterEqual(stats["elapsed_ms"], 0)
+
+    def test_play_include_stats_from_search_agent(self) -> None:
+        with patch.dict("os.environ", {"NEGAMAX_TIME_LIMIT_MS": "50"}):
+            payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "negamax", "include_stats": True}
+            response = self.client.post("/play", json=payload)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertGreater(data["stats"]["nodes"], 0)
+        self.assertEqual(data["stats"]["pv"], [data["move"]])
+
+    def test_play_without_include_stats_has_no_stats(self) -> None:
+        response = self.client.post("/play", json={"board": VALID_BOARD, "turn": 1})
+        self.assertNotIn("stats", response.json())
+
+    def test_negative_time_left_returns_400(self) -> None:
+        payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "negamax", "time_left_ms": -1}
+        response = self.client.post("/play", json=payload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_negamax_time_limit_env_var(self) -> None:
         """NEGAMAX_TIME_LIMIT_MS 環境変数が反映される。"""
         import os
@@ -138,6 +187,256 @@ class TestApiServer(unittest.TestCase):
             agent = _select_agent("transposition")
         self.assertEqual(agent._time_limit_ms, 456)
 
+    def test_transposition_workers_env_var(self) -> None:
+        """TRANSPOSITION_WORKERS で Lazy SMP のワーカー数を指定できる。"""
+        import os
+
+        from unittest.mock import patch as mock_patch
+
+        with mock_patch.dict(os.environ, {"TRANSPOSITION_WORKERS": "3"}):
+            from server.api_server import _select_agent
+
+            agent = _select_agent("transposition")
+        self.assertEqual(agent._workers, 3)
+        # 使用中のときの使い捨てエージェントはヘルパーを起動しない
+        self.assertEqual(agent._factory()._workers, 1)
+
+    def test_opening_book_env_var(self) -> None:
+        """OPENING_BOOK_PATH を設定すると探索系のエージェントが定石を引く。"""
+        import os
+        import tempfile
+
+        from unittest.mock import patch as mock_patch
+
+        from agents.opening_book import BookAgent, write_book
+        from agents.position_key import canonical_key
+        from server.api_server import _opening_book, _select_agent
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.bin")
+            key, _ = canonical_key(VALID_BOARD, 1)
+            write_book(path, 8, {key: (2, 4)})
+            with mock_patch.dict(os.environ, {"OPENING_BOOK_PATH": path}):
+                agent = _select_agent("negamax")
+                response = self.client.post(
+                    "/play", json={"board": VALID_BOARD, "turn": 1, "agent_type": "negamax"}
+                )
+                self.assertIsInstance(agent, BookAgent)
+                self.assertIsInstance(_select_agent("transposition"), BookAgent)
+                self.assertNotIsInstance(_select_agent("random"), BookAgent)
+            book = _opening_book(path)
+            assert book is not None
+            book.close()
+            _opening_book.cache_clear()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["move"], [2, 4])
+
+    def test_opening_book_missing_file_is_ignored(self) -> None:
+        """定石ファイルを開けなければ定石なしで探索する。"""
+        import os
+
+        from unittest.mock import patch as mock_patch
+
+        from agents.opening_book import BookAgent
+        from server.api_server import _opening_book, _select_agent
+
+        with mock_patch.dict(os.environ, {"OPENING_BOOK_PATH": "/nonexistent/book.bin"}):
+            agent = _select_agent("negamax")
+        _opening_book.cache_clear()
+        self.assertNotIsInstance(agent, BookAgent)
+
+    def test_transposition_agent_is_reused_across_requests(self) -> None:
+        """TT を持ち越すため、同じ設定なら同じエージェントを使い回す。"""
+        from server.api_server import _select_agent
+
+        first = _select_agent("transposition")
+        second = _select_agent("transposition")
+        self.assertIs(first._agent, second._agent)
+
+    def test_shared_agents_are_separate_per_session(self) -> None:
+        """session_id が違えば別のエージェント（TT・ポンダー）を使う。"""
+        from server.api_server import _analysis_agent, _select_agent
+
+        first = _select_agent("transposition", "game-1")
+        self.assertIs(_select_agent("transposition", "game-1")._agent, first._agent)
+        self.assertIs(_analysis_agent("transposition", "game-1"), first)
+        self.assertIsNot(_select_agent("transposition", "game-2")._agent, first._agent)
+        self.assertIsNot(_select_agent("transposition")._agent, first._agent)
+
+    def test_least_recently_used_session_is_closed(self) -> None:
+        """使い回すエージェントが上限を超えたら、最も長く使われていないものを閉じる。"""
+        import os
+
+        from unittest.mock import Mock
+        from unittest.mock import patch as mock_patch
+
+        from server.api_server import _shared_agent, _shared_agents
+
+        factory = Mock(side_effect=lambda **kwargs: Mock())
+        with mock_patch.dict(os.environ, {"MAX_SHARED_AGENTS": "2"}):
+            old = _shared_agent(factory, "lru-1")
+            recent = _shared_agent(factory, "lru-2")
+            _shared_agent(factory, "lru-1")
+            _shared_agent(factory, "lru-3")
+        self.assertLessEqual(len(_shared_agents), 2)
+        recent._agent.close.assert_called_once_with()
+        old._agent.close.assert_not_called()
+
+    def test_invalid_session_id_is_rejected(self) -> None:
+        for session_id in ("", "x" * 65):
+            response = self.client.post("/play", json={
+                "board": VALID_BOARD, "turn": 1, "session_id": session_id,
+            })
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_transposition_ponder_env_var(self) -> None:
+        """TRANSPOSITION_PONDER でポンダー付きのエージェントを使う。"""
+        import os
+
+        from unittest.mock import patch as mock_patch
+
+        from agents.ponder import PonderingAgent
+        from server.api_server import _select_agent
+
+        with mock_patch.dict(os.environ, {"TRANSPOSITION_PONDER": "all"}):
+            agent = _select_agent("transposition")
+        self.assertIsInstance(agent._agent, PonderingAgent)
+        self.assertEqual(agent.mode, "all")
+        self.assertNotIsInstance(_select_agent("transposition")._agent, PonderingAgent)
+
+    def test_ponder_endpoint_starts_pondering(self) -> None:
+        """/ponder は共有エージェントのポンダーを始め、次の /play で止める。"""
+        import os
+
+        from unittest.mock import patch as mock_patch
+
+        from server.api_server import _select_agent
+
+        payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "transposition"}
+        env = {"TRANSPOSITION_PONDER": "predict", "TRANSPOSITION_TIME_LIMIT_MS": "50"}
+        with mock_patch.dict(os.environ, env):
+            response = self.client.post("/ponder", json=payload)
+            agent = _select_agent("transposition")
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()["pondering"])
+            self.assertIsNotNone(agent._thread)
+            response = self.client.post("/play", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(agent._thread)
+
+    def test_ponder_endpoint_without_support(self) -> None:
+        """ポンダーに対応していない種別・設定では何もしない。"""
+        for agent_type in ("random", "transposition"):
+            response = self.client.post(
+                "/ponder", json={"board": VALID_BOARD, "turn": 1, "agent_type": agent_type}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.json()["pondering"])
+
+    def test_ponder_endpoint_validates_input(self) -> None:
+        response = self.client.post(
+            "/ponder", json={"board": VALID_BOARD, "turn": 0, "agent_type": "transposition"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_shared_agent_busy_falls_back_to_fresh_instance(self) -> None:
+        """使用中の共有エージェントは使わず、使い捨てのエージェントで応答する。"""
+        from unittest.mock import Mock
+
+        from server.api_server import _SharedAgent
+
+        factory = Mock(side_effect=lambda: Mock(**{"play.return_value": (2, 3)}))
+        shared = _SharedAgent(factory)
+        with shared._lock:
+            self.assertEqual(shared.play(Mock()), (2, 3))
+        self.assertEqual(factory.call_count, 2)
+        shared._agent.play.assert_not_called()
+
+    def test_analyze_returns_top_k_moves(self) -> None:
+        """/analyze は上位 k 手を評価値の高い順に、読み筋付きで返す。"""
+        legal = [[2, 4], [3, 5], [4, 2], [5, 3]]
+        payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "negamax", "k": 3}
+        with patch.dict("os.environ", {"NEGAMAX_TIME_LIMIT_MS": "50"}):
+            response = self.client.post("/analyze", json=payload)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        moves = data["moves"]
+        self.assertEqual(len(moves), 3)
+        scores = [item["score"] for item in moves]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        for item in moves:
+            self.assertIn(item["move"], legal)
+            self.assertEqual(item["pv"][0], item["move"])
+        self.assertGreaterEqual(data["depth"], 1)
+        self.assertNotIn("stats", data)
+
+    def test_analyze_all_moves_with_stats(self) -> None:
+        payload = {"board": VALID_BOARD, "turn": -1, "agent_type": "transposition",
+                   "k": 10, "include_stats": True}
+        with patch.dict("os.environ", {"TRANSPOSITION_TIME_LIMIT_MS": "50"}):
+            response = self.client.post("/analyze", json=payload)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data["moves"]), 4)
+        self.assertGreater(data["stats"]["nodes"], 0)
+        self.assertEqual(data["stats"]["depth"], data["depth"])
+        self.assertEqual(data["stats"]["pv"][0], data["moves"][0]["move"])
+
+    def test_analyze_pattern_shares_agent_with_play(self) -> None:
+        """pattern の /analyze は /play と同じ（TT を持ち越す）エージェントで解析する。"""
+        import os
+
+        from unittest.mock import patch as mock_patch
+
+        from server.api_server import _analysis_agent, _select_agent
+
+        payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "pattern", "k": 2}
+        with mock_patch.dict(os.environ, {"PATTERN_TIME_LIMIT_MS": "50"}):
+            response = self.client.post("/analyze", json=payload)
+            self.assertIs(_analysis_agent("pattern"), _select_agent("pattern"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["moves"]), 2)
+
+    def test_analyze_stops_pondering(self) -> None:
+        """ポンダー中の共有エージェントは、ポンダーを止めてから解析する。"""
+        import os
+
+        from unittest.mock import patch as mock_patch
+
+        from server.api_server import _select_agent
+
+        payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "transposition"}
+        env = {"TRANSPOSITION_PONDER": "all", "TRANSPOSITION_TIME_LIMIT_MS": "50"}
+        with mock_patch.dict(os.environ, env):
+            self.assertTrue(self.client.post("/ponder", json=payload).json()["pondering"])
+            agent = _select_agent("transposition")
+            response = self.client.post("/analyze", json={**payload, "k": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["moves"]), 2)
+        self.assertIsNone(agent._thread)
+
+    def test_analyze_validates_input(self) -> None:
+        for payload in (
+            {"board": VALID_BOARD, "turn": 1, "agent_type": "random"},
+            {"board": VALID_BOARD, "turn": 1, "agent_type": "negamax", "k": 0},
+            {"board": VALID_BOARD, "turn": 0, "agent_type": "negamax"},
+            {"board": VALID_BOARD, "turn": 1, "agent_type": "negamax", "time_left_ms": -1},
+        ):
+            response = self.client.post("/analyze", json=payload)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, payload)
+
+    def test_shared_agent_analyze_falls_back_when_busy(self) -> None:
+        from unittest.mock import Mock
+
+        from server.api_server import _SharedAgent
+
+        factory = Mock(side_effect=lambda: Mock(**{"analyze.return_value": ["result"]}))
+        shared = _SharedAgent(factory)
+        with shared._lock:
+            analysis, _ = shared.analyze_with_stats(Mock(), k=2)
+        self.assertEqual(analysis, ["result"])
+        shared._agent.analyze.assert_not_called()
+
     def test_play_agent_type_pattern(self) -> None:
         payload = {"board": VALID_BOARD, "turn": 1, "agent_type": "pattern"}
         with patch("server.api_server.PatternAgent") as MockPattern:
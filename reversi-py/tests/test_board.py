@@ -8,7 +8,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
-from board import Board
+import random
+
+from board import Board, MailboxBoard, create_board
 
 
 class TestBoard(unittest.TestCase):
@@ -87,6 +89,23 @@ class TestBoard(unittest.TestCase):
         self.assertFalse(self.board.place_stone(0, 0, -1))
         self.assertFalse(self.board.place_stone(3, 3, -1))
 
+    def test_has_valid_move(self):
+        self.assertTrue(self.board.has_valid_move(-1))
+        self.board.board = [[-1] * 8 for _ in range(8)]
+        self.assertFalse(self.board.has_valid_move(1))
+
+    def test_frontier(self):
+        # 初期配置の 4 石を囲む 12 マスがフロンティア
+        frontier = self.board.get_frontier()
+        self.assertEqual(len(frontier), 12)
+        self.assertIn((2, 2), frontier)
+        self.assertNotIn((3, 3), frontier)
+        self.board.place_stone(2, 3, -1)
+        frontier = self.board.get_frontier()
+        self.assertNotIn((2, 3), frontier)
+        self.assertIn((1, 3), frontier)
+        self.assertEqual(len(frontier), 14)
+
     def test_count_stones(self):
         # 石の数の確認
         black_count, white_count = self.board.count_stones()
@@ -98,5 +117,82 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(black_count, 4)
         self.assertEqual(white_count, 1)
 
+    def test_clone_is_independent(self):
+        self.board.place_stone(2, 3, -1)
+        clone = self.board.clone()
+        self.assertIs(type(clone), type(self.board))
+        self.assertEqual(clone.get_board(), self.board.get_board())
+        self.assertEqual(clone.count_stones(), self.board.count_stones())
+        self.assertEqual(clone.get_frontier(), self.board.get_frontier())
+
+        # 複製側の着手は元の盤面に影響しない（逆も同様）
+        clone.place_stone(2, 2, 1)
+        self.assertEqual(self.board.get_board()[2][2], 0)
+        self.assertEqual(self.board.count_stones(), (4, 1))
+        self.board.place_stone(4, 5, 1)
+        self.assertEqual(clone.get_board()[4][5], 0)
+        self.assertEqual(clone.get_valid_moves(-1), clone.clone().get_valid_moves(-1))
+
+
+class TestMailboxBoard(TestBoard):
+    """MailboxBoard でも Board と同じテストが通ることを確認する。"""
+
+    def setUp(self):
+        self.board = MailboxBoard()
+
+    def test_matches_list_board_through_random_games(self):
+        # ランダム対局の全局面で合法手・反転・石数が Board と一致する
+        rng = random.Random(0)
+        for size in (4, 6, 8, 10):
+            plain, mailbox = Board(size), MailboxBoard(size)
+            turn = -1
+            while True:
+                moves = plain.get_valid_moves(turn)
+                self.assertEqual(mailbox.get_valid_moves(turn), moves)
+                self.assertEqual(mailbox.has_valid_move(turn), bool(moves))
+                self.assertEqual(mailbox.get_frontier(), plain.get_frontier())
+                self.assertEqual(mailbox.count_stones(), plain.count_stones())
+                if not moves:
+                    turn = -turn
+                    if not plain.get_valid_moves(turn):
+                        break
+                    continue
+                row, col = rng.choice(moves)
+                self.assertEqual(
+                    mailbox.get_flipped_stones(row, col, turn),
+                    plain.get_flipped_stones(row, col, turn),
+                )
+                self.assertTrue(mailbox.place_stone(row, col, turn))
+                plain.place_stone(row, col, turn)
+                self.assertEqual(mailbox.get_board(), plain.get_board())
+                turn = -turn
+
+    def test_board_view_is_a_copy(self):
+        # 互換ビューへの書き込みは内部状態に影響しない
+        view = self.board.get_board()
+        view[0][0] = -1
+        self.assertEqual(self.board.get_board()[0][0], 0)
+
+    def test_board_assignment_reloads_counts(self):
+        self.board.board = [[-1] * 8 for _ in range(8)]
+        self.assertEqual(self.board.count_stones(), (64, 0))
+        self.assertEqual(self.board.get_valid_moves(1), [])
+        self.assertEqual(self.board.get_frontier(), [])
+
+    def test_from_grid(self):
+        grid = Board(6).get_board()
+        grid[0][0] = 1
+        board = MailboxBoard.from_grid(grid)
+        self.assertEqual(board.board_size, 6)
+        self.assertEqual(board.get_board(), grid)
+        self.assertEqual(board.count_stones(), (2, 3))
+
+    def test_create_board(self):
+        self.assertIs(type(create_board(8)), Board)
+        self.assertIs(type(create_board(8, "mailbox")), MailboxBoard)
+        with self.assertRaises(ValueError):
+            create_board(8, "unknown")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -8,8 +8,10 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
-from game import Game
-from board import Board
+import random
+
+from game import Game, HISTORY_CHECKPOINT_INTERVAL
+from board import Board, MailboxBoard
 from agents.api_agent import ApiAgent
 from config.agents_config import AGENT_DEFINITIONS
 
@@ -85,9 +87,8 @@ class TestGame(unittest.TestCase):
         history_entry = self.game.history[0]
         self.assertEqual(history_entry[0], valid_move) # 置いた手
         self.assertEqual(history_entry[1], -1) # 手番
-        # 盤面のコピーが保存されているか (一部だけ確認)
-        self.assertEqual(history_entry[2][valid_move[0]][valid_move[1]], -1)
-        self.assertEqual(history_entry[2][3][3], -1)
+        # 盤面全体ではなく反転した石の差分が保存されているか
+        self.assertEqual(history_entry.flips, [(3, 3)])
 
     def test_place_stone_invalid(self):
         self.assertEqual(self.game.turn, -1)
@@ -149,19 +150,20 @@ class TestGame(unittest.TestCase):
         self.assertFalse(self.game.replay(0)) # 行 127 カバー (範囲外)
 
     def test_history_navigation(self):
+        # 履歴は差分なので、比較用に各手の直後の盤面を控えておく
         # 1手目: 黒 (2,3)
         self.game.place_stone(2, 3)
-        history1 = self.game.history[0]
+        history1 = (*self.game.history[0][:2], [r[:] for r in self.game.get_board()])
 
         # 2手目: 白 (2,4) - place_stoneの前に手番を変える必要がある
         self.game.switch_turn()
         self.game.place_stone(2, 4)
-        history2 = self.game.history[1]
+        history2 = (*self.game.history[1][:2], [r[:] for r in self.game.get_board()])
 
         # 3手目: 黒 (3,5)
         self.game.switch_turn()
         self.game.place_stone(3, 5)
-        history3 = self.game.history[2]
+        history3 = (*self.game.history[2][:2], [r[:] for r in self.game.get_board()])
 
         self.assertEqual(len(self.game.history), 3)
         self.assertEqual(self.game.history_index, 2) # 最新のインデックス
@@ -199,7 +201,8 @@ class TestGame(unittest.TestCase):
         self.assertIsNotNone(current_hist)
         self.assertEqual(current_hist[0], (2, 4)) # 2手目の手
         self.assertEqual(current_hist[1], 1)      # 2手目の手番 (白)
-        self.assertEqual(current_hist[2], history2[2]) # 2手目終了時の盤面
+        self.assertEqual(current_hist[2], [(3, 4)]) # 2手目で反転した石
+        self.assertEqual(self.game.get_board(), history2[2]) # 2手目終了時の盤面
 
         # 範囲外の replay (行 127 カバー)
         self.assertTrue(self.game.replay(-1))
@@ -321,6 +324,159 @@ class TestGame(unittest.TestCase):
         self.assertIsNone(agent_unknown, "Agent for unknown ID should be None")
         mock_get_class.assert_called_with(unknown_id) # get_agent_class が呼ばれる
 
+
+class TestGameMailboxStorage(unittest.TestCase):
+    """storage="mailbox" の Game が list 盤面と同じ進行になることを確認する。"""
+
+    def test_storage_selects_board_class(self):
+        self.assertIsInstance(Game(storage="mailbox").board, MailboxBoard)
+        self.assertIs(type(Game().board), Board)
+
+    def test_reset_keeps_storage(self):
+        game = Game(storage="mailbox")
+        game.place_stone(2, 3)
+        game.reset()
+        self.assertIsInstance(game.board, MailboxBoard)
+        self.assertEqual(game.get_board(), Board().get_board())
+
+    def test_play_and_replay_match_list_storage(self):
+        plain, mailbox = Game(), Game(storage="mailbox")
+        for _ in range(10):
+            move = plain.get_valid_moves()[0]
+            self.assertEqual(mailbox.get_valid_moves(), plain.get_valid_moves())
+            self.assertTrue(plain.place_stone(*move))
+            self.assertTrue(mailbox.place_stone(*move))
+            for game in (plain, mailbox):
+                game.switch_turn()
+                game.check_game_over()
+        self.assertEqual(mailbox.get_board(), plain.get_board())
+        self.assertEqual(mailbox.get_winner(), plain.get_winner())
+        plain.replay(3)
+        mailbox.replay(3)
+        self.assertEqual(mailbox.get_board(), plain.get_board())
+        self.assertEqual(mailbox.board.count_stones(), plain.board.count_stones())
+
+
+class TestGameDeltaHistory(unittest.TestCase):
+    """差分履歴とチェックポイントによる巻き戻し・やり直しのテスト。"""
+
+    def _play_random_game(self, game, seed=0):
+        """ランダム対局を最後まで進め、各手の直後の盤面を返す。"""
+        rng = random.Random(seed)
+        boards = []
+        while not game.game_over:
+            moves = game.get_valid_moves()
+            if moves:
+                game.place_stone(*rng.choice(moves))
+                boards.append([r[:] for r in game.get_board()])
+            game.switch_turn()
+            game.check_game_over()
+        return boards
+
+    def test_random_seeks_match_snapshots(self):
+        for storage in ("list", "mailbox"):
+            game = Game(storage=storage)
+            initial = [r[:] for r in game.get_board()]
+            boards = self._play_random_game(game)
+            self.assertGreater(len(boards), HISTORY_CHECKPOINT_INTERVAL * 2)
+            rng = random.Random(1)
+            for index in [rng.randrange(-1, len(boards)) for _ in range(60)]:
+                self.assertTrue(game.replay(index))
+                expected = initial if index == -1 else boards[index]
+                self.assertEqual(game.get_board(), expected)
+                self.assertEqual(
+                    game.board.count_stones(),
+                    (sum(r.count(-1) for r in expected), sum(r.count(1) for r in expected)),
+                )
+
+    def test_checkpoints_are_periodic(self):
+        game = Game()
+        self._play_random_game(game)
+        expected = {-1} | {
+            i for i in range(len(game.history)) if (i + 1) % HISTORY_CHECKPOINT_INTERVAL == 0
+        }
+        self.assertEqual(set(game._checkpoints), expected)
+
+    def test_new_move_after_undo_truncates_history_and_checkpoints(self):
+        game = Game()
+        self._play_random_game(game)
+        game.replay(HISTORY_CHECKPOINT_INTERVAL - 3)
+        move = game.get_valid_moves()[0]
+        self.assertTrue(game.place_stone(*move))
+        self.assertEqual(len(game.history), HISTORY_CHECKPOINT_INTERVAL - 1)
+        self.assertEqual(set(game._checkpoints), {-1})
+        self.assertEqual(game.history[-1].move, move)
+
+    def test_history_from_custom_start_position(self):
+        # 外部から設定した盤面から始めても -1 へ戻すと同じ盤面になる
+        game = Game(board_size=4)
+        game.board.board = [[0, 0, 0, 0], [0, 1, -1, 0], [0, -1, -1, 0], [0, 0, 0, 0]]
+        start = [r[:] for r in game.get_board()]
+        game.turn = 1
+        self.assertTrue(game.place_stone(*game.get_valid_moves()[0]))
+        game.replay(-1)
+        self.assertEqual(game.get_board(), start)
+
+class TestGameSnapshot(unittest.TestCase):
+    """Game.snapshot() の読み取り専用スナップショットのテスト。"""
+
+    def test_snapshot_copies_position_and_turn_only(self):
+        for storage in ("list", "mailbox"):
+            game = Game(storage=storage)
+            game.place_stone(2, 3)
+            game.switch_turn()
+            snap = game.snapshot()
+            self.assertEqual(snap.turn, game.turn)
+            self.assertEqual(snap.board_size, game.board_size)
+            self.assertIs(type(snap.board), type(game.board))
+            self.assertEqual(snap.get_board(), game.get_board())
+            self.assertEqual(snap.get_valid_moves(), game.get_valid_moves())
+            self.assertFalse(hasattr(snap, "history"))
+            self.assertFalse(hasattr(snap, "agents"))
+
+    def test_snapshot_is_unaffected_by_game_changes(self):
+        game = Game()
+        game.place_stone(2, 3)
+        game.switch_turn()
+        snap = game.snapshot()
+        before = [r[:] for r in snap.get_board()]
+        moves = snap.get_valid_moves()
+
+        game.place_stone(*game.get_valid_moves()[0])
+        game.replay(-1)
+        game.reset()
+        self.assertEqual(snap.get_board(), before)
+        self.assertEqual(snap.get_valid_moves(), moves)
+        self.assertEqual(snap.turn, 1)
+
+    def test_snapshot_is_read_only(self):
+        snap = Game().snapshot()
+        with self.assertRaises(AttributeError):
+            snap.turn = 1
+        with self.assertRaises(AttributeError):
+            snap.board = None
+        with self.assertRaises(AttributeError):
+            del snap.turn
+
+    def test_snapshot_of_snapshot_copies_board(self):
+        snap = Game(storage="mailbox").snapshot()
+        copy = snap.snapshot()
+        copy.board.place_stone(2, 3, -1)
+        self.assertEqual(snap.board.count_stones(), (2, 2))
+
+    def test_agents_play_from_snapshot(self):
+        from agents.mcts_agent import MonteCarloTreeSearchAgent
+        from agents.negamax_agent import NegamaxAgent
+
+        game = Game()
+        snap = game.snapshot()
+        for agent in (
+            NegamaxAgent(max_depth=2, time_limit_ms=10**6),
+            MonteCarloTreeSearchAgent(iterations=20, time_limit_ms=10**6),
+        ):
+            self.assertIn(agent.play(snap), game.get_valid_moves())
+        self.assertEqual(snap.get_board(), game.get_board())
+
 # ... (クラスの末尾) ...
 
 if __name__ == '__main__':
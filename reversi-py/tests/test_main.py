@@ -222,6 +222,10 @@ class TestApp(unittest.TestCase):
             self.assertTrue(self.app.is_ai_thinking)
             mock_thread.assert_called_once()
             mock_thread.return_value.start.assert_called_once()
+            # AI スレッドには Game 全体ではなく局面のスナップショットを渡す
+            self.mock_game.snapshot.assert_called_once()
+            _, kwargs = mock_thread.call_args
+            self.assertIs(kwargs["args"][1], self.mock_game.snapshot.return_value)
 
         # パス処理のテスト
         self.app.is_ai_thinking = False
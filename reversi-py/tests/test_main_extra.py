@@ -145,6 +145,34 @@ def test_apply_ai_move_success_and_invalid():
         patcher.stop()
 
 
+def test_apply_ai_move_starts_pondering_against_human():
+    app, mock_game, mock_gui, patcher = make_app()
+    try:
+        ai = MagicMock()
+        # AI（黒）が指した後は白（人間）の手番
+        mock_game.agents = {-1: ai, 1: None}
+        mock_game.switch_turn.side_effect = lambda: setattr(mock_game, "turn", 1)
+        mock_game.game_over = False
+        with patch('main.threading.Thread') as mock_thread:
+            app._apply_ai_move((3, 3))
+            mock_thread.assert_called_once()
+            _, kwargs = mock_thread.call_args
+            assert kwargs["args"] == (ai.ponder, mock_game.snapshot.return_value)
+            mock_thread.return_value.start.assert_called_once()
+
+        # 相手も AI ならポンダーしない
+        mock_game.turn = -1
+        mock_game.agents = {-1: ai, 1: MagicMock()}
+        with patch('main.threading.Thread') as mock_thread:
+            app._apply_ai_move((3, 3))
+            mock_thread.assert_not_called()
+
+        # ポンダーの失敗は対局を止めない
+        app._run_ponder(MagicMock(side_effect=RuntimeError("down")), MagicMock())
+    finally:
+        patcher.stop()
+
+
 def test_handle_human_move_ignores_when_ai_thinking():
     app, mock_game, mock_gui, patcher = make_app()
     try:
@@ -319,3 +347,21 @@ def test_handle_click_in_game_calls_player_settings_click():
             mock_handle.assert_called_once_with((400, 400))
     finally:
         patcher.stop()
+
+
+def test_run_ai_agent_logs_search_stats():
+    """エージェントが探索統計を持っていればログに出す"""
+    from agents.search_stats import SearchStats
+
+    app, _, _, patcher = make_app()
+    try:
+        mock_agent = MagicMock()
+        mock_agent.play.return_value = (2, 5)
+        mock_agent.last_stats = SearchStats(nodes=1000, elapsed_ms=10.0, depth=4, pv=((2, 5),))
+        with patch('main.logging.info') as mock_info:
+            app._run_ai_agent(mock_agent, app.game, 0)
+        logged = " ".join(str(call.args[0]) for call in mock_info.call_args_list)
+        assert "nodes=1000" in logged and "depth=4" in logged
+        assert app.ai_queue.get_nowait() == ((2, 5), 0)
+    finally:
+        patcher.stop()
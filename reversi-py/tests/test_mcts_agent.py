@@ -14,6 +14,9 @@ class DummyBoard:
         pass
     def count_stones(self):
         return self._counts
+    def clone(self):
+        # the stub has no position to diverge, so sharing is fine
+        return self
 
 class PassBoard:
     """手番側に合法手がなく、相手側にだけ合法手がある盤面スタブ"""
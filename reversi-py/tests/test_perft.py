@@ -0,0 +1,66 @@
+"""utils/perft.py（着手生成の perft）のテスト。
+
+全バックエンドの葉ノード数を既知の値・相互に照合する、
+着手生成の回帰ゲートを兼ねる。
+"""
+import pytest
+
+from utils.perft import (
+    PERFT_8X8,
+    PERFT_BACKENDS,
+    format_position,
+    initial_position,
+    parse_position,
+)
+
+
+@pytest.mark.parametrize("name", sorted(PERFT_BACKENDS))
+def test_known_8x8_counts(name: str) -> None:
+    grid, turn = initial_position(8)
+    for depth in range(6):
+        assert PERFT_BACKENDS[name].run(grid, turn, depth) == PERFT_8X8[depth]
+
+
+@pytest.mark.parametrize("size, depth", [(4, 10), (6, 6), (10, 4), (16, 3)])
+def test_backends_agree(size: int, depth: int) -> None:
+    # 4x4 は深さ 10 でパスと終局を含む全手順を数える
+    grid, turn = initial_position(size)
+    counts = {
+        name: backend.run(grid, turn, depth)
+        for name, backend in PERFT_BACKENDS.items()
+        if backend.supports(size)
+    }
+    assert len(counts) >= 3
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_backends_agree_on_given_position() -> None:
+    # 白番・終盤寄りの局面（パスを含む）でも一致すること
+    grid, turn = parse_position(
+        "XXXXXXXX"
+        "XOOOOOOX"
+        "XO....OX"
+        "XO.XO.OX"
+        "XO.OX.OX"
+        "XO....OX"
+        "XOOOOOOX"
+        "XXXXXXX."
+        "O"
+    )
+    counts = {name: backend.run(grid, turn, 5) for name, backend in PERFT_BACKENDS.items()}
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_position_roundtrip() -> None:
+    grid, _ = initial_position(6)
+    text = format_position(grid, 1)
+    assert len(text) == 37
+    assert parse_position(text) == (grid, 1)
+    # 手番省略時は黒番、空白と "-" も受け付ける
+    assert parse_position(text[:-1].replace(".", "-")[:18] + " " + text[18:-1]) == (grid, -1)
+
+
+@pytest.mark.parametrize("text", ["X" * 11, "." * 16 + "Z", "." * 15 + "Q"])
+def test_parse_position_rejects_invalid(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_position(text)
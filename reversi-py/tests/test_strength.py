@@ -3,6 +3,9 @@
 Negamax、Transposition、Pattern、AlphaZero エージェントが初期化でき、
 基本的な着手を返すことを確認。複数エージェントは GainAgent に勝てることを確認。
 
+探索エージェントは思考時間ではなく固定深さ（max_depth）か 1 手のノード数の上限
+（node_limit）で探索させ、マシンの速さによらず毎回同じ対局になるようにする。
+
 通常の pytest 実行からは除外される::
 
     uv run pytest  # ← strength テストは実行されない
@@ -45,16 +48,15 @@ class TestNegamaxBeatsGainAgent:
 
     board_size=8 の理由:
       - 実際のゲーム盤面（8x8）での強さを検証
-      - time_limit_ms=50 で探索時間を制限
-      - 1 ゲーム最大 3 秒（60 手 × 50ms）
-      - 2 ゲーム合計で約 6 秒以内
+      - 時間制限なしの固定深さ 3 で探索（結果は決定論的）
+      - 2 ゲーム合計で数秒以内
     """
 
     BOARD_SIZE = 8
-    TIME_LIMIT_MS = 50
+    MAX_DEPTH = 3
 
     def _negamax(self) -> NegamaxAgent:
-        return NegamaxAgent(time_limit_ms=self.TIME_LIMIT_MS)
+        return NegamaxAgent(time_limit_ms=None, max_depth=self.MAX_DEPTH)
 
     def _gain(self) -> GainAgent:
         return GainAgent()
@@ -85,7 +87,7 @@ class TestTranspositionAgent:
 
     def test_transposition_returns_move(self) -> None:
         """TranspositionNegamaxAgent が 8x8 初期盤面で合法手を返す。"""
-        agent = TranspositionNegamaxAgent(time_limit_ms=50)
+        agent = TranspositionNegamaxAgent(time_limit_ms=None, max_depth=3)
         game = Game(board_size=8)
         move = agent.play(game)
         # 初期盤面では黒が合法手を持つ
@@ -150,38 +152,42 @@ class TestAlphaZeroAgent:
 
 @pytest.mark.strength
 class TestTranspositionBeatsNegamax:
-    """TranspositionNegamaxAgent が NegamaxAgent に勝てることを確認。"""
+    """TranspositionNegamaxAgent が同じノード数の NegamaxAgent に勝てることを確認。"""
+
+    NODE_LIMIT = 20000
 
     def test_transposition_black_wins_vs_negamax(self) -> None:
         """黒番で NegamaxAgent に勝てる。"""
-        trans = TranspositionNegamaxAgent(time_limit_ms=100)
-        nmax = NegamaxAgent(time_limit_ms=100)
+        trans = TranspositionNegamaxAgent(time_limit_ms=None, node_limit=self.NODE_LIMIT)
+        nmax = NegamaxAgent(time_limit_ms=None, node_limit=self.NODE_LIMIT)
         diff = play_one_game(trans, nmax, 8)
         assert diff > 0, f"Transposition(黒) が Negamax(白) に負けた (石差={diff})"
 
     def test_transposition_white_wins_vs_negamax(self) -> None:
         """白番で NegamaxAgent に勝てる。"""
-        trans = TranspositionNegamaxAgent(time_limit_ms=100)
-        nmax = NegamaxAgent(time_limit_ms=100)
+        trans = TranspositionNegamaxAgent(time_limit_ms=None, node_limit=self.NODE_LIMIT)
+        nmax = NegamaxAgent(time_limit_ms=None, node_limit=self.NODE_LIMIT)
         diff = play_one_game(nmax, trans, 8)
         assert diff < 0, f"Transposition(白) が Negamax(黒) に負けた (石差={diff})"
 
 
 @pytest.mark.strength
 class TestTranspositionBeatsPattern:
-    """TranspositionNegamaxAgent が PatternAgent に勝てることを確認。"""
+    """TranspositionNegamaxAgent が同じノード数の PatternAgent に勝てることを確認。"""
+
+    NODE_LIMIT = 20000
 
     def test_transposition_black_wins_vs_pattern(self) -> None:
         """黒番で PatternAgent に勝てる。"""
-        trans = TranspositionNegamaxAgent(time_limit_ms=200)
-        pattern = PatternAgent(weights_path=None, time_limit_ms=200)
+        trans = TranspositionNegamaxAgent(time_limit_ms=None, node_limit=self.NODE_LIMIT)
+        pattern = PatternAgent(weights_path=None, time_limit_ms=None, node_limit=self.NODE_LIMIT)
         diff = play_one_game(trans, pattern, 8)
         assert diff > 0, f"Transposition(黒) が Pattern(白) に負けた (石差={diff})"
 
     def test_transposition_white_wins_vs_pattern(self) -> None:
         """白番で PatternAgent に勝てる。"""
-        trans = TranspositionNegamaxAgent(time_limit_ms=200)
-        pattern = PatternAgent(weights_path=None, time_limit_ms=200)
+        trans = TranspositionNegamaxAgent(time_limit_ms=None, node_limit=self.NODE_LIMIT)
+        pattern = PatternAgent(weights_path=None, time_limit_ms=None, node_limit=self.NODE_LIMIT)
         diff = play_one_game(pattern, trans, 8)
         assert diff < 0, f"Transposition(白) が Pattern(黒) に負けた (石差={diff})"
 
@@ -194,13 +200,14 @@ class TestNegamaxWithPatternEvaluator:
     """
 
     BOARD_SIZE = 8
-    TIME_LIMIT_MS = 100
+    MAX_DEPTH = 3
 
     def test_pattern_negamax_black_wins(self) -> None:
         """黒番で PatternEvaluator 統合版が GainAgent に勝つ。"""
         evaluator = PatternEvaluator(board_size=8, weights_path=None)
         agent = NegamaxAgent(
-            time_limit_ms=self.TIME_LIMIT_MS,
+            time_limit_ms=None,
+            max_depth=self.MAX_DEPTH,
             pattern_evaluator=evaluator
         )
         gain = GainAgent()
@@ -211,7 +218,8 @@ class TestNegamaxWithPatternEvaluator:
         """白番で PatternEvaluator 統合版が GainAgent に勝つ。"""
         evaluator = PatternEvaluator(board_size=8, weights_path=None)
         agent = NegamaxAgent(
-            time_limit_ms=self.TIME_LIMIT_MS,
+            time_limit_ms=None,
+            max_depth=self.MAX_DEPTH,
             pattern_evaluator=evaluator
         )
         gain = GainAgent()
@@ -229,7 +237,7 @@ class TestAlphaZeroN6KVsTransposition:
 
     BOARD_SIZE = 8
     ALPHAZERO_SIMULATIONS = 100  # テスト用に軽量化
-    NEGAMAX_TIME_LIMIT_MS = 500
+    NEGAMAX_NODE_LIMIT = 50000
 
     def test_alphazero_n6k_black_wins_vs_transposition(self) -> None:
         """AlphaZero-N6K が黒番で TranspositionNegamaxAgent に勝つ。"""
@@ -241,7 +249,9 @@ class TestAlphaZeroN6KVsTransposition:
             n_simulations=self.ALPHAZERO_SIMULATIONS,
             model_path=model_path,
         )
-        trans = TranspositionNegamaxAgent(time_limit_ms=self.NEGAMAX_TIME_LIMIT_MS)
+        trans = TranspositionNegamaxAgent(
+            time_limit_ms=None, node_limit=self.NEGAMAX_NODE_LIMIT
+        )
         diff = play_one_game(az, trans, self.BOARD_SIZE)
         assert diff > 0, f"AlphaZero-N6K(黒) が Transposition(白) に負けた (石差={diff})"
 
@@ -255,6 +265,8 @@ class TestAlphaZeroN6KVsTransposition:
             n_simulations=self.ALPHAZERO_SIMULATIONS,
             model_path=model_path,
         )
-        trans = TranspositionNegamaxAgent(time_limit_ms=self.NEGAMAX_TIME_LIMIT_MS)
+        trans = TranspositionNegamaxAgent(
+            time_limit_ms=None, node_limit=self.NEGAMAX_NODE_LIMIT
+        )
         diff = play_one_game(trans, az, self.BOARD_SIZE)
         assert diff < 0, f"AlphaZero-N6K(白) が Transposition(黒) に負けた (石差={diff})"
@@ -0,0 +1,103 @@
+"""training/batch_engine.py（NumPy 一括対局エンジン）のテスト。"""
+import numpy as np
+import pytest
+
+from agents.negamax_agent import _apply, _flips_for_move, _valid_moves
+from training.batch_engine import NO_ACTION, BatchEngine, play_games, random_policy
+from tests.conftest import initial_board
+
+
+class TestBatchEngine:
+    """リスト盤面ヘルパーとの一致と API のテスト。"""
+
+    def test_initial_state(self) -> None:
+        engine = BatchEngine(3)
+        assert engine.boards.shape == (3, 8, 8)
+        assert engine.boards.dtype == np.int8
+        assert engine.boards[2].tolist() == initial_board(8)
+        assert engine.turns.tolist() == [-1, -1, -1]
+        assert [tuple(x) for x in np.argwhere(engine.legal[0])] == [(2, 3), (3, 2), (4, 5), (5, 4)]
+
+    @pytest.mark.parametrize("n", [4, 6, 8])
+    def test_matches_list_helpers(self, n: int) -> None:
+        # ランダム対局を list ヘルパーで追いかけ、合法手・反転・盤面・手番が一致すること
+        count = 32
+        engine = BatchEngine(count, n)
+        rng = np.random.default_rng(n)
+        boards = [initial_board(n) for _ in range(count)]
+        turns = [-1] * count
+        while not engine.done.all():
+            actions = engine.random_actions(rng)
+            flips = engine.flips(actions)
+            for i in range(count):
+                if engine.done[i]:
+                    assert actions[i] == NO_ACTION
+                    assert not _valid_moves(boards[i], n, 1)
+                    assert not _valid_moves(boards[i], n, -1)
+                    continue
+                assert engine.turns[i] == turns[i]
+                legal = [tuple(x) for x in np.argwhere(engine.legal[i])]
+                assert legal == _valid_moves(boards[i], n, turns[i])
+                r, c = divmod(int(actions[i]), n)
+                expected = _flips_for_move(boards[i], n, r, c, turns[i])
+                assert [tuple(x) for x in np.argwhere(flips[i])] == sorted(expected)
+                _apply(boards[i], (r, c), expected, turns[i])
+                turns[i] = -turns[i]
+                if not _valid_moves(boards[i], n, turns[i]):
+                    turns[i] = -turns[i]   # パス
+            engine.step(actions)
+            assert [b.tolist() for b in engine.boards] == boards
+
+        black, white = engine.stone_counts()
+        for i in range(count):
+            b = sum(row.count(-1) for row in boards[i])
+            w = sum(row.count(1) for row in boards[i])
+            assert (black[i], white[i]) == (b, w)
+            assert engine.winners()[i] == (w > b) - (b > w)
+
+    def test_illegal_action_raises(self) -> None:
+        engine = BatchEngine(2)
+        with pytest.raises(ValueError, match=r"\[1\]"):
+            engine.step(np.array([2 * 8 + 3, 0]))
+        with pytest.raises(ValueError):
+            engine.step(np.array([2 * 8 + 3, 64]))
+        with pytest.raises(ValueError):
+            engine.step(np.array([2 * 8 + 3]))
+        # 失敗した step は盤面を変えない
+        assert engine.boards[0].tolist() == initial_board(8)
+
+    def test_finished_games_ignore_actions(self) -> None:
+        engine = BatchEngine(4, 4)
+        play_games(engine, random_policy(0), record=False)
+        boards = engine.boards.copy()
+        engine.step(np.zeros(4, dtype=np.int64))
+        assert (engine.boards == boards).all()
+        assert not engine.legal.any()
+
+    def test_play_games_records_positions(self) -> None:
+        engine = BatchEngine(5)
+        trajectories, winners = play_games(engine, random_policy(1))
+        assert len(trajectories) == 5
+        for states, plies in zip(trajectories, engine.plies):
+            assert len(states) == plies
+            assert states[0][0].tolist() == initial_board(8)
+            assert states[0][1] == -1
+        assert set(winners.tolist()) <= {-1, 0, 1}
+
+    def test_random_policy_is_reproducible(self) -> None:
+        first = play_games(BatchEngine(8), random_policy(3), record=False)[1]
+        second = play_games(BatchEngine(8), random_policy(3), record=False)[1]
+        assert first.tolist() == second.tolist()
+
+    def test_reset(self) -> None:
+        engine = BatchEngine(2)
+        play_games(engine, random_policy(0), record=False)
+        engine.reset()
+        assert not engine.done.any()
+        assert engine.plies.tolist() == [0, 0]
+        assert engine.boards[1].tolist() == initial_board(8)
+
+    @pytest.mark.parametrize("n_games, board_size", [(0, 8), (1, 3), (1, 5), (1, 10)])
+    def test_invalid_arguments(self, n_games: int, board_size: int) -> None:
+        with pytest.raises(ValueError):
+            BatchEngine(n_games, board_size)
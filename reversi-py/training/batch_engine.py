@@ -0,0 +1,282 @@
+"""NumPy による複数盤面の一括対局エンジン（バッチ自己対戦・プレイアウト用）。
+
+N 局の盤面を (N, n, n) の int8 配列（0=空, -1=黒, 1=白）で保持し、
+合法手マスク・反転石・着手の適用を全局まとめてベクトル演算で行う。
+Game やリスト盤面ヘルパーで 1 局ずつ進める代わりに、学習スクリプトの
+ランダム対局・方策による自己対戦を 1 コアで大量に生成するために使う。
+
+合法手と反転は bitboard.py と同じシフト + マスクで、全局分の uint64
+ビットボード配列に対して 8 方向まとめて求める（盤面は 8x8 以下）。
+
+使い方::
+
+    engine = BatchEngine(n_games=1024)
+    rng = np.random.default_rng(0)
+    while not engine.done.all():
+        engine.step(engine.random_actions(rng))
+    winners = engine.winners()
+
+着手は ``row * n + col`` の整数（AlphaZero の action index と同じ）。
+パスは step が自動で処理する（手番側に合法手がなければ相手に手番を渡し、
+両者とも合法手がなければその局を終局にする）ため、actions に含めない。
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+
+from agents.bitboard import _SHIFTS
+
+# 1 局を 64-bit（8x8、sq = row * 8 + col）に収めるため盤面は 8 以下
+MAX_BOARD_SIZE = 8
+
+# 終局済みの局に対する random_actions の値（step では無視される）
+NO_ACTION = -1
+
+# bitboard._SHIFTS を uint64 配列演算用に変換した (シフト量, 左シフトか, マスク)
+_SHIFTS_U64 = tuple(
+    (np.uint64(abs(shift)), shift > 0, np.uint64(mask)) for shift, mask in _SHIFTS
+)
+
+
+def _pack(mask: np.ndarray) -> np.ndarray:
+    """(N, n, n) bool マスクを (N,) uint64 のビットボードにする。"""
+    count, n = mask.shape[0], mask.shape[1]
+    bits = np.zeros((count, MAX_BOARD_SIZE, MAX_BOARD_SIZE), dtype=bool)
+    bits[:, :n, :n] = mask
+    packed = np.packbits(bits.reshape(count, -1), axis=1, bitorder="little")
+    return packed.view("<u8").reshape(count).astype(np.uint64)
+
+
+def _unpack(bits: np.ndarray, n: int) -> np.ndarray:
+    """(N,) uint64 のビットボードを (N, n, n) bool マスクに戻す。"""
+    count = bits.shape[0]
+    raw = np.ascontiguousarray(bits, dtype="<u8").view(np.uint8).reshape(count, 8)
+    unpacked = np.unpackbits(raw, axis=1, bitorder="little")
+    return unpacked.reshape(count, MAX_BOARD_SIZE, MAX_BOARD_SIZE)[:, :n, :n].astype(bool)
+
+
+class BatchEngine:
+    """N 局を同時に進めるベクトル化対局エンジン。
+
+    盤面は ``boards`` に (N, n, n) int8 で持つ。合法手と反転の計算では各局を
+    手番側・相手側の uint64 ビットボード（bitboard.py と同じビット配置）に
+    詰め、8 方向のシフトとマスクを (N,) 配列に対して一括で行う。
+    n < 8 の盤面も 8 列ストライドで詰めるため、盤外のビットは常に空かつ
+    着手不可となり、同じ演算のまま扱える。
+
+    Attributes:
+        boards: (N, n, n) int8 の盤面（0=空, -1=黒, 1=白）。
+        turns: (N,) int8 の手番（-1=黒, 1=白）。終局した局は最後の手番のまま。
+        legal: (N, n, n) bool の手番側の合法手マスク（終局した局は全て False）。
+        done: (N,) bool の終局フラグ。
+        plies: (N,) int32 の着手数（パスは数えない）。
+
+    Args:
+        n_games: 同時に進める局数 N。
+        board_size: 盤面サイズ（4 以上 8 以下の偶数）。
+
+    Raises:
+        ValueError: n_games や board_size が範囲外の場合。
+    """
+
+    def __init__(self, n_games: int, board_size: int = 8) -> None:
+        if n_games < 1:
+            raise ValueError(f"n_games must be positive: {n_games}")
+        if not 4 <= board_size <= MAX_BOARD_SIZE or board_size % 2:
+            raise ValueError(
+                f"board_size must be an even number in [4, {MAX_BOARD_SIZE}]: {board_size}"
+            )
+        self.n_games = n_games
+        self.board_size = board_size
+        # 盤内マス（row, col < n）のビット
+        self._valid = _pack(np.ones((1, board_size, board_size), dtype=bool))[0]
+        # 相手石の連なりの最大長は n-2。最初の 1 マスの後に n-3 回伸ばす
+        self._extend = board_size - 3
+        self._rows = np.arange(n_games)
+        self.reset()
+
+    def reset(self) -> None:
+        """全局を初期配置・黒番に戻す。"""
+        n = self.board_size
+        h = n // 2
+        self.boards = np.zeros((self.n_games, n, n), dtype=np.int8)
+        self.boards[:, h - 1, h - 1] = self.boards[:, h, h] = 1  # 白
+        self.boards[:, h - 1, h] = self.boards[:, h, h - 1] = -1  # 黒
+        self.turns = np.full(self.n_games, -1, dtype=np.int8)
+        self.done = np.zeros(self.n_games, dtype=bool)
+        self.plies = np.zeros(self.n_games, dtype=np.int32)
+        self._update_legal()
+
+    def _sides(self) -> tuple[np.ndarray, np.ndarray]:
+        """各局の (手番側, 相手側) ビットボード。"""
+        side = self.turns[:, None, None]
+        return _pack(self.boards == side), _pack(self.boards == -side)
+
+    def _ray(
+        self, start: np.ndarray, opponent: np.ndarray, amount: np.uint64, left: bool,
+        mask: np.uint64,
+    ) -> np.ndarray:
+        """start から 1 方向に連続する相手石をすべて集める。"""
+        om = opponent & mask
+        if left:
+            ray = (start << amount) & om
+            for _ in range(self._extend):
+                ray |= (ray << amount) & om
+        else:
+            ray = (start >> amount) & om
+            for _ in range(self._extend):
+                ray |= (ray >> amount) & om
+        return ray
+
+    def _legal_bits(self, player: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+        """各局で player 側が打てるマスのビットボード。"""
+        empty = ~(player | opponent) & self._valid
+        moves = np.zeros_like(player)
+        for amount, left, mask in _SHIFTS_U64:
+            # 自石から相手石の連なりを伸ばし、その先の空きマスが合法手
+            ray = self._ray(player, opponent, amount, left, mask)
+            moves |= ((ray << amount) if left else (ray >> amount)) & empty
+        return moves
+
+    def _flip_bits(
+        self, player: np.ndarray, opponent: np.ndarray, moves: np.ndarray
+    ) -> np.ndarray:
+        """各局で moves（1 ビット）に着手したとき反転する石のビットボード。"""
+        result = np.zeros_like(player)
+        zero = np.uint64(0)
+        for amount, left, mask in _SHIFTS_U64:
+            ray = self._ray(moves, opponent, amount, left, mask)
+            # 連なりの先に自石があれば挟める
+            end = (ray << amount) if left else (ray >> amount)
+            result |= np.where(end & player != zero, ray, zero)
+        return result
+
+    def _update_legal(self) -> None:
+        """手番側の合法手を求め、合法手がなければパス・終局を処理する。"""
+        player, opponent = self._sides()
+        legal = self._legal_bits(player, opponent)
+        stuck = ~self.done & (legal == 0)
+        if stuck.any():
+            # 手番側に合法手がなければパスし、相手も打てなければ終局
+            self.turns[stuck] = -self.turns[stuck]
+            legal[stuck] = self._legal_bits(opponent[stuck], player[stuck])
+            self.done |= stuck & (legal == 0)
+        legal[self.done] = 0
+        self._legal = legal
+        self.legal = _unpack(legal, self.board_size)
+
+    def _move_bits(self, actions: np.ndarray, active: np.ndarray) -> np.ndarray:
+        """active な局の着手位置だけを立てたビットボード（それ以外は 0）。"""
+        n = self.board_size
+        safe = np.where(active, actions, 0)
+        squares = (safe // n) * MAX_BOARD_SIZE + safe % n
+        bits = np.left_shift(np.uint64(1), squares.astype(np.uint64))
+        return np.where(active, bits, np.uint64(0))
+
+    def flips(self, actions: np.ndarray) -> np.ndarray:
+        """各局で actions に着手したときに反転する石のマスクを返す。
+
+        Args:
+            actions: (N,) の着手（row * n + col）。終局した局の値は無視する。
+
+        Returns:
+            (N, n, n) bool の反転マスク（不合法手・終局した局は全て False）。
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        n = self.board_size
+        active = ~self.done & (actions >= 0) & (actions < n * n)
+        player, opponent = self._sides()
+        moves = self._move_bits(actions, active) & ~(player | opponent)
+        return _unpack(self._flip_bits(player, opponent, moves), n)
+
+    def step(self, actions: np.ndarray) -> np.ndarray:
+        """未終局の全局に着手を適用し、手番を進める（パス・終局判定込み）。
+
+        Args:
+            actions: (N,) の着手（row * n + col）。終局した局の値は無視する。
+
+        Returns:
+            (N,) bool の終局フラグ（self.done と同じ配列）。
+
+        Raises:
+            ValueError: 未終局の局に不合法手が指定された場合。
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.n_games,):
+            raise ValueError(f"actions must have shape ({self.n_games},): {actions.shape}")
+        active = ~self.done
+        n = self.board_size
+        moves = self._move_bits(actions, active & (actions >= 0) & (actions < n * n))
+        ok = (moves & self._legal) != 0
+        if not ok[active].all():
+            raise ValueError(f"illegal actions for games {self._rows[active & ~ok].tolist()}")
+
+        player, opponent = self._sides()
+        changed = _unpack(self._flip_bits(player, opponent, moves) | moves, n)
+        self.boards = np.where(changed, self.turns[:, None, None], self.boards)
+        self.plies[active] += 1
+        self.turns[active] = -self.turns[active]
+        self._update_legal()
+        return self.done
+
+    def random_actions(self, rng: np.random.Generator) -> np.ndarray:
+        """各局の合法手から一様ランダムに 1 手ずつ選ぶ。
+
+        Args:
+            rng: NumPy の乱数生成器。
+
+        Returns:
+            (N,) の着手。終局した局は NO_ACTION。
+        """
+        legal = self.legal.reshape(self.n_games, -1)
+        scores = np.where(legal, rng.random(legal.shape), -1.0)
+        actions = scores.argmax(axis=1)
+        actions[self.done] = NO_ACTION
+        return actions
+
+    def stone_counts(self) -> tuple[np.ndarray, np.ndarray]:
+        """(黒石数, 白石数) をそれぞれ (N,) の配列で返す。"""
+        return (self.boards == -1).sum(axis=(1, 2)), (self.boards == 1).sum(axis=(1, 2))
+
+    def winners(self) -> np.ndarray:
+        """各局の石数で勝っている側（-1=黒, 1=白, 0=同数）を返す。"""
+        return np.sign(self.boards.sum(axis=(1, 2), dtype=np.int32)).astype(np.int8)
+
+
+def play_games(
+    engine: BatchEngine,
+    policy: Callable[[BatchEngine], np.ndarray],
+    record: bool = True,
+) -> tuple[list[list[tuple[np.ndarray, int]]], np.ndarray]:
+    """engine の全局を policy で終局まで進める。
+
+    Args:
+        engine: 対局エンジン（呼び出し時の局面から進める）。
+        policy: engine を受け取り (N,) の着手を返す関数。
+        record: 各局の着手前の (盤面, 手番) を記録するか。
+
+    Returns:
+        (局ごとの [(盤面 (n, n) int8, 手番)] のリスト, (N,) の勝者)。
+        record=False の場合、局ごとのリストは空。
+    """
+    trajectories: list[list[tuple[np.ndarray, int]]] = [[] for _ in range(engine.n_games)]
+    while not engine.done.all():
+        if record:
+            for i in np.flatnonzero(~engine.done):
+                trajectories[i].append((engine.boards[i].copy(), int(engine.turns[i])))
+        engine.step(policy(engine))
+    return trajectories, engine.winners()
+
+
+def random_policy(
+    seed: int | np.random.Generator | None = None,
+) -> Callable[[BatchEngine], np.ndarray]:
+    """一様ランダムに着手する play_games 用の方策を返す。
+
+    Args:
+        seed: 乱数シード、または使い回す NumPy の乱数生成器。
+    """
+    rng = np.random.default_rng(seed)
+    return lambda engine: engine.random_actions(rng)
@@ -0,0 +1,240 @@
+"""perft（指定深さまでの葉ノード数の数え上げ）による着手生成の検証と計測。
+
+同じ局面から各バックエンドで深さ d までの手順を全列挙し、葉の数を数える。
+着手生成・反転・着手の取り消しのどこかに誤りがあれば数が合わなくなるため、
+バックエンド間の相互チェックと既知の値（PERFT_8X8）との照合で正しさを、
+葉ノード数 / 秒で着手生成の速さを測る。
+
+数え方の規約:
+    - 合法手がなく相手には合法手がある局面では、パスを 1 手として数える。
+    - 深さに達する前に終局した局面は葉 1 つとして数える。
+    - 深さ 1 の局面では合法手の数をそのまま葉の数とする（末端の着手は適用しない）。
+
+バックエンド（PERFT_BACKENDS）:
+    board    board.Board（2 次元リスト）の play_move / undo_move
+    mailbox  board.MailboxBoard の play_move / undo_move
+    helpers  search_primitives のリスト盤面ヘルパー（_valid_moves / _flips_for_move）
+    bitboard agents.bitboard のカーネル（8x8 のみ）
+    batched  training.batch_engine の uint64 配列カーネルで 1 段ずつ一括展開（8x8 以下の偶数）
+"""
+import math
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from agents import bitboard
+from agents.search_primitives import _apply, _flips_for_move, _undo, _valid_moves
+from board import Board, MailboxBoard
+from training.batch_engine import MAX_BOARD_SIZE, BatchEngine, _pack
+
+__all__ = [
+    "PERFT_8X8",
+    "PERFT_BACKENDS",
+    "PerftBackend",
+    "format_position",
+    "initial_position",
+    "parse_position",
+]
+
+# 8x8 初期局面（黒番）の既知の perft 値。PERFT_8X8[d] が深さ d の葉の数
+PERFT_8X8 = (1, 4, 12, 56, 244, 1396, 8200, 55092, 390216, 3005288, 24571284)
+
+# parse_position が受け付ける文字（黒 / 白 / 空き）
+_BLACK_CHARS = "XxBb*"
+_WHITE_CHARS = "OoWw"
+_EMPTY_CHARS = "-.0_"
+
+Grid = List[List[int]]
+
+
+class PerftBackend(NamedTuple):
+    """perft のバックエンド。"""
+
+    run: Callable[[Grid, int, int], int]  # (盤面, 手番, 深さ) -> 葉の数
+    supports: Callable[[int], bool]  # 盤面サイズに対応しているか
+
+
+def initial_position(size: int = 8) -> Tuple[Grid, int]:
+    """size×size の初期局面と手番（黒）を返す。"""
+    return Board(size).get_board(), -1
+
+
+def parse_position(text: str) -> Tuple[Grid, int]:
+    """文字列から局面を読み込む。
+
+    空白を除いた文字列が n*n 文字のマス（X=黒, O=白, . または -=空き。
+    行優先）と、省略可能な末尾 1 文字の手番（X または O。省略時は黒）からなる。
+
+    Args:
+        text: 局面文字列（例: 64 文字 + "X"）。
+
+    Returns:
+        (盤面, 手番)。
+
+    Raises:
+        ValueError: 長さや文字が不正な場合。
+    """
+    chars = "".join(text.split())
+    turn = -1
+    size = math.isqrt(len(chars))
+    if size * size != len(chars):
+        side, chars = chars[-1], chars[:-1]
+        size = math.isqrt(len(chars))
+        if size * size != len(chars) or size == 0:
+            raise ValueError(f"position must have n*n squares (+ side to move): {len(text)} chars")
+        if side in _BLACK_CHARS:
+            turn = -1
+        elif side in _WHITE_CHARS:
+            turn = 1
+        else:
+            raise ValueError(f"unknown side to move: {side!r}")
+    grid = [[0] * size for _ in range(size)]
+    for i, ch in enumerate(chars):
+        if ch in _BLACK_CHARS:
+            grid[i // size][i % size] = -1
+        elif ch in _WHITE_CHARS:
+            grid[i // size][i % size] = 1
+        elif ch not in _EMPTY_CHARS:
+            raise ValueError(f"unknown square character: {ch!r}")
+    return grid, turn
+
+
+def format_position(grid: Grid, turn: int) -> str:
+    """parse_position の逆変換（マス n*n 文字 + 手番 1 文字）。"""
+    cells = "".join("X" if v == -1 else "O" if v == 1 else "." for row in grid for v in row)
+    return cells + ("X" if turn == -1 else "O")
+
+
+def _board_nodes(board: Board, turn: int, depth: int) -> int:
+    """Board の API で葉の数を数える。"""
+    moves = board.get_valid_moves(turn)
+    if not moves:
+        if not board.has_valid_move(-turn):
+            return 1
+        return 1 if depth == 1 else _board_nodes(board, -turn, depth - 1)
+    if depth == 1:
+        return len(moves)
+    total = 0
+    for row, col in moves:
+        flips = board.play_move(row, col, turn)
+        total += _board_nodes(board, -turn, depth - 1)
+        board.undo_move(row, col, flips, turn)
+    return total
+
+
+def _board_backend(board_cls: type) -> Callable[[Grid, int, int], int]:
+    def run(grid: Grid, turn: int, depth: int) -> int:
+        if depth == 0:
+            return 1
+        board = board_cls(len(grid))
+        board.board = [row[:] for row in grid]
+        return _board_nodes(board, turn, depth)
+    return run
+
+
+def _helper_nodes(board: Grid, n: int, turn: int, depth: int) -> int:
+    """negamax のリスト盤面ヘルパーで葉の数を数える。"""
+    moves = _valid_moves(board, n, turn)
+    if not moves:
+        if not _valid_moves(board, n, -turn):
+            return 1
+        return 1 if depth == 1 else _helper_nodes(board, n, -turn, depth - 1)
+    if depth == 1:
+        return len(moves)
+    total = 0
+    for move in moves:
+        flips = _flips_for_move(board, n, move[0], move[1], turn)
+        _apply(board, move, flips, turn)
+        total += _helper_nodes(board, n, -turn, depth - 1)
+        _undo(board, move, flips, turn)
+    return total
+
+
+def _run_helpers(grid: Grid, turn: int, depth: int) -> int:
+    if depth == 0:
+        return 1
+    return _helper_nodes([row[:] for row in grid], len(grid), turn, depth)
+
+
+def _bitboard_nodes(player: int, opponent: int, depth: int) -> int:
+    """ビットボード（手番側, 相手側）で葉の数を数える。"""
+    moves = bitboard.legal_moves(player, opponent)
+    if not moves:
+        if not bitboard.legal_moves(opponent, player):
+            return 1
+        return 1 if depth == 1 else _bitboard_nodes(opponent, player, depth - 1)
+    if depth == 1:
+        return moves.bit_count()
+    total = 0
+    while moves:
+        low = moves & -moves
+        moves ^= low
+        flipped = bitboard.flips(player, opponent, low.bit_length() - 1)
+        total += _bitboard_nodes(opponent ^ flipped, player | low | flipped, depth - 1)
+    return total
+
+
+def _run_bitboard(grid: Grid, turn: int, depth: int) -> int:
+    if depth == 0:
+        return 1
+    player, opponent = bitboard.from_board(grid, turn)
+    return _bitboard_nodes(player, opponent, depth)
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """(M,) uint64 の各要素の立っているビット数。"""
+    raw = np.ascontiguousarray(bits, dtype="<u8").view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(raw, axis=1).sum(axis=1)
+
+
+def _run_batched(grid: Grid, turn: int, depth: int) -> int:
+    """局面の集合を 1 段ずつ配列のまま展開して葉の数を数える。"""
+    if depth == 0:
+        return 1
+    n = len(grid)
+    kernel = BatchEngine(1, n)
+    array = np.array(grid, dtype=np.int8)[None]
+    player, opponent = _pack(array == turn), _pack(array == -turn)
+    zero = np.uint64(0)
+    leaves = 0
+    for remaining in range(depth, 0, -1):
+        moves = kernel._legal_bits(player, opponent)
+        stuck = moves == zero
+        if stuck.any():
+            # パスできる局面は手番を入れ替えて次の段へ、終局なら葉 1 つ
+            answer = kernel._legal_bits(opponent[stuck], player[stuck])
+            over = int((answer == zero).sum())
+            leaves += over
+            passed = answer != zero
+            pass_player, pass_opponent = opponent[stuck][passed], player[stuck][passed]
+        else:
+            pass_player = pass_opponent = player[:0]
+        if remaining == 1:
+            return leaves + int(_popcount(moves).sum()) + len(pass_player)
+        children_player = [pass_player]
+        children_opponent = [pass_opponent]
+        while True:
+            active = moves != zero
+            if not active.any():
+                break
+            player, opponent, moves = player[active], opponent[active], moves[active]
+            low = moves & (~moves + np.uint64(1))
+            moves = moves ^ low
+            flipped = kernel._flip_bits(player, opponent, low)
+            children_player.append(opponent ^ flipped)
+            children_opponent.append(player | low | flipped)
+        player = np.concatenate(children_player)
+        opponent = np.concatenate(children_opponent)
+    return leaves  # pragma: no cover
+
+
+# バックエンド名 -> PerftBackend
+PERFT_BACKENDS: Dict[str, PerftBackend] = {
+    "board": PerftBackend(_board_backend(Board), lambda n: n >= 4),
+    "mailbox": PerftBackend(_board_backend(MailboxBoard), lambda n: n >= 4),
+    "helpers": PerftBackend(_run_helpers, lambda n: n >= 4),
+    "bitboard": PerftBackend(_run_bitboard, lambda n: n == bitboard.SIZE),
+    "batched": PerftBackend(
+        _run_batched, lambda n: 4 <= n <= MAX_BOARD_SIZE and n % 2 == 0
+    ),
+}